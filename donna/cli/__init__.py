@@ -1,6 +1,10 @@
-from donna.cli import application as application
-from donna.cli import entities as entities
-from donna.cli import errors as errors
-from donna.cli import types as types
+from donna.core.utils import lazy_submodules
 
-__all__ = ("application", "entities", "errors", "types")
+__all__ = (
+    "application",
+    "entities",
+    "errors",
+    "types",
+)
+
+__getattr__ = lazy_submodules(__name__, __all__)
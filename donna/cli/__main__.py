@@ -1,3 +1,3 @@
-from donna.cli.application import main
+from donna.cli.client import main
 
 main()
@@ -1,11 +1,71 @@
+import importlib
+
+import click
 import typer
+from typer.core import TyperGroup
 
 from donna.cli.entities import GLOBAL_OPTIONS_CONTEXT_KEY, GlobalOptions
 from donna.cli.types import ConfigOption, ProtocolModeOption
 from donna.domain.paths import UntrustedPath
 from donna.protocol.modes import Mode
 
-app = typer.Typer(help="Donna CLI: manage hierarchical state machines to guide your AI agents.")
+# Modules register their commands on `app` when imported. A command module is imported only when its command
+# is invoked, so a command does not pay for the dependencies of the others.
+COMMAND_MODULES = {
+    "init": "donna.cli.commands.workspaces",
+    "list": "donna.cli.commands.artifacts",
+    "render": "donna.cli.commands.artifacts",
+    "validate": "donna.cli.commands.artifacts",
+    "graph": "donna.cli.commands.graph",
+    "new-session": "donna.cli.commands.sessions",
+    "continue": "donna.cli.commands.sessions",
+    "status": "donna.cli.commands.sessions",
+    "details": "donna.cli.commands.sessions",
+    "run": "donna.cli.commands.sessions",
+    "complete-action-request": "donna.cli.commands.sessions",
+    "journal": "donna.cli.commands.journal",
+    "skill": "donna.cli.commands.skills",
+    "version": "donna.cli.commands.version",
+    "daemon": "donna.cli.commands.daemon",
+}
+
+
+def load_command_modules() -> None:
+    for module_name in dict.fromkeys(COMMAND_MODULES.values()):
+        importlib.import_module(module_name)
+
+
+class LazyCommandGroup(TyperGroup):
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return list(COMMAND_MODULES)
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands:
+            module_name = COMMAND_MODULES.get(cmd_name)
+
+            # Unknown names load every command, so typo suggestions still list all of them.
+            if module_name is None:
+                load_command_modules()
+            else:
+                importlib.import_module(module_name)
+
+            self._add_registered_commands()
+
+        return self.commands.get(cmd_name)
+
+    def _add_registered_commands(self) -> None:
+        for command_info in app.registered_commands:
+            command = typer.main.get_command_from_info(
+                command_info,
+                pretty_exceptions_short=app.pretty_exceptions_short,
+                rich_markup_mode=app.rich_markup_mode,
+            )
+
+            if command.name is not None and command.name not in self.commands:
+                self.add_command(command)
+
+
+app = typer.Typer(cls=LazyCommandGroup, help="Donna CLI: manage hierarchical state machines to guide your AI agents.")
 
 
 @app.callback()
@@ -20,10 +80,4 @@ def initialize(
 
 
 def main() -> None:
-    from donna.cli.commands import artifacts  # noqa: F401
-    from donna.cli.commands import sessions  # noqa: F401
-    from donna.cli.commands import skills  # noqa: F401
-    from donna.cli.commands import version  # noqa: F401
-    from donna.cli.commands import workspaces  # noqa: F401
-
     app()
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import pathlib
+import socket
+import stat
+import struct
+import sys
+import tempfile
+from collections.abc import Sequence
+from typing import BinaryIO
+
+from donna.domain.constants import DONNA_CONFIG_NAME
+
+# This module runs before every command, so it must import only the standard library and light Donna modules.
+# A command is forwarded to the daemon of its project when one is running and is executed in-process otherwise.
+
+DAEMON_DISABLE_ENV = "DONNA_NO_DAEMON"
+
+# Commands that only read and write the session and the artifacts. Commands that create the project, read stdin
+# or run forever are always executed in-process.
+FORWARDED_COMMANDS = frozenset(
+    {
+        "new-session",
+        "continue",
+        "status",
+        "details",
+        "run",
+        "complete-action-request",
+        "list",
+        "render",
+        "validate",
+        "graph",
+    }
+)
+
+# Global options that take a value, they come before the command name.
+VALUE_OPTIONS = ("--config", "--protocol", "-p")
+
+FRAME_HEADER = struct.Struct(">BI")
+FRAME_STDOUT = 1
+FRAME_STDERR = 2
+FRAME_EXIT = 3
+# The daemon can not run the command, for example because the project config changed, the client runs it itself.
+FRAME_FALLBACK = 4
+
+
+def runtime_dir() -> pathlib.Path:
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return pathlib.Path(base) / f"donna-{os.getuid()}"
+
+
+def is_private_dir(path: pathlib.Path) -> bool:
+    """Check that the directory belongs to the current user and nobody else can create sockets in it.
+
+    The fallback runtime directory is in the shared temporary directory, where another user may create it first.
+    """
+    try:
+        dir_stat = path.lstat()
+    except OSError:
+        return False
+
+    return stat.S_ISDIR(dir_stat.st_mode) and dir_stat.st_uid == os.getuid() and dir_stat.st_mode & 0o077 == 0
+
+
+def socket_path(config_path: pathlib.Path) -> pathlib.Path:
+    # Socket paths are limited to about a hundred bytes, so the project is identified by a hash of its config path.
+    digest = hashlib.blake2b(str(config_path).encode("utf-8"), digest_size=8).hexdigest()
+    return runtime_dir() / f"{digest}.sock"
+
+
+def _option_value(argv: Sequence[str], index: int) -> tuple[str, str | None, int] | None:
+    """Parse the global option at the index into its name, value and the index of the next argument."""
+    argument = argv[index]
+    name, separator, value = argument.partition("=")
+
+    if separator and name in VALUE_OPTIONS:
+        return name, value, index + 1
+
+    if argument in VALUE_OPTIONS:
+        return (argument, argv[index + 1], index + 2) if index + 1 < len(argv) else None
+
+    if argument.startswith("-p") and len(argument) > 2:
+        return "-p", argument[2:], index + 1
+
+    return None
+
+
+def scan_arguments(argv: Sequence[str]) -> tuple[str | None, str | None]:
+    """Find the command name and the `--config` value in the command line arguments.
+
+    Returns no command when the arguments can not be understood without the full CLI, for example for `--help`.
+    """
+    config: str | None = None
+    index = 0
+
+    while index < len(argv):
+        if not argv[index].startswith("-"):
+            return argv[index], config
+
+        option = _option_value(argv, index)
+        if option is None:
+            return None, config
+
+        name, value, index = option
+        if name == "--config":
+            config = value
+
+    return None, config
+
+
+def resolve_config_path(config: str | None, cwd: pathlib.Path) -> pathlib.Path | None:
+    if config is not None:
+        return (cwd / pathlib.Path(config).expanduser()).resolve()
+
+    current_dir = cwd.resolve()
+
+    for parent in [current_dir, *current_dir.parents]:
+        if (parent / DONNA_CONFIG_NAME).is_file():
+            return parent / DONNA_CONFIG_NAME
+
+    return None
+
+
+def encode_frame(kind: int, payload: bytes = b"") -> bytes:
+    return FRAME_HEADER.pack(kind, len(payload)) + payload
+
+
+def read_frame(stream: BinaryIO) -> tuple[int, bytes] | None:
+    header = stream.read(FRAME_HEADER.size)
+    if len(header) < FRAME_HEADER.size:
+        return None
+
+    kind, size = FRAME_HEADER.unpack(header)
+    payload = stream.read(size)
+    if len(payload) < size:
+        return None
+
+    return kind, payload
+
+
+def connect(config_path: pathlib.Path) -> socket.socket | None:
+    if not is_private_dir(runtime_dir()):
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        connection.connect(str(socket_path(config_path)))
+    except OSError:
+        connection.close()
+        return None
+
+    return connection
+
+
+def _send_request(connection: socket.socket, request: dict[str, object]) -> BinaryIO:
+    connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+    return connection.makefile("rb")
+
+
+def _receive_output(stream: BinaryIO, stdout: BinaryIO, stderr: BinaryIO) -> int | None:
+    while (frame := read_frame(stream)) is not None:
+        kind, payload = frame
+
+        if kind == FRAME_EXIT:
+            return int(payload)
+
+        if kind == FRAME_FALLBACK:
+            return None
+
+        target = stdout if kind == FRAME_STDOUT else stderr
+        target.write(payload)
+        target.flush()
+
+    stderr.write(b"Donna daemon closed the connection before the command finished.\n")
+    return 1
+
+
+def forward(argv: Sequence[str], stdout: BinaryIO, stderr: BinaryIO) -> int | None:
+    """Run the command in the daemon of its project and return the exit code.
+
+    Returns None when the command must be executed in the current process.
+    """
+    if os.environ.get(DAEMON_DISABLE_ENV):
+        return None
+
+    command, config = scan_arguments(argv)
+    if command not in FORWARDED_COMMANDS:
+        return None
+
+    cwd = pathlib.Path.cwd()
+    config_path = resolve_config_path(config, cwd)
+    if config_path is None:
+        return None
+
+    connection = connect(config_path)
+    if connection is None:
+        return None
+
+    # Scripts of the command must see the environment of the client, not the one of the daemon.
+    request: dict[str, object] = {"argv": list(argv), "cwd": str(cwd), "env": dict(os.environ)}
+
+    with connection, _send_request(connection, request) as stream:
+        return _receive_output(stream, stdout, stderr)
+
+
+def stop_daemon(config_path: pathlib.Path) -> bool:
+    """Ask the daemon of the project to stop and return whether one was running."""
+    connection = connect(config_path)
+    if connection is None:
+        return False
+
+    with connection, _send_request(connection, {"stop": True}) as stream:
+        while read_frame(stream) is not None:
+            pass
+
+    return True
+
+
+def main() -> None:
+    try:
+        exit_code = forward(sys.argv[1:], sys.stdout.buffer, sys.stderr.buffer)
+    except BrokenPipeError:
+        # The output reader exited early, as `head` does. Python must not report the unflushed output at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from donna.cli.application import main as application_main
+
+    application_main()
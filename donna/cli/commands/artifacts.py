@@ -10,7 +10,13 @@ from donna.cli.utils import command_context
 from donna.context.context import context
 from donna.protocol.cell_shortcuts import operation_succeeded
 from donna.protocol.errors import environment_error_node
-from donna.workspaces.artifacts import RENDER_CONTEXT_VIEW, ArtifactRenderContext, fetch_artifact_bytes
+from donna.runtime import validation
+from donna.workspaces.artifacts import (
+    RENDER_CONTEXT_VIEW,
+    ArtifactRenderContext,
+    fetch_artifact_bytes,
+    list_artifact_ids,
+)
 from donna.workspaces.templates import render as render_template
 
 
@@ -65,7 +71,7 @@ def validate(  # noqa: CCR001
 
         if all_artifacts:
             _log_artifact_operation("Validate all artifacts")
-            artifacts = context().artifacts.list(RENDER_CONTEXT_VIEW).unwrap()
+            artifact_ids = list_artifact_ids()
         else:
             assert artifact_paths is not None
             artifact_ids = [
@@ -74,19 +80,13 @@ def validate(  # noqa: CCR001
             _log_artifact_operation(
                 f"Validate artifacts {', '.join(f'`{artifact_id}`' for artifact_id in artifact_ids)}"
             )
-            artifacts = [
-                context().artifacts.load(artifact_id, RENDER_CONTEXT_VIEW).unwrap() for artifact_id in artifact_ids
-            ]
-
-        errors = []
 
-        for artifact in artifacts:
-            result = artifact.validate_artifact()
-            if result.is_err():
-                errors.extend(result.unwrap_err())
+        validations = validation.validate_artifacts(artifact_ids)
+        errors = [error for artifact_validation in validations for error in artifact_validation.errors]
 
         if errors:
             command.write_cells(environment_error_node(error).info() for error in errors)
-            return
+        else:
+            command.write_cells([operation_succeeded("All artifacts are valid")])
 
-        command.write_cells([operation_succeeded("All artifacts are valid")])
+        command.write_cells([validation.summary_cell(validations)])
@@ -0,0 +1,41 @@
+import pathlib
+from typing import Annotated
+
+import typer
+
+from donna.cli import client
+from donna.cli.application import app
+from donna.cli.daemon import DaemonServer
+from donna.cli.utils import command_context
+from donna.protocol.cell_shortcuts import info, operation_succeeded
+from donna.workspaces import config as workspace_config
+
+
+@app.command(
+    help=(
+        "Serve commands of the current project from a long-running process that keeps workspace, session state "
+        "and artifacts in memory."
+    )
+)
+def daemon(
+    context: typer.Context,
+    stop: Annotated[bool, typer.Option("--stop", help="Stop the running daemon of the current project.")] = False,
+) -> None:
+    with command_context(context) as command:
+        config_path = workspace_config.config_path()
+
+        if stop:
+            stopped = client.stop_daemon(pathlib.Path(config_path))
+            command.write_cells([operation_succeeded("Stopped Donna daemon." if stopped else "No Donna daemon runs.")])
+            return
+
+        server = DaemonServer(config_path)
+        listener = server.bind().unwrap()
+        command.write_cells([info(f"Donna daemon is listening on `{server.socket_path}`.")])
+
+        try:
+            server.serve(listener)
+        except KeyboardInterrupt:
+            pass
+
+        command.write_cells([operation_succeeded("Stopped Donna daemon.")])
@@ -0,0 +1,69 @@
+from typing import Annotated
+
+import typer
+
+from donna.cli.application import app
+from donna.cli.types import parse_artifact_section_id_argument
+from donna.cli.utils import command_context
+from donna.protocol.cells import Cell
+from donna.protocol.errors import environment_error_node
+from donna.runtime import graph as workflow_graph
+
+
+@app.command(
+    help=(
+        "Analyze the workflow graph of the project: sections of all artifacts linked by operation transitions "
+        "and workflow starts."
+    )
+)
+def graph(  # noqa: CCR001
+    context: typer.Context,
+    reachable_from: Annotated[
+        str | None,
+        typer.Option("--from", help="Show sections reachable from this 'artifact:section' path."),
+    ] = None,
+    reaching: Annotated[
+        str | None,
+        typer.Option("--to", help="Show sections that lead to this 'artifact:section' path."),
+    ] = None,
+    dead: Annotated[bool, typer.Option("--dead", help="Show operations no artifact entry leads to.")] = False,
+    cycles: Annotated[
+        bool, typer.Option("--cycles", help="Show groups of sections that lead back to themselves.")
+    ] = False,
+) -> None:
+    with command_context(context) as command:
+        loaded = workflow_graph.load_graph()
+
+        cells: list[Cell] = [environment_error_node(error).info() for error in loaded.errors]
+        cells.append(workflow_graph.summary_cell(loaded))
+
+        if reachable_from is not None:
+            section_id = parse_artifact_section_id_argument(reachable_from, command.target_dir())
+            cells.append(
+                workflow_graph.sections_cell(
+                    "workflow_graph_reachable",
+                    f"Sections reachable from `{section_id}`",
+                    loaded.reachable_from([section_id]),
+                )
+            )
+
+        if reaching is not None:
+            section_id = parse_artifact_section_id_argument(reaching, command.target_dir())
+            cells.append(
+                workflow_graph.sections_cell(
+                    "workflow_graph_reaching", f"Sections that lead to `{section_id}`", loaded.reaching([section_id])
+                )
+            )
+
+        if dead:
+            cells.append(
+                workflow_graph.sections_cell("workflow_graph_dead", "Dead operations", loaded.dead_operations())
+            )
+
+        if cycles:
+            cells.extend(
+                workflow_graph.sections_cell("workflow_graph_cycle", "Cycle", component)
+                for component in loaded.cycles()
+            )
+
+        command.write_cells(cells)
@@ -0,0 +1,51 @@
+from typing import Annotated
+
+import typer
+
+from donna.cli.application import app
+from donna.cli.types import TaskIdOption, parse_artifact_section_id_argument
+from donna.cli.utils import command_context
+from donna.workspaces import journal_store
+
+
+@app.command(
+    name="journal", help="Show the last journal records of the current session and optionally follow new ones."
+)
+def journal(
+    context: typer.Context,
+    lines: Annotated[int, typer.Option("--lines", "-n", min=0, help="Number of the last records to show.")] = 20,
+    follow: Annotated[
+        bool,
+        typer.Option("--follow", "-f", help="Keep running and show new records as they are written."),
+    ] = False,
+    task_id: TaskIdOption = None,
+    operation_path: Annotated[
+        str | None,
+        typer.Option(
+            "--operation",
+            help="Show only records of the operation with this artifact section path in 'artifact:section' form.",
+        ),
+    ] = None,
+) -> None:
+    with command_context(context) as command:
+        journal_store.require_enabled().unwrap()
+
+        operation_id = (
+            None
+            if operation_path is None
+            else parse_artifact_section_id_argument(operation_path, command.target_dir())
+        )
+        query = journal_store.JournalQuery(task_id=task_id, operation_id=operation_id)
+        position = journal_store.end_position(journal_store.load_index())
+
+        for record in journal_store.tail(lines, query, position):
+            command.emitter.emit_journal(record)
+
+        if not follow:
+            return
+
+        try:
+            for record in journal_store.follow(query, position):
+                command.emitter.emit_journal(record)
+        except KeyboardInterrupt:
+            pass
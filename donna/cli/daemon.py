@@ -0,0 +1,244 @@
+import io
+import json
+import os
+import pathlib
+import socket
+import sys
+import traceback
+from collections.abc import Buffer, Iterator
+from contextlib import chdir, contextmanager, redirect_stderr, redirect_stdout
+
+import typer
+
+from donna.cli import client
+from donna.cli import errors as cli_errors
+from donna.cli.application import app, load_command_modules
+from donna.cli.utils import keep_runtime_contexts
+from donna.context.context import Context
+from donna.core.errors import ErrorsList
+from donna.core.result import Err, Ok, Result
+from donna.domain.paths import ProjectConfigPath
+from donna.protocol.modes import Mode
+from donna.workspaces import config as workspace_config
+from donna.workspaces.files import (
+    FileContentKeys,
+    FileFingerprint,
+    content_keys,
+    content_keys_changed,
+    forget_module_content_keys,
+)
+
+# Seconds a client may take to send its request. The daemon serves clients one by one, so a stalled client
+# must not block the commands of the others.
+REQUEST_TIMEOUT = 5.0
+
+
+class _ClientConnection:
+    __slots__ = ("_socket", "disconnected")
+
+    def __init__(self, connection: socket.socket) -> None:
+        self._socket = connection
+        self.disconnected = False
+
+    def send(self, kind: int, payload: bytes = b"") -> None:
+        if self.disconnected:
+            return
+
+        try:
+            self._socket.sendall(client.encode_frame(kind, payload))
+        except OSError:
+            # The client was interrupted, the command still runs to the end to keep the session consistent.
+            self.disconnected = True
+
+    def text_stream(self, kind: int) -> io.TextIOWrapper:
+        return io.TextIOWrapper(
+            io.BufferedWriter(_ClientOutput(self, kind)), encoding="utf-8", line_buffering=True, write_through=True
+        )
+
+
+class _ClientOutput(io.RawIOBase):
+    def __init__(self, connection: _ClientConnection, kind: int) -> None:
+        super().__init__()
+        self._connection = connection
+        self._kind = kind
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Buffer) -> int:
+        payload = bytes(data)
+        self._connection.send(self._kind, payload)
+        return len(payload)
+
+
+def _exit_code(code: object, stderr: io.TextIOWrapper) -> int:
+    if code is None:
+        return 0
+
+    if isinstance(code, int):
+        return code
+
+    stderr.write(f"{code}\n")
+    return 1
+
+
+@contextmanager
+def _client_environment(env: dict[str, str]) -> Iterator[None]:
+    daemon_env = dict(os.environ)
+    os.environ.clear()
+    os.environ.update(env)
+
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(daemon_env)
+
+
+class DaemonServer:
+    """Run CLI commands sent by clients in this process, keeping runtime contexts warm between them.
+
+    Commands are executed one at a time: each of them gets the working directory and the environment of its
+    client for the time it runs, and they share the session state and the standard streams of the process.
+    """
+
+    __slots__ = (
+        "_base_modules",
+        "_command",
+        "_config_fingerprint",
+        "_config_path",
+        "_contexts",
+        "_module_sources",
+        "socket_path",
+    )
+
+    def __init__(self, config_path: ProjectConfigPath) -> None:
+        load_command_modules()
+
+        self._config_path = config_path
+        self._config_fingerprint = FileFingerprint.from_path(config_path)
+        self._contexts: dict[Mode, Context] = {}
+        self._command = typer.main.get_command(app)
+        self.socket_path = client.socket_path(pathlib.Path(config_path))
+        self._base_modules = frozenset(sys.modules)
+        self._module_sources: FileContentKeys = {}
+
+    def bind(self) -> Result[socket.socket, ErrorsList]:
+        running = client.connect(pathlib.Path(self._config_path))
+
+        if running is not None:
+            running.close()
+            return Err([cli_errors.DaemonAlreadyRunning(config_path=self._config_path)])
+
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        if not client.is_private_dir(self.socket_path.parent):
+            return Err([cli_errors.DaemonRuntimeDirNotPrivate(runtime_dir=str(self.socket_path.parent))])
+
+        # A socket left by a daemon that was killed refuses connections and can be replaced.
+        self.socket_path.unlink(missing_ok=True)
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(self.socket_path))
+        listener.listen()
+        return Ok(listener)
+
+    def serve(self, listener: socket.socket) -> None:
+        """Serve clients until one asks to stop or the project config changes."""
+        with listener:
+            try:
+                while self._serve_client(listener):
+                    pass
+            finally:
+                self.socket_path.unlink(missing_ok=True)
+
+    def _serve_client(self, listener: socket.socket) -> bool:
+        connection, _ = listener.accept()
+
+        connection.settimeout(REQUEST_TIMEOUT)
+
+        with connection, connection.makefile("rb") as stream:
+            try:
+                request = json.loads(stream.readline())
+            except (ValueError, OSError):
+                return True
+
+            connection.settimeout(None)
+
+            if not isinstance(request, dict):
+                return True
+
+            return self._handle(_ClientConnection(connection), request)
+
+    def _handle(self, connection: _ClientConnection, request: dict[str, object]) -> bool:
+        if request.get("stop"):
+            connection.send(client.FRAME_EXIT, b"0")
+            return False
+
+        argv, cwd, env = request.get("argv"), request.get("cwd"), request.get("env")
+        if not isinstance(argv, list) or not isinstance(cwd, str) or not isinstance(env, dict):
+            return True
+
+        if self._is_outdated():
+            connection.send(client.FRAME_FALLBACK)
+            return False
+
+        exit_code = self._run(
+            [str(argument) for argument in argv],
+            cwd,
+            {str(name): str(value) for name, value in env.items()},
+            connection,
+        )
+        self._record_module_sources()
+        connection.send(client.FRAME_EXIT, str(exit_code).encode("utf-8"))
+        return True
+
+    def _is_outdated(self) -> bool:
+        # Workspace globals and imported modules are loaded once, a changed config or custom primitive or directive
+        # module requires a new daemon.
+        if FileFingerprint.from_path(self._config_path) != self._config_fingerprint:
+            return True
+
+        return content_keys_changed(self._module_sources)
+
+    def _record_module_sources(self) -> None:
+        # Modules imported by commands, rather than by the daemon itself, include custom primitives and directives.
+        paths: list[str] = []
+
+        for name, module in list(sys.modules.items()):
+            path: str | None = getattr(module, "__file__", None)
+
+            if name not in self._base_modules and path is not None and path not in self._module_sources:
+                paths.append(path)
+
+        self._module_sources.update(content_keys(paths))
+
+    def _run(self, argv: list[str], cwd: str, env: dict[str, str], connection: _ClientConnection) -> int:
+        # Every command chooses its own protocol and reads the sources of modules behind cached data again.
+        workspace_config.protocol.reset()
+        forget_module_content_keys()
+
+        stdout = connection.text_stream(client.FRAME_STDOUT)
+        stderr = connection.text_stream(client.FRAME_STDERR)
+
+        try:
+            with (
+                chdir(cwd),
+                _client_environment(env),
+                redirect_stdout(stdout),
+                redirect_stderr(stderr),
+                keep_runtime_contexts(self._contexts),
+            ):
+                self._command.main(args=argv, prog_name="donna", standalone_mode=True)
+        except SystemExit as error:
+            return _exit_code(error.code, stderr)
+        except Exception:
+            # The failed command may leave caches half-updated, the next command fills them again.
+            self._contexts.clear()
+            traceback.print_exc(file=stderr)
+            return 1
+        finally:
+            stdout.flush()
+            stderr.flush()
+
+        return 0
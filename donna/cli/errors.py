@@ -1,4 +1,5 @@
 from donna.core import errors as core_errors
+from donna.domain.paths import ProjectConfigPath
 
 
 class InternalError(core_errors.InternalError):
@@ -7,3 +8,25 @@ class InternalError(core_errors.InternalError):
 
 class CliError(core_errors.EnvironmentError):
     cell_kind: str = "cli_error"
+
+
+class DaemonAlreadyRunning(CliError):
+    code: str = "donna.cli.daemon_already_running"
+    message: str = "Donna daemon is already running for `{error.config_path}`."
+    ways_to_fix: list[str] = [
+        "Keep using the running daemon, commands are forwarded to it automatically.",
+        "Stop the running daemon with `donna daemon --stop` before starting a new one.",
+    ]
+    config_path: ProjectConfigPath
+
+
+class DaemonRuntimeDirNotPrivate(CliError):
+    code: str = "donna.cli.daemon_runtime_dir_not_private"
+    message: str = (
+        "Donna daemon runtime directory `{error.runtime_dir}` is not a private directory of the current user."
+    )
+    ways_to_fix: list[str] = [
+        "Remove the directory, Donna creates it again with the right owner and permissions.",
+        "Set `XDG_RUNTIME_DIR` to a directory that only the current user can access.",
+    ]
+    runtime_dir: str
@@ -1,24 +1,14 @@
-import importlib
 import json
 import pathlib
 
 from click.testing import Result as CliResult
 from typer.testing import CliRunner
 
-from donna.cli.application import app
-
-COMMAND_MODULES = (
-    "donna.cli.commands.artifacts",
-    "donna.cli.commands.sessions",
-    "donna.cli.commands.skills",
-    "donna.cli.commands.version",
-    "donna.cli.commands.workspaces",
-)
+from donna.cli.application import app, load_command_modules
 
 
 def load_cli_commands() -> None:
-    for module_name in COMMAND_MODULES:
-        importlib.import_module(module_name)
+    load_command_modules()
 
 
 def make_runner() -> CliRunner:
@@ -1,5 +1,7 @@
 import pathlib
 
+from pytest_mock import MockerFixture
+
 from donna.cli.tests import helpers
 
 
@@ -60,6 +62,38 @@ class TestValidate:
         assert result.exit_code == 0
         assert "kind=operation_succeeded" in result.output
 
+    def test_reports_machine_readable_summary(self, tmp_path: pathlib.Path) -> None:
+        config_path = helpers.write_config(tmp_path)
+        helpers.write_workflow(tmp_path)
+        helpers.write_workflow(tmp_path, path="workflows/broken.donna.md").write_text(
+            "# Broken\n\nNo sections.\n", encoding="utf-8"
+        )
+
+        result = helpers.invoke(["--config", str(config_path), "-p", "automation", "validate", "--all"])
+
+        assert result.exit_code == 0
+        summary = helpers.json_lines(result.output)[-1]
+        assert summary["artifacts"] == 2
+        assert summary["valid"] == 1
+        assert summary["invalid_artifacts"] == ["@/workflows/broken.donna.md"]
+        assert summary["revalidated"] == 2
+
+    def test_reuses_results_of_unchanged_artifacts(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        mocker.patch("donna.workspaces.caches.donna_version", return_value="1.2.3")
+        mocker.patch("donna.workspaces.caches.signing_key", return_value=b"k" * 32)
+        config_path = helpers.write_config(tmp_path)
+        helpers.write_workflow(tmp_path)
+        helpers.write_workflow(tmp_path, path="workflows/other.donna.md")
+        command = ["--config", str(config_path), "-p", "automation", "validate", "--all"]
+
+        helpers.invoke(command)
+        helpers.write_workflow(tmp_path, path="workflows/other.donna.md", description="Changed description.")
+        result = helpers.invoke(command)
+
+        summary = helpers.json_lines(result.output)[-1]
+        assert summary["cached"] == 1
+        assert summary["revalidated"] == 1
+
     def test_rejects_all_option_combined_with_artifact_argument(self, tmp_path: pathlib.Path) -> None:
         config_path = helpers.write_config(tmp_path)
         helpers.write_workflow(tmp_path)
@@ -0,0 +1,172 @@
+import io
+import pathlib
+
+import pytest
+from pytest_mock import MockerFixture
+
+from donna.cli import client
+from donna.cli.application import COMMAND_MODULES
+
+
+class TestForwardedCommands:
+    def test_are_registered_commands(self) -> None:
+        assert client.FORWARDED_COMMANDS <= set(COMMAND_MODULES)
+
+
+class TestRuntimeDir:
+    def test_uses_xdg_runtime_dir(self, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+        assert client.runtime_dir().parent == tmp_path
+
+
+class TestIsPrivateDir:
+    def test_accepts_directory_of_current_user(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "runtime"
+        path.mkdir(mode=0o700)
+
+        assert client.is_private_dir(path)
+
+    def test_rejects_directory_open_to_other_users(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "runtime"
+        path.mkdir()
+        path.chmod(0o777)
+
+        assert not client.is_private_dir(path)
+
+    def test_rejects_directory_of_another_user(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "runtime"
+        path.mkdir(mode=0o700)
+        mocker.patch.object(client.os, "getuid", return_value=path.stat().st_uid + 1)
+
+        assert not client.is_private_dir(path)
+
+    def test_rejects_symlink(self, tmp_path: pathlib.Path) -> None:
+        target = tmp_path / "target"
+        target.mkdir(mode=0o700)
+        (tmp_path / "runtime").symlink_to(target)
+
+        assert not client.is_private_dir(tmp_path / "runtime")
+
+
+class TestSocketPath:
+    def test_differs_between_projects(self, tmp_path: pathlib.Path) -> None:
+        first = client.socket_path(tmp_path / "first" / "donna.toml")
+        second = client.socket_path(tmp_path / "second" / "donna.toml")
+
+        assert first != second
+        assert first.parent == second.parent == client.runtime_dir()
+        assert first.suffix == ".sock"
+
+
+class TestOptionValue:
+    @pytest.mark.parametrize(
+        ("argv", "expected"),
+        [
+            (["--config", "donna.toml"], ("--config", "donna.toml", 2)),
+            (["--config=donna.toml"], ("--config", "donna.toml", 1)),
+            (["-pllm"], ("-p", "llm", 1)),
+            (["-p"], None),
+            (["--help"], None),
+        ],
+    )
+    def test_parses_global_options(self, argv: list[str], expected: tuple[str, str, int] | None) -> None:
+        assert client._option_value(argv, 0) == expected
+
+
+class TestScanArguments:
+    def test_finds_command_after_global_options(self) -> None:
+        assert client.scan_arguments(["--config", "a/donna.toml", "-p", "llm", "status", "--help"]) == (
+            "status",
+            "a/donna.toml",
+        )
+
+    def test_stops_at_unknown_option(self) -> None:
+        assert client.scan_arguments(["--help", "status"]) == (None, None)
+
+    def test_returns_no_command_for_empty_arguments(self) -> None:
+        assert client.scan_arguments([]) == (None, None)
+
+
+class TestResolveConfigPath:
+    def test_resolves_config_option_against_cwd(self, tmp_path: pathlib.Path) -> None:
+        assert client.resolve_config_path("project/donna.toml", tmp_path) == tmp_path / "project" / "donna.toml"
+
+    def test_discovers_config_in_parent_dirs(self, tmp_path: pathlib.Path) -> None:
+        (tmp_path / "donna.toml").write_text("version = 1\n", encoding="utf-8")
+        nested = tmp_path / "a" / "b"
+        nested.mkdir(parents=True)
+
+        assert client.resolve_config_path(None, nested) == tmp_path.resolve() / "donna.toml"
+
+    def test_returns_none_without_config(self, tmp_path: pathlib.Path) -> None:
+        assert client.resolve_config_path(None, tmp_path) is None
+
+
+class TestReadFrame:
+    def test_reads_encoded_frames(self) -> None:
+        stream = io.BytesIO(
+            client.encode_frame(client.FRAME_STDOUT, b"output") + client.encode_frame(client.FRAME_EXIT)
+        )
+
+        assert client.read_frame(stream) == (client.FRAME_STDOUT, b"output")
+        assert client.read_frame(stream) == (client.FRAME_EXIT, b"")
+        assert client.read_frame(stream) is None
+
+    def test_returns_none_for_truncated_frame(self) -> None:
+        stream = io.BytesIO(client.encode_frame(client.FRAME_STDOUT, b"output")[:-1])
+
+        assert client.read_frame(stream) is None
+
+
+class TestReceiveOutput:
+    def test_writes_streams_and_returns_exit_code(self) -> None:
+        stdout, stderr = io.BytesIO(), io.BytesIO()
+        stream = io.BytesIO(
+            client.encode_frame(client.FRAME_STDOUT, b"out")
+            + client.encode_frame(client.FRAME_STDERR, b"err")
+            + client.encode_frame(client.FRAME_EXIT, b"2")
+        )
+
+        assert client._receive_output(stream, stdout, stderr) == 2
+        assert (stdout.getvalue(), stderr.getvalue()) == (b"out", b"err")
+
+    def test_returns_none_on_fallback(self) -> None:
+        stream = io.BytesIO(client.encode_frame(client.FRAME_FALLBACK))
+
+        assert client._receive_output(stream, io.BytesIO(), io.BytesIO()) is None
+
+    def test_reports_closed_connection(self) -> None:
+        stderr = io.BytesIO()
+
+        assert client._receive_output(io.BytesIO(), io.BytesIO(), stderr) == 1
+        assert b"closed the connection" in stderr.getvalue()
+
+
+class TestForward:
+    @pytest.fixture(autouse=True)
+    def project_dir(self, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> pathlib.Path:
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "donna.toml").write_text("version = 1\n", encoding="utf-8")
+        return tmp_path
+
+    def test_runs_locally_without_daemon(self) -> None:
+        assert client.forward(["-p", "llm", "status"], io.BytesIO(), io.BytesIO()) is None
+
+    def test_runs_locally_commands_that_are_not_forwarded(self) -> None:
+        assert client.forward(["-p", "llm", "init"], io.BytesIO(), io.BytesIO()) is None
+
+    def test_runs_locally_when_disabled(self, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(client.DAEMON_DISABLE_ENV, "1")
+        connect = mocker.patch.object(client, "connect")
+
+        assert client.forward(["-p", "llm", "status"], io.BytesIO(), io.BytesIO()) is None
+        connect.assert_not_called()
+
+
+class TestStopDaemon:
+    def test_reports_missing_daemon(self, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+        assert not client.stop_daemon(tmp_path / "donna.toml")
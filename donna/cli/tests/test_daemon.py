@@ -0,0 +1,178 @@
+import importlib
+import io
+import os
+import pathlib
+import socket
+import sys
+import tempfile
+import threading
+from collections.abc import Iterator
+
+import pytest
+from pytest_mock import MockerFixture
+
+from donna.cli import client
+from donna.cli import errors as cli_errors
+from donna.cli import utils as cli_utils
+from donna.cli.daemon import DaemonServer, _ClientConnection
+from donna.cli.tests import helpers
+from donna.domain.paths import ProjectConfigPath
+from donna.workspaces import sessions as workspace_sessions
+
+
+@pytest.fixture(autouse=True)
+def runtime_dir(monkeypatch: pytest.MonkeyPatch) -> Iterator[pathlib.Path]:
+    # Socket paths are short, the pytest temporary directories may be too long for them.
+    with tempfile.TemporaryDirectory(prefix="donna-") as path:
+        monkeypatch.setenv("XDG_RUNTIME_DIR", path)
+        yield pathlib.Path(path)
+
+
+@pytest.fixture
+def config_path(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> pathlib.Path:
+    monkeypatch.chdir(tmp_path)
+    helpers.write_workflow(tmp_path)
+    return helpers.write_config(tmp_path)
+
+
+@pytest.fixture
+def daemon(config_path: pathlib.Path) -> Iterator[threading.Thread]:
+    server = DaemonServer(ProjectConfigPath(config_path))
+    listener = server.bind().unwrap()
+    thread = threading.Thread(target=server.serve, args=(listener,), daemon=True)
+    thread.start()
+
+    yield thread
+
+    client.stop_daemon(config_path)
+    thread.join(timeout=10)
+
+
+def _forward(*args: str) -> tuple[int | None, str, str]:
+    stdout, stderr = io.BytesIO(), io.BytesIO()
+    exit_code = client.forward(["-p", "llm", *args], stdout, stderr)
+    return exit_code, stdout.getvalue().decode("utf-8"), stderr.getvalue().decode("utf-8")
+
+
+@pytest.mark.usefixtures("daemon")
+class TestDaemonServer:
+    def test_runs_forwarded_commands(self) -> None:
+        assert _forward("new-session")[0] == 0
+        exit_code, output, _ = _forward("run", "@/workflows/test.donna.md")
+
+        assert exit_code == 0
+        assert "Finish workflow `Test Workflow`" in output
+
+    def test_keeps_workspace_and_state_between_commands(self, mocker: MockerFixture) -> None:
+        _forward("new-session")
+        load_workspace = mocker.spy(cli_utils, "load_workspace")
+        read_state = mocker.spy(workspace_sessions, "read_state")
+
+        exit_code, output, _ = _forward("status")
+
+        assert exit_code == 0
+        assert "kind=session_state_status" in output
+        load_workspace.assert_not_called()
+        read_state.assert_not_called()
+
+    def test_reads_state_changed_by_another_process(self) -> None:
+        _forward("new-session")
+        helpers.invoke(["-p", "llm", "run", "@/workflows/test.donna.md"])
+
+        exit_code, output, _ = _forward("status")
+
+        assert exit_code == 0
+        assert "The session is IDLE" in output
+
+    def test_reports_usage_errors(self) -> None:
+        exit_code, _, errors = _forward("complete-action-request", "bad", "@/workflows/test.donna.md:finish")
+
+        assert exit_code == 2
+        assert "Invalid action request ID format" in errors
+
+    def test_serves_next_client_after_stalled_one(self, config_path: pathlib.Path, mocker: MockerFixture) -> None:
+        mocker.patch("donna.cli.daemon.REQUEST_TIMEOUT", 0.1)
+        stalled = client.connect(config_path)
+        assert stalled is not None
+
+        with stalled:
+            stalled.sendall(b'{"argv": ')
+
+            assert _forward("new-session")[0] == 0
+
+    def test_stops_when_config_changes(self, config_path: pathlib.Path, daemon: threading.Thread) -> None:
+        config_path.write_text(config_path.read_text(encoding="utf-8") + "\n# changed\n", encoding="utf-8")
+
+        assert _forward("status")[0] is None
+
+        daemon.join(timeout=10)
+        assert not daemon.is_alive()
+        assert not client.socket_path(config_path).exists()
+
+    def test_stops_when_imported_module_changes(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, daemon: threading.Thread
+    ) -> None:
+        module_path = tmp_path / "donna_test_custom_primitives.py"
+        module_path.write_text("VALUE = 1\n", encoding="utf-8")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "donna_test_custom_primitives", raising=False)
+        importlib.import_module("donna_test_custom_primitives")
+
+        assert _forward("status")[0] == 0
+
+        module_path.write_text("VALUE = 2\n", encoding="utf-8")
+
+        assert _forward("status")[0] is None
+
+        daemon.join(timeout=10)
+        assert not daemon.is_alive()
+
+    def test_bind__rejects_second_daemon(self, config_path: pathlib.Path) -> None:
+        result = DaemonServer(ProjectConfigPath(config_path)).bind()
+
+        assert result.is_err()
+        assert isinstance(result.unwrap_err()[0], cli_errors.DaemonAlreadyRunning)
+
+
+class TestBind:
+    def test_rejects_runtime_dir_open_to_other_users(self, config_path: pathlib.Path) -> None:
+        client.runtime_dir().mkdir()
+        client.runtime_dir().chmod(0o777)
+
+        result = DaemonServer(ProjectConfigPath(config_path)).bind()
+
+        assert result.is_err()
+        assert isinstance(result.unwrap_err()[0], cli_errors.DaemonRuntimeDirNotPrivate)
+
+
+class TestRun:
+    def test_runs_command_in_client_directory_and_environment(
+        self, config_path: pathlib.Path, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+    ) -> None:
+        seen: list[tuple[str, str | None]] = []
+        client_dir = tmp_path / "client"
+        client_dir.mkdir()
+        monkeypatch.setenv("DONNA_TEST_VALUE", "daemon")
+
+        server = DaemonServer(ProjectConfigPath(config_path))
+        command = mocker.patch.object(server, "_command")
+        command.main.side_effect = lambda **kwargs: seen.append((os.getcwd(), os.environ.get("DONNA_TEST_VALUE")))
+        sender, receiver = socket.socketpair()
+
+        with sender, receiver:
+            exit_code = server._run(
+                ["status"], str(client_dir), {"DONNA_TEST_VALUE": "client"}, _ClientConnection(sender)
+            )
+
+        assert exit_code == 0
+        assert seen == [(str(client_dir), "client")]
+        assert os.getcwd() == str(tmp_path)
+        assert os.environ["DONNA_TEST_VALUE"] == "daemon"
+
+
+class TestDaemonCommand:
+    def test_stop__reports_missing_daemon(self, config_path: pathlib.Path) -> None:
+        result = helpers.invoke(["-p", "llm", "daemon", "--stop"])
+
+        assert result.exit_code == 0
+        assert "No Donna daemon runs." in result.output
@@ -0,0 +1,62 @@
+import pathlib
+
+from pytest_mock import MockerFixture
+
+from donna.cli.tests import helpers
+from donna.runtime import graph
+
+ORPHAN_SECTION = """
+
+## Orphan
+
+```toml donna
+id = "orphan"
+kind = "donna.lib.finish"
+```
+
+Never reached.
+"""
+
+
+class TestGraph:
+    def test_reports_summary_and_queries(self, tmp_path: pathlib.Path) -> None:
+        config_path = helpers.write_config(tmp_path)
+        workflow_path = helpers.write_workflow(tmp_path)
+        with workflow_path.open("a", encoding="utf-8") as stream:
+            stream.write(ORPHAN_SECTION)
+
+        result = helpers.invoke(
+            [
+                "--config",
+                str(config_path),
+                "-p",
+                "automation",
+                "graph",
+                "--from",
+                "@/workflows/test.donna.md:workflow",
+                "--dead",
+            ]
+        )
+
+        assert result.exit_code == 0
+        summary, reachable, dead = helpers.json_lines(result.output)
+        assert summary["sections"] == 3
+        assert summary["dead_operations"] == 1
+        assert reachable["sections"] == ["@/workflows/test.donna.md:finish"]
+        assert dead["sections"] == ["@/workflows/test.donna.md:orphan"]
+
+    def test_indexes_only_changed_artifacts(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        mocker.patch("donna.workspaces.caches.donna_version", return_value="1.2.3")
+        mocker.patch("donna.workspaces.caches.signing_key", return_value=b"k" * 32)
+        config_path = helpers.write_config(tmp_path)
+        helpers.write_workflow(tmp_path)
+        helpers.write_workflow(tmp_path, path="workflows/other.donna.md")
+        command = ["--config", str(config_path), "-p", "automation", "graph"]
+
+        helpers.invoke(command)
+        helpers.write_workflow(tmp_path, path="workflows/other.donna.md", description="Changed description.")
+        index_artifact = mocker.spy(graph, "_index_artifact")
+        result = helpers.invoke(command)
+
+        assert helpers.json_lines(result.output)[0]["sections"] == 4
+        assert [call.args[0] for call in index_artifact.call_args_list] == ["@/workflows/other.donna.md"]
@@ -0,0 +1,62 @@
+import pathlib
+
+from click.testing import Result as CliResult
+
+from donna.cli.tests import helpers
+
+
+def _write_config(tmp_path: pathlib.Path) -> pathlib.Path:
+    config_path = helpers.write_config(tmp_path)
+    config_path.write_text(config_path.read_text(encoding="utf-8") + "\n[journal]\nstore = true\n", encoding="utf-8")
+    return config_path
+
+
+def _run_workflow(tmp_path: pathlib.Path) -> pathlib.Path:
+    config_path = _write_config(tmp_path)
+    helpers.write_workflow(tmp_path)
+    helpers.invoke(["--config", str(config_path), "-p", "llm", "new-session"])
+    helpers.invoke(["--config", str(config_path), "-p", "llm", "run", "@/workflows/test.donna.md"])
+    return config_path
+
+
+def _journal(config_path: pathlib.Path, *args: str) -> CliResult:
+    return helpers.invoke(["--config", str(config_path), "-p", "llm", "journal", *args])
+
+
+class TestJournal:
+    def test_shows_last_session_records(self, tmp_path: pathlib.Path) -> None:
+        config_path = _run_workflow(tmp_path)
+
+        result = _journal(config_path, "-n", "2")
+
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        assert len(lines) == 2
+        assert lines[0].endswith("Finish")
+        assert lines[1].endswith("Finish workflow `Test Workflow`")
+
+    def test_filters_records_by_task_and_operation(self, tmp_path: pathlib.Path) -> None:
+        config_path = _run_workflow(tmp_path)
+
+        by_task = _journal(config_path, "--task", "T-1-b")
+        by_operation = _journal(config_path, "--operation", "@/workflows/test.donna.md:finish")
+        by_other_task = _journal(config_path, "--task", "T-99-bL")
+
+        assert len(by_task.output.splitlines()) == 3
+        assert [line.rsplit(" ", 1)[-1] for line in by_operation.output.splitlines()] == ["Finish"]
+        assert by_other_task.output == ""
+
+    def test_reports_disabled_store(self, tmp_path: pathlib.Path) -> None:
+        config_path = helpers.write_config(tmp_path)
+
+        result = _journal(config_path)
+
+        assert result.exit_code == 0
+        assert "donna.workspaces.journal_store_disabled" in result.output
+
+    def test_rejects_invalid_task_id(self, tmp_path: pathlib.Path) -> None:
+        config_path = _write_config(tmp_path)
+
+        result = _journal(config_path, "--task", "bad")
+
+        assert result.exit_code != 0
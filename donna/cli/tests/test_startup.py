@@ -0,0 +1,71 @@
+import json
+import pathlib
+import subprocess  # noqa: S404
+import sys
+
+import pytest
+from typer.main import get_command_name
+
+import donna
+from donna.cli.application import COMMAND_MODULES, app, load_command_modules
+from donna.cli.tests import helpers
+
+# Dependencies needed only to parse and render artifacts.
+ARTIFACT_DEPENDENCIES = ("jinja2", "markdown_it", "mdformat", "yaml")
+
+PROJECT_ROOT = pathlib.Path(donna.__file__).resolve().parents[1]
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *args], check=True, capture_output=True, text=True, cwd=PROJECT_ROOT
+    )
+
+
+def _loaded_modules(*module_names: str) -> list[str]:
+    imports = "; ".join(f"importlib.import_module({name!r})" for name in module_names)
+    result = _run_python("-c", f"import importlib, json, sys; {imports}; print(json.dumps(sorted(sys.modules)))")
+    return list(json.loads(result.stdout))
+
+
+class TestCommandModules:
+    def test_registry_matches_registered_commands(self) -> None:
+        load_command_modules()
+
+        registered = {
+            command.name or get_command_name(command.callback.__name__): command.callback.__module__
+            for command in app.registered_commands
+            if command.callback is not None
+        }
+
+        assert registered == COMMAND_MODULES
+
+
+class TestStartup:
+    @pytest.mark.parametrize(
+        "command_module",
+        ["donna.cli.commands.sessions", "donna.cli.commands.journal", "donna.cli.commands.version"],
+    )
+    def test_session_commands_do_not_import_artifact_dependencies(self, command_module: str) -> None:
+        modules = _loaded_modules("donna.cli.application", command_module)
+
+        assert [name for name in ARTIFACT_DEPENDENCIES if name in modules] == []
+
+    def test_client_imports_only_light_modules(self) -> None:
+        modules = _loaded_modules("donna.cli.client")
+
+        assert [name for name in ("typer", "pydantic", "donna.cli.application") if name in modules] == []
+
+
+class TestLazyCommandGroup:
+    def test_help_lists_every_command(self) -> None:
+        result = helpers.invoke(["--help"])
+
+        assert result.exit_code == 0
+        assert all(name in result.output for name in COMMAND_MODULES)
+
+    def test_unknown_command_suggests_known_ones(self) -> None:
+        result = helpers.invoke(["statu"])
+
+        assert result.exit_code != 0
+        assert "status" in result.output
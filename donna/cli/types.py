@@ -3,7 +3,6 @@ from typing import Annotated, NoReturn
 
 import typer
 
-from donna.cli.utils import output_cells
 from donna.core.errors import ErrorsList
 from donna.domain import errors as domain_errors
 from donna.domain.artifact_ids import (
@@ -13,7 +12,7 @@ from donna.domain.artifact_ids import (
     split_artifact_section_id,
 )
 from donna.domain.constants import DONNA_ARTIFACT_EXTENSION
-from donna.domain.internal_ids import ActionRequestId
+from donna.domain.internal_ids import ActionRequestId, TaskId
 from donna.domain.paths import PathInput, UntrustedPath
 from donna.machine.templates import RenderMode
 from donna.protocol.errors import environment_error_node
@@ -23,6 +22,8 @@ from donna.workspaces.artifacts import has_donna_artifact_extension
 
 
 def _exit_with_errors(errors: ErrorsList) -> NoReturn:
+    from donna.cli.utils import output_cells
+
     output_cells([environment_error_node(error).info() for error in errors])
     raise typer.Exit(code=0)
 
@@ -81,6 +82,12 @@ def _parse_action_request_id(value: str) -> ActionRequestId:
     return ActionRequestId(value)
 
 
+def _parse_task_id(value: str) -> TaskId:
+    if not TaskId.validate(value):
+        raise typer.BadParameter("Invalid task ID format (expected '<prefix>-<number>-<crc>').")
+    return TaskId(value)
+
+
 def _parse_protocol_mode(value: str) -> Mode:
     try:
         return Mode(value)
@@ -115,6 +122,16 @@ ActionRequestIdArgument = Annotated[
 ]
 
 
+TaskIdOption = Annotated[
+    TaskId | None,
+    typer.Option(
+        "--task",
+        parser=_parse_task_id,
+        help="Show only records of the task with this ID (for example: T-3-d).",
+    ),
+]
+
+
 ArtifactIdArgument = Annotated[
     str,
     typer.Argument(
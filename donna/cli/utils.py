@@ -2,7 +2,7 @@ import pathlib
 import sys
 from collections.abc import Iterable, Iterator
 from contextlib import contextmanager
-from contextvars import Token
+from contextvars import ContextVar, Token
 
 import typer
 
@@ -70,10 +70,13 @@ class CommandContext:
         if not workspace_config.protocol.is_set():
             workspace_config.protocol.set(self.protocol)
 
-    def load_workspace(self) -> workspace_config.Workspace:
+    def load_workspace(self) -> None:
+        # The daemon installs the workspace once and serves all commands with it.
+        if workspace_config.config.is_set():
+            return
+
         workspace = load_workspace(config_path=self.global_options.config_path).unwrap()
         workspace_config.install_workspace(workspace)
-        return workspace
 
     def target_config_path(self) -> ProjectConfigPath:
         if self.global_options.config_path is not None:
@@ -95,12 +98,43 @@ class CommandContext:
             self.emitter.emit_cell(cell)
 
 
+# Runtime contexts kept by the daemon between commands, one per protocol mode because renders depend on it.
+_warm_contexts: ContextVar[dict[Mode, Context] | None] = ContextVar("donna_warm_contexts", default=None)
+
+
+@contextmanager
+def keep_runtime_contexts(contexts: dict[Mode, Context]) -> Iterator[None]:
+    token = _warm_contexts.set(contexts)
+
+    try:
+        yield
+    finally:
+        _warm_contexts.reset(token)
+
+
+def _runtime_context(command: CommandContext) -> Context:
+    contexts = _warm_contexts.get()
+
+    if contexts is None:
+        return Context(output=command.emitter)
+
+    runtime_context = contexts.get(command.protocol)
+
+    if runtime_context is None:
+        runtime_context = contexts[command.protocol] = Context()
+
+    runtime_context.output = command.emitter
+    runtime_context.state.forget_external_changes()
+    return runtime_context
+
+
 @contextmanager
 def command_context(context: typer.Context, *, load_environment: bool = True) -> Iterator[CommandContext]:
     from donna.context import reset_context, set_context
     from donna.machine import context as machine_context
 
     command = CommandContext(context)
+    runtime_context: Context | None = None
     context_token: Token[Context | None] | None = None
     machine_context_token: Token[machine_context.MachineContext | None] | None = None
 
@@ -109,7 +143,7 @@ def command_context(context: typer.Context, *, load_environment: bool = True) ->
 
         if load_environment:
             command.load_workspace()
-            runtime_context = Context(output=command.emitter)
+            runtime_context = _runtime_context(command)
             context_token = set_context(runtime_context)
             machine_context_token = machine_context.set_context(runtime_context)
 
@@ -118,6 +152,9 @@ def command_context(context: typer.Context, *, load_environment: bool = True) ->
         command.write_cells(_cells_from_unwrap(error))
         raise typer.Exit(code=0) from error
     finally:
+        if runtime_context is not None:
+            _close_journal(command, runtime_context)
+
         if machine_context_token is not None:
             machine_context.reset_context(machine_context_token)
 
@@ -125,6 +162,14 @@ def command_context(context: typer.Context, *, load_environment: bool = True) ->
             reset_context(context_token)
 
 
+def _close_journal(command: CommandContext, runtime_context: Context) -> None:
+    # Records delivered in the background may fail after the command output is written.
+    closed = runtime_context.journal.close()
+
+    if closed.is_err():
+        command.write_cells(environment_error_node(error).info() for error in closed.unwrap_err())
+
+
 def _write_errors_to_journal(errors: ErrorsList) -> None:
     from donna.context.context import context
 
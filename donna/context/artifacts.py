@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Ok, Result, unwrap_to_error
-from donna.domain.artifact_ids import ArtifactId
+from donna.domain.artifact_ids import ArtifactId, split_artifact_section_id
 from donna.machine.artifacts import Artifact
 from donna.machine.tasks import Task, WorkUnit
 from donna.machine.templates import RenderMode
@@ -34,10 +34,17 @@ class ArtifactsCache:
         self._cache: dict[ArtifactId, _ArtifactCacheValue] = {}
 
     @unwrap_to_error
-    def _is_cache_stale(self, artifact_id: ArtifactId, fingerprint: "FileFingerprint") -> Result[bool, ErrorsList]:
+    def _is_cache_stale(self, artifact_id: ArtifactId, cached: _ArtifactCacheValue) -> Result[bool, ErrorsList]:
         from donna.workspaces.artifacts import artifact_fingerprint
 
-        return Ok(artifact_fingerprint(artifact_id).unwrap() != fingerprint)
+        fingerprint = artifact_fingerprint(artifact_id).unwrap()
+
+        if fingerprint is None or fingerprint != cached.fingerprint:
+            return Ok(True)
+
+        # A matching fingerprint replaces the cached one, so a file that settled since is not hashed on every check.
+        cached.fingerprint = fingerprint
+        return Ok(False)
 
     @staticmethod
     @unwrap_to_error
@@ -70,7 +77,7 @@ class ArtifactsCache:
         if cached is None:
             return Ok(self._refresh_cache_value(artifact_id).unwrap())
 
-        cache_stale = self._is_cache_stale(artifact_id, cached.fingerprint).unwrap()
+        cache_stale = self._is_cache_stale(artifact_id, cached).unwrap()
         if not cache_stale:
             return Ok(cached)
 
@@ -84,21 +91,34 @@ class ArtifactsCache:
 
         return self.load(artifact_id, RENDER_CONTEXT_VIEW)
 
+    @unwrap_to_error
     def load_for_execution(
         self,
         artifact_id: ArtifactId,
         task: Task,
         work_unit: WorkUnit,
     ) -> Result[Artifact, ErrorsList]:
-        from donna.workspaces.artifacts import ArtifactRenderContext
-
-        return self.load(
-            artifact_id,
-            ArtifactRenderContext(
-                primary_mode=RenderMode.execute,
-                current_task=task,
-                current_work_unit=work_unit,
-            ),
+        from donna.workspaces.artifacts import RENDER_CONTEXT_VIEW, ArtifactRenderContext
+
+        render_context = ArtifactRenderContext(
+            primary_mode=RenderMode.execute,
+            current_task=task,
+            current_work_unit=work_unit,
+        )
+
+        operation_parts = split_artifact_section_id(work_unit.operation_id)
+        if operation_parts is None or operation_parts.artifact_id != artifact_id:
+            return self.load(artifact_id, render_context)
+
+        # Only the executed section depends on the task, the rest of the artifact is taken from the view render.
+        structure = self.load(artifact_id, RENDER_CONTEXT_VIEW)
+        if structure.is_err():
+            return self.load(artifact_id, render_context)
+
+        cached = self._get_cache_value(artifact_id).unwrap()
+
+        return cached.raw_artifact.render_section(
+            artifact_id, structure.unwrap(), operation_parts.section_id, render_context
         )
 
     @unwrap_to_error
@@ -121,6 +141,53 @@ class ArtifactsCache:
 
         return Ok(artifact)
 
+    def _listing_max_workers(self) -> int:
+        from donna.workspaces import config as workspace_config
+
+        if not workspace_config.config.is_set():
+            return 1
+
+        return workspace_config.config().listing.max_workers
+
+    def preload(
+        self, artifact_ids: list[ArtifactId], render_context: "ArtifactRenderContext"
+    ) -> dict[ArtifactId, ErrorsList]:
+        """Render artifacts missing from the cache in parallel and return loading errors by artifact id."""
+        from donna.workspaces.artifacts import render_artifact_files_in_processes
+
+        max_workers = self._listing_max_workers()
+
+        # Execute-mode renders are never cached, so there is nothing to preload for them.
+        if max_workers == 1 or render_context.primary_mode == RenderMode.execute:
+            return {}
+
+        missing = [
+            artifact_id
+            for artifact_id in artifact_ids
+            if artifact_id not in self._cache
+            or render_context.primary_mode not in self._cache[artifact_id].rendered_artifacts
+        ]
+
+        if len(missing) < 2:
+            return {}
+
+        errors: dict[ArtifactId, ErrorsList] = {}
+        results = render_artifact_files_in_processes(missing, render_context, max_workers)
+
+        for artifact_id, result in zip(missing, results):
+            if result.is_err():
+                errors[artifact_id] = result.unwrap_err()
+                continue
+
+            raw_artifact, fingerprint, artifact = result.unwrap()
+            self._cache[artifact_id] = _ArtifactCacheValue(
+                raw_artifact=raw_artifact,
+                rendered_artifacts={render_context.primary_mode: artifact},
+                fingerprint=fingerprint,
+            )
+
+        return errors
+
     @unwrap_to_error
     def list(  # noqa: CCR001
         self,
@@ -128,10 +195,17 @@ class ArtifactsCache:
     ) -> Result[list[Artifact], ErrorsList]:
         from donna.workspaces.artifacts import list_artifact_ids
 
+        artifact_ids = list_artifact_ids()
+        preload_errors = self.preload(artifact_ids, render_context)
+
         artifacts: list[Artifact] = []
         errors: ErrorsList = []
 
-        for artifact_id in list_artifact_ids():
+        for artifact_id in artifact_ids:
+            if artifact_id in preload_errors:
+                errors.extend(preload_errors[artifact_id])
+                continue
+
             artifact_result = self.load(artifact_id, render_context)
 
             if artifact_result.is_err():
@@ -18,10 +18,17 @@ if TYPE_CHECKING:
 
 
 class Journal:
-    __slots__ = ("_context",)
+    __slots__ = ("_context", "_writer")
 
     def __init__(self, context: Context) -> None:
         self._context = context
+        self._writer: workspace_journal.JournalWriter | workspace_journal.BackgroundJournalWriter | None = None
+
+    def _get_writer(self) -> workspace_journal.JournalWriter | workspace_journal.BackgroundJournalWriter:
+        if self._writer is None:
+            self._writer = workspace_journal.open_writer()
+
+        return self._writer
 
     def smart_actor_id(self) -> str:
         match protocol_mode():
@@ -57,7 +64,17 @@ class Journal:
             current_operation_id=parsed_operation_id,
         )
 
-        workspace_journal.write_record(record).unwrap()
+        self._get_writer().write(record).unwrap()
         self._context.output.emit_journal(record)
 
         return Ok(record)
+
+    def close(self) -> Result[None, ErrorsList]:
+        """Deliver pending records and release the journal sinks."""
+        writer = self._writer
+        self._writer = None
+
+        if writer is None:
+            return Ok(None)
+
+        return writer.close()
@@ -1,10 +1,12 @@
 import importlib
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Ok, Result, unwrap_to_error
 from donna.domain.python_path import PythonPath
 from donna.machine import errors as machine_errors
+from donna.workspaces.files import ModuleContentKeys, module_content_keys
 
 if TYPE_CHECKING:
     from donna.machine.primitives import Primitive
@@ -47,3 +49,20 @@ class PrimitivesCache:
         self._cache[primitive_id] = primitive
 
         return Ok(primitive)
+
+    def source_keys(self, primitive_ids: Iterable[PythonPath]) -> ModuleContentKeys:
+        """Identify the code of the primitives by the content of the modules that define them.
+
+        Custom primitives change without a Donna release, so caches can not rely on the Donna version for them.
+        Module sources are read once per command, however many artifacts use the primitives.
+        """
+        modules: set[str] = set()
+
+        for primitive_id in primitive_ids:
+            modules.add(str(primitive_id).rsplit(".", maxsplit=1)[0])
+
+            primitive = self.resolve(primitive_id)
+            if primitive.is_ok():
+                modules.add(type(primitive.unwrap()).__module__)
+
+        return module_content_keys(modules)
@@ -1,24 +1,154 @@
-from typing import TYPE_CHECKING
+import hashlib
+import json
+from typing import TYPE_CHECKING, Sequence
+
+import pydantic
 
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Ok, Result, unwrap_to_error
 from donna.machine import errors as machine_errors
+from donna.workspaces.files import content_hasher
 
 if TYPE_CHECKING:
+    from donna.machine.changes import Change
     from donna.machine.state import ConsistentState
     from donna.workspaces.files import FileFingerprint
 
 
+# The change log is compacted into the state snapshot after this number of changes.
+STATE_CHANGES_COMPACTION_THRESHOLD = 128
+
+STATE_BINARY_MAGIC = b"DONNA-STATE\n"
+
+# Bump when the layout of the binary state changes.
+STATE_BINARY_FORMAT_VERSION = 2
+
+
 class _StateCacheValue:
-    __slots__ = ("fingerprint", "state")
+    __slots__ = ("changes_count", "changes_fingerprint", "changes_hasher", "fingerprint", "snapshot_digest", "state")
 
-    def __init__(
+    def __init__(  # noqa: CFQ002
         self,
         state: "ConsistentState",
         fingerprint: "FileFingerprint",
+        snapshot_digest: str,
+        changes_fingerprint: "FileFingerprint | None" = None,
+        changes_hasher: "hashlib.blake2b | None" = None,
+        changes_count: int = 0,
     ) -> None:
         self.state = state
         self.fingerprint = fingerprint
+        self.snapshot_digest = snapshot_digest
+        self.changes_fingerprint = changes_fingerprint
+        # Hash of the change log content, continued on appends instead of reading the log again.
+        self.changes_hasher = changes_hasher
+        self.changes_count = changes_count
+
+
+def _snapshot_digest(content: bytes) -> str:
+    return content_hasher(content).hexdigest()
+
+
+def _continued_hasher(hasher: "hashlib.blake2b | None", content: bytes) -> "hashlib.blake2b | None":
+    if hasher is None:
+        return None
+
+    continued = hasher.copy()
+    continued.update(content)
+    return continued
+
+
+def _hexdigest(hasher: "hashlib.blake2b | None") -> str | None:
+    return hasher.hexdigest() if hasher is not None else None
+
+
+def _encode_state(state: "ConsistentState") -> bytes:
+    from donna.workspaces import sessions as workspace_sessions
+    from donna.workspaces.config import StateFormat
+
+    if workspace_sessions.state_format() == StateFormat.json:
+        return state.to_json().encode("utf-8")
+
+    header = json.dumps({"version": STATE_BINARY_FORMAT_VERSION}).encode("utf-8")
+    return STATE_BINARY_MAGIC + header + b"\n" + state.model_dump_json().encode("utf-8")
+
+
+@unwrap_to_error
+def _decode_state(content: bytes) -> Result["ConsistentState", ErrorsList]:
+    """Decode the state snapshot in any of the supported formats.
+
+    The binary snapshot holds only data, so it is validated like the JSON one, but without the text decoding and
+    indentation overhead.
+    """
+    from donna.machine.state import ConsistentState
+
+    if not content.startswith(STATE_BINARY_MAGIC):
+        return Ok(ConsistentState.from_json(content.decode("utf-8")))
+
+    header, _, payload = content[len(STATE_BINARY_MAGIC) :].partition(b"\n")
+
+    try:
+        if json.loads(header) != {"version": STATE_BINARY_FORMAT_VERSION}:
+            return Err([machine_errors.SessionStateUnreadable()])
+
+        return Ok(ConsistentState.model_validate_json(payload))
+    except ValueError:
+        return Err([machine_errors.SessionStateUnreadable()])
+
+
+def _encode_changes_header(snapshot_digest: str) -> bytes:
+    return json.dumps({"snapshot": snapshot_digest}).encode("utf-8") + b"\n"
+
+
+def _encode_change(change: "Change") -> bytes:
+    record = {"kind": type(change).__name__, "change": change.model_dump(mode="json")}
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _decode_change(line: bytes) -> "Change | None":
+    from donna.machine.changes import change_class
+
+    try:
+        record = json.loads(line)
+        change_type = change_class(record["kind"])
+
+        if change_type is None:
+            return None
+
+        return change_type.model_validate(record["change"])
+    except (ValueError, TypeError, KeyError, pydantic.ValidationError):
+        return None
+
+
+def _decode_changes(content: bytes | None, snapshot_digest: str) -> tuple[list["Change"], bool]:
+    """Decode the change log written on top of the snapshot with the given digest.
+
+    Returns the decoded changes and whether the whole log was decoded. A log written for another snapshot
+    is left by an interrupted compaction and is ignored; undecodable lines are left by an interrupted append,
+    changes starting from them are ignored.
+    """
+    if not content:
+        return [], True
+
+    header, *lines = content.splitlines()
+
+    try:
+        if json.loads(header) != {"snapshot": snapshot_digest}:
+            return [], True
+    except ValueError:
+        return [], False
+
+    changes: list["Change"] = []
+
+    for line in lines:
+        change = _decode_change(line)
+
+        if change is None:
+            return changes, False
+
+        changes.append(change)
+
+    return changes, True
 
 
 class StateCache:
@@ -27,54 +157,153 @@ class StateCache:
     def __init__(self) -> None:
         self._session_state: _StateCacheValue | None = None
 
-    @unwrap_to_error
-    def load(self) -> Result["ConsistentState", ErrorsList]:
-        from donna.machine.state import ConsistentState
+    @staticmethod
+    def _is_changed_externally(cached: _StateCacheValue) -> bool:
         from donna.workspaces import sessions as workspace_sessions
 
-        cached = self._session_state
         fingerprint = workspace_sessions.state_fingerprint()
+        changes_fingerprint = workspace_sessions.state_changes_fingerprint()
+
+        if (
+            fingerprint is None
+            or fingerprint != cached.fingerprint
+            or changes_fingerprint != cached.changes_fingerprint
+        ):
+            return True
+
+        # Matching fingerprints replace the cached ones, so files that settled since are not hashed on every check.
+        cached.fingerprint = fingerprint
+        cached.changes_fingerprint = changes_fingerprint
+        return False
+
+    def forget_external_changes(self) -> None:
+        """Drop the cached state if another process changed the session since it was cached."""
+        cached = self._session_state
+
+        if cached is not None and self._is_changed_externally(cached):
+            self._session_state = None
+
+    @unwrap_to_error
+    def load(self) -> Result["ConsistentState", ErrorsList]:
+        cached = self._session_state
 
         if cached is not None:
-            if fingerprint != cached.fingerprint:
+            if self._is_changed_externally(cached):
                 return Err([machine_errors.SessionStateChangedExternally()])
 
             return Ok(cached.state)
 
-        if fingerprint is None:
-            return Err([machine_errors.SessionStateNotInitialized()])
+        self._session_state = self._read().unwrap()
+        return Ok(self._session_state.state)
+
+    @staticmethod
+    @unwrap_to_error
+    def _read() -> Result[_StateCacheValue, ErrorsList]:
+        from donna.workspaces import sessions as workspace_sessions
 
         content = workspace_sessions.read_state()
         if content is None:
             return Err([machine_errors.SessionStateNotInitialized()])
 
-        latest_fingerprint = workspace_sessions.state_fingerprint()
-        if latest_fingerprint != fingerprint:
-            return Err([machine_errors.SessionStateChangedExternally()])
+        changes_content = workspace_sessions.read_state_changes()
 
-        state = ConsistentState.from_json(content.decode("utf-8"))
-        self._session_state = _StateCacheValue(
-            state=state,
-            fingerprint=fingerprint,
+        snapshot_digest = _snapshot_digest(content)
+        changes_hasher = content_hasher(changes_content) if changes_content is not None else None
+
+        # Fingerprints are taken with hashes of the read content, so a file changed while it was read does not
+        # match them and the next check reports the change.
+        fingerprint = workspace_sessions.state_fingerprint(snapshot_digest)
+        changes_fingerprint = workspace_sessions.state_changes_fingerprint(_hexdigest(changes_hasher))
+
+        if fingerprint is None:
+            return Err([machine_errors.SessionStateNotInitialized()])
+
+        state = _decode_state(content).unwrap()
+        changes, complete = _decode_changes(changes_content, snapshot_digest)
+
+        if changes:
+            mutator = state.mutator()
+            mutator.replay_changes(changes)
+            state = mutator.freeze()
+
+        return Ok(
+            _StateCacheValue(
+                state=state,
+                fingerprint=fingerprint,
+                snapshot_digest=snapshot_digest,
+                changes_fingerprint=changes_fingerprint,
+                changes_hasher=changes_hasher,
+                # A damaged log can not be appended to, so the next save compacts it.
+                changes_count=len(changes) if complete else STATE_CHANGES_COMPACTION_THRESHOLD,
+            )
         )
-        return Ok(state)
 
     @unwrap_to_error
-    def save(self, state: "ConsistentState") -> Result[None, ErrorsList]:
-        from donna.workspaces import sessions as workspace_sessions
+    def save(self, state: "ConsistentState", changes: Sequence["Change"] | None = None) -> Result[None, ErrorsList]:
+        """Save the state.
 
+        `changes` must be the changes applied to the last loaded or saved state to get `state`. When they are
+        passed, only they are appended to the change log, otherwise the whole state is written as a snapshot.
+        """
         cached = self._session_state
-        if cached is not None and workspace_sessions.state_fingerprint() != cached.fingerprint:
+        if cached is not None and self._is_changed_externally(cached):
             return Err([machine_errors.SessionStateChangedExternally()])
 
-        content = state.to_json().encode("utf-8")
+        if (
+            cached is None
+            or changes is None
+            or cached.changes_count + len(changes) > STATE_CHANGES_COMPACTION_THRESHOLD
+        ):
+            return self._save_snapshot(state)
+
+        return self._append_changes(cached, state, changes)
+
+    @unwrap_to_error
+    def _save_snapshot(self, state: "ConsistentState") -> Result[None, ErrorsList]:
+        from donna.workspaces import sessions as workspace_sessions
+
+        content = _encode_state(state)
         workspace_sessions.write_state(content)
-        fingerprint = workspace_sessions.state_fingerprint()
+        workspace_sessions.remove_state_changes()
+
+        snapshot_digest = _snapshot_digest(content)
+
+        fingerprint = workspace_sessions.state_fingerprint(snapshot_digest)
         if fingerprint is None:
             return Err([machine_errors.SessionStateNotInitialized()])
 
         self._session_state = _StateCacheValue(
             state=state,
             fingerprint=fingerprint,
+            snapshot_digest=snapshot_digest,
+        )
+        return Ok(None)
+
+    @unwrap_to_error
+    def _append_changes(
+        self, cached: _StateCacheValue, state: "ConsistentState", changes: Sequence["Change"]
+    ) -> Result[None, ErrorsList]:
+        from donna.workspaces import sessions as workspace_sessions
+
+        content = b"".join(_encode_change(change) for change in changes)
+
+        if cached.changes_count == 0:
+            # The log may be left from an interrupted compaction, it is rewritten for the current snapshot.
+            content = _encode_changes_header(cached.snapshot_digest) + content
+            workspace_sessions.write_state_changes(content)
+            changes_hasher: "hashlib.blake2b | None" = content_hasher(content)
+        else:
+            if content:
+                workspace_sessions.append_state_changes(content)
+
+            changes_hasher = _continued_hasher(cached.changes_hasher, content)
+
+        self._session_state = _StateCacheValue(
+            state=state,
+            fingerprint=cached.fingerprint,
+            snapshot_digest=cached.snapshot_digest,
+            changes_fingerprint=workspace_sessions.state_changes_fingerprint(_hexdigest(changes_hasher)),
+            changes_hasher=changes_hasher,
+            changes_count=cached.changes_count + len(changes),
         )
         return Ok(None)
@@ -2,6 +2,7 @@ import pathlib
 
 from donna.core.errors import ErrorsList
 from donna.core.result import Ok, Result
+from donna.domain.ids import SectionId
 from donna.machine.artifacts import Artifact
 from donna.machine.templates import RenderMode
 from donna.workspaces.artifacts import ArtifactRenderContext
@@ -12,7 +13,18 @@ class FakeRawArtifact:
         self.path = path
         self.artifact = artifact
         self.render_modes: list[RenderMode] = []
+        self.rendered_sections: list[SectionId] = []
 
     def render(self, artifact_id: object, render_context: ArtifactRenderContext) -> Result[Artifact, ErrorsList]:
         self.render_modes.append(render_context.primary_mode)
         return Ok(self.artifact)
+
+    def render_section(
+        self,
+        artifact_id: object,
+        structure: Artifact,
+        section_id: SectionId,
+        render_context: ArtifactRenderContext,
+    ) -> Result[Artifact, ErrorsList]:
+        self.rendered_sections.append(section_id)
+        return Ok(self.artifact)
@@ -4,12 +4,13 @@ from pytest_mock import MockerFixture
 
 from donna.context.artifacts import ArtifactsCache
 from donna.context.tests import make
-from donna.core.result import Ok
+from donna.core.result import Err, Ok
 from donna.domain.artifact_ids import ArtifactId
 from donna.machine.templates import RenderMode
 from donna.machine.tests import make as machine_make
 from donna.workspaces import artifacts as workspace_artifacts
 from donna.workspaces import errors as workspace_errors
+from donna.workspaces.config import Config, ListingConfig
 from donna.workspaces.files import FileFingerprint
 
 
@@ -54,6 +55,42 @@ class TestArtifactsCache:
 
         assert raw_artifact.render_modes == [RenderMode.execute, RenderMode.execute]
 
+    def test_load_for_execution__renders_only_executed_section(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        path = _write_artifact_file(tmp_path, "workflow.donna.md", "# Workflow")
+        raw_artifact = make.FakeRawArtifact(path, machine_make.artifact())
+        mocker.patch("donna.workspaces.artifacts.fetch_raw_artifact", return_value=Ok(raw_artifact))
+        mocker.patch(
+            "donna.workspaces.artifacts.artifact_fingerprint", return_value=Ok(FileFingerprint.from_path(path))
+        )
+        work_unit = machine_make.work_unit(operation_id=machine_make.SECONDARY_OPERATION_ID)
+        cache = ArtifactsCache()
+
+        assert cache.load_for_execution(machine_make.ARTIFACT_ID, machine_make.task(), work_unit).is_ok()
+        assert cache.load_for_execution(machine_make.ARTIFACT_ID, machine_make.task(), work_unit).is_ok()
+
+        assert raw_artifact.render_modes == [RenderMode.view]
+        assert raw_artifact.rendered_sections == [machine_make.SECONDARY_SECTION_ID, machine_make.SECONDARY_SECTION_ID]
+
+    def test_load_for_execution__renders_whole_artifact_for_foreign_operation(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        path = _write_artifact_file(tmp_path, "workflow.donna.md", "# Workflow")
+        raw_artifact = make.FakeRawArtifact(path, machine_make.artifact())
+        mocker.patch("donna.workspaces.artifacts.fetch_raw_artifact", return_value=Ok(raw_artifact))
+        mocker.patch(
+            "donna.workspaces.artifacts.artifact_fingerprint", return_value=Ok(FileFingerprint.from_path(path))
+        )
+        other_artifact_id = ArtifactId("@/workflows/other.donna.md")
+        cache = ArtifactsCache()
+
+        result = cache.load_for_execution(other_artifact_id, machine_make.task(), machine_make.work_unit())
+
+        assert result.is_ok()
+        assert raw_artifact.render_modes == [RenderMode.execute]
+        assert raw_artifact.rendered_sections == []
+
     def test_load__refreshes_stale_raw_artifact(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
         first_path = _write_artifact_file(tmp_path, "first.donna.md", "# First")
         second_path = _write_artifact_file(tmp_path, "second.donna.md", "# Second with changed size")
@@ -146,3 +183,51 @@ class TestArtifactsCache:
         error = result.unwrap_err()[0]
         assert isinstance(error, workspace_errors.ArtifactNotFound)
         assert error.artifact_id == missing_id
+
+    def test_list__preloads_missing_artifacts_in_processes_and_keeps_discovery_order(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        missing_id = ArtifactId("@/workflows/missing.donna.md")
+        second_id = ArtifactId("@/workflows/other.donna.md")
+        first_path = _write_artifact_file(tmp_path, "first.donna.md", "# First")
+        second_path = _write_artifact_file(tmp_path, "second.donna.md", "# Second")
+        first_artifact = machine_make.artifact()
+        second_artifact = machine_make.artifact().replace(id=second_id)
+        missing_error = workspace_errors.ArtifactNotFound(artifact_id=missing_id)
+        config = Config(listing=ListingConfig(max_workers=4))
+        mocker.patch("donna.workspaces.config.config", return_value=config)
+        mocker.patch(
+            "donna.workspaces.artifacts.list_artifact_ids",
+            return_value=[machine_make.ARTIFACT_ID, missing_id, second_id],
+        )
+        mocker.patch(
+            "donna.workspaces.artifacts.artifact_fingerprint",
+            side_effect=[Ok(FileFingerprint.from_path(first_path)), Ok(FileFingerprint.from_path(second_path))],
+        )
+        render = mocker.patch(
+            "donna.workspaces.artifacts.render_artifact_files_in_processes",
+            return_value=[
+                Ok(
+                    (
+                        make.FakeRawArtifact(first_path, first_artifact),
+                        FileFingerprint.from_path(first_path),
+                        first_artifact,
+                    )
+                ),
+                Err([missing_error]),
+                Ok(
+                    (
+                        make.FakeRawArtifact(second_path, second_artifact),
+                        FileFingerprint.from_path(second_path),
+                        second_artifact,
+                    )
+                ),
+            ],
+        )
+
+        result = ArtifactsCache().list(workspace_artifacts.RENDER_CONTEXT_VIEW)
+
+        render.assert_called_once_with(
+            [machine_make.ARTIFACT_ID, missing_id, second_id], workspace_artifacts.RENDER_CONTEXT_VIEW, 4
+        )
+        assert result.unwrap_err() == [missing_error]
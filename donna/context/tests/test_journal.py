@@ -14,6 +14,7 @@ from donna.machine.context import ValueScope
 from donna.machine.tests import make as machine_make
 from donna.protocol import errors as protocol_errors
 from donna.protocol import modes as protocol_modes
+from donna.workspaces import journal as workspace_journal
 
 
 class _FakeStateCache:
@@ -59,7 +60,9 @@ class TestJournal:
         fake_context = _FakeContext()
         mocker.patch("donna.context.journal.protocol_mode", return_value=protocol_modes.Mode.llm)
         mocker.patch("donna.context.journal.now", return_value=now)
-        write_record = mocker.patch("donna.context.journal.workspace_journal.write_record", return_value=Ok(None))
+        writer = mocker.Mock()
+        writer.write.return_value = Ok(None)
+        mocker.patch("donna.context.journal.workspace_journal.open_writer", return_value=writer)
 
         with fake_context.current_work_unit_id.scope(machine_make.WORK_UNIT_ID):
             with fake_context.current_operation_id.scope(machine_make.PRIMARY_OPERATION_ID):
@@ -73,13 +76,16 @@ class TestJournal:
         assert record.current_task_id == machine_make.TASK_ID
         assert record.current_work_unit_id == machine_make.WORK_UNIT_ID
         assert record.current_operation_id == machine_make.PRIMARY_OPERATION_ID
-        write_record.assert_called_once_with(record)
+        writer.write.assert_called_once_with(record)
         assert fake_context.output.journal_records == [record]
 
     def test_add__uses_explicit_actor_id(self, mocker: MockerFixture) -> None:
         fake_context = _FakeContext()
         mocker.patch("donna.context.journal.now", return_value=datetime.datetime(2026, 5, 18, tzinfo=datetime.UTC))
-        mocker.patch("donna.context.journal.workspace_journal.write_record", return_value=Ok(None))
+        mocker.patch(
+            "donna.context.journal.workspace_journal.open_writer",
+            return_value=workspace_journal.JournalWriter([]),
+        )
         protocol_mode = mocker.patch("donna.context.journal.protocol_mode")
 
         result = Journal(cast(Context, fake_context)).add("message", actor_id="donna")
@@ -87,3 +93,19 @@ class TestJournal:
         assert result.is_ok()
         assert result.unwrap().actor_id == "donna"
         protocol_mode.assert_not_called()
+
+    def test_close__closes_opened_writer_once(self, mocker: MockerFixture) -> None:
+        writer = mocker.Mock()
+        writer.write.return_value = Ok(None)
+        writer.close.return_value = Ok(None)
+        open_writer = mocker.patch("donna.context.journal.workspace_journal.open_writer", return_value=writer)
+        mocker.patch("donna.context.journal.protocol_mode", return_value=protocol_modes.Mode.llm)
+        journal = Journal(cast(Context, _FakeContext()))
+
+        assert journal.close().is_ok()
+        journal.add("message").unwrap()
+
+        assert journal.close().is_ok()
+        assert journal.close().is_ok()
+        open_writer.assert_called_once_with()
+        writer.close.assert_called_once_with()
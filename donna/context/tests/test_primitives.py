@@ -5,6 +5,7 @@ from donna.domain.python_path import PythonPath
 from donna.machine import errors as machine_errors
 from donna.machine.tests import make as machine_make
 from donna.machine.tests.test_primitives import sample_primitive
+from donna.workspaces import files
 
 
 def _python_path(value: str) -> PythonPath:
@@ -65,3 +66,20 @@ class TestPrimitivesCache:
         error = result.unwrap_err()[0]
         assert isinstance(error, machine_errors.PrimitiveNotPrimitive)
         assert error.import_path == "donna.machine.tests.test_primitives.sample_non_primitive"
+
+    def test_source_keys__fingerprint_modules_of_primitives(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(files, "_MODULE_CONTENT_KEYS", {})
+
+        keys = PrimitivesCache().source_keys([machine_make.PRIMITIVE_PATH, _python_path("missing.primitive")])
+
+        # The module of the primitive instance, the module of its class, and the missing module.
+        assert list(keys) == ["donna.machine.primitives", "donna.machine.tests.test_primitives", "missing"]
+        assert keys["missing"] == ("missing",)
+
+    def test_source_keys__reads_module_sources_once(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(files, "_MODULE_CONTENT_KEYS", {})
+        module_path = mocker.spy(files, "_module_path")
+        cache = PrimitivesCache()
+
+        assert cache.source_keys([machine_make.PRIMITIVE_PATH]) == cache.source_keys([machine_make.PRIMITIVE_PATH])
+        assert module_path.call_count == 2
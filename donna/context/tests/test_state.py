@@ -1,24 +1,124 @@
 import pathlib
+import pickle  # noqa: S403
+import time
 
 from pytest_mock import MockerFixture
 
+from donna.context import state as context_state
 from donna.context.state import StateCache
-from donna.domain.constants import STATE_FILE_NAME
+from donna.domain.constants import STATE_BINARY_FILE_NAME, STATE_CHANGES_FILE_NAME, STATE_FILE_NAME
 from donna.domain.paths import RelativeProjectPath
 from donna.machine import errors as machine_errors
+from donna.machine.changes import Change, ChangeAddWorkUnit, ChangeSetTaskContext
+from donna.machine.state import ConsistentState
 from donna.machine.tests import make as machine_make
+from donna.workspaces import files
 from donna.workspaces import sessions as workspace_sessions
-from donna.workspaces.config import Config
+from donna.workspaces.config import Config, StateConfig, StateFormat
 
 
-def _patch_session_globals(mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+def _patch_session_globals(
+    mocker: MockerFixture, tmp_path: pathlib.Path, state_format: StateFormat = StateFormat.json
+) -> None:
     mocker.patch("donna.workspaces.sessions.project_dir", return_value=tmp_path)
     mocker.patch(
         "donna.workspaces.sessions.config",
-        return_value=Config(session_dir=RelativeProjectPath(pathlib.Path(".session/donna"))),
+        return_value=Config(
+            session_dir=RelativeProjectPath(pathlib.Path(".session/donna")),
+            state=StateConfig(format=state_format),
+        ),
     )
 
 
+def _changed_state(cache: StateCache, key: str) -> tuple[ConsistentState, list[Change]]:
+    mutator = cache.load().unwrap().mutator()
+    mutator.apply_changes([ChangeSetTaskContext(task_id=machine_make.TASK_ID, key=key, value=key.upper())])
+    return mutator.freeze(), mutator.take_changes()
+
+
+def _save_initial_state(mocker: MockerFixture, tmp_path: pathlib.Path) -> StateCache:
+    _patch_session_globals(mocker, tmp_path)
+    cache = StateCache()
+    assert cache.save(machine_make.mutable_state(tasks=[machine_make.task()]).freeze()).is_ok()
+    return cache
+
+
+class TestEncodeState:
+    def test_encode_state__writes_json_by_default(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path)
+        state = machine_make.mutable_state(tasks=[machine_make.task()]).freeze()
+
+        assert context_state._encode_state(state) == state.to_json().encode("utf-8")
+
+    def test_encode_state__writes_binary_with_header(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+        state = machine_make.mutable_state(tasks=[machine_make.task()]).freeze()
+
+        assert context_state._encode_state(state).startswith(context_state.STATE_BINARY_MAGIC)
+
+
+class TestDecodeState:
+    def test_decode_state__reads_json(self) -> None:
+        state = machine_make.mutable_state(tasks=[machine_make.task()]).freeze()
+
+        assert context_state._decode_state(state.to_json().encode("utf-8")).unwrap() == state
+
+    def test_decode_state__reads_binary(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+        state = machine_make.mutable_state(tasks=[machine_make.task()]).freeze()
+
+        assert context_state._decode_state(context_state._encode_state(state)).unwrap() == state
+
+    def test_decode_state__rejects_binary_of_other_format_version(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+        state = machine_make.mutable_state(tasks=[machine_make.task()]).freeze()
+        content = context_state._encode_state(state)
+        mocker.patch.object(
+            context_state, "STATE_BINARY_FORMAT_VERSION", context_state.STATE_BINARY_FORMAT_VERSION + 1
+        )
+
+        result = context_state._decode_state(content)
+
+        assert result.is_err()
+        assert isinstance(result.unwrap_err()[0], machine_errors.SessionStateUnreadable)
+
+    def test_decode_state__does_not_unpickle_binary(self) -> None:
+        content = context_state.STATE_BINARY_MAGIC + pickle.dumps(({"version": 2}, "state"))
+
+        result = context_state._decode_state(content)
+
+        assert result.is_err()
+        assert isinstance(result.unwrap_err()[0], machine_errors.SessionStateUnreadable)
+
+    def test_decode_state__reports_damaged_binary(self) -> None:
+        result = context_state._decode_state(context_state.STATE_BINARY_MAGIC + b"damaged")
+
+        assert result.is_err()
+        assert isinstance(result.unwrap_err()[0], machine_errors.SessionStateUnreadable)
+
+
+class TestDecodeChanges:
+    def test_decode_changes__returns_changes_written_for_snapshot(self) -> None:
+        change = ChangeAddWorkUnit(task_id=machine_make.TASK_ID, operation_id=machine_make.SECONDARY_OPERATION_ID)
+        content = context_state._encode_changes_header("digest") + context_state._encode_change(change)
+
+        assert context_state._decode_changes(content, "digest") == ([change], True)
+
+    def test_decode_changes__ignores_log_of_another_snapshot(self) -> None:
+        change = ChangeAddWorkUnit(task_id=machine_make.TASK_ID, operation_id=machine_make.SECONDARY_OPERATION_ID)
+        content = context_state._encode_changes_header("old") + context_state._encode_change(change)
+
+        assert context_state._decode_changes(content, "digest") == ([], True)
+
+    def test_decode_changes__stops_at_damaged_line(self) -> None:
+        change = ChangeAddWorkUnit(task_id=machine_make.TASK_ID, operation_id=machine_make.SECONDARY_OPERATION_ID)
+        content = context_state._encode_changes_header("digest") + context_state._encode_change(change) + b'{"kind'
+
+        assert context_state._decode_changes(content, "digest") == ([change], False)
+
+
 class TestStateCache:
     def test_load__reports_not_initialized_without_state_file(
         self, mocker: MockerFixture, tmp_path: pathlib.Path
@@ -40,6 +140,25 @@ class TestStateCache:
         assert result.is_ok()
         assert result.unwrap() == state
 
+    def test_load__reads_state_saved_in_binary_format(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+        state = machine_make.mutable_state(tasks=[machine_make.task()]).freeze()
+        assert StateCache().save(state).is_ok()
+
+        result = StateCache().load()
+
+        assert (tmp_path / ".session" / "donna" / STATE_BINARY_FILE_NAME).is_file()
+        assert result.unwrap() == state
+
+    def test_load__replays_changes_over_binary_snapshot(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+        cache = StateCache()
+        assert cache.save(machine_make.mutable_state(tasks=[machine_make.task()]).freeze()).is_ok()
+        state, changes = _changed_state(cache, "first")
+        assert cache.save(state, changes).is_ok()
+
+        assert StateCache().load().unwrap() == state
+
     def test_load__returns_cached_state_while_fingerprint_matches(
         self, mocker: MockerFixture, tmp_path: pathlib.Path
     ) -> None:
@@ -71,6 +190,30 @@ class TestStateCache:
         assert result.is_err()
         assert isinstance(result.unwrap_err()[0], machine_errors.SessionStateChangedExternally)
 
+    def test_forget_external_changes__reloads_state_changed_externally(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path)
+        cache = StateCache()
+        assert cache.save(machine_make.mutable_state().freeze()).is_ok()
+        state = machine_make.mutable_state(tasks=[machine_make.task()]).freeze()
+        workspace_sessions.write_state(state.to_json().encode("utf-8"))
+
+        cache.forget_external_changes()
+
+        assert cache.load().unwrap() == state
+
+    def test_forget_external_changes__keeps_unchanged_state(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        cache = _save_initial_state(mocker, tmp_path)
+        read_state = mocker.patch("donna.workspaces.sessions.read_state")
+
+        cache.forget_external_changes()
+
+        assert cache.load().is_ok()
+        read_state.assert_not_called()
+
     def test_save__writes_state_and_updates_cache(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
         _patch_session_globals(mocker, tmp_path)
         state = machine_make.mutable_state(tasks=[machine_make.task()]).freeze()
@@ -93,3 +236,117 @@ class TestStateCache:
 
         assert result.is_err()
         assert isinstance(result.unwrap_err()[0], machine_errors.SessionStateChangedExternally)
+
+    def test_save__appends_changes_instead_of_rewriting_snapshot(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        cache = _save_initial_state(mocker, tmp_path)
+        snapshot = workspace_sessions.read_state()
+        state, changes = _changed_state(cache, "first")
+
+        result = cache.save(state, changes)
+
+        assert result.is_ok()
+        assert workspace_sessions.read_state() == snapshot
+        assert (tmp_path / ".session" / "donna" / STATE_CHANGES_FILE_NAME).exists()
+        assert cache.load().unwrap() == state
+
+    def test_load__replays_changes_over_snapshot(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        cache = _save_initial_state(mocker, tmp_path)
+        first_state, first_changes = _changed_state(cache, "first")
+        assert cache.save(first_state, first_changes).is_ok()
+        second_state, second_changes = _changed_state(cache, "second")
+        assert cache.save(second_state, second_changes).is_ok()
+
+        result = StateCache().load()
+
+        assert result.is_ok()
+        assert result.unwrap() == second_state
+        assert result.unwrap().tasks[machine_make.TASK_ID].context == {"first": "FIRST", "second": "SECOND"}
+
+    def test_save__compacts_changes_into_snapshot_at_threshold(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        mocker.patch.object(context_state, "STATE_CHANGES_COMPACTION_THRESHOLD", 1)
+        cache = _save_initial_state(mocker, tmp_path)
+        first_state, first_changes = _changed_state(cache, "first")
+        assert cache.save(first_state, first_changes).is_ok()
+        second_state, second_changes = _changed_state(cache, "second")
+
+        result = cache.save(second_state, second_changes)
+
+        assert result.is_ok()
+        assert workspace_sessions.read_state() == second_state.to_json().encode("utf-8")
+        assert workspace_sessions.read_state_changes() is None
+        assert StateCache().load().unwrap() == second_state
+
+    def test_load__ignores_changes_left_by_interrupted_compaction(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        cache = _save_initial_state(mocker, tmp_path)
+        state, changes = _changed_state(cache, "first")
+        assert cache.save(state, changes).is_ok()
+        workspace_sessions.write_state(state.to_json().encode("utf-8"))
+
+        result = StateCache().load()
+
+        assert result.is_ok()
+        assert result.unwrap() == state
+
+    def test_save__compacts_damaged_changes_log(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        cache = _save_initial_state(mocker, tmp_path)
+        state, changes = _changed_state(cache, "first")
+        assert cache.save(state, changes).is_ok()
+        workspace_sessions.append_state_changes(b'{"kind":')
+        reloaded = StateCache()
+        assert reloaded.load().unwrap() == state
+        next_state, next_changes = _changed_state(reloaded, "second")
+
+        result = reloaded.save(next_state, next_changes)
+
+        assert result.is_ok()
+        assert workspace_sessions.read_state_changes() is None
+        assert StateCache().load().unwrap() == next_state
+
+    def test_load__reports_changes_log_changed_externally(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        cache = _save_initial_state(mocker, tmp_path)
+        state, changes = _changed_state(cache, "first")
+        assert cache.save(state, changes).is_ok()
+        workspace_sessions.append_state_changes(b"external change\n")
+
+        result = cache.load()
+
+        assert result.is_err()
+        assert isinstance(result.unwrap_err()[0], machine_errors.SessionStateChangedExternally)
+
+    def test_save__does_not_read_settled_session_files(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        cache = _save_initial_state(mocker, tmp_path)
+        first_state, first_changes = _changed_state(cache, "first")
+        assert cache.save(first_state, first_changes).is_ok()
+        state, changes = _changed_state(cache, "second")
+        clock = mocker.patch.object(files, "time")
+        clock.time_ns.return_value = time.time_ns() + 2 * files.TIMESTAMP_RESOLUTION_NS
+        cache.forget_external_changes()
+        read_bytes = mocker.spy(pathlib.Path, "read_bytes")
+
+        result = cache.save(state, changes)
+
+        assert result.is_ok()
+        read_bytes.assert_not_called()
+        assert cache.load().unwrap() == state
+
+    def test_save__fingerprints_changes_log_by_written_content(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        cache = _save_initial_state(mocker, tmp_path)
+        first_state, first_changes = _changed_state(cache, "first")
+        assert cache.save(first_state, first_changes).is_ok()
+        state, changes = _changed_state(cache, "second")
+
+        assert cache.save(state, changes).is_ok()
+
+        changes_content = workspace_sessions.read_state_changes()
+        cached = cache._session_state
+        assert changes_content is not None
+        assert cached is not None and cached.changes_fingerprint is not None
+        assert cached.changes_fingerprint.content_hash == files.content_hash(changes_content)
@@ -1,6 +1,10 @@
-from donna.core import entities as entities
-from donna.core import errors as errors
-from donna.core import result as result
-from donna.core import utils as utils
+from donna.core.utils import lazy_submodules
 
-__all__ = ("entities", "errors", "result", "utils")
+__all__ = (
+    "entities",
+    "errors",
+    "result",
+    "utils",
+)
+
+__getattr__ = lazy_submodules(__name__, __all__)
@@ -1,6 +1,8 @@
 import datetime
 
-from donna.core import utils
+import pytest
+
+from donna.core import result, utils
 
 
 class TestNow:
@@ -9,3 +11,16 @@ class TestNow:
 
         assert isinstance(value, datetime.datetime)
         assert value.tzinfo == datetime.UTC
+
+
+class TestLazySubmodules:
+    def test_imports_listed_submodule_on_access(self) -> None:
+        getattr_ = utils.lazy_submodules("donna.core", ["result"])
+
+        assert getattr_("result") is result
+
+    def test_rejects_unlisted_names(self) -> None:
+        getattr_ = utils.lazy_submodules("donna.core", ["result"])
+
+        with pytest.raises(AttributeError):
+            getattr_("missing")
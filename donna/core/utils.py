@@ -1,5 +1,21 @@
 import datetime
+import importlib
+from collections.abc import Callable, Iterable
+from types import ModuleType
 
 
 def now() -> datetime.datetime:
     return datetime.datetime.now(datetime.UTC)
+
+
+def lazy_submodules(package: str, names: Iterable[str]) -> Callable[[str], ModuleType]:
+    """Build a package `__getattr__` that imports the listed submodules on first access."""
+    submodules = frozenset(names)
+
+    def __getattr__(name: str) -> ModuleType:
+        if name not in submodules:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        return importlib.import_module(f"{package}.{name}")
+
+    return __getattr__
@@ -1,11 +1,4 @@
-from donna.domain import artifact_ids as artifact_ids
-from donna.domain import constants as constants
-from donna.domain import errors as errors
-from donna.domain import id_paths as id_paths
-from donna.domain import ids as ids
-from donna.domain import internal_ids as internal_ids
-from donna.domain import paths as paths
-from donna.domain import python_path as python_path
+from donna.core.utils import lazy_submodules
 
 __all__ = (
     "artifact_ids",
@@ -17,3 +10,5 @@ __all__ = (
     "paths",
     "python_path",
 )
+
+__getattr__ = lazy_submodules(__name__, __all__)
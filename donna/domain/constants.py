@@ -6,3 +6,8 @@ DONNA_ARTIFACT_EXTENSION = ".donna.md"
 DONNA_DEFAULT_SESSION_DIR = pathlib.Path(".session") / "donna"
 DONNA_DEFAULT_WORKFLOW_DIR = pathlib.Path("workflows")
 STATE_FILE_NAME = "state.json"
+STATE_BINARY_FILE_NAME = "state.bin"
+STATE_CHANGES_FILE_NAME = "state.changes.jsonl"
+CACHE_DIR_NAME = "cache"
+OUTPUTS_DIR_NAME = "outputs"
+JOURNAL_DIR_NAME = "journal"
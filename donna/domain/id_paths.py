@@ -131,6 +131,9 @@ class IdPath:
         memo[id(self)] = self
         return self
 
+    def __reduce__(self) -> tuple[type[Self], tuple[NormalizedRawIdPath]]:
+        return (type(self), (NormalizedRawIdPath(self.raw_value),))
+
     def __setattr__(self, name: str, value: object) -> None:
         raise AttributeError(f"{type(self).__name__} is immutable")
 
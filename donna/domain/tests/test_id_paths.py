@@ -1,4 +1,5 @@
 import copy
+import pickle  # noqa: S403
 
 import pydantic
 import pytest
@@ -70,6 +71,11 @@ class TestIdPath:
         assert copy.copy(path) == path
         assert copy.deepcopy(path) == path
 
+    def test_pickle__restores_equal_path(self) -> None:
+        path = _SlashPath(NormalizedRawIdPath("alpha/beta"))
+
+        assert pickle.loads(pickle.dumps(path)) == path  # noqa: S301
+
     def test_setattr__rejects_mutation(self) -> None:
         path = _SlashPath(NormalizedRawIdPath("alpha/beta"))
 
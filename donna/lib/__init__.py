@@ -2,7 +2,7 @@
 
 from donna.primitives.artifacts import Workflow
 from donna.primitives.directives import GoTo, TaskVariable
-from donna.primitives.sections import FinishWorkflow, Output, RequestAction, RunScript, Text
+from donna.primitives.sections import FinishWorkflow, Output, RequestAction, RunScript, RunScripts, Text
 
 workflow = Workflow()
 text = Text()
@@ -10,6 +10,7 @@ request_action = RequestAction()
 finish = FinishWorkflow()
 output = Output()
 run_script = RunScript()
+run_scripts = RunScripts()
 
 goto = GoTo(analyze_id="goto")
 task_variable = TaskVariable(analyze_id="task_variable")
@@ -1,7 +1,7 @@
 import donna.lib as lib
 from donna.primitives.artifacts import Workflow
 from donna.primitives.directives import GoTo, TaskVariable
-from donna.primitives.sections import FinishWorkflow, Output, RequestAction, RunScript, Text
+from donna.primitives.sections import FinishWorkflow, Output, RequestAction, RunScript, RunScripts, Text
 
 
 class TestPrimitiveInitialization:
@@ -12,6 +12,7 @@ class TestPrimitiveInitialization:
         assert isinstance(lib.finish, FinishWorkflow)
         assert isinstance(lib.output, Output)
         assert isinstance(lib.run_script, RunScript)
+        assert isinstance(lib.run_scripts, RunScripts)
 
     def test_directive_primitives_are_initialized_with_analyze_ids(self) -> None:
         assert isinstance(lib.goto, GoTo)
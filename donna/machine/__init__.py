@@ -1,13 +1,4 @@
-from donna.machine import action_requests as action_requests
-from donna.machine import artifacts as artifacts
-from donna.machine import changes as changes
-from donna.machine import context as context
-from donna.machine import errors as errors
-from donna.machine import operations as operations
-from donna.machine import primitives as primitives
-from donna.machine import state as state
-from donna.machine import tasks as tasks
-from donna.machine import templates as templates
+from donna.core.utils import lazy_submodules
 
 __all__ = (
     "action_requests",
@@ -21,3 +12,5 @@ __all__ = (
     "tasks",
     "templates",
 )
+
+__getattr__ = lazy_submodules(__name__, __all__)
@@ -1,5 +1,7 @@
 from collections.abc import Mapping
 
+import pydantic
+
 from donna.core.entities import BaseEntity
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Ok, Result, unwrap_to_error
@@ -22,6 +24,9 @@ class ArtifactSectionMeta(BaseEntity):
     def cells_meta(self) -> Mapping[str, MetaValue]:
         return {}
 
+    def transitions(self) -> frozenset[SectionId]:
+        return frozenset()
+
 
 class ArtifactSection(BaseEntity):
     id: SectionId
@@ -45,11 +50,29 @@ class Artifact(BaseEntity):
 
     sections: list[ArtifactSection]
 
-    def _primary_sections(self) -> list[ArtifactSection]:
-        return [section for section in self.sections if section.primary]
+    # Sections are looked up by id many times during validation and execution, so they are indexed once.
+    # The first section wins when ids are duplicated.
+    _sections_by_id: dict[SectionId, ArtifactSection] = pydantic.PrivateAttr(default_factory=dict)
+    _section_numbers: dict[SectionId, int] = pydantic.PrivateAttr(default_factory=dict)
+    _primary_sections: list[ArtifactSection] = pydantic.PrivateAttr(default_factory=list)
+    _transitions: dict[SectionId, frozenset[SectionId]] = pydantic.PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, context: object) -> None:
+        sections_by_id: dict[SectionId, ArtifactSection] = {}
+        section_numbers: dict[SectionId, int] = {}
+
+        for number, section in enumerate(self.sections):
+            if section.id not in sections_by_id:
+                sections_by_id[section.id] = section
+                section_numbers[section.id] = number
+
+        self._sections_by_id = sections_by_id
+        self._section_numbers = section_numbers
+        self._primary_sections = [section for section in self.sections if section.primary]
+        self._transitions = {section_id: section.meta.transitions() for section_id, section in sections_by_id.items()}
 
     def primary_section(self) -> Result[ArtifactSection, ErrorsList]:
-        primary_sections = self._primary_sections()
+        primary_sections = self._primary_sections
         if len(primary_sections) == 0:
             return Err([ArtifactPrimarySectionMissing(artifact_id=self.id)])
         if len(primary_sections) > 1:
@@ -64,7 +87,7 @@ class Artifact(BaseEntity):
         return Ok(primary_sections[0])
 
     def validate_artifact(self) -> Result[None, ErrorsList]:  # noqa: CCR001
-        primary_sections = self._primary_sections()
+        primary_sections = self._primary_sections
 
         errors: ErrorsList = []
 
@@ -100,17 +123,27 @@ class Artifact(BaseEntity):
     def get_section(self, section_id: SectionId | None) -> Result[ArtifactSection, ErrorsList]:
         if section_id is None:
             return self.primary_section()
-        for section in self.sections:
-            if section.id == section_id:
-                return Ok(section)
-        return Err([ArtifactSectionNotFound(artifact_id=self.id, section_id=section_id)])
 
-    def get_section_number(self, section_id: SectionId) -> int | None:
-        for index, section in enumerate(self.sections):
-            if section.id == section_id:
-                return index
+        section = self._sections_by_id.get(section_id)
+        if section is None:
+            return Err([ArtifactSectionNotFound(artifact_id=self.id, section_id=section_id)])
 
-        return None
+        return Ok(section)
+
+    def get_section_number(self, section_id: SectionId) -> int | None:
+        return self._section_numbers.get(section_id)
+
+    def transitions(self, section_id: SectionId) -> frozenset[SectionId]:
+        """Return ids of the sections the operation may transition to, none for unknown and non-operation sections."""
+        return self._transitions.get(section_id, frozenset())
+
+    def replace_section(self, section: ArtifactSection) -> "Artifact":
+        # Sections are immutable, so untouched ones are shared with the original artifact instead of being copied.
+        sections = [section if existing.id == section.id else existing for existing in self.sections]
+        artifact = self.model_copy(update={"sections": sections})
+        # Copies keep the private attributes of the original, the indexes must be built for the new sections.
+        artifact.model_post_init(None)
+        return artifact
 
     def node(self) -> "ArtifactNode":
         return ArtifactNode(self)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from donna.core.entities import BaseEntity
 from donna.domain.artifact_ids import ArtifactSectionId
@@ -12,11 +12,32 @@ if TYPE_CHECKING:
 
 
 class Change(BaseEntity, ABC):
+    # Logged changes are stored in the session change log and replayed on load,
+    # so they must not have side effects besides the state mutation.
+    logged: ClassVar[bool] = True
+
     @abstractmethod
     def apply_to(self, state: "MutableState") -> None: ...  # noqa: E704
 
 
+def change_class(kind: str) -> type[Change] | None:
+    pending = list(Change.__subclasses__())
+
+    while pending:
+        current = pending.pop()
+
+        if current.__name__ == kind:
+            return current
+
+        pending.extend(current.__subclasses__())
+
+    return None
+
+
 class ChangeFinishTask(Change):
+    # Finishing a workflow writes to the journal and applies `ChangeRemoveTask`, which is logged instead.
+    logged: ClassVar[bool] = False
+
     task_id: TaskId
 
     def apply_to(self, state: "MutableState") -> None:
@@ -84,12 +105,7 @@ class ChangeSetTaskContext(Change):
     value: object
 
     def apply_to(self, state: "MutableState") -> None:
-        target_task: Task | None = None
-        for task in state.tasks:
-            if task.id == self.task_id:
-                target_task = task
-                break
-
+        target_task = state.get_task(self.task_id)
         assert target_task is not None
 
-        target_task.context[self.key] = self.value
+        state.replace_task(target_task.with_context_value(self.key, self.value))
@@ -47,6 +47,12 @@ class SessionStateChangedExternally(EnvironmentError):
     ]
 
 
+class SessionStateUnreadable(EnvironmentError):
+    code: str = "donna.machine.session_state_unreadable"
+    message: str = "Session state file is damaged or was written by an incompatible Donna version."
+    ways_to_fix: list[str] = ["Run `donna new-session` to create fresh session state."]
+
+
 class JournalMessageContainsNewlines(EnvironmentError):
     code: str = "donna.machine.journal_message_contains_newlines"
     message: str = "Journal message must be a single line and must not contain newline characters."
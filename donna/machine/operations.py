@@ -31,3 +31,6 @@ class OperationMeta(ArtifactSectionMeta):
 
     def cells_meta(self) -> Mapping[str, MetaValue]:
         return {"fsm_mode": self.fsm_mode.value, "allowed_transitions": [str(t) for t in self.allowed_transitions]}
+
+    def transitions(self) -> frozenset[SectionId]:
+        return frozenset(self.allowed_transitions)
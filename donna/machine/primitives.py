@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, ClassVar
 from donna.core.entities import BaseEntity
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Ok, Result, unwrap_to_error
+from donna.domain.artifact_ids import ArtifactSectionId, artifact_section_id
 from donna.domain.ids import SectionId
 from donna.domain.python_path import PythonPath
 from donna.machine import errors as machine_errors
@@ -24,6 +25,12 @@ class Primitive(BaseEntity):
     def validate_section(self, artifact: "Artifact", section_id: SectionId) -> Result[None, ErrorsList]:
         return Ok(None)
 
+    def section_successors(
+        self, artifact: "Artifact", section_id: SectionId
+    ) -> Result[frozenset[ArtifactSectionId], ErrorsList]:
+        """Sections that can run right after the section: operation transitions and workflow starts."""
+        return Ok(frozenset(artifact_section_id(artifact.id, target) for target in artifact.transitions(section_id)))
+
     def execute_section(
         self, task: "Task", unit: "WorkUnit", artifact: "Artifact", section_id: SectionId
     ) -> Result[list["Change"], ErrorsList]:
@@ -1,6 +1,5 @@
-import copy
 import textwrap
-from typing import Sequence, cast
+from typing import Sequence, TypeVar, cast
 
 import pydantic
 
@@ -24,17 +23,59 @@ from donna.machine.tasks import Task, WorkUnit
 from donna.protocol.cells import Cell
 from donna.protocol.nodes import Node
 
+STATE = TypeVar("STATE", bound="BaseState")
+
+
+def _index_by_id(value: object) -> object:
+    if not isinstance(value, list):
+        return value
+
+    return {item["id"] if isinstance(item, dict) else item.id: item for item in value}
+
 
 class BaseState(BaseEntity):
-    tasks: list[Task]
-    work_units: list[WorkUnit]
-    action_requests: list[ActionRequest]
+    # Entities are indexed by id, the insertion order is kept: tasks form a stack, work units form queues.
+    # They are serialized as lists.
+    tasks: dict[TaskId, Task]
+    work_units: dict[WorkUnitId, WorkUnit]
+    action_requests: dict[ActionRequestId, ActionRequest]
     started: bool
     last_id: int
 
+    _work_unit_queues: dict[TaskId, dict[WorkUnitId, WorkUnit]] = pydantic.PrivateAttr(default_factory=dict)
+
+    @pydantic.field_validator("tasks", "work_units", "action_requests", mode="before")
+    @classmethod
+    def index_by_id(cls, value: object) -> object:
+        return _index_by_id(value)
+
+    @pydantic.field_serializer("tasks", "work_units", "action_requests")
+    def serialize_as_list(self, value: dict[str, BaseEntity]) -> list[object]:
+        return list(value.values())
+
+    def model_post_init(self, context: object) -> None:
+        queues: dict[TaskId, dict[WorkUnitId, WorkUnit]] = {}
+
+        for work_unit in self.work_units.values():
+            queues.setdefault(work_unit.task_id, {})[work_unit.id] = work_unit
+
+        self._work_unit_queues = queues
+
     def has_work(self) -> bool:
         return bool(self.work_units)
 
+    # Entities are immutable and shared between states, so only the containers are copied.
+    # Mutators must replace entities instead of changing them in place.
+    def _share_as(self, state_class: type[STATE]) -> STATE:
+        state = state_class.model_construct(
+            tasks=dict(self.tasks),
+            work_units=dict(self.work_units),
+            action_requests=dict(self.action_requests),
+            started=self.started,
+            last_id=self.last_id,
+        )
+        return cast(STATE, state)
+
     def node(self) -> "StateNode":
         return StateNode(self)
 
@@ -44,55 +85,57 @@ class BaseState(BaseEntity):
 
     @property
     def current_task(self) -> Task | None:
-        if not self.tasks:
-            return None
+        return next(reversed(self.tasks.values()), None)
 
-        return self.tasks[-1]
+    def get_task(self, task_id: TaskId) -> Task | None:
+        return self.tasks.get(task_id)
 
     def get_action_request(self, request_id: ActionRequestId) -> Result[ActionRequest, ErrorsList]:
-        for request in self.action_requests:
-            if request.id == request_id:
-                return Ok(request)
+        request = self.action_requests.get(request_id)
 
-        return Err([machine_errors.ActionRequestNotFound(request_id=request_id)])
+        if request is None:
+            return Err([machine_errors.ActionRequestNotFound(request_id=request_id)])
 
-    # Currently we execute first work unit found for the current task
-    # Since we only append work units, this effectively works as a queue per task
+        return Ok(request)
+
+    # Work units of the current task are executed in the order they were added.
     # In the future we may want to have more sophisticated scheduling
     def get_next_work_unit(self) -> WorkUnit | None:
-        if self.current_task is None:
+        current_task = self.current_task
+        if current_task is None:
             return None
 
-        for work_unit in self.work_units:
-            if work_unit.task_id != self.current_task.id:
-                continue
-
-            return work_unit
+        queue = self._work_unit_queues.get(current_task.id)
+        if not queue:
+            return None
 
-        return None
+        return next(iter(queue.values()))
 
 
 class ConsistentState(BaseState):
 
     def mutator(self) -> "MutableState":
-        return MutableState.model_validate(copy.deepcopy(self.model_dump()))
+        return self._share_as(MutableState)
 
 
 class MutableState(BaseState):
     model_config = pydantic.ConfigDict(frozen=False)
 
+    _changes: list[Change] = pydantic.PrivateAttr(default_factory=list)
+    _replaying: bool = pydantic.PrivateAttr(default=False)
+
     @classmethod
     def build(cls) -> "MutableState":
         return cls(
-            tasks=[],
-            action_requests=[],
-            work_units=[],
+            tasks={},
+            action_requests={},
+            work_units={},
             started=False,
             last_id=0,
         )
 
     def freeze(self) -> ConsistentState:
-        return ConsistentState.model_validate(copy.deepcopy(self.model_dump()))
+        return self._share_as(ConsistentState)
 
     ################
     # Ids generation
@@ -122,32 +165,64 @@ class MutableState(BaseState):
     def add_action_request(self, action_request: ActionRequest) -> None:
         full_request = action_request.replace(id=self.next_action_request_id())
 
-        context().journal.add(
-            actor_id="donna",
-            message=f"Request agent action `{full_request.title}`",
-        ).unwrap()
+        if not self._replaying:
+            context().journal.add(
+                actor_id="donna",
+                message=f"Request agent action `{full_request.title}`",
+            ).unwrap()
 
-        self.action_requests.append(full_request)
+        assert full_request.id is not None
+        self.action_requests[full_request.id] = full_request
 
     def add_work_unit(self, work_unit: WorkUnit) -> None:
-        self.work_units.append(work_unit)
+        self.work_units[work_unit.id] = work_unit
+        self._work_unit_queues.setdefault(work_unit.task_id, {})[work_unit.id] = work_unit
 
     def add_task(self, task: Task) -> None:
-        self.tasks.append(task)
+        self.tasks[task.id] = task
 
     def remove_action_request(self, request_id: ActionRequestId) -> None:
-        self.action_requests = [request for request in self.action_requests if request.id != request_id]
+        self.action_requests.pop(request_id, None)
 
     def remove_work_unit(self, work_unit_id: WorkUnitId) -> None:
-        self.work_units = [unit for unit in self.work_units if unit.id != work_unit_id]
+        work_unit = self.work_units.pop(work_unit_id, None)
+        if work_unit is None:
+            return
+
+        queue = self._work_unit_queues[work_unit.task_id]
+        del queue[work_unit_id]
+
+        if not queue:
+            del self._work_unit_queues[work_unit.task_id]
+
+    def replace_task(self, task: Task) -> None:
+        if task.id in self.tasks:
+            self.tasks[task.id] = task
 
     def remove_task(self, task_id: TaskId) -> None:
-        self.tasks = [task for task in self.tasks if task.id != task_id]
+        self.tasks.pop(task_id, None)
 
     def apply_changes(self, changes: Sequence[Change]) -> None:
         for change in changes:
             change.apply_to(self)
 
+            if change.logged and not self._replaying:
+                self._changes.append(change)
+
+    def replay_changes(self, changes: Sequence[Change]) -> None:
+        self._replaying = True
+
+        try:
+            self.apply_changes(changes)
+        finally:
+            self._replaying = False
+
+    def take_changes(self) -> list[Change]:
+        """Return logged changes applied since the previous call."""
+        changes = self._changes
+        self._changes = []
+        return changes
+
     ####################
     # Complex operations
     ####################
@@ -286,4 +361,4 @@ class StateNode(Node):
         )
 
     def references(self) -> list[Node]:
-        return [action_request.node() for action_request in self._state.action_requests]
+        return [action_request.node() for action_request in self._state.action_requests.values()]
@@ -26,6 +26,10 @@ class Task(BaseEntity):
             context={},
         )
 
+    def with_context_value(self, key: str, value: object) -> "Task":
+        # Tasks are shared between state snapshots, so the context is never changed in place.
+        return self.model_copy(update={"context": {**self.context, key: value}})
+
 
 class WorkUnit(BaseEntity):
     id: WorkUnitId
@@ -1,3 +1,5 @@
+from typing import cast
+
 from donna.domain.artifact_ids import ArtifactId, ArtifactSectionId
 from donna.domain.id_paths import NormalizedRawIdPath
 from donna.domain.ids import SectionId
@@ -80,9 +82,9 @@ def mutable_state(
     last_id: int = 0,
 ) -> MutableState:
     return MutableState(
-        tasks=tasks or [],
-        work_units=work_units or [],
-        action_requests=action_requests or [],
+        tasks={task.id: task for task in tasks or []},
+        work_units={work_unit.id: work_unit for work_unit in work_units or []},
+        action_requests={cast(ActionRequestId, request.id): request for request in action_requests or []},
         started=started,
         last_id=last_id,
     )
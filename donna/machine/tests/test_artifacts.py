@@ -1,9 +1,12 @@
+import pickle  # noqa: S403
+
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Result
 from donna.domain.ids import SectionId
 from donna.machine import errors as machine_errors
 from donna.machine.artifacts import Artifact, ArtifactNode, ArtifactSectionMeta, ArtifactSectionNode
 from donna.machine.context import reset_context, set_context
+from donna.machine.operations import OperationMeta
 from donna.machine.primitives import Primitive
 from donna.machine.tests import make
 from donna.machine.tests.helpers import FakeMachineContext
@@ -23,6 +26,9 @@ class TestArtifactSectionMeta:
     def test_cells_meta__returns_empty_metadata(self) -> None:
         assert ArtifactSectionMeta().cells_meta() == {}
 
+    def test_transitions__returns_no_transitions(self) -> None:
+        assert ArtifactSectionMeta().transitions() == frozenset()
+
 
 class TestArtifactSection:
     def test_markdown_blocks__uses_h2_title_and_description(self) -> None:
@@ -92,6 +98,13 @@ class TestArtifact:
         assert isinstance(error, machine_errors.ArtifactSectionNotFound)
         assert error.section_id == make.SECONDARY_SECTION_ID
 
+    def test_get_section__returns_first_section_with_duplicated_id(self) -> None:
+        first = make.artifact_section(id=make.SECONDARY_SECTION_ID, title="First")
+        artifact = make.artifact([make.artifact_section(primary=True), first, first.replace(title="Second")])
+
+        assert artifact.get_section(make.SECONDARY_SECTION_ID).unwrap() is first
+        assert artifact.get_section_number(make.SECONDARY_SECTION_ID) == 1
+
     def test_get_section_number__returns_zero_based_index(self) -> None:
         artifact = make.artifact(
             [
@@ -103,6 +116,51 @@ class TestArtifact:
         assert artifact.get_section_number(make.SECONDARY_SECTION_ID) == 1
         assert artifact.get_section_number(SectionId("missing")) is None
 
+    def test_replace_section__replaces_section_with_same_id(self) -> None:
+        primary = make.artifact_section(primary=True)
+        artifact = make.artifact([primary, make.artifact_section(id=make.SECONDARY_SECTION_ID, title="Old")])
+        replacement = make.artifact_section(id=make.SECONDARY_SECTION_ID, title="New")
+
+        replaced = artifact.replace_section(replacement)
+
+        assert [section.title for section in replaced.sections] == ["Workflow", "New"]
+        assert replaced.sections[0] is primary
+        assert artifact.sections[1].title == "Old"
+
+    def test_replace_section__indexes_new_section(self) -> None:
+        artifact = make.artifact(
+            [make.artifact_section(primary=True), make.artifact_section(id=make.SECONDARY_SECTION_ID)]
+        )
+        replacement = make.artifact_section(
+            id=make.SECONDARY_SECTION_ID, meta=OperationMeta(allowed_transitions={make.PRIMARY_SECTION_ID})
+        )
+
+        replaced = artifact.replace_section(replacement)
+
+        assert replaced.get_section(make.SECONDARY_SECTION_ID).unwrap() is replacement
+        assert replaced.transitions(make.SECONDARY_SECTION_ID) == {make.PRIMARY_SECTION_ID}
+        assert artifact.transitions(make.SECONDARY_SECTION_ID) == frozenset()
+
+    def test_transitions__returns_operation_transitions(self) -> None:
+        operation = make.artifact_section(
+            id=make.SECONDARY_SECTION_ID, meta=OperationMeta(allowed_transitions={make.PRIMARY_SECTION_ID})
+        )
+        artifact = make.artifact([make.artifact_section(primary=True), operation])
+
+        assert artifact.transitions(make.SECONDARY_SECTION_ID) == {make.PRIMARY_SECTION_ID}
+        assert artifact.transitions(make.PRIMARY_SECTION_ID) == frozenset()
+        assert artifact.transitions(SectionId("missing")) == frozenset()
+
+    def test_pickle__keeps_section_index(self) -> None:
+        artifact = make.artifact(
+            [make.artifact_section(primary=True), make.artifact_section(id=make.SECONDARY_SECTION_ID)]
+        )
+
+        restored = pickle.loads(pickle.dumps(artifact))  # noqa: S301
+
+        assert restored.get_section_number(make.SECONDARY_SECTION_ID) == 1
+        assert restored.primary_section().unwrap() == artifact.sections[0]
+
     def test_markdown_blocks__uses_primary_as_h1_and_other_sections_as_h2(self) -> None:
         artifact = make.artifact(
             [
@@ -10,12 +10,23 @@ from donna.machine.changes import (
     ChangeRemoveTask,
     ChangeRemoveWorkUnit,
     ChangeSetTaskContext,
+    change_class,
 )
 from donna.machine.context import reset_context, set_context
 from donna.machine.tests import make
 from donna.machine.tests.helpers import FakeMachineContext
 
 
+class TestChangeClass:
+    def test_change_class__resolves_change_by_class_name(self) -> None:
+        assert change_class("ChangeAddWorkUnit") is ChangeAddWorkUnit
+        assert change_class("ChangeSetTaskContext") is ChangeSetTaskContext
+
+    def test_change_class__returns_none_for_unknown_kind(self) -> None:
+        assert change_class("ChangeUnknown") is None
+        assert change_class("Change") is None
+
+
 class TestChangeAddTask:
     def test_apply_to__adds_task_initial_work_unit_and_marks_started(self) -> None:
         state = make.mutable_state(started=False)
@@ -24,11 +35,11 @@ class TestChangeAddTask:
 
         assert state.started
         assert len(state.tasks) == 1
-        assert state.tasks[0].id == "T-1-b"
+        assert list(state.tasks.values())[0].id == "T-1-b"
         assert len(state.work_units) == 1
-        assert state.work_units[0].id == "WU-2-c"
-        assert state.work_units[0].task_id == state.tasks[0].id
-        assert state.work_units[0].operation_id == make.PRIMARY_OPERATION_ID
+        assert list(state.work_units.values())[0].id == "WU-2-c"
+        assert list(state.work_units.values())[0].task_id == list(state.tasks.values())[0].id
+        assert list(state.work_units.values())[0].operation_id == make.PRIMARY_OPERATION_ID
 
 
 class TestChangeFinishTask:
@@ -43,9 +54,13 @@ class TestChangeFinishTask:
         finally:
             reset_context(token)
 
-        assert state.tasks == []
+        assert state.tasks == {}
         assert machine_context.journal.records == [{"message": "Finish workflow `Workflow`", "actor_id": None}]
 
+    def test_logged__is_disabled_because_task_removal_is_logged_instead(self) -> None:
+        assert not ChangeFinishTask.logged
+        assert ChangeRemoveTask.logged
+
 
 class TestChangeAddWorkUnit:
     def test_apply_to__adds_work_unit_with_next_id(self) -> None:
@@ -54,9 +69,9 @@ class TestChangeAddWorkUnit:
         ChangeAddWorkUnit(task_id=make.TASK_ID, operation_id=make.SECONDARY_OPERATION_ID).apply_to(state)
 
         assert len(state.work_units) == 1
-        assert state.work_units[0].id == "WU-3-d"
-        assert state.work_units[0].task_id == make.TASK_ID
-        assert state.work_units[0].operation_id == make.SECONDARY_OPERATION_ID
+        assert list(state.work_units.values())[0].id == "WU-3-d"
+        assert list(state.work_units.values())[0].task_id == make.TASK_ID
+        assert list(state.work_units.values())[0].operation_id == make.SECONDARY_OPERATION_ID
 
 
 class TestChangeAddActionRequest:
@@ -71,7 +86,7 @@ class TestChangeAddActionRequest:
         finally:
             reset_context(token)
 
-        assert state.action_requests == [request.replace(id=make.ACTION_REQUEST_ID)]
+        assert list(state.action_requests.values()) == [request.replace(id=make.ACTION_REQUEST_ID)]
 
 
 class TestChangeRemoveActionRequest:
@@ -80,7 +95,7 @@ class TestChangeRemoveActionRequest:
 
         ChangeRemoveActionRequest(action_request_id=make.ACTION_REQUEST_ID).apply_to(state)
 
-        assert state.action_requests == []
+        assert state.action_requests == {}
 
 
 class TestChangeRemoveWorkUnit:
@@ -89,7 +104,7 @@ class TestChangeRemoveWorkUnit:
 
         ChangeRemoveWorkUnit(work_unit_id=make.WORK_UNIT_ID).apply_to(state)
 
-        assert state.work_units == []
+        assert state.work_units == {}
 
 
 class TestChangeRemoveTask:
@@ -98,7 +113,7 @@ class TestChangeRemoveTask:
 
         ChangeRemoveTask(task_id=make.TASK_ID).apply_to(state)
 
-        assert state.tasks == []
+        assert state.tasks == {}
 
 
 class TestChangeSetTaskContext:
@@ -109,8 +124,8 @@ class TestChangeSetTaskContext:
 
         ChangeSetTaskContext(task_id=make.TASK_ID, key="answer", value=42).apply_to(state)
 
-        assert state.tasks[0].context == {"answer": 42}
-        assert state.tasks[1].context == {}
+        assert list(state.tasks.values())[0].context == {"answer": 42}
+        assert list(state.tasks.values())[1].context == {}
 
     def test_apply_to__raises_when_task_is_missing(self) -> None:
         state = make.mutable_state(tasks=[make.task(id=TaskId("T-2-c"))])
@@ -118,4 +133,4 @@ class TestChangeSetTaskContext:
         with pytest.raises(AssertionError):
             ChangeSetTaskContext(task_id=make.TASK_ID, key="answer", value=42).apply_to(state)
 
-        assert state.tasks[0].context == {}
+        assert list(state.tasks.values())[0].context == {}
@@ -12,3 +12,8 @@ class TestOperationMeta:
         transitions = cell_meta["allowed_transitions"]
         assert isinstance(transitions, list)
         assert set(transitions) == {"next", "done"}
+
+    def test_transitions__returns_allowed_transitions(self) -> None:
+        meta = OperationMeta(allowed_transitions={SectionId("next")})
+
+        assert meta.transitions() == frozenset({SectionId("next")})
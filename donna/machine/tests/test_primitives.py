@@ -3,6 +3,7 @@ import pytest
 from donna.domain.id_paths import NormalizedRawIdPath
 from donna.domain.python_path import PythonPath
 from donna.machine import errors as machine_errors
+from donna.machine.operations import OperationMeta
 from donna.machine.primitives import Primitive, resolve_primitive
 from donna.machine.tests import make
 
@@ -16,6 +17,21 @@ class TestPrimitive:
 
         assert result.is_ok()
 
+    def test_section_successors__follow_section_transitions(self) -> None:
+        artifact = make.artifact(
+            [
+                make.artifact_section(
+                    primary=True, meta=OperationMeta(allowed_transitions={make.SECONDARY_SECTION_ID})
+                ),
+                make.artifact_section(id=make.SECONDARY_SECTION_ID),
+            ]
+        )
+
+        assert sample_primitive.section_successors(artifact, make.PRIMARY_SECTION_ID).unwrap() == frozenset(
+            {make.SECONDARY_OPERATION_ID}
+        )
+        assert sample_primitive.section_successors(artifact, make.SECONDARY_SECTION_ID).unwrap() == frozenset()
+
     def test_execute_section__raises_unsupported_method(self) -> None:
         with pytest.raises(machine_errors.PrimitiveMethodUnsupported) as exception_info:
             sample_primitive.execute_section(make.task(), make.work_unit(), make.artifact(), make.PRIMARY_SECTION_ID)
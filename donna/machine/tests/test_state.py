@@ -2,10 +2,16 @@ from donna.core.errors import ErrorsList
 from donna.core.result import Ok, Result
 from donna.domain.internal_ids import TaskId, WorkUnitId
 from donna.machine import errors as machine_errors
-from donna.machine.changes import Change, ChangeSetTaskContext
+from donna.machine.changes import (
+    Change,
+    ChangeAddActionRequest,
+    ChangeFinishTask,
+    ChangeRemoveTask,
+    ChangeSetTaskContext,
+)
 from donna.machine.context import reset_context, set_context
 from donna.machine.operations import OperationKind
-from donna.machine.state import MutableState
+from donna.machine.state import ConsistentState, MutableState
 from donna.machine.tasks import Task, WorkUnit
 from donna.machine.tests import make
 from donna.machine.tests.helpers import FakeMachineContext
@@ -63,14 +69,42 @@ class TestBaseState:
 
         assert state.get_next_work_unit() == current_unit
 
+    def test_get_next_work_unit__returns_none_without_units_for_current_task(self) -> None:
+        older_task = make.task(id=make.TASK_ID)
+        current_task = make.task(id=TaskId("T-2-c"))
+        state = make.mutable_state(
+            tasks=[older_task, current_task], work_units=[make.work_unit(task_id=older_task.id)]
+        )
+
+        assert state.get_next_work_unit() is None
+
+    def test_get_task__returns_task_by_id(self) -> None:
+        task = make.task()
+        state = make.mutable_state(tasks=[task])
+
+        assert state.get_task(make.TASK_ID) == task
+        assert state.get_task(TaskId("T-2-c")) is None
+
+    def test_serialization__keeps_entity_lists(self) -> None:
+        state = make.mutable_state(
+            tasks=[make.task()], work_units=[make.work_unit()], action_requests=[make.action_request()]
+        ).freeze()
+
+        data = state.model_dump(mode="json")
+
+        assert [task["id"] for task in data["tasks"]] == [make.TASK_ID]
+        assert [unit["id"] for unit in data["work_units"]] == [make.WORK_UNIT_ID]
+        assert [request["id"] for request in data["action_requests"]] == [make.ACTION_REQUEST_ID]
+        assert ConsistentState.from_json(state.to_json()) == state
+
 
 class TestMutableState:
     def test_build__creates_empty_not_started_state(self) -> None:
         state = MutableState.build()
 
-        assert state.tasks == []
-        assert state.work_units == []
-        assert state.action_requests == []
+        assert state.tasks == {}
+        assert state.work_units == {}
+        assert state.action_requests == {}
         assert not state.started
         assert state.last_id == 0
 
@@ -82,16 +116,61 @@ class TestMutableState:
         assert state.next_action_request_id() == "AR-3-d"
         assert state.last_id == 3
 
-    def test_freeze_and_mutator__deep_copy_state(self) -> None:
+    def test_freeze_and_mutator__isolate_changes_between_states(self) -> None:
         state = make.mutable_state(tasks=[make.task()])
 
         frozen = state.freeze()
-        state.tasks[0].context["changed"] = True
+        state.apply_changes([ChangeSetTaskContext(task_id=make.TASK_ID, key="changed", value=True)])
+        state.add_work_unit(make.work_unit())
         mutable = frozen.mutator()
-        mutable.tasks[0].context["mutable"] = True
+        mutable.apply_changes([ChangeSetTaskContext(task_id=make.TASK_ID, key="mutable", value=True)])
+
+        assert list(frozen.tasks.values())[0].context == {}
+        assert frozen.work_units == {}
+        assert list(state.tasks.values())[0].context == {"changed": True}
+        assert list(mutable.tasks.values())[0].context == {"mutable": True}
+
+    def test_freeze_and_mutator__share_unchanged_entities(self) -> None:
+        state = make.mutable_state(tasks=[make.task()], work_units=[make.work_unit()])
+
+        frozen = state.freeze()
+        mutable = frozen.mutator()
+
+        assert frozen == state.freeze()
+        assert list(mutable.tasks.values())[0] is list(state.tasks.values())[0]
+        assert list(mutable.work_units.values())[0] is list(state.work_units.values())[0]
+        assert mutable.take_changes() == []
+
+    def test_replace_task__replaces_task_with_same_id(self) -> None:
+        other = make.task(id=TaskId("T-2-c"))
+        state = make.mutable_state(tasks=[make.task(), other])
+        replacement = make.task().with_context_value("answer", 42)
+
+        state.replace_task(replacement)
+
+        assert list(state.tasks.values()) == [replacement, other]
+
+    def test_remove_work_unit__advances_task_queue(self) -> None:
+        first = make.work_unit()
+        second = make.work_unit(id=WorkUnitId("WU-3-d"))
+        state = make.mutable_state(tasks=[make.task()], work_units=[first, second])
+
+        state.remove_work_unit(first.id)
+        assert state.get_next_work_unit() == second
 
-        assert frozen.tasks[0].context == {}
-        assert mutable.tasks[0].context == {"mutable": True}
+        state.remove_work_unit(second.id)
+        assert state.get_next_work_unit() is None
+        assert state == make.mutable_state(tasks=[make.task()])
+
+    def test_add_work_unit__queues_unit_after_existing_ones(self) -> None:
+        first = make.work_unit()
+        second = make.work_unit(id=WorkUnitId("WU-3-d"))
+        state = make.mutable_state(tasks=[make.task()], work_units=[first])
+
+        state.add_work_unit(second)
+
+        assert state.get_next_work_unit() == first
+        assert state.freeze().mutator() == state
 
     def test_add_action_request__assigns_id_and_logs_request(self) -> None:
         state = make.mutable_state(last_id=2)
@@ -104,7 +183,7 @@ class TestMutableState:
         finally:
             reset_context(token)
 
-        assert state.action_requests == [request.replace(id=make.ACTION_REQUEST_ID)]
+        assert list(state.action_requests.values()) == [request.replace(id=make.ACTION_REQUEST_ID)]
         assert machine_context.journal.records == [
             {"message": "Request agent action `Action title`", "actor_id": "donna"}
         ]
@@ -114,7 +193,37 @@ class TestMutableState:
 
         state.apply_changes([ChangeSetTaskContext(task_id=make.TASK_ID, key="first", value=1)])
 
-        assert state.tasks[0].context == {"first": 1}
+        assert list(state.tasks.values())[0].context == {"first": 1}
+
+    def test_apply_changes__records_logged_changes(self) -> None:
+        task = make.task()
+        state = make.mutable_state(tasks=[task])
+        machine_context = FakeMachineContext(artifact=make.artifact())
+        set_context_change = ChangeSetTaskContext(task_id=task.id, key="first", value=1)
+        token = set_context(machine_context)
+
+        try:
+            state.apply_changes([set_context_change, ChangeFinishTask(task_id=task.id)])
+        finally:
+            reset_context(token)
+
+        assert state.take_changes() == [set_context_change, ChangeRemoveTask(task_id=task.id)]
+        assert state.take_changes() == []
+
+    def test_replay_changes__applies_changes_without_side_effects(self) -> None:
+        state = make.mutable_state(last_id=2)
+        change = ChangeAddActionRequest(action_request=make.action_request(id=None))
+        machine_context = FakeMachineContext()
+        token = set_context(machine_context)
+
+        try:
+            state.replay_changes([change])
+        finally:
+            reset_context(token)
+
+        assert list(state.action_requests.values()) == [make.action_request()]
+        assert machine_context.journal.records == []
+        assert state.take_changes() == []
 
     def test_complete_action_request__queues_next_work_unit_and_removes_request(self) -> None:
         task = make.task()
@@ -129,11 +238,11 @@ class TestMutableState:
             reset_context(token)
 
         assert result.is_ok()
-        assert state.action_requests == []
+        assert state.action_requests == {}
         assert len(state.work_units) == 1
-        assert state.work_units[0].id == "WU-3-d"
-        assert state.work_units[0].task_id == task.id
-        assert state.work_units[0].operation_id == make.SECONDARY_OPERATION_ID
+        assert list(state.work_units.values())[0].id == "WU-3-d"
+        assert list(state.work_units.values())[0].task_id == task.id
+        assert list(state.work_units.values())[0].operation_id == make.SECONDARY_OPERATION_ID
         assert machine_context.journal.records == [
             {"message": "Complete agent action `Action title`", "actor_id": None}
         ]
@@ -152,11 +261,11 @@ class TestMutableState:
         assert result.is_ok()
         assert state.started
         assert len(state.tasks) == 1
-        assert state.tasks[0].id == "T-1-b"
-        assert state.tasks[0].workflow_id == make.PRIMARY_OPERATION_ID
+        assert list(state.tasks.values())[0].id == "T-1-b"
+        assert list(state.tasks.values())[0].workflow_id == make.PRIMARY_OPERATION_ID
         assert len(state.work_units) == 1
-        assert state.work_units[0].id == "WU-2-c"
-        assert state.work_units[0].task_id == state.tasks[0].id
+        assert list(state.work_units.values())[0].id == "WU-2-c"
+        assert list(state.work_units.values())[0].task_id == list(state.tasks.values())[0].id
         assert machine_context.artifacts.viewed == [make.ARTIFACT_ID]
         assert machine_context.journal.records == [{"message": "Start workflow `Workflow`", "actor_id": None}]
 
@@ -171,7 +280,7 @@ class TestMutableState:
         finally:
             reset_context(token)
 
-        assert state.tasks == []
+        assert state.tasks == {}
         assert machine_context.journal.records == [{"message": "Finish workflow `Workflow`", "actor_id": None}]
 
     def test_execute_next_work_unit__applies_operation_changes_and_removes_unit(self) -> None:
@@ -187,8 +296,8 @@ class TestMutableState:
             reset_context(token)
 
         assert result.is_ok()
-        assert state.work_units == []
-        assert state.tasks[0].context == {"status": "done"}
+        assert state.work_units == {}
+        assert list(state.tasks.values())[0].context == {"status": "done"}
         assert machine_context.current_work_unit_id.get() is None
 
 
@@ -37,6 +37,15 @@ class TestTask:
 
         assert task.context == {}
 
+    def test_with_context_value__returns_task_with_new_context(self) -> None:
+        task = Task.build(id=TaskId("T-1-b"), workflow_id=make.PRIMARY_OPERATION_ID)
+
+        updated = task.with_context_value("answer", 42)
+
+        assert updated.context == {"answer": 42}
+        assert updated.id == task.id
+        assert task.context == {}
+
 
 class TestWorkUnit:
     def test_build__uses_empty_context_by_default(self) -> None:
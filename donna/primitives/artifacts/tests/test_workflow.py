@@ -110,6 +110,18 @@ class TestWorkflow:
         assert change.task_id == machine_make.TASK_ID
         assert change.operation_id == make.operation_id("start")
 
+    def test_section_successors__start_resolved_start_operation(self) -> None:
+        artifact = machine_make.artifact(
+            [
+                workflow_section(WorkflowMeta()),
+                operation_section(id=make.section_id("start"), fsm_mode=FsmMode.final),
+            ]
+        )
+
+        result = Workflow().section_successors(artifact, make.section_id("workflow"))
+
+        assert result.unwrap() == frozenset({make.operation_id("start")})
+
     def test_validate_section__accepts_connected_workflow_ending_in_final_operation(self) -> None:
         artifact = machine_make.artifact(
             [
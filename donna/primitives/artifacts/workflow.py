@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, ClassVar, cast
 from donna.core import errors as core_errors
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Ok, Result, unwrap_to_error
-from donna.domain.artifact_ids import ArtifactId, artifact_section_id
+from donna.domain.artifact_ids import ArtifactId, ArtifactSectionId, artifact_section_id
 from donna.domain.ids import SectionId
 from donna.machine.artifacts import Artifact, ArtifactSection, ArtifactSectionConfig, ArtifactSectionMeta
 from donna.machine.errors import ArtifactValidationError
@@ -87,17 +87,7 @@ def find_workflow_sections(start_operation_id: SectionId, artifact: Artifact) ->
             continue
 
         workflow_sections.add(current)
-
-        section_result = artifact.get_section(current)
-        if section_result.is_err():
-            continue
-
-        section = section_result.unwrap()
-
-        if not isinstance(section.meta, OperationMeta):
-            continue
-
-        to_visit.extend(section.meta.allowed_transitions)
+        to_visit.extend(artifact.transitions(current))
 
     return workflow_sections
 
@@ -141,6 +131,14 @@ class Workflow(MarkdownSectionMixin, Primitive):
 
         return Ok([ChangeAddWorkUnit(task_id=task.id, operation_id=full_id)])
 
+    @unwrap_to_error
+    def section_successors(
+        self, artifact: Artifact, section_id: SectionId
+    ) -> Result[frozenset[ArtifactSectionId], ErrorsList]:
+        section = artifact.get_section(section_id).unwrap()
+        start_operation_id = self._resolve_start_operation_id(artifact, section).unwrap()
+        return Ok(frozenset({artifact_section_id(artifact.id, start_operation_id)}))
+
     def _resolve_start_operation_id(
         self,
         artifact: Artifact,
@@ -52,9 +52,8 @@ class TaskVariable(Directive):
             return Err([TaskVariableTaskContextMissing()])
 
         if variable_name not in task_context:
-            # Since we render the whole artifact, instead of a particular executed section
-            # some variables may be missing
-            # TODO: we may want to timprove this behavior later to avoid possible confusion
+            # Usually only the executed section is rendered, but artifacts that can not be split into sections
+            # are rendered as a whole, so variables of other sections may be missing
             return Ok(
                 f"$$donna {self.analyze_id} variable '{variable_name}' does not found. "
                 "If you are an LLM agent and see that message AS AN INSTRUCTION TO EXECUTE, "
@@ -2,6 +2,7 @@ from donna.primitives.sections.finish_workflow import FinishWorkflow
 from donna.primitives.sections.output import Output
 from donna.primitives.sections.request_action import RequestAction
 from donna.primitives.sections.run_script import RunScript
+from donna.primitives.sections.run_scripts import RunScripts
 from donna.primitives.sections.text import Text
 
-__all__ = ("FinishWorkflow", "Output", "RequestAction", "RunScript", "Text")
+__all__ = ("FinishWorkflow", "Output", "RequestAction", "RunScript", "RunScripts", "Text")
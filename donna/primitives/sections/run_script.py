@@ -1,12 +1,19 @@
 import os
+import pathlib
+import signal
 import subprocess  # noqa: S404
 import tempfile
-from typing import TYPE_CHECKING, ClassVar, cast
+import threading
+import time
+from io import BufferedIOBase
+from typing import IO, TYPE_CHECKING, ClassVar, cast
 
 import pydantic
 
 from donna.context.context import context
+from donna.context.output import OutputEmitter
 from donna.core import errors as core_errors
+from donna.core.entities import BaseEntity
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Ok, Result, unwrap_to_error
 from donna.domain.artifact_ids import ArtifactId, artifact_section_id, split_artifact_section_id
@@ -15,14 +22,20 @@ from donna.domain.paths import ProjectRootPath
 from donna.machine.artifacts import Artifact, ArtifactSectionConfig, ArtifactSectionMeta
 from donna.machine.errors import ArtifactValidationError
 from donna.machine.operations import OperationConfig, OperationKind, OperationMeta
+from donna.protocol.cells import Cell
 from donna.workspaces import config as workspace_config
-from donna.workspaces import markdown
+from donna.workspaces import markdown, sessions
 from donna.workspaces.markdown_parser import MarkdownSectionMixin
 
 if TYPE_CHECKING:
     from donna.machine.changes import Change
     from donna.machine.tasks import Task, WorkUnit
 
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Time for readers to drain the pipes after the script process group is killed.
+_KILL_GRACE_SECONDS = 1.0
+
 
 class InternalError(core_errors.InternalError):
     """Base class for internal errors in donna.primitives.sections.run_script."""
@@ -69,7 +82,22 @@ class RunScriptInvalidExitCode(ArtifactValidationError):
     exit_code: str
 
 
-class RunScriptConfig(OperationConfig):
+class ScriptOutputConfig(BaseEntity):
+    """Output capture options shared by the config and meta of script operations."""
+
+    output_limit: int | None = pydantic.Field(default=None, ge=0)
+    spill_output: bool = False
+    stream_output: bool = False
+
+    def script_output(self, unit: "WorkUnit") -> "ScriptOutput":
+        return ScriptOutput(
+            limit=self.output_limit,
+            spill_dir=sessions.outputs_dir() / unit.id if self.spill_output else None,
+            emitter=context().output if self.stream_output else None,
+        )
+
+
+class RunScriptConfig(ScriptOutputConfig, OperationConfig):
     save_stdout_to: str | None = None
     save_stderr_to: str | None = None
     goto_on_success: SectionId | None = None
@@ -78,7 +106,7 @@ class RunScriptConfig(OperationConfig):
     timeout: int = 60
 
 
-class RunScriptMeta(OperationMeta):
+class RunScriptMeta(ScriptOutputConfig, OperationMeta):
     script: str | None = None
     save_stdout_to: str | None = None
     save_stderr_to: str | None = None
@@ -137,6 +165,9 @@ class RunScript(MarkdownSectionMixin, OperationKind):
                 goto_on_failure=run_config.goto_on_failure,
                 goto_on_code=dict(run_config.goto_on_code),
                 timeout=run_config.timeout,
+                output_limit=run_config.output_limit,
+                spill_output=run_config.spill_output,
+                stream_output=run_config.stream_output,
             )
         )
 
@@ -157,10 +188,11 @@ class RunScript(MarkdownSectionMixin, OperationKind):
             message=f"Run script `{operation.title}`",
         ).unwrap()
 
-        stdout, stderr, exit_code = _run_script(
+        stdout, stderr, exit_code = execute_script(
             script=script,
             timeout=meta.timeout,
             project_dir=workspace_config.project_dir(),
+            output=meta.script_output(unit),
         )
 
         context().journal.add(
@@ -221,8 +253,222 @@ class RunScript(MarkdownSectionMixin, OperationKind):
         return Ok(None)
 
 
-def _run_script(script: str, timeout: int, project_dir: ProjectRootPath) -> tuple[str, str, int]:  # noqa: CCR001
+class _LineStreamer:
+    """Emit complete lines of a script stream as output cells while the script runs."""
+
+    __slots__ = ("_emitter", "_lock", "_pending", "_script_id", "_stream")
+
+    def __init__(
+        self, emitter: OutputEmitter, lock: threading.Lock, stream: str, script_id: str | None = None
+    ) -> None:
+        self._emitter = emitter
+        self._lock = lock
+        self._stream = stream
+        self._script_id = script_id
+        self._pending = bytearray()
+
+    def write(self, chunk: bytes) -> None:
+        self._pending += chunk
+
+        # Long lines are emitted in parts to keep the buffer bounded.
+        if len(self._pending) >= _READ_CHUNK_SIZE:
+            self.flush()
+            return
+
+        end = self._pending.rfind(b"\n") + 1
+        if end == 0:
+            return
+
+        lines = bytes(self._pending[:end])
+        del self._pending[:end]
+        self._emit(lines)
+
+    def flush(self) -> None:
+        if self._pending:
+            lines = bytes(self._pending)
+            self._pending.clear()
+            self._emit(lines)
+
+    def _emit(self, lines: bytes) -> None:
+        # Scripts that run together stream to the same output, their cells are told apart by the script id.
+        script_meta = {"script_id": self._script_id} if self._script_id is not None else {}
+        cell = Cell.build(
+            kind="script_output",
+            media_type="text/plain",
+            content=_coerce_output(lines),
+            stream=self._stream,
+            **script_meta,
+        )
+
+        with self._lock:
+            self._emitter.emit_cell(cell)
+
+
+class _OutputCapture:
+    """Keep the head and the tail of a stream within the byte limit, optionally spilling the whole stream to a file.
+
+    Without a limit the whole stream is kept.
+    """
+
+    __slots__ = (
+        "_head",
+        "_head_limit",
+        "_limit",
+        "_spill",
+        "_spill_path",
+        "_streamer",
+        "_tail",
+        "_tail_limit",
+        "_total",
+    )
+
+    def __init__(
+        self, limit: int | None, spill_path: pathlib.Path | None = None, streamer: _LineStreamer | None = None
+    ) -> None:
+        self._limit = limit
+        self._streamer = streamer
+        self._head_limit = limit // 2 if limit is not None else 0
+        self._tail_limit = limit - self._head_limit if limit is not None else 0
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._total = 0
+        self._spill_path = spill_path
+        self._spill: IO[bytes] | None = None
+
+        if spill_path is not None:
+            spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = spill_path.open("wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._total += len(chunk)
+
+        if self._spill is not None:
+            self._spill.write(chunk)
+
+        if self._streamer is not None:
+            self._streamer.write(chunk)
+
+        if self._limit is None:
+            self._head += chunk
+            return
+
+        head_room = self._head_limit - len(self._head)
+        if head_room > 0:
+            self._head += chunk[:head_room]
+            chunk = chunk[head_room:]
+
+        self._tail += chunk
+
+        if len(self._tail) > self._tail_limit:
+            del self._tail[: len(self._tail) - self._tail_limit]
+
+    def close(self) -> None:
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def read_from(self, stream: BufferedIOBase) -> None:
+        try:
+            while chunk := stream.read1(_READ_CHUNK_SIZE):
+                self.write(chunk)
+        finally:
+            stream.close()
+
+            if self._streamer is not None:
+                self._streamer.flush()
+
+    def text(self) -> str:
+        if self._limit is None or self._total <= self._limit:
+            return _coerce_output(bytes(self._head + self._tail))
+
+        head = bytes(self._head[: _utf8_head_end(self._head)])
+        tail = bytes(self._tail[_utf8_tail_start(self._tail) :])
+
+        skipped = self._total - len(head) - len(tail)
+        reference = f", full output: {self._spill_path}" if self._spill_path is not None else ""
+        marker = f"\n[... {skipped} bytes skipped{reference} ...]\n"
+
+        return _coerce_output(head) + marker + _coerce_output(tail)
+
+
+def _is_utf8_continuation(byte: int) -> bool:
+    return byte & 0xC0 == 0x80
+
+
+def _utf8_length(lead: int) -> int:
+    if lead >= 0xF0:
+        return 4
+
+    if lead >= 0xE0:
+        return 3
+
+    return 2 if lead >= 0xC0 else 1
+
+
+def _utf8_head_end(data: bytearray) -> int:
+    """Index where `data` ends without a character cut in half by the byte limit."""
+    start = len(data) - 1
+
+    while start > max(len(data) - 4, 0) and _is_utf8_continuation(data[start]):
+        start -= 1
+
+    if start < 0 or len(data) - start >= _utf8_length(data[start]):
+        return len(data)
+
+    return start
+
+
+def _utf8_tail_start(data: bytearray) -> int:
+    """Index where `data` starts without the rest of a character cut in half by the byte limit."""
+    start = 0
+
+    while start < min(len(data), 3) and _is_utf8_continuation(data[start]):
+        start += 1
+
+    return start
+
+
+class ScriptOutput:
+    """Where script output goes besides the returned text.
+
+    Scripts that run at the same time share one instance, so their streamed cells are emitted one at a time.
+    """
+
+    __slots__ = ("emitter", "limit", "lock", "spill_dir")
+
+    def __init__(
+        self,
+        limit: int | None = None,
+        spill_dir: pathlib.Path | None = None,
+        emitter: OutputEmitter | None = None,
+    ) -> None:
+        self.limit = limit
+        self.spill_dir = spill_dir
+        self.emitter = emitter
+        self.lock = threading.Lock()
+
+    def capture(self, stream: str, script_id: str | None = None) -> _OutputCapture:
+        spill_path = None
+
+        if self.spill_dir is not None:
+            spill_dir = self.spill_dir / script_id if script_id is not None else self.spill_dir
+            spill_path = spill_dir / f"{stream}.log"
+
+        streamer = _LineStreamer(self.emitter, self.lock, stream, script_id) if self.emitter is not None else None
+        return _OutputCapture(self.limit, spill_path, streamer)
+
+
+def execute_script(
+    script: str,
+    timeout: int,
+    project_dir: ProjectRootPath,
+    output: ScriptOutput | None = None,
+    script_id: str | None = None,
+) -> tuple[str, str, int]:
     temp_path = None
+    output = output or ScriptOutput()
+    stdout = output.capture("stdout", script_id)
+    stderr = output.capture("stderr", script_id)
 
     try:
         with tempfile.NamedTemporaryFile("w", prefix="donna-script-", delete=False) as temp:
@@ -232,24 +478,12 @@ def _run_script(script: str, timeout: int, project_dir: ProjectRootPath) -> tupl
 
         os.chmod(temp_path, 0o700)
 
-        try:
-            result = subprocess.run(  # noqa: S603
-                [temp_path],
-                capture_output=True,
-                text=True,
-                cwd=project_dir,
-                env=os.environ.copy(),
-                stdin=subprocess.DEVNULL,
-                timeout=timeout,
-                check=False,
-            )
-        except subprocess.TimeoutExpired as exc:
-            stdout = _coerce_output(exc.stdout)
-            stderr = _coerce_output(exc.stderr)
-            return stdout, stderr, 124
-
-        return _coerce_output(result.stdout), _coerce_output(result.stderr), result.returncode
+        exit_code = _run_captured([temp_path], timeout, project_dir, stdout, stderr)
+        return stdout.text(), stderr.text(), exit_code
     finally:
+        stdout.close()
+        stderr.close()
+
         if temp_path is not None:
             try:
                 os.remove(temp_path)
@@ -257,11 +491,69 @@ def _run_script(script: str, timeout: int, project_dir: ProjectRootPath) -> tupl
                 pass
 
 
+def _run_captured(
+    command: list[str], timeout: int, project_dir: ProjectRootPath, stdout: _OutputCapture, stderr: _OutputCapture
+) -> int:
+    # The script runs in its own process group, so processes it starts are killed with it on timeout.
+    process = subprocess.Popen(  # noqa: S603
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=project_dir,
+        env=os.environ.copy(),
+        stdin=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    assert process.stdout is not None
+    assert process.stderr is not None
+
+    readers = [
+        threading.Thread(target=stdout.read_from, args=(process.stdout,), daemon=True),
+        threading.Thread(target=stderr.read_from, args=(process.stderr,), daemon=True),
+    ]
+
+    for reader in readers:
+        reader.start()
+
+    deadline = time.monotonic() + timeout
+
+    try:
+        exit_code = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        exit_code = None
+
+    # Background processes of the script keep the pipes open after the script exits, they share its time limit.
+    if exit_code is not None and _join_readers(readers, deadline):
+        return exit_code
+
+    _kill_process_group(process)
+    _join_readers(readers, time.monotonic() + _KILL_GRACE_SECONDS)
+
+    return 124
+
+
+def _join_readers(readers: list[threading.Thread], deadline: float) -> bool:
+    for reader in readers:
+        reader.join(timeout=max(deadline - time.monotonic(), 0))
+
+    return not any(reader.is_alive() for reader in readers)
+
+
+def _kill_process_group(process: subprocess.Popen[bytes]) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+    process.wait()
+
+
 def _coerce_output(value: str | bytes | None) -> str:
     if value is None:
         return ""
 
     if isinstance(value, bytes):
-        return value.decode("utf-8", errors="replace")
+        # Output is read as bytes, newlines are translated as in the text mode of `subprocess`.
+        return value.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
 
     return value
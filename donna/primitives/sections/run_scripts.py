@@ -0,0 +1,319 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, ClassVar, cast
+
+import pydantic
+
+from donna.context.context import context
+from donna.core.errors import ErrorsList
+from donna.core.result import Err, Ok, Result, unwrap_to_error
+from donna.domain.artifact_ids import ArtifactId, artifact_section_id, split_artifact_section_id
+from donna.domain.ids import SectionId
+from donna.domain.paths import ProjectRootPath
+from donna.machine.artifacts import Artifact, ArtifactSectionConfig, ArtifactSectionMeta
+from donna.machine.errors import ArtifactValidationError
+from donna.machine.operations import OperationConfig, OperationKind, OperationMeta
+from donna.primitives.sections.run_script import ScriptOutput, ScriptOutputConfig, execute_script
+from donna.workspaces import config as workspace_config
+from donna.workspaces import markdown
+from donna.workspaces.markdown_parser import MarkdownSectionMixin
+
+if TYPE_CHECKING:
+    from donna.machine.changes import Change
+    from donna.machine.tasks import Task, WorkUnit
+
+SCRIPT_ID_PLACEHOLDER = "{id}"
+
+ScriptResult = tuple[str, str, int]
+
+
+class RunScriptsMissingScriptBlocks(ArtifactValidationError):
+    code: str = "donna.workflows.run_scripts_missing_script_blocks"
+    message: str = "Run scripts operation `{error.section_id}` must include at least one `donna script` code block."
+    ways_to_fix: list[str] = [
+        "Add fenced code blocks starting with ` ``` donna script id=<script_id> ` to the operation body.",
+    ]
+
+
+class RunScriptsScriptWithoutId(ArtifactValidationError):
+    code: str = "donna.workflows.run_scripts_script_without_id"
+    message: str = "Run scripts operation `{error.section_id}` has a `donna script` block without an id."
+    ways_to_fix: list[str] = [
+        "Add an `id=<script_id>` property to the info string of every script block.",
+    ]
+
+
+class RunScriptsDuplicateScriptId(ArtifactValidationError):
+    code: str = "donna.workflows.run_scripts_duplicate_script_id"
+    message: str = "Run scripts operation `{error.section_id}` has several scripts with id `{error.script_id}`."
+    ways_to_fix: list[str] = [
+        "Give every script block of the operation a unique id.",
+    ]
+    script_id: str
+
+
+class RunScriptsMissingGotoOnSuccess(ArtifactValidationError):
+    code: str = "donna.workflows.run_scripts_missing_goto_on_success"
+    message: str = "Run scripts operation `{error.section_id}` must define `goto_on_success`."
+    ways_to_fix: list[str] = [
+        'Add `goto_on_success = "<next_operation_id>"` to the operation config block.',
+    ]
+
+
+class RunScriptsMissingGotoOnFailure(ArtifactValidationError):
+    code: str = "donna.workflows.run_scripts_missing_goto_on_failure"
+    message: str = "Run scripts operation `{error.section_id}` must define `goto_on_failure`."
+    ways_to_fix: list[str] = [
+        'Add `goto_on_failure = "<next_operation_id>"` to the operation config block.',
+    ]
+
+
+class RunScriptsUnknownScriptId(ArtifactValidationError):
+    code: str = "donna.workflows.run_scripts_unknown_script_id"
+    message: str = "Run scripts operation `{error.section_id}` routes failures of unknown script `{error.script_id}`."
+    ways_to_fix: list[str] = [
+        "Use ids of the operation script blocks as keys of `goto_on_script_failure`.",
+    ]
+    script_id: str
+
+
+class RunScriptsSaveKeyWithoutId(ArtifactValidationError):
+    code: str = "donna.workflows.run_scripts_save_key_without_id"
+    message: str = "Run scripts operation `{error.section_id}` must use `{{id}}` in `{error.field}`."
+    ways_to_fix: list[str] = [
+        'Include the script id placeholder in the key, e.g. `save_stdout_to = "{id}_stdout"`.',
+    ]
+    field: str
+
+
+class RunScriptsConfig(ScriptOutputConfig, OperationConfig):
+    save_stdout_to: str | None = None
+    save_stderr_to: str | None = None
+    goto_on_success: SectionId | None = None
+    goto_on_failure: SectionId | None = None
+    goto_on_script_failure: dict[str, SectionId] = pydantic.Field(default_factory=dict)
+    timeout: int = 60
+    max_workers: int | None = pydantic.Field(default=None, ge=1)
+
+
+class RunScriptsMeta(ScriptOutputConfig, OperationMeta):
+    scripts: dict[str, str] = pydantic.Field(default_factory=dict)
+    save_stdout_to: str | None = None
+    save_stderr_to: str | None = None
+    goto_on_success: SectionId | None = None
+    goto_on_failure: SectionId | None = None
+    goto_on_script_failure: dict[str, SectionId] = pydantic.Field(default_factory=dict)
+    timeout: int = 60
+    max_workers: int | None = None
+
+    def select_next_operation(self, exit_codes: dict[str, int]) -> SectionId:
+        """Route by the first failed script, in the order scripts are declared, that has its own transition."""
+        failed = [script_id for script_id, exit_code in exit_codes.items() if exit_code != 0]
+
+        if not failed:
+            next_operation = self.goto_on_success
+        else:
+            next_operation = next(
+                (
+                    self.goto_on_script_failure[script_id]
+                    for script_id in failed
+                    if script_id in self.goto_on_script_failure
+                ),
+                self.goto_on_failure,
+            )
+
+        assert next_operation is not None
+        return next_operation
+
+
+class RunScripts(MarkdownSectionMixin, OperationKind):
+    config_class: ClassVar[type[RunScriptsConfig]] = RunScriptsConfig
+
+    @unwrap_to_error
+    def markdown_construct_meta(
+        self,
+        artifact_id: "ArtifactId",
+        source: markdown.SectionSource,
+        section_config: ArtifactSectionConfig,
+        description: str,
+        primary: bool = False,
+    ) -> Result[ArtifactSectionMeta, ErrorsList]:
+        run_config = cast(RunScriptsConfig, section_config)
+        scripts = _collect_scripts(artifact_id, run_config.id, source).unwrap()
+
+        allowed_transitions: set[SectionId] = set(run_config.goto_on_script_failure.values())
+
+        if run_config.goto_on_success is not None:
+            allowed_transitions.add(run_config.goto_on_success)
+
+        if run_config.goto_on_failure is not None:
+            allowed_transitions.add(run_config.goto_on_failure)
+
+        return Ok(
+            RunScriptsMeta(
+                fsm_mode=run_config.fsm_mode,
+                allowed_transitions=allowed_transitions,
+                scripts=scripts,
+                save_stdout_to=run_config.save_stdout_to,
+                save_stderr_to=run_config.save_stderr_to,
+                goto_on_success=run_config.goto_on_success,
+                goto_on_failure=run_config.goto_on_failure,
+                goto_on_script_failure=dict(run_config.goto_on_script_failure),
+                timeout=run_config.timeout,
+                output_limit=run_config.output_limit,
+                spill_output=run_config.spill_output,
+                stream_output=run_config.stream_output,
+                max_workers=run_config.max_workers,
+            )
+        )
+
+    @unwrap_to_error
+    def execute_section(
+        self, task: "Task", unit: "WorkUnit", artifact: Artifact, section_id: SectionId
+    ) -> Result[list["Change"], ErrorsList]:
+        from donna.machine.changes import ChangeAddWorkUnit
+
+        operation = artifact.get_section(section_id).unwrap()
+        meta = cast(RunScriptsMeta, operation.meta)
+
+        context().journal.add(
+            actor_id="donna",
+            message=f"Run scripts `{operation.title}`: {', '.join(meta.scripts)}",
+        ).unwrap()
+
+        results = execute_scripts(
+            scripts=meta.scripts,
+            timeout=meta.timeout,
+            project_dir=workspace_config.project_dir(),
+            output=meta.script_output(unit),
+            max_workers=meta.max_workers,
+        )
+
+        changes: list["Change"] = []
+
+        for script_id, result in results.items():
+            changes.extend(_record_result(task, meta, operation.title, script_id, result))
+
+        next_operation = meta.select_next_operation(
+            {script_id: exit_code for script_id, (_, _, exit_code) in results.items()}
+        )
+        operation_parts = split_artifact_section_id(unit.operation_id)
+        assert operation_parts is not None
+        full_operation_id = artifact_section_id(operation_parts.artifact_id, next_operation)
+
+        changes.append(ChangeAddWorkUnit(task_id=task.id, operation_id=full_operation_id))
+        return Ok(changes)
+
+    def validate_section(self, artifact: Artifact, section_id: SectionId) -> Result[None, ErrorsList]:  # noqa: CCR001
+        section = artifact.get_section(section_id).unwrap()
+
+        meta = cast(RunScriptsMeta, section.meta)
+
+        errors: ErrorsList = []
+
+        if meta.goto_on_success is None:
+            errors.append(RunScriptsMissingGotoOnSuccess(artifact_id=artifact.id, section_id=section_id))
+
+        if meta.goto_on_failure is None:
+            errors.append(RunScriptsMissingGotoOnFailure(artifact_id=artifact.id, section_id=section_id))
+
+        for script_id in meta.goto_on_script_failure:
+            if script_id not in meta.scripts:
+                errors.append(
+                    RunScriptsUnknownScriptId(artifact_id=artifact.id, section_id=section_id, script_id=script_id)
+                )
+
+        for field, key in (("save_stdout_to", meta.save_stdout_to), ("save_stderr_to", meta.save_stderr_to)):
+            if key is not None and SCRIPT_ID_PLACEHOLDER not in key:
+                errors.append(RunScriptsSaveKeyWithoutId(artifact_id=artifact.id, section_id=section_id, field=field))
+
+        if errors:
+            return Err(errors)
+
+        return Ok(None)
+
+
+def _collect_scripts(  # noqa: CCR001
+    artifact_id: ArtifactId, section_id: SectionId, source: markdown.SectionSource
+) -> Result[dict[str, str], ErrorsList]:
+    blocks = source.scripts()
+
+    if not blocks:
+        return Err([RunScriptsMissingScriptBlocks(artifact_id=artifact_id, section_id=section_id)])
+
+    scripts: dict[str, str] = {}
+    errors: ErrorsList = []
+
+    for block in blocks:
+        script_id = block.properties.get("id")
+
+        if not isinstance(script_id, str) or not script_id:
+            errors.append(RunScriptsScriptWithoutId(artifact_id=artifact_id, section_id=section_id))
+        elif script_id in scripts:
+            errors.append(
+                RunScriptsDuplicateScriptId(artifact_id=artifact_id, section_id=section_id, script_id=script_id)
+            )
+        else:
+            scripts[script_id] = block.content
+
+    if errors:
+        return Err(errors)
+
+    return Ok(scripts)
+
+
+def _record_result(
+    task: "Task", meta: RunScriptsMeta, title: str, script_id: str, result: ScriptResult
+) -> list["Change"]:
+    from donna.machine.changes import ChangeSetTaskContext
+
+    stdout, stderr, exit_code = result
+
+    context().journal.add(
+        actor_id="donna",
+        message=(
+            f"Script `{script_id}` of `{title}` finished, exit code: {exit_code}, "
+            f"has stdout: {bool(stdout)}, has stderr: {bool(stderr)}"
+        ),
+    ).unwrap()
+
+    changes: list["Change"] = []
+
+    if meta.save_stdout_to is not None:
+        key = meta.save_stdout_to.replace(SCRIPT_ID_PLACEHOLDER, script_id)
+        changes.append(ChangeSetTaskContext(task_id=task.id, key=key, value=stdout))
+
+    if meta.save_stderr_to is not None:
+        key = meta.save_stderr_to.replace(SCRIPT_ID_PLACEHOLDER, script_id)
+        changes.append(ChangeSetTaskContext(task_id=task.id, key=key, value=stderr))
+
+    return changes
+
+
+def execute_scripts(
+    scripts: dict[str, str],
+    timeout: int,
+    project_dir: ProjectRootPath,
+    output: ScriptOutput | None = None,
+    max_workers: int | None = None,
+) -> dict[str, ScriptResult]:
+    """Run scripts concurrently, each in its own process, and return their results in the declaration order.
+
+    Spilled output of every script goes to its own subdirectory named by the script id.
+    """
+    output = output or ScriptOutput()
+
+    # Workers only wait for the script processes, so threads are enough to run them in parallel.
+    with ThreadPoolExecutor(max_workers=max_workers or len(scripts)) as executor:
+        futures = {
+            script_id: executor.submit(
+                execute_script,
+                script=script,
+                timeout=timeout,
+                project_dir=project_dir,
+                output=output,
+                script_id=script_id,
+            )
+            for script_id, script in scripts.items()
+        }
+
+        return {script_id: future.result() for script_id, future in futures.items()}
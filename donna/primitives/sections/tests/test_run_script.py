@@ -1,7 +1,11 @@
+import threading
+import time
 from pathlib import Path
 
 from pytest_mock import MockerFixture
 
+from donna.context.tests.helpers import FakeOutputEmitter
+from donna.domain.paths import ProjectRootPath
 from donna.machine.changes import ChangeAddWorkUnit, ChangeSetTaskContext
 from donna.machine.tests import make as machine_make
 from donna.primitives.sections import run_script
@@ -14,7 +18,12 @@ from donna.primitives.sections.run_script import (
     RunScriptMissingGotoOnFailure,
     RunScriptMissingGotoOnSuccess,
     RunScriptMissingScriptBlock,
+    ScriptOutput,
+    ScriptOutputConfig,
     _coerce_output,
+    _LineStreamer,
+    _OutputCapture,
+    execute_script,
 )
 from donna.primitives.tests import make
 from donna.workspaces.tests import make as workspace_make
@@ -130,7 +139,7 @@ class TestRunScript:
         runtime_context = make.FakeRuntimeContext()
         mocker.patch("donna.primitives.sections.run_script.context", return_value=runtime_context)
         mocker.patch.object(run_script.workspace_config, "project_dir", return_value=Path("/project"))
-        run = mocker.patch.object(run_script, "_run_script", return_value=("stdout", "stderr", 2))
+        run = mocker.patch.object(run_script, "execute_script", return_value=("stdout", "stderr", 2))
         artifact = machine_make.artifact(
             [
                 machine_make.artifact_section(
@@ -162,7 +171,12 @@ class TestRunScript:
         )
 
         assert result.is_ok()
-        run.assert_called_once_with(script="echo ok", timeout=60, project_dir=Path("/project"))
+        run.assert_called_once()
+        assert run.call_args.kwargs["script"] == "echo ok"
+        assert run.call_args.kwargs["timeout"] == 60
+        assert run.call_args.kwargs["project_dir"] == Path("/project")
+        output = run.call_args.kwargs["output"]
+        assert (output.limit, output.spill_dir, output.emitter) == (None, None, None)
         assert [message for _, message in runtime_context.journal.messages] == [
             "Run script `Run checks`",
             "Script finished `Run checks`, exit code: 2, has stdout: True, has stderr: True`",
@@ -177,6 +191,221 @@ class TestRunScript:
         assert isinstance(changes[2], ChangeAddWorkUnit)
         assert changes[2].operation_id == machine_make.ARTIFACT_ID + ":other"
 
+    def test_execute_section__spills_output_to_work_unit_dir(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        mocker.patch("donna.primitives.sections.run_script.context", return_value=make.FakeRuntimeContext())
+        mocker.patch.object(run_script.workspace_config, "project_dir", return_value=Path("/project"))
+        mocker.patch.object(run_script.sessions, "outputs_dir", return_value=tmp_path)
+        run = mocker.patch.object(run_script, "execute_script", return_value=("", "", 0))
+        artifact = machine_make.artifact(
+            [
+                machine_make.artifact_section(
+                    id=make.section_id("start"),
+                    kind=make.primitive_kind("donna.primitives.sections.run_script.RunScript"),
+                    meta=RunScriptMeta(
+                        allowed_transitions={make.section_id("next")},
+                        script="echo ok",
+                        goto_on_success=make.section_id("next"),
+                        goto_on_failure=make.section_id("next"),
+                        output_limit=10,
+                        spill_output=True,
+                    ),
+                )
+            ]
+        )
+        unit = machine_make.work_unit(operation_id=make.operation_id("start"))
+
+        assert RunScript().execute_section(machine_make.task(), unit, artifact, make.section_id("start")).is_ok()
+
+        assert run.call_args.kwargs["output"].limit == 10
+        assert run.call_args.kwargs["output"].spill_dir == tmp_path / unit.id
+
+    def test_execute_section__streams_output_through_context_emitter(self, mocker: MockerFixture) -> None:
+        runtime_context = make.FakeRuntimeContext()
+        mocker.patch("donna.primitives.sections.run_script.context", return_value=runtime_context)
+        mocker.patch.object(run_script.workspace_config, "project_dir", return_value=Path("/project"))
+        run = mocker.patch.object(run_script, "execute_script", return_value=("", "", 0))
+        artifact = machine_make.artifact(
+            [
+                machine_make.artifact_section(
+                    id=make.section_id("start"),
+                    kind=make.primitive_kind("donna.primitives.sections.run_script.RunScript"),
+                    meta=RunScriptMeta(
+                        allowed_transitions={make.section_id("next")},
+                        script="echo ok",
+                        goto_on_success=make.section_id("next"),
+                        goto_on_failure=make.section_id("next"),
+                        stream_output=True,
+                    ),
+                )
+            ]
+        )
+        unit = machine_make.work_unit(operation_id=make.operation_id("start"))
+
+        assert RunScript().execute_section(machine_make.task(), unit, artifact, make.section_id("start")).is_ok()
+
+        assert run.call_args.kwargs["output"].emitter is runtime_context.output
+
+
+class TestLineStreamer:
+    def test_write__emits_complete_lines_and_keeps_partial_line(self) -> None:
+        emitter = FakeOutputEmitter()
+        streamer = _LineStreamer(emitter, threading.Lock(), "stdout")
+
+        streamer.write(b"first\nsec")
+        streamer.write(b"ond\nthi")
+        streamer.flush()
+
+        assert [cell.content for cell in emitter.cells] == ["first", "second", "thi"]
+        assert {cell.kind for cell in emitter.cells} == {"script_output"}
+        assert {cell.meta["stream"] for cell in emitter.cells} == {"stdout"}
+
+    def test_write__emits_long_line_in_parts(self) -> None:
+        emitter = FakeOutputEmitter()
+        streamer = _LineStreamer(emitter, threading.Lock(), "stderr")
+
+        streamer.write(b"x" * run_script._READ_CHUNK_SIZE)
+
+        assert [len(cell.content or "") for cell in emitter.cells] == [run_script._READ_CHUNK_SIZE]
+
+
+class TestOutputCapture:
+    def test_text__returns_whole_output_within_limit(self) -> None:
+        capture = _OutputCapture(limit=10)
+        capture.write(b"hello")
+        capture.write(b"world")
+
+        assert capture.text() == "helloworld"
+
+    def test_text__keeps_head_and_tail_of_long_output(self) -> None:
+        capture = _OutputCapture(limit=6)
+
+        for chunk in (b"abcd", b"efgh", b"ijkl"):
+            capture.write(chunk)
+
+        assert capture.text() == "abc\n[... 6 bytes skipped ...]\njkl"
+
+    def test_text__keeps_whole_output_without_limit(self) -> None:
+        capture = _OutputCapture(limit=None)
+        capture.write(b"x" * 100000)
+
+        assert capture.text() == "x" * 100000
+
+    def test_text__does_not_split_utf8_characters(self) -> None:
+        capture = _OutputCapture(limit=6)
+        capture.write("ab\u20acxy\u20acz".encode("utf-8"))
+
+        assert capture.text() == "ab\n[... 8 bytes skipped ...]\nz"
+
+    def test_text__references_spilled_output(self, tmp_path: Path) -> None:
+        spill_path = tmp_path / "unit" / "stdout.log"
+        capture = _OutputCapture(limit=2, spill_path=spill_path)
+        capture.write(b"abcdef")
+        capture.close()
+
+        assert capture.text() == f"a\n[... 4 bytes skipped, full output: {spill_path} ...]\nf"
+        assert spill_path.read_bytes() == b"abcdef"
+
+
+class TestScriptOutputConfig:
+    def test_script_output__builds_output_of_enabled_options(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        runtime_context = make.FakeRuntimeContext()
+        mocker.patch("donna.primitives.sections.run_script.context", return_value=runtime_context)
+        mocker.patch.object(run_script.sessions, "outputs_dir", return_value=tmp_path)
+        unit = machine_make.work_unit(operation_id=make.operation_id("start"))
+
+        output = ScriptOutputConfig(output_limit=10, spill_output=True, stream_output=True).script_output(unit)
+        default = ScriptOutputConfig().script_output(unit)
+
+        assert (output.limit, output.spill_dir, output.emitter) == (10, tmp_path / unit.id, runtime_context.output)
+        assert (default.limit, default.spill_dir, default.emitter) == (None, None, None)
+
+
+class TestScriptOutput:
+    def test_capture__spills_script_output_to_its_own_dir(self, tmp_path: Path) -> None:
+        capture = ScriptOutput(spill_dir=tmp_path).capture("stdout", "lint")
+        capture.write(b"data")
+        capture.close()
+
+        assert (tmp_path / "lint" / "stdout.log").read_bytes() == b"data"
+
+    def test_capture__tags_streamed_cells_with_script_id(self) -> None:
+        emitter = FakeOutputEmitter()
+        capture = ScriptOutput(emitter=emitter).capture("stderr", "lint")
+
+        capture.write(b"line\n")
+
+        assert [(cell.meta["stream"], cell.meta["script_id"]) for cell in emitter.cells] == [("stderr", "lint")]
+
+
+class TestExecuteScript:
+    def test_execute_script__captures_outputs_and_exit_code(self, tmp_path: Path) -> None:
+        script = "#!/bin/sh\necho out\necho err >&2\nexit 3\n"
+
+        result = execute_script(script=script, timeout=10, project_dir=ProjectRootPath(tmp_path))
+
+        assert result == ("out\n", "err\n", 3)
+
+    def test_execute_script__translates_newlines(self, tmp_path: Path) -> None:
+        script = "#!/bin/sh\nprintf 'one\\r\\ntwo\\rthree\\n'\n"
+
+        result = execute_script(script=script, timeout=10, project_dir=ProjectRootPath(tmp_path))
+
+        assert result == ("one\ntwo\nthree\n", "", 0)
+
+    def test_execute_script__streams_lines_while_capturing(self, tmp_path: Path) -> None:
+        emitter = FakeOutputEmitter()
+        script = "#!/bin/sh\necho one\necho two >&2\n"
+
+        result = execute_script(
+            script=script, timeout=10, project_dir=ProjectRootPath(tmp_path), output=ScriptOutput(emitter=emitter)
+        )
+
+        assert result == ("one\n", "two\n", 0)
+        assert sorted((cell.meta["stream"], cell.content) for cell in emitter.cells) == [
+            ("stderr", "two"),
+            ("stdout", "one"),
+        ]
+
+    def test_execute_script__caps_captured_output(self, tmp_path: Path) -> None:
+        script = "#!/bin/sh\nhead -c 100000 /dev/zero | tr '\\0' x\n"
+
+        stdout, _, exit_code = execute_script(
+            script=script,
+            timeout=10,
+            project_dir=ProjectRootPath(tmp_path),
+            output=ScriptOutput(limit=8, spill_dir=tmp_path / "outputs"),
+        )
+
+        assert exit_code == 0
+        assert stdout.startswith("xxxx\n[... 99992 bytes skipped, full output: ")
+        assert stdout.endswith(" ...]\nxxxx")
+        assert (tmp_path / "outputs" / "stdout.log").read_bytes() == b"x" * 100000
+
+    def test_execute_script__reports_timeout(self, tmp_path: Path) -> None:
+        script = "#!/bin/sh\necho started\nexec sleep 10\n"
+
+        result = execute_script(script=script, timeout=1, project_dir=ProjectRootPath(tmp_path))
+
+        assert result == ("started\n", "", 124)
+
+    def test_execute_script__kills_background_processes_on_timeout(self, tmp_path: Path) -> None:
+        script = "#!/bin/sh\nsleep 8 &\nsleep 20\n"
+        started = time.monotonic()
+
+        result = execute_script(script=script, timeout=1, project_dir=ProjectRootPath(tmp_path))
+
+        assert result == ("", "", 124)
+        assert time.monotonic() - started < 5
+
+    def test_execute_script__limits_waiting_for_background_output(self, tmp_path: Path) -> None:
+        script = "#!/bin/sh\necho done\nsleep 8 &\n"
+        started = time.monotonic()
+
+        result = execute_script(script=script, timeout=1, project_dir=ProjectRootPath(tmp_path))
+
+        assert result == ("done\n", "", 124)
+        assert time.monotonic() - started < 5
+
 
 class TestCoerceOutput:
     def test_returns_empty_string_for_missing_output(self) -> None:
@@ -185,5 +414,8 @@ class TestCoerceOutput:
     def test_decodes_bytes_as_utf8_with_replacement(self) -> None:
         assert _coerce_output(b"ok \xff") == "ok \ufffd"
 
+    def test_translates_newlines(self) -> None:
+        assert _coerce_output(b"one\r\ntwo\rthree\n") == "one\ntwo\nthree\n"
+
     def test_returns_string_output_unchanged(self) -> None:
         assert _coerce_output("ok") == "ok"
@@ -0,0 +1,232 @@
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from donna.context.tests.helpers import FakeOutputEmitter
+from donna.core.errors import ErrorsList
+from donna.core.result import Result
+from donna.domain.paths import ProjectRootPath
+from donna.machine.artifacts import ArtifactSectionMeta
+from donna.machine.changes import ChangeAddWorkUnit, ChangeSetTaskContext
+from donna.machine.tests import make as machine_make
+from donna.primitives.sections import run_scripts
+from donna.primitives.sections.run_script import ScriptOutput
+from donna.primitives.sections.run_scripts import (
+    RunScripts,
+    RunScriptsConfig,
+    RunScriptsDuplicateScriptId,
+    RunScriptsMeta,
+    RunScriptsMissingGotoOnFailure,
+    RunScriptsMissingGotoOnSuccess,
+    RunScriptsMissingScriptBlocks,
+    RunScriptsSaveKeyWithoutId,
+    RunScriptsScriptWithoutId,
+    RunScriptsUnknownScriptId,
+    execute_scripts,
+)
+from donna.primitives.tests import make
+from donna.workspaces.markdown import CodeSource
+from donna.workspaces.tests import make as workspace_make
+
+KIND = "donna.primitives.sections.run_scripts.RunScripts"
+
+
+def _meta(**fields: object) -> RunScriptsMeta:
+    values: dict[str, object] = {
+        "allowed_transitions": {make.section_id("next"), make.section_id("done"), make.section_id("fix_lint")},
+        "scripts": {"lint": "echo lint", "tests": "echo tests"},
+        "goto_on_success": make.section_id("next"),
+        "goto_on_failure": make.section_id("done"),
+    }
+    values.update(fields)
+    return RunScriptsMeta.model_validate(values)
+
+
+def _construct_meta(*configs: CodeSource) -> Result[ArtifactSectionMeta, ErrorsList]:
+    return RunScripts().markdown_construct_meta(
+        artifact_id=machine_make.ARTIFACT_ID,
+        source=workspace_make.section_source(configs=list(configs)),
+        section_config=RunScriptsConfig(
+            id=make.section_id("checks"),
+            kind=make.primitive_kind(KIND),
+            goto_on_success=make.section_id("next"),
+            goto_on_failure=make.section_id("done"),
+            goto_on_script_failure={"lint": make.section_id("fix_lint")},
+            save_stdout_to="{id}_stdout",
+            timeout=5,
+            max_workers=2,
+            output_limit=100,
+            spill_output=True,
+            stream_output=True,
+        ),
+        description="checks",
+    )
+
+
+class TestRunScriptsMeta:
+    def test_select_next_operation__uses_success_transition_when_all_scripts_succeed(self) -> None:
+        assert _meta().select_next_operation({"lint": 0, "tests": 0}) == make.section_id("next")
+
+    def test_select_next_operation__uses_transition_of_first_failed_script(self) -> None:
+        meta = _meta(goto_on_script_failure={"lint": make.section_id("fix_lint")})
+
+        assert meta.select_next_operation({"lint": 1, "tests": 2}) == make.section_id("fix_lint")
+
+    def test_select_next_operation__falls_back_to_failure_transition(self) -> None:
+        meta = _meta(goto_on_script_failure={"lint": make.section_id("fix_lint")})
+
+        assert meta.select_next_operation({"lint": 0, "tests": 2}) == make.section_id("done")
+
+
+class TestRunScripts:
+    def test_markdown_construct_meta__collects_scripts_and_allowed_transitions(self) -> None:
+        result = _construct_meta(
+            workspace_make.code_source("bash", "echo lint", donna=True, script=True, id="lint"),
+            workspace_make.code_source("bash", "echo tests", donna=True, script=True, id="tests"),
+        )
+
+        meta = result.unwrap()
+        assert isinstance(meta, RunScriptsMeta)
+        assert meta.scripts == {"lint": "echo lint", "tests": "echo tests"}
+        assert list(meta.scripts) == ["lint", "tests"]
+        assert meta.save_stdout_to == "{id}_stdout"
+        assert meta.timeout == 5
+        assert meta.max_workers == 2
+        assert (meta.output_limit, meta.spill_output, meta.stream_output) == (100, True, True)
+        assert meta.allowed_transitions == {
+            make.section_id("next"),
+            make.section_id("done"),
+            make.section_id("fix_lint"),
+        }
+
+    def test_markdown_construct_meta__requires_script_blocks(self) -> None:
+        result = _construct_meta()
+
+        assert [type(error) for error in result.unwrap_err()] == [RunScriptsMissingScriptBlocks]
+
+    def test_markdown_construct_meta__requires_unique_script_ids(self) -> None:
+        result = _construct_meta(
+            workspace_make.code_source("bash", "echo lint", donna=True, script=True, id="lint"),
+            workspace_make.code_source("bash", "echo again", donna=True, script=True, id="lint"),
+            workspace_make.code_source("bash", "echo anonymous", donna=True, script=True),
+        )
+
+        assert [type(error) for error in result.unwrap_err()] == [
+            RunScriptsDuplicateScriptId,
+            RunScriptsScriptWithoutId,
+        ]
+
+    def test_validate_section__collects_config_errors(self) -> None:
+        artifact = machine_make.artifact(
+            [
+                machine_make.artifact_section(
+                    id=make.section_id("checks"),
+                    kind=make.primitive_kind(KIND),
+                    meta=_meta(
+                        goto_on_success=None,
+                        goto_on_failure=None,
+                        goto_on_script_failure={"unknown": make.section_id("next")},
+                        save_stderr_to="stderr",
+                    ),
+                )
+            ]
+        )
+
+        result = RunScripts().validate_section(artifact, make.section_id("checks"))
+
+        assert [type(error) for error in result.unwrap_err()] == [
+            RunScriptsMissingGotoOnSuccess,
+            RunScriptsMissingGotoOnFailure,
+            RunScriptsUnknownScriptId,
+            RunScriptsSaveKeyWithoutId,
+        ]
+
+    def test_execute_section__saves_results_and_routes_on_exit_codes(self, mocker: MockerFixture) -> None:
+        runtime_context = make.FakeRuntimeContext()
+        mocker.patch("donna.primitives.sections.run_scripts.context", return_value=runtime_context)
+        mocker.patch.object(run_scripts.workspace_config, "project_dir", return_value=Path("/project"))
+        run = mocker.patch.object(
+            run_scripts,
+            "execute_scripts",
+            return_value={"lint": ("lint out", "", 1), "tests": ("tests out", "tests err", 0)},
+        )
+        artifact = machine_make.artifact(
+            [
+                machine_make.artifact_section(
+                    id=make.section_id("checks"),
+                    kind=make.primitive_kind(KIND),
+                    title="Checks",
+                    meta=_meta(
+                        save_stdout_to="{id}_stdout",
+                        save_stderr_to="{id}_stderr",
+                        goto_on_script_failure={"lint": make.section_id("fix_lint")},
+                    ),
+                )
+            ]
+        )
+
+        result = RunScripts().execute_section(
+            machine_make.task(),
+            machine_make.work_unit(operation_id=make.operation_id("checks")),
+            artifact,
+            make.section_id("checks"),
+        )
+
+        run.assert_called_once()
+        assert run.call_args.kwargs["scripts"] == {"lint": "echo lint", "tests": "echo tests"}
+        assert run.call_args.kwargs["timeout"] == 60
+        assert run.call_args.kwargs["project_dir"] == Path("/project")
+        assert run.call_args.kwargs["max_workers"] is None
+        output = run.call_args.kwargs["output"]
+        assert (output.limit, output.spill_dir, output.emitter) == (None, None, None)
+        assert [message for _, message in runtime_context.journal.messages] == [
+            "Run scripts `Checks`: lint, tests",
+            "Script `lint` of `Checks` finished, exit code: 1, has stdout: True, has stderr: False",
+            "Script `tests` of `Checks` finished, exit code: 0, has stdout: True, has stderr: True",
+        ]
+        changes = result.unwrap()
+        assert [(change.key, change.value) for change in changes if isinstance(change, ChangeSetTaskContext)] == [
+            ("lint_stdout", "lint out"),
+            ("lint_stderr", ""),
+            ("tests_stdout", "tests out"),
+            ("tests_stderr", "tests err"),
+        ]
+        assert isinstance(changes[-1], ChangeAddWorkUnit)
+        assert changes[-1].operation_id == machine_make.ARTIFACT_ID + ":fix_lint"
+
+
+class TestExecuteScripts:
+    def test_execute_scripts__returns_results_in_declaration_order(self, tmp_path: Path) -> None:
+        scripts = {
+            "slow": "#!/bin/sh\nsleep 0.2\necho slow\n",
+            "failing": "#!/bin/sh\necho failed >&2\nexit 4\n",
+        }
+
+        results = execute_scripts(scripts=scripts, timeout=10, project_dir=ProjectRootPath(tmp_path))
+
+        assert list(results.items()) == [("slow", ("slow\n", "", 0)), ("failing", ("", "failed\n", 4))]
+
+    def test_execute_scripts__spills_and_streams_output_of_every_script(self, tmp_path: Path) -> None:
+        emitter = FakeOutputEmitter()
+        scripts = {"first": "#!/bin/sh\necho one\n", "second": "#!/bin/sh\necho two\n"}
+        output = ScriptOutput(spill_dir=tmp_path / "outputs", emitter=emitter)
+
+        execute_scripts(scripts=scripts, timeout=10, project_dir=ProjectRootPath(tmp_path), output=output)
+
+        assert (tmp_path / "outputs" / "first" / "stdout.log").read_bytes() == b"one\n"
+        assert (tmp_path / "outputs" / "second" / "stdout.log").read_bytes() == b"two\n"
+        assert sorted((cell.meta["script_id"], cell.content) for cell in emitter.cells) == [
+            ("first", "one"),
+            ("second", "two"),
+        ]
+
+    def test_execute_scripts__runs_scripts_concurrently(self, tmp_path: Path) -> None:
+        # Each script waits for the marker of the other one, so they finish only when run at the same time.
+        scripts = {
+            "first": "#!/bin/sh\ntouch first\nwhile [ ! -e second ]; do sleep 0.05; done\n",
+            "second": "#!/bin/sh\ntouch second\nwhile [ ! -e first ]; do sleep 0.05; done\n",
+        }
+
+        results = execute_scripts(scripts=scripts, timeout=5, project_dir=ProjectRootPath(tmp_path))
+
+        assert [exit_code for _, _, exit_code in results.values()] == [0, 0]
@@ -1,9 +1,13 @@
-from donna.protocol import cell_shortcuts as cell_shortcuts
-from donna.protocol import cells as cells
-from donna.protocol import errors as errors
-from donna.protocol import formatters as formatters
-from donna.protocol import journal as journal
-from donna.protocol import modes as modes
-from donna.protocol import nodes as nodes
+from donna.core.utils import lazy_submodules
 
-__all__ = ("cell_shortcuts", "cells", "errors", "formatters", "journal", "modes", "nodes")
+__all__ = (
+    "cell_shortcuts",
+    "cells",
+    "errors",
+    "formatters",
+    "journal",
+    "modes",
+    "nodes",
+)
+
+__getattr__ = lazy_submodules(__name__, __all__)
@@ -1,5 +1,7 @@
 """Runtime orchestration for Donna workflow execution."""
 
+from donna.runtime import graph as graph
 from donna.runtime import sessions as sessions
+from donna.runtime import validation as validation
 
-__all__ = ("sessions",)
+__all__ = ("graph", "sessions", "validation")
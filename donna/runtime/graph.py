@@ -0,0 +1,310 @@
+import itertools
+from collections.abc import Iterable
+
+from donna.context.context import context
+from donna.core.errors import ErrorsList
+from donna.core.result import Ok, Result, unwrap_to_error
+from donna.domain.artifact_ids import ArtifactId, ArtifactSectionId, artifact_section_id
+from donna.machine.artifacts import Artifact
+from donna.machine.operations import OperationMeta
+from donna.protocol.cells import Cell
+from donna.workspaces import caches
+from donna.workspaces import config as workspace_config
+from donna.workspaces.artifacts import RENDER_CONTEXT_VIEW, list_artifact_ids, view_cache_key
+from donna.workspaces.files import ModuleContentKeys, module_content_keys_changed
+
+GRAPH_CACHE_NAMESPACE = "graph"
+GRAPH_INDEX_NAME = "index"
+
+Edges = dict[ArtifactSectionId, frozenset[ArtifactSectionId]]
+
+
+class _IndexedArtifact:
+    """Nodes and edges of one artifact, with the keys of the artifact and primitive sources they were built from."""
+
+    __slots__ = ("edges", "entry", "key", "operations", "sources")
+
+    def __init__(
+        self,
+        key: caches.CacheKey | None,
+        sources: ModuleContentKeys,
+        entry: ArtifactSectionId | None,
+        operations: frozenset[ArtifactSectionId],
+        edges: Edges,
+    ) -> None:
+        self.key = key
+        self.sources = sources
+        self.entry = entry
+        self.operations = operations
+        self.edges = edges
+
+    def is_fresh(self, key: caches.CacheKey | None) -> bool:
+        return key is not None and self.key == key and not module_content_keys_changed(self.sources)
+
+
+ArtifactsIndex = dict[ArtifactId, _IndexedArtifact]
+
+
+def _reverse_edges(edges: Edges) -> Edges:
+    reverse_edges: dict[ArtifactSectionId, set[ArtifactSectionId]] = {}
+
+    for source, targets in edges.items():
+        for target in targets:
+            reverse_edges.setdefault(target, set()).add(source)
+
+    return {target: frozenset(sources) for target, sources in reverse_edges.items()}
+
+
+class WorkflowGraph:
+    """Sections of all project artifacts linked by operation transitions and workflow starts.
+
+    Artifacts are entered through their primary sections, like `donna run` does.
+    """
+
+    __slots__ = ("edges", "entries", "errors", "operations", "reverse_edges")
+
+    def __init__(self, artifacts: Iterable[_IndexedArtifact], errors: ErrorsList | None = None) -> None:
+        self.edges: Edges = {}
+        self.entries: set[ArtifactSectionId] = set()
+        self.operations: set[ArtifactSectionId] = set()
+        self.errors = errors or []
+
+        for artifact in artifacts:
+            self.edges.update(artifact.edges)
+            self.operations.update(artifact.operations)
+
+            if artifact.entry is not None:
+                self.entries.add(artifact.entry)
+
+        self.reverse_edges = _reverse_edges(self.edges)
+
+    def edges_count(self) -> int:
+        return sum(len(targets) for targets in self.edges.values())
+
+    def successors(self, node: ArtifactSectionId) -> frozenset[ArtifactSectionId]:
+        return self.edges.get(node, frozenset())
+
+    def predecessors(self, node: ArtifactSectionId) -> frozenset[ArtifactSectionId]:
+        return self.reverse_edges.get(node, frozenset())
+
+    @staticmethod
+    def _walk(starts: Iterable[ArtifactSectionId], edges: Edges) -> set[ArtifactSectionId]:
+        visited: set[ArtifactSectionId] = set()
+        to_visit = list(starts)
+
+        while to_visit:
+            current = to_visit.pop()
+
+            if current in visited:
+                continue
+
+            visited.add(current)
+            to_visit.extend(edges.get(current, ()))
+
+        return visited
+
+    def reachable_from(self, nodes: Iterable[ArtifactSectionId]) -> set[ArtifactSectionId]:
+        """Sections that can run after the given ones. A given section is included only when it is on a cycle."""
+        return self._walk(itertools.chain.from_iterable(map(self.successors, nodes)), self.edges)
+
+    def reaching(self, nodes: Iterable[ArtifactSectionId]) -> set[ArtifactSectionId]:
+        """Sections that can lead to the given ones. A given section is included only when it is on a cycle."""
+        return self._walk(itertools.chain.from_iterable(map(self.predecessors, nodes)), self.reverse_edges)
+
+    def dead_operations(self) -> list[ArtifactSectionId]:
+        """Operations that no artifact entry leads to."""
+        return sorted(self.operations - self.reachable_from(self.entries) - self.entries)
+
+    def cycles(self) -> list[list[ArtifactSectionId]]:
+        """Groups of sections that can lead back to themselves, as strongly connected components."""
+        return sorted(
+            component for component in _strongly_connected_components(self.edges) if self._is_cycle(component)
+        )
+
+    def _is_cycle(self, component: list[ArtifactSectionId]) -> bool:
+        return len(component) > 1 or component[0] in self.successors(component[0])
+
+
+class _Tarjan:
+    """Iterative Tarjan's algorithm, workflows may be too long for recursion."""
+
+    __slots__ = ("_edges", "_indexes", "_lowlinks", "_on_stack", "_stack", "components")
+
+    def __init__(self, edges: Edges) -> None:
+        self._edges = edges
+        self._indexes: dict[ArtifactSectionId, int] = {}
+        self._lowlinks: dict[ArtifactSectionId, int] = {}
+        self._on_stack: set[ArtifactSectionId] = set()
+        self._stack: list[ArtifactSectionId] = []
+        self.components: list[list[ArtifactSectionId]] = []
+
+    def _enter(self, node: ArtifactSectionId) -> None:
+        self._indexes[node] = self._lowlinks[node] = len(self._indexes)
+        self._stack.append(node)
+        self._on_stack.add(node)
+
+    def _leave(self, node: ArtifactSectionId) -> None:
+        if self._lowlinks[node] != self._indexes[node]:
+            return
+
+        component: list[ArtifactSectionId] = []
+
+        while True:
+            member = self._stack.pop()
+            self._on_stack.discard(member)
+            component.append(member)
+
+            if member == node:
+                break
+
+        self.components.append(sorted(component))
+
+    def visit(self, root: ArtifactSectionId) -> None:  # noqa: CCR001
+        self._enter(root)
+        work = [(root, iter(sorted(self._edges.get(root, ()))))]
+
+        while work:
+            node, targets = work[-1]
+            target = next(targets, None)
+
+            if target is None:
+                work.pop()
+                self._leave(node)
+                if work:
+                    parent = work[-1][0]
+                    self._lowlinks[parent] = min(self._lowlinks[parent], self._lowlinks[node])
+                continue
+
+            if target not in self._indexes:
+                self._enter(target)
+                work.append((target, iter(sorted(self._edges.get(target, ())))))
+            elif target in self._on_stack:
+                self._lowlinks[node] = min(self._lowlinks[node], self._indexes[target])
+
+    def run(self) -> list[list[ArtifactSectionId]]:
+        for node in sorted(self._edges):
+            if node not in self._indexes:
+                self.visit(node)
+
+        return self.components
+
+
+def _strongly_connected_components(edges: Edges) -> list[list[ArtifactSectionId]]:
+    return _Tarjan(edges).run()
+
+
+@unwrap_to_error
+def _index_artifact(artifact_id: ArtifactId, key: caches.CacheKey | None) -> Result[_IndexedArtifact, ErrorsList]:
+    artifact = context().artifacts.load(artifact_id, RENDER_CONTEXT_VIEW).unwrap()
+    primary_section = artifact.primary_section()
+
+    return Ok(
+        _IndexedArtifact(
+            key=key,
+            sources=context().primitives.source_keys({section.kind for section in artifact.sections}),
+            entry=(artifact_section_id(artifact.id, primary_section.unwrap().id) if primary_section.is_ok() else None),
+            operations=frozenset(
+                artifact_section_id(artifact.id, section.id)
+                for section in artifact.sections
+                if isinstance(section.meta, OperationMeta)
+            ),
+            edges=_artifact_edges(artifact),
+        )
+    )
+
+
+def _artifact_edges(artifact: Artifact) -> Edges:
+    edges: Edges = {}
+
+    for section in artifact.sections:
+        primitive = context().primitives.resolve(section.kind)
+        successors = primitive.unwrap().section_successors(artifact, section.id) if primitive.is_ok() else None
+
+        # Broken sections are reported by `donna validate`, the graph keeps them without edges.
+        edges[artifact_section_id(artifact.id, section.id)] = (
+            successors.unwrap() if successors is not None and successors.is_ok() else frozenset()
+        )
+
+    return edges
+
+
+def _is_index_enabled() -> bool:
+    return workspace_config.config().cache.graph
+
+
+def _index_key() -> caches.CacheKey:
+    return (str(workspace_config.project_dir()),)
+
+
+def _load_index() -> ArtifactsIndex:
+    if not _is_index_enabled():
+        return {}
+
+    persisted = caches.read(GRAPH_CACHE_NAMESPACE, GRAPH_INDEX_NAME, _index_key())
+
+    if not isinstance(persisted, dict):
+        return {}
+
+    return persisted
+
+
+def _save_index(index: ArtifactsIndex) -> None:
+    if not _is_index_enabled():
+        return
+
+    caches.write(GRAPH_CACHE_NAMESPACE, GRAPH_INDEX_NAME, _index_key(), index)
+
+
+def load_graph() -> WorkflowGraph:
+    """Build the graph of all discovered artifacts, indexing again only artifacts changed since the last build."""
+    previous = _load_index()
+    keys = {artifact_id: view_cache_key(artifact_id) for artifact_id in list_artifact_ids()}
+    index: ArtifactsIndex = {
+        artifact_id: previous[artifact_id]
+        for artifact_id, key in keys.items()
+        if artifact_id in previous and previous[artifact_id].is_fresh(key)
+    }
+
+    stale = [artifact_id for artifact_id in keys if artifact_id not in index]
+    context().artifacts.preload(stale, RENDER_CONTEXT_VIEW)
+
+    errors: ErrorsList = []
+
+    for artifact_id in stale:
+        result = _index_artifact(artifact_id, keys[artifact_id])
+
+        if result.is_err():
+            errors.extend(result.unwrap_err())
+            continue
+
+        index[artifact_id] = result.unwrap()
+
+    if stale or index.keys() != previous.keys():
+        _save_index(index)
+
+    return WorkflowGraph((index[artifact_id] for artifact_id in keys if artifact_id in index), errors)
+
+
+def summary_cell(graph: WorkflowGraph) -> Cell:
+    dead_operations = graph.dead_operations()
+    cycles = graph.cycles()
+
+    return Cell.build_markdown(
+        kind="workflow_graph_summary",
+        content=(
+            f"Workflow graph: {len(graph.edges)} sections, {graph.edges_count()} edges, "
+            f"{len(dead_operations)} dead operations, {len(cycles)} cycles."
+        ),
+        sections=len(graph.edges),
+        edges=graph.edges_count(),
+        entries=len(graph.entries),
+        dead_operations=len(dead_operations),
+        cycles=len(cycles),
+    )
+
+
+def sections_cell(kind: str, title: str, sections: Iterable[ArtifactSectionId]) -> Cell:
+    section_ids = sorted(str(section) for section in sections)
+    lines = [f"- `{section}`" for section in section_ids] or ["No sections."]
+
+    return Cell.build_markdown(kind=kind, content="\n".join([f"{title}:", "", *lines]), sections=section_ids)
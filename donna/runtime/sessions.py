@@ -1,5 +1,5 @@
 import functools
-from typing import Callable, ParamSpec
+from typing import Callable, ParamSpec, Sequence
 
 from donna.context.context import context
 from donna.core.errors import ErrorsList
@@ -7,6 +7,7 @@ from donna.core.result import Err, Ok, Result, unwrap_to_error
 from donna.domain.artifact_ids import ArtifactId, ArtifactSectionId, artifact_section_id, split_artifact_section_id
 from donna.domain.internal_ids import ActionRequestId
 from donna.machine import errors as machine_errors
+from donna.machine.changes import Change
 from donna.machine.operations import OperationMeta
 from donna.machine.state import ConsistentState, MutableState
 from donna.protocol.cell_shortcuts import operation_succeeded
@@ -32,16 +33,21 @@ def load_state() -> Result[ConsistentState, ErrorsList]:
 
 
 @unwrap_to_error
-def _save_state(state: ConsistentState) -> Result[None, ErrorsList]:
-    context().state.save(state).unwrap()
+def _save_state(state: ConsistentState, changes: Sequence[Change] | None = None) -> Result[None, ErrorsList]:
+    context().state.save(state, changes).unwrap()
     return Ok(None)
 
 
+@unwrap_to_error
+def _save_mutator(mutator: MutableState) -> Result[None, ErrorsList]:
+    return _save_state(mutator.freeze(), mutator.take_changes())
+
+
 @unwrap_to_error
 def _state_run(mutator: MutableState) -> Result[None, ErrorsList]:
     while mutator.has_work():
         mutator.execute_next_work_unit().unwrap()
-        _save_state(mutator.freeze()).unwrap()
+        _save_mutator(mutator).unwrap()
 
     return Ok(None)
 
@@ -112,7 +118,7 @@ def start_workflow(artifact_id: ArtifactId) -> Result[list[Cell], ErrorsList]:
     primary_section = workflow.primary_section().unwrap()
     mutator = static_state.mutator()
     mutator.start_workflow(artifact_section_id(workflow.id, primary_section.id)).unwrap()
-    _save_state(mutator.freeze()).unwrap()
+    _save_mutator(mutator).unwrap()
     _state_run(mutator).unwrap()
     return _state_cells()
 
@@ -132,7 +138,7 @@ def _validate_operation_transition(
 
     assert isinstance(operation.meta, OperationMeta)
 
-    if next_operation_parts.section_id not in operation.meta.allowed_transitions:
+    if next_operation_parts.section_id not in workflow.transitions(operation.id):
         return Err(
             [machine_errors.InvalidOperationTransition(operation_id=operation_id, next_operation_id=next_operation_id)]
         )
@@ -148,6 +154,6 @@ def complete_action_request(
     mutator = load_state().unwrap().mutator()
     _validate_operation_transition(mutator, request_id, next_operation_id).unwrap()
     mutator.complete_action_request(request_id, next_operation_id).unwrap()
-    _save_state(mutator.freeze()).unwrap()
+    _save_mutator(mutator).unwrap()
     _state_run(mutator).unwrap()
     return _state_cells()
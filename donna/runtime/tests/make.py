@@ -1,5 +1,5 @@
 import contextvars
-from typing import cast
+from typing import Iterable, Sequence, cast
 
 from donna.context.context import Context
 from donna.context.context import reset_context as reset_runtime_context
@@ -11,6 +11,7 @@ from donna.domain.artifact_ids import ArtifactId, ArtifactSectionId
 from donna.domain.internal_ids import WorkUnitId
 from donna.domain.python_path import PythonPath
 from donna.machine.artifacts import Artifact
+from donna.machine.changes import Change
 from donna.machine.context import MachineContext, ValueScope
 from donna.machine.context import reset_context as reset_machine_context
 from donna.machine.context import set_context as set_machine_context
@@ -18,6 +19,7 @@ from donna.machine.primitives import Primitive
 from donna.machine.state import ConsistentState
 from donna.machine.tasks import Task, WorkUnit
 from donna.workspaces.artifacts import ArtifactRenderContext
+from donna.workspaces.files import ModuleContentKeys
 
 
 class FakeStateStore:
@@ -26,6 +28,7 @@ class FakeStateStore:
         self.errors = errors
         self.loaded_count = 0
         self.saved: list[ConsistentState] = []
+        self.saved_changes: list[Sequence[Change] | None] = []
 
     def load(self) -> Result[ConsistentState, ErrorsList]:
         self.loaded_count += 1
@@ -36,8 +39,9 @@ class FakeStateStore:
         assert self.state is not None
         return Ok(self.state)
 
-    def save(self, state: ConsistentState) -> Result[None, ErrorsList]:
+    def save(self, state: ConsistentState, changes: Sequence[Change] | None = None) -> Result[None, ErrorsList]:
         self.saved.append(state)
+        self.saved_changes.append(changes)
         self.state = state
         self.errors = None
         return Ok(None)
@@ -49,11 +53,18 @@ class FakeArtifacts:
         self.loaded: list[tuple[ArtifactId, ArtifactRenderContext]] = []
         self.viewed: list[ArtifactId] = []
         self.executed: list[tuple[ArtifactId, Task, WorkUnit]] = []
+        self.preloaded: list[list[ArtifactId]] = []
 
     def load(self, artifact_id: ArtifactId, render_context: ArtifactRenderContext) -> Result[Artifact, ErrorsList]:
         self.loaded.append((artifact_id, render_context))
         return Ok(self.artifact)
 
+    def preload(
+        self, artifact_ids: list[ArtifactId], render_context: ArtifactRenderContext
+    ) -> dict[ArtifactId, ErrorsList]:
+        self.preloaded.append(artifact_ids)
+        return {}
+
     def load_for_view(self, artifact_id: ArtifactId) -> Result[Artifact, ErrorsList]:
         self.viewed.append(artifact_id)
         return Ok(self.artifact)
@@ -77,6 +88,9 @@ class FakePrimitives:
         self.resolved.append(primitive_id)
         return Ok(self.primitive)
 
+    def source_keys(self, primitive_ids: Iterable[PythonPath]) -> ModuleContentKeys:
+        return {}
+
 
 class FakeRuntimeContext:
     def __init__(self, *, state: ConsistentState | None, artifact: Artifact, primitive: Primitive) -> None:
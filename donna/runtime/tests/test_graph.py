@@ -0,0 +1,73 @@
+from donna.domain.artifact_ids import ArtifactSectionId
+from donna.runtime import graph
+
+START = ArtifactSectionId("@/workflows/graph.donna.md:start")
+LOOP = ArtifactSectionId("@/workflows/graph.donna.md:loop")
+FINISH = ArtifactSectionId("@/workflows/graph.donna.md:finish")
+ORPHAN = ArtifactSectionId("@/workflows/graph.donna.md:orphan")
+WORKFLOW = ArtifactSectionId("@/workflows/graph.donna.md:workflow")
+
+
+def _graph() -> graph.WorkflowGraph:
+    indexed = graph._IndexedArtifact(
+        key=("key",),
+        sources={},
+        entry=WORKFLOW,
+        operations=frozenset({START, LOOP, FINISH, ORPHAN}),
+        edges={
+            WORKFLOW: frozenset({START}),
+            START: frozenset({LOOP}),
+            LOOP: frozenset({START, FINISH}),
+            FINISH: frozenset(),
+            ORPHAN: frozenset({ORPHAN}),
+        },
+    )
+    return graph.WorkflowGraph([indexed])
+
+
+class TestIndexedArtifact:
+    def test_is_fresh__requires_same_key(self) -> None:
+        indexed = graph._IndexedArtifact(key=("key",), sources={}, entry=None, operations=frozenset(), edges={})
+
+        assert indexed.is_fresh(("key",))
+        assert not indexed.is_fresh(("other",))
+        assert not indexed.is_fresh(None)
+
+
+class TestWorkflowGraph:
+    def test_keeps_reverse_edges(self) -> None:
+        workflow_graph = _graph()
+
+        assert workflow_graph.predecessors(START) == frozenset({WORKFLOW, LOOP})
+        assert workflow_graph.predecessors(WORKFLOW) == frozenset()
+        assert workflow_graph.edges_count() == 5
+
+    def test_reachable_from__includes_start_only_on_cycle(self) -> None:
+        workflow_graph = _graph()
+
+        assert workflow_graph.reachable_from([WORKFLOW]) == {START, LOOP, FINISH}
+        assert workflow_graph.reachable_from([LOOP]) == {START, LOOP, FINISH}
+
+    def test_reaching__follows_reverse_edges(self) -> None:
+        assert _graph().reaching([FINISH]) == {WORKFLOW, START, LOOP}
+
+    def test_dead_operations__lists_operations_unreachable_from_entries(self) -> None:
+        assert _graph().dead_operations() == [ORPHAN]
+
+    def test_cycles__lists_strongly_connected_components_and_self_loops(self) -> None:
+        assert _graph().cycles() == [[LOOP, START], [ORPHAN]]
+
+
+class TestSectionsCell:
+    def test_lists_sorted_sections(self) -> None:
+        cell = graph.sections_cell("workflow_graph_dead", "Dead operations", [START, FINISH])
+
+        assert cell.meta == {"sections": [str(FINISH), str(START)]}
+        assert cell.content == f"Dead operations:\n\n- `{FINISH}`\n- `{START}`"
+
+
+class TestSummaryCell:
+    def test_counts_sections_edges_and_findings(self) -> None:
+        cell = graph.summary_cell(_graph())
+
+        assert cell.meta == {"sections": 5, "edges": 5, "entries": 1, "dead_operations": 1, "cycles": 2}
@@ -163,6 +163,7 @@ class TestNewSession:
 
         assert result.is_ok()
         assert runtime_context.state.saved == [MutableState.build().freeze()]
+        assert runtime_context.state.saved_changes == [None]
         assert runtime_context.journal.records == [{"message": "Created new session state.", "actor_id": None}]
         assert result.unwrap()[0].kind == "operation_succeeded"
 
@@ -181,9 +182,9 @@ class TestClear:
 class TestContinue:
     def test_runs_queued_work_until_action_request_and_returns_details(self) -> None:
         state = MutableState(
-            tasks=[_task()],
-            work_units=[_work_unit()],
-            action_requests=[],
+            tasks={TASK_ID: _task()},
+            work_units={WORK_UNIT_ID: _work_unit()},
+            action_requests={},
             started=True,
             last_id=2,
         )
@@ -195,9 +196,15 @@ class TestContinue:
         assert result.is_ok()
         final_state = runtime_context.state.state
         assert final_state is not None
-        assert final_state.work_units == []
+        assert final_state.work_units == {}
         assert len(final_state.action_requests) == 1
         assert runtime_context.state.saved[-1] == final_state
+        saved_changes = runtime_context.state.saved_changes[-1]
+        assert saved_changes is not None
+        assert [type(change).__name__ for change in saved_changes] == [
+            "ChangeAddActionRequest",
+            "ChangeRemoveWorkUnit",
+        ]
         assert [cell.kind for cell in result.unwrap()] == ["session_state_status", "action_request"]
 
 
@@ -215,9 +222,9 @@ class TestStatus:
 class TestDetails:
     def test_returns_current_state_detail_cells(self) -> None:
         state = MutableState(
-            tasks=[_task()],
-            work_units=[],
-            action_requests=[_action_request()],
+            tasks={TASK_ID: _task()},
+            work_units={},
+            action_requests={ACTION_REQUEST_ID: _action_request()},
             started=True,
             last_id=3,
         )
@@ -242,7 +249,7 @@ class TestStartWorkflow:
         assert final_state is not None
         assert final_state.started
         assert len(final_state.tasks) == 1
-        assert final_state.work_units == []
+        assert final_state.work_units == {}
         assert len(final_state.action_requests) == 1
         assert runtime_context.artifacts.loaded[0][0] == ARTIFACT_ID
         assert runtime_context.artifacts.viewed == [ARTIFACT_ID]
@@ -252,9 +259,9 @@ class TestStartWorkflow:
 class TestValidateOperationTransition:
     def test_accepts_allowed_transition(self) -> None:
         state = MutableState(
-            tasks=[_task()],
-            work_units=[],
-            action_requests=[_action_request()],
+            tasks={TASK_ID: _task()},
+            work_units={},
+            action_requests={ACTION_REQUEST_ID: _action_request()},
             started=True,
             last_id=3,
         )
@@ -267,9 +274,9 @@ class TestValidateOperationTransition:
 
     def test_rejects_disallowed_transition(self) -> None:
         state = MutableState(
-            tasks=[_task()],
-            work_units=[],
-            action_requests=[_action_request()],
+            tasks={TASK_ID: _task()},
+            work_units={},
+            action_requests={ACTION_REQUEST_ID: _action_request()},
             started=True,
             last_id=3,
         )
@@ -288,9 +295,9 @@ class TestValidateOperationTransition:
 class TestCompleteActionRequest:
     def test_completes_request_runs_next_operation_and_returns_details(self) -> None:
         state = MutableState(
-            tasks=[_task()],
-            work_units=[],
-            action_requests=[_action_request()],
+            tasks={TASK_ID: _task()},
+            work_units={},
+            action_requests={ACTION_REQUEST_ID: _action_request()},
             started=True,
             last_id=3,
         )
@@ -302,17 +309,17 @@ class TestCompleteActionRequest:
         assert result.is_ok()
         final_state = runtime_context.state.state
         assert final_state is not None
-        assert final_state.action_requests == []
-        assert final_state.work_units == []
+        assert final_state.action_requests == {}
+        assert final_state.work_units == {}
         assert len(runtime_context.state.saved) == 2
         assert runtime_context.artifacts.executed[0][0] == ARTIFACT_ID
         assert [cell.kind for cell in result.unwrap()] == ["session_state_status"]
 
     def test_returns_error_for_disallowed_transition_without_saving(self) -> None:
         state = MutableState(
-            tasks=[_task()],
-            work_units=[],
-            action_requests=[_action_request()],
+            tasks={TASK_ID: _task()},
+            work_units={},
+            action_requests={ACTION_REQUEST_ID: _action_request()},
             started=True,
             last_id=3,
         )
@@ -0,0 +1,147 @@
+from pytest_mock import MockerFixture
+
+from donna.core.errors import ErrorsList
+from donna.core.result import Err, Ok, Result
+from donna.domain.artifact_ids import ArtifactId
+from donna.domain.id_paths import NormalizedRawIdPath
+from donna.domain.ids import SectionId
+from donna.domain.python_path import PythonPath
+from donna.machine import errors as machine_errors
+from donna.machine.artifacts import Artifact, ArtifactSection
+from donna.machine.operations import OperationKind, OperationMeta
+from donna.machine.state import MutableState
+from donna.runtime import validation
+from donna.runtime.tests import make
+from donna.workspaces import caches, files
+
+ARTIFACT_ID = ArtifactId("@/workflows/validation.donna.md")
+OTHER_ARTIFACT_ID = ArtifactId("@/workflows/other.donna.md")
+OPERATION_KIND = PythonPath(NormalizedRawIdPath("donna.runtime.tests.test_validation.operation"))
+
+
+class _ValidOperation(OperationKind):
+    def validate_section(self, artifact: Artifact, section_id: SectionId) -> Result[None, ErrorsList]:
+        return Ok(None)
+
+
+class _InvalidOperation(OperationKind):
+    def validate_section(self, artifact: Artifact, section_id: SectionId) -> Result[None, ErrorsList]:
+        return Err([machine_errors.ArtifactPrimarySectionMissing(artifact_id=artifact.id)])
+
+
+def _artifact() -> Artifact:
+    return Artifact(
+        id=ARTIFACT_ID,
+        sections=[
+            ArtifactSection(
+                id=SectionId("start"),
+                artifact_id=ARTIFACT_ID,
+                kind=OPERATION_KIND,
+                title="Start",
+                description="Start operation",
+                primary=True,
+                meta=OperationMeta(allowed_transitions=set()),
+            )
+        ],
+    )
+
+
+def _context(primitive: OperationKind | None = None) -> make.FakeRuntimeContext:
+    return make.FakeRuntimeContext(
+        state=MutableState.build().freeze(),
+        artifact=_artifact(),
+        primitive=primitive or _ValidOperation(),
+    )
+
+
+def _memory_cache(mocker: MockerFixture) -> dict[str, object]:
+    entries: dict[str, object] = {}
+
+    mocker.patch.object(validation, "_validation_key", return_value=("key",))
+    mocker.patch.object(caches, "read", side_effect=lambda namespace, name, key: entries.get(name))
+    mocker.patch.object(
+        caches, "write", side_effect=lambda namespace, name, key, value: entries.__setitem__(name, value)
+    )
+
+    return entries
+
+
+class TestArtifactValidation:
+    def test_is_valid__without_errors(self) -> None:
+        assert validation.ArtifactValidation(ARTIFACT_ID, [], cached=False).is_valid
+
+    def test_is_valid__with_errors(self) -> None:
+        errors: ErrorsList = [machine_errors.ArtifactPrimarySectionMissing(artifact_id=ARTIFACT_ID)]
+
+        assert not validation.ArtifactValidation(ARTIFACT_ID, errors, cached=False).is_valid
+
+
+class TestValidateArtifacts:
+    def test_validates_artifacts_without_cache(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(validation, "_validation_key", return_value=None)
+
+        with make.installed_context(_context(_InvalidOperation())) as context:
+            validations = validation.validate_artifacts([ARTIFACT_ID])
+
+        assert [item.artifact_id for item in validations] == [ARTIFACT_ID]
+        assert not validations[0].is_valid
+        assert not validations[0].cached
+        assert context.artifacts.preloaded == [[ARTIFACT_ID]]
+
+    def test_reuses_stored_results_of_unchanged_artifacts(self, mocker: MockerFixture) -> None:
+        _memory_cache(mocker)
+
+        with make.installed_context(_context()):
+            validation.validate_artifacts([ARTIFACT_ID])
+
+        with make.installed_context(_context()) as context:
+            validations = validation.validate_artifacts([ARTIFACT_ID, OTHER_ARTIFACT_ID])
+
+        assert [item.cached for item in validations] == [True, False]
+        assert [artifact_id for artifact_id, _ in context.artifacts.loaded] == [OTHER_ARTIFACT_ID]
+        assert context.artifacts.preloaded == [[OTHER_ARTIFACT_ID]]
+
+    def test_revalidates_when_primitive_source_changes(self, mocker: MockerFixture) -> None:
+        entries = _memory_cache(mocker)
+        entries[str(ARTIFACT_ID)] = (files.module_content_keys(["json"]), [])
+
+        mocker.patch.object(files, "_MODULE_CONTENT_KEYS", {"json": ("blake2b", "changed")})
+
+        with make.installed_context(_context()) as context:
+            validations = validation.validate_artifacts([ARTIFACT_ID])
+
+        assert not validations[0].cached
+        assert len(context.artifacts.loaded) == 1
+
+    def test_does_not_store_loading_errors(self, mocker: MockerFixture) -> None:
+        entries = _memory_cache(mocker)
+        errors: ErrorsList = [machine_errors.ArtifactPrimarySectionMissing(artifact_id=ARTIFACT_ID)]
+
+        with make.installed_context(_context()) as context:
+            mocker.patch.object(context.artifacts, "load", return_value=Err(errors))
+            validations = validation.validate_artifacts([ARTIFACT_ID])
+
+        assert validations[0].errors == errors
+        assert entries == {}
+
+
+class TestSummaryCell:
+    def test_counts_valid_invalid_and_cached_artifacts(self) -> None:
+        errors: ErrorsList = [machine_errors.ArtifactPrimarySectionMissing(artifact_id=ARTIFACT_ID)]
+
+        cell = validation.summary_cell(
+            [
+                validation.ArtifactValidation(ARTIFACT_ID, errors, cached=True),
+                validation.ArtifactValidation(OTHER_ARTIFACT_ID, [], cached=False),
+            ]
+        )
+
+        assert cell.kind == "validation_summary"
+        assert cell.meta == {
+            "artifacts": 2,
+            "valid": 1,
+            "invalid": 1,
+            "cached": 1,
+            "revalidated": 1,
+            "invalid_artifacts": [str(ARTIFACT_ID)],
+        }
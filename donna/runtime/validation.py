@@ -0,0 +1,113 @@
+from typing import Iterable
+
+from donna.context.context import context
+from donna.core.errors import ErrorsList
+from donna.domain.artifact_ids import ArtifactId
+from donna.machine.artifacts import Artifact
+from donna.protocol.cells import Cell
+from donna.workspaces import caches
+from donna.workspaces import config as workspace_config
+from donna.workspaces.artifacts import RENDER_CONTEXT_VIEW, view_cache_key
+from donna.workspaces.files import ModuleContentKeys, module_content_keys_changed
+
+VALIDATION_CACHE_NAMESPACE = "validation"
+
+
+class ArtifactValidation:
+    __slots__ = ("artifact_id", "cached", "errors")
+
+    def __init__(self, artifact_id: ArtifactId, errors: ErrorsList, cached: bool) -> None:
+        self.artifact_id = artifact_id
+        self.errors = errors
+        self.cached = cached
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+
+def _validation_key(artifact_id: ArtifactId) -> caches.CacheKey | None:
+    if not workspace_config.config().cache.validation:
+        return None
+
+    return view_cache_key(artifact_id)
+
+
+def _read_cached_errors(artifact_id: ArtifactId, key: caches.CacheKey) -> ErrorsList | None:
+    entry = caches.read(VALIDATION_CACHE_NAMESPACE, str(artifact_id), key)
+
+    if not isinstance(entry, tuple) or len(entry) != 2:
+        return None
+
+    sources, errors = entry
+
+    if not isinstance(sources, dict) or not isinstance(errors, list):
+        return None
+
+    if module_content_keys_changed(sources):
+        return None
+
+    return errors
+
+
+def _primitive_sources(artifact: Artifact) -> ModuleContentKeys:
+    return context().primitives.source_keys({section.kind for section in artifact.sections})
+
+
+def _validate(artifact_id: ArtifactId, key: caches.CacheKey | None) -> ArtifactValidation:
+    loaded = context().artifacts.load(artifact_id, RENDER_CONTEXT_VIEW)
+
+    # Loading errors come from the environment as well as from the artifact, so they are reported but not cached.
+    if loaded.is_err():
+        return ArtifactValidation(artifact_id, loaded.unwrap_err(), cached=False)
+
+    artifact = loaded.unwrap()
+    result = artifact.validate_artifact()
+    errors = result.unwrap_err() if result.is_err() else []
+
+    if key is not None:
+        caches.write(VALIDATION_CACHE_NAMESPACE, str(artifact_id), key, (_primitive_sources(artifact), errors))
+
+    return ArtifactValidation(artifact_id, errors, cached=False)
+
+
+def validate_artifacts(artifact_ids: Iterable[ArtifactId]) -> list[ArtifactValidation]:
+    """Validate artifacts, reusing stored results of artifacts whose source and primitives did not change."""
+    artifact_ids = list(artifact_ids)
+    keys = {artifact_id: _validation_key(artifact_id) for artifact_id in artifact_ids}
+
+    validations: dict[ArtifactId, ArtifactValidation] = {}
+
+    for artifact_id, key in keys.items():
+        cached_errors = None if key is None else _read_cached_errors(artifact_id, key)
+
+        if cached_errors is not None:
+            validations[artifact_id] = ArtifactValidation(artifact_id, cached_errors, cached=True)
+
+    missing = [artifact_id for artifact_id in artifact_ids if artifact_id not in validations]
+    context().artifacts.preload(missing, RENDER_CONTEXT_VIEW)
+
+    for artifact_id in missing:
+        validations[artifact_id] = _validate(artifact_id, keys[artifact_id])
+
+    return [validations[artifact_id] for artifact_id in artifact_ids]
+
+
+def summary_cell(validations: list[ArtifactValidation]) -> Cell:
+    invalid = [str(validation.artifact_id) for validation in validations if not validation.is_valid]
+    cached = sum(validation.cached for validation in validations)
+    valid = len(validations) - len(invalid)
+
+    return Cell.build_markdown(
+        kind="validation_summary",
+        content=(
+            f"Validated artifacts: {len(validations)}, valid: {valid}, invalid: {len(invalid)}, "
+            f"reused from the validation cache: {cached}."
+        ),
+        artifacts=len(validations),
+        valid=valid,
+        invalid=len(invalid),
+        cached=cached,
+        revalidated=len(validations) - cached,
+        invalid_artifacts=invalid,
+    )
@@ -1,25 +1,19 @@
-from donna.workspaces import artifacts as artifacts
-from donna.workspaces import config as config
-from donna.workspaces import errors as errors
-from donna.workspaces import files as files
-from donna.workspaces import initialization as initialization
-from donna.workspaces import journal as journal
-from donna.workspaces import markdown as markdown
-from donna.workspaces import markdown_parser as markdown_parser
-from donna.workspaces import paths as paths
-from donna.workspaces import sessions as sessions
-from donna.workspaces import templates as templates
+from donna.core.utils import lazy_submodules
 
 __all__ = (
     "artifacts",
+    "caches",
     "config",
     "errors",
     "files",
     "initialization",
     "journal",
+    "journal_store",
     "markdown",
     "markdown_parser",
     "paths",
     "sessions",
     "templates",
 )
+
+__getattr__ = lazy_submodules(__name__, __all__)
@@ -1,20 +1,39 @@
+import itertools
+import os
 import pathlib
-from typing import TYPE_CHECKING, Iterator, Sequence
+import time
+from concurrent.futures import ProcessPoolExecutor
+from stat import S_ISDIR
+from typing import TYPE_CHECKING, Iterator, Sequence, TypeVar
 
 from donna.core.entities import BaseEntity
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Ok, Result, unwrap_to_error
 from donna.domain.artifact_ids import ArtifactId, artifact_path_parts, validate_artifact_id
 from donna.domain.constants import DONNA_ARTIFACT_EXTENSION
+from donna.domain.ids import SectionId
 from donna.domain.paths import ProjectPathId, RelativeProjectPath, ResolvedProjectPath, UntrustedPath
 from donna.machine.tasks import Task, WorkUnit
 from donna.machine.templates import RenderMode
+from donna.workspaces import caches
 from donna.workspaces import errors as world_errors
-from donna.workspaces.files import FileFingerprint
+from donna.workspaces.files import (
+    TIMESTAMP_RESOLUTION_NS,
+    FileFingerprint,
+    ModuleContentKeys,
+    content_hash,
+    module_content_keys,
+    module_content_keys_changed,
+)
 from donna.workspaces.paths import normalize_existing_path
 
 if TYPE_CHECKING:
-    from donna.machine.artifacts import Artifact
+    from donna.domain.paths import ProjectConfigPath, ProjectRootPath
+    from donna.machine.artifacts import Artifact, ArtifactSection
+    from donna.protocol.modes import Mode
+    from donna.workspaces.config import Config, GlobalConfig
+
+    WorkerGlobals = tuple[ProjectRootPath | None, ProjectConfigPath | None, Config | None, Mode | None]
 
 
 class ArtifactRenderContext(BaseEntity):
@@ -25,6 +44,13 @@ class ArtifactRenderContext(BaseEntity):
 
 RENDER_CONTEXT_VIEW = ArtifactRenderContext(primary_mode=RenderMode.view)
 
+GLOBAL_VALUE = TypeVar("GLOBAL_VALUE")
+
+ARTIFACTS_CACHE_NAMESPACE = "artifacts"
+
+DISCOVERY_CACHE_NAMESPACE = "discovery"
+DISCOVERY_INDEX_NAME = "index"
+
 
 class FilesystemRawArtifact(BaseEntity):
     path: ResolvedProjectPath
@@ -34,7 +60,144 @@ class FilesystemRawArtifact(BaseEntity):
 
     @unwrap_to_error
     def render(self, artifact_id: ArtifactId, render_context: ArtifactRenderContext) -> Result["Artifact", ErrorsList]:
-        return Ok(render_markdown_artifact(artifact_id, self.get_bytes(), render_context).unwrap())
+        content = self.get_bytes()
+
+        if not _is_persistable(render_context):
+            return Ok(render_markdown_artifact(artifact_id, content, render_context).unwrap())
+
+        # Persisted renders are keyed by the hash of the content they are rendered from, so the file is read once.
+        fingerprint = FileFingerprint.from_path(self.path, content_hash(content))
+        if fingerprint is None:
+            return Ok(render_markdown_artifact(artifact_id, content, render_context).unwrap())
+
+        persisted = _load_persisted_artifact(artifact_id, fingerprint, render_context)
+        if persisted is not None:
+            return Ok(persisted)
+
+        from donna.workspaces.templates import recording_directive_modules
+
+        with recording_directive_modules() as directive_modules:
+            artifact = render_markdown_artifact(artifact_id, content, render_context).unwrap()
+
+        sources = module_content_keys(_artifact_source_modules(artifact, directive_modules))
+        _persist_artifact(artifact_id, fingerprint, render_context, artifact, sources)
+
+        return Ok(artifact)
+
+    @unwrap_to_error
+    def render_section(
+        self,
+        artifact_id: ArtifactId,
+        structure: "Artifact",
+        section_id: SectionId,
+        render_context: ArtifactRenderContext,
+    ) -> Result["Artifact", ErrorsList]:
+        """Render a single section and take the rest of the artifact from `structure`.
+
+        Falls back to rendering the whole artifact when it can not be split into sections safely.
+        """
+        content = self.get_bytes()
+
+        section = render_markdown_section(artifact_id, content, structure, section_id, render_context).unwrap()
+
+        if section is None:
+            return Ok(render_markdown_artifact(artifact_id, content, render_context).unwrap())
+
+        return Ok(structure.replace_section(section))
+
+
+# Execute-mode renders depend on task state, so only task-independent renders are shared across CLI calls.
+def _is_persistable(render_context: ArtifactRenderContext) -> bool:
+    from donna.workspaces import config as workspace_config
+
+    if not workspace_config.config().cache.artifacts:
+        return False
+
+    if render_context.primary_mode == RenderMode.execute:
+        return False
+
+    return render_context.current_task is None and render_context.current_work_unit is None
+
+
+def _persisted_artifact_name(artifact_id: ArtifactId, render_context: ArtifactRenderContext) -> str:
+    return f"{artifact_id}:{render_context.primary_mode.value}"
+
+
+# Rendered artifacts embed the protocol and config path (see `goto`) and depend on config defaults.
+# The file is identified by its content, so touching or checking it out again keeps the cached render.
+def persisted_artifact_key(
+    artifact_id: ArtifactId, fingerprint: FileFingerprint, render_context: ArtifactRenderContext
+) -> caches.CacheKey:
+    from donna.workspaces import config as workspace_config
+
+    protocol = workspace_config.protocol().value if workspace_config.protocol.is_set() else None
+    config_path = str(workspace_config.config_path()) if workspace_config.config_path.is_set() else None
+
+    return (
+        artifact_id,
+        fingerprint.content_key(),
+        render_context.primary_mode.value,
+        protocol,
+        config_path,
+        workspace_config.config().model_dump_json(),
+    )
+
+
+def _artifact_source_modules(artifact: "Artifact", directive_modules: set[str]) -> set[str]:
+    """Modules whose code produced the artifact: its section primitives and the directives of its template."""
+    from donna.machine.primitives import resolve_primitive
+
+    modules = set(directive_modules)
+
+    for section in artifact.sections:
+        modules.add(str(section.kind).rsplit(".", maxsplit=1)[0])
+
+        primitive = resolve_primitive(section.kind)
+        if primitive.is_ok():
+            modules.add(type(primitive.unwrap()).__module__)
+
+    return modules
+
+
+def _load_persisted_artifact(
+    artifact_id: ArtifactId, fingerprint: FileFingerprint, render_context: ArtifactRenderContext
+) -> "Artifact | None":
+    from donna.machine.artifacts import Artifact
+
+    persisted = caches.read(
+        ARTIFACTS_CACHE_NAMESPACE,
+        _persisted_artifact_name(artifact_id, render_context),
+        persisted_artifact_key(artifact_id, fingerprint, render_context),
+    )
+
+    if not isinstance(persisted, tuple) or len(persisted) != 2:
+        return None
+
+    sources, artifact = persisted
+
+    if not isinstance(sources, dict) or not isinstance(artifact, Artifact):
+        return None
+
+    # Custom primitives and directives change without a Donna release, the render is reused only for the same code.
+    if module_content_keys_changed(sources):
+        return None
+
+    return artifact
+
+
+def _persist_artifact(
+    artifact_id: ArtifactId,
+    fingerprint: FileFingerprint,
+    render_context: ArtifactRenderContext,
+    artifact: "Artifact",
+    sources: ModuleContentKeys,
+) -> None:
+    caches.write(
+        ARTIFACTS_CACHE_NAMESPACE,
+        _persisted_artifact_name(artifact_id, render_context),
+        persisted_artifact_key(artifact_id, fingerprint, render_context),
+        (sources, artifact),
+    )
 
 
 def has_donna_artifact_extension(path: ProjectPathId | RelativeProjectPath | ResolvedProjectPath | str) -> bool:
@@ -73,43 +236,136 @@ def _artifact_is_visible_in_workspace(artifact_id: ArtifactId) -> bool:
     return _artifact_is_in_workflow_dirs(artifact_id, workspace_config.config().workflow_dirs)
 
 
-def _artifact_id_from_filesystem_entry(entry: ResolvedProjectPath, parts: list[str]) -> ArtifactId | None:
-    if not entry.is_file():
-        return None
+class _IndexedDirectory:
+    # Entries are `(name, is_directory)` pairs in name order, only artifact files and directories are kept.
+    __slots__ = ("entries", "mtime_ns", "scanned_ns")
 
-    if not has_donna_artifact_extension(entry):
-        return None
+    def __init__(self, mtime_ns: int, entries: tuple[tuple[str, bool], ...], scanned_ns: int) -> None:
+        self.mtime_ns = mtime_ns
+        self.entries = entries
+        self.scanned_ns = scanned_ns
+
+    def is_fresh(self, mtime_ns: int) -> bool:
+        return self.mtime_ns == mtime_ns and mtime_ns + TIMESTAMP_RESOLUTION_NS < self.scanned_ns
+
+
+class _DiscoveryIndex:
+    """Directory listings of workflow dirs, reused while the directory mtime stays the same.
+
+    A directory mtime changes when its entries are added, removed, or renamed, which is all discovery depends on.
+    Listings scanned in the same timestamp tick as the last change are rescanned, see `TIMESTAMP_RESOLUTION_NS`.
+    """
+
+    __slots__ = ("_previous", "_current")
+
+    def __init__(self, previous: dict[str, _IndexedDirectory]) -> None:
+        self._previous = previous
+        self._current: dict[str, _IndexedDirectory] = {}
+
+    @property
+    def directories(self) -> dict[str, _IndexedDirectory]:
+        return self._current
+
+    def listing(self, path: str) -> _IndexedDirectory | None:
+        try:
+            path_stat = os.stat(path)
+        except OSError:
+            return None
+
+        if not S_ISDIR(path_stat.st_mode):
+            return None
+
+        indexed = self._previous.get(path)
+        if indexed is None or not indexed.is_fresh(path_stat.st_mtime_ns):
+            indexed = _scan_directory(path, path_stat.st_mtime_ns)
+
+        self._current[path] = indexed
+        return indexed
+
+    def is_changed(self) -> bool:
+        if self._current.keys() != self._previous.keys():
+            return True
 
-    artifact_parts = parts + [entry.name]
-    return _artifact_id_from_parts(artifact_parts)
+        return any(self._previous[path] is not indexed for path, indexed in self._current.items())
 
 
-def _walk_workflow_dir(node: ResolvedProjectPath, parts: list[str]) -> Iterator[ArtifactId]:
-    for raw_entry in sorted(pathlib.Path(node).iterdir(), key=lambda item: item.name):
-        entry = ResolvedProjectPath(raw_entry)
-        if entry.is_dir():
-            yield from _walk_workflow_dir(entry, parts + [entry.name])
+def _scan_directory(path: str, mtime_ns: int) -> _IndexedDirectory:
+    # Taken before listing, so entries added while scanning are never older than the scan.
+    scanned_ns = time.time_ns()
+    entries: list[tuple[str, bool]] = []
+
+    # `os.scandir` gets entry types from the directory listing, so most entries are not stat-ed.
+    with os.scandir(path) as directory:
+        for entry in directory:
+            if entry.is_dir():
+                entries.append((entry.name, True))
+            elif entry.is_file() and has_donna_artifact_extension(entry.name):
+                entries.append((entry.name, False))
+
+    entries.sort()
+    return _IndexedDirectory(mtime_ns, tuple(entries), scanned_ns)
+
+
+def _walk_workflow_dir(path: str, parts: list[str], index: _DiscoveryIndex) -> Iterator[ArtifactId]:
+    listing = index.listing(path)
+    if listing is None:
+        return
+
+    for name, is_directory in listing.entries:
+        if is_directory:
+            yield from _walk_workflow_dir(os.path.join(path, name), parts + [name], index)
             continue
 
-        artifact_id = _artifact_id_from_filesystem_entry(entry, parts)
+        artifact_id = _artifact_id_from_parts(parts + [name])
         if artifact_id is not None:
             yield artifact_id
 
 
+def _is_discovery_index_enabled() -> bool:
+    from donna.workspaces import config as workspace_config
+
+    return workspace_config.config.is_set() and workspace_config.config().cache.discovery
+
+
+def _discovery_index_key() -> caches.CacheKey:
+    from donna.workspaces.config import project_dir
+
+    return (str(project_dir()),)
+
+
+def _load_discovery_index() -> _DiscoveryIndex:
+    if not _is_discovery_index_enabled():
+        return _DiscoveryIndex({})
+
+    persisted = caches.read(DISCOVERY_CACHE_NAMESPACE, DISCOVERY_INDEX_NAME, _discovery_index_key())
+
+    if not isinstance(persisted, dict):
+        return _DiscoveryIndex({})
+
+    return _DiscoveryIndex(persisted)
+
+
+def _save_discovery_index(index: _DiscoveryIndex) -> None:
+    if not _is_discovery_index_enabled() or not index.is_changed():
+        return
+
+    caches.write(DISCOVERY_CACHE_NAMESPACE, DISCOVERY_INDEX_NAME, _discovery_index_key(), index.directories)
+
+
 def walk_filesystem(workflow_dirs: Sequence[RelativeProjectPath]) -> Iterator[ArtifactId]:
     from donna.workspaces.config import project_dir
 
     root = project_dir()
-    if not root.exists() or not root.is_dir():
+    if not root.is_dir():
         return
 
+    index = _load_discovery_index()
+
     for workflow_dir in workflow_dirs:
         workflow_parts = _workflow_dir_parts(workflow_dir)
-        workflow_path = root.joinpath(*workflow_parts)
-        if not workflow_path.exists() or not workflow_path.is_dir():
-            continue
+        yield from _walk_workflow_dir(os.path.join(root, *workflow_parts), list(workflow_parts), index)
 
-        yield from _walk_workflow_dir(ResolvedProjectPath(workflow_path), list(workflow_parts))
+    _save_discovery_index(index)
 
 
 def list_artifact_ids() -> list[ArtifactId]:
@@ -199,6 +455,32 @@ def render_markdown_artifact(
     )
 
 
+@unwrap_to_error
+def render_markdown_section(
+    artifact_id: ArtifactId,
+    content: bytes,
+    structure: "Artifact",
+    section_id: SectionId,
+    render_context: ArtifactRenderContext,
+) -> Result["ArtifactSection | None", ErrorsList]:
+    from donna.workspaces.config import config
+    from donna.workspaces.markdown_parser import construct_section_from_markdown_source
+
+    defaults = config().defaults
+    return Ok(
+        construct_section_from_markdown_source(
+            artifact_id,
+            content.decode("utf-8"),
+            structure,
+            section_id,
+            render_context,
+            default_section_kind=defaults.tail_section_kind,
+            default_primary_section_kind=defaults.primary_section_kind,
+            default_primary_section_id=defaults.primary_section_id,
+        ).unwrap()
+    )
+
+
 @unwrap_to_error
 def artifact_fingerprint(artifact_id: ArtifactId) -> Result[FileFingerprint | None, ErrorsList]:
     artifact_path = resolve_artifact_path(artifact_id).unwrap()
@@ -207,3 +489,75 @@ def artifact_fingerprint(artifact_id: ArtifactId) -> Result[FileFingerprint | No
         return Ok(None)
 
     return Ok(FileFingerprint.from_path(artifact_path))
+
+
+def view_cache_key(artifact_id: ArtifactId) -> caches.CacheKey | None:
+    """Key persisted data derived from the view render of the artifact, like its validation errors."""
+    fingerprint = artifact_fingerprint(artifact_id)
+    file_fingerprint = fingerprint.unwrap() if fingerprint.is_ok() else None
+
+    if file_fingerprint is None:
+        return None
+
+    return persisted_artifact_key(artifact_id, file_fingerprint, RENDER_CONTEXT_VIEW)
+
+
+RenderedArtifactFile = tuple[FilesystemRawArtifact, FileFingerprint, "Artifact"]
+
+
+@unwrap_to_error
+def render_artifact_file(
+    artifact_id: ArtifactId, render_context: ArtifactRenderContext
+) -> Result[RenderedArtifactFile, ErrorsList]:
+    raw_artifact = fetch_raw_artifact(artifact_id).unwrap()
+    fingerprint = FileFingerprint.from_path(raw_artifact.path)
+    if fingerprint is None:
+        return Err([world_errors.ArtifactNotFound(artifact_id=artifact_id)])
+
+    return Ok((raw_artifact, fingerprint, raw_artifact.render(artifact_id, render_context).unwrap()))
+
+
+def _worker_globals() -> "WorkerGlobals":
+    from donna.workspaces import config as workspace_config
+
+    return (
+        workspace_config.project_dir() if workspace_config.project_dir.is_set() else None,
+        workspace_config.config_path() if workspace_config.config_path.is_set() else None,
+        workspace_config.config() if workspace_config.config.is_set() else None,
+        workspace_config.protocol() if workspace_config.protocol.is_set() else None,
+    )
+
+
+def _set_worker_global(global_config: "GlobalConfig[GLOBAL_VALUE]", value: GLOBAL_VALUE | None) -> None:
+    # Forked workers inherit the globals, spawned ones start without them.
+    if value is not None and not global_config.is_set():
+        global_config.set(value)
+
+
+def _install_worker_globals(worker_globals: "WorkerGlobals") -> None:
+    from donna.workspaces import config as workspace_config
+
+    root, config_path, config, protocol = worker_globals
+
+    _set_worker_global(workspace_config.project_dir, root)
+    _set_worker_global(workspace_config.config_path, config_path)
+    _set_worker_global(workspace_config.config, config)
+    _set_worker_global(workspace_config.protocol, protocol)
+
+
+def render_artifact_files_in_processes(
+    artifact_ids: Sequence[ArtifactId], render_context: ArtifactRenderContext, max_workers: int
+) -> list[Result[RenderedArtifactFile, ErrorsList]]:
+    """Render artifacts in a pool of processes and return the results in the order of `artifact_ids`.
+
+    Parsing and rendering are CPU-bound, so threads would be serialized by the GIL.
+    """
+    workers = min(max_workers, len(artifact_ids))
+    chunk_size = max(1, len(artifact_ids) // (workers * 4))
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_install_worker_globals, initargs=(_worker_globals(),)
+    ) as executor:
+        return list(
+            executor.map(render_artifact_file, artifact_ids, itertools.repeat(render_context), chunksize=chunk_size)
+        )
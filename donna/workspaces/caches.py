@@ -0,0 +1,165 @@
+import hashlib
+import hmac
+import importlib.metadata
+import os
+import pathlib
+import pickle  # noqa: S403
+import secrets
+import stat
+import tempfile
+from functools import cache
+
+from donna.domain.constants import CACHE_DIR_NAME
+from donna.domain.paths import ResolvedProjectPath
+from donna.workspaces import sessions
+
+# Bump when the layout of cached values changes in a way the donna version does not capture.
+CACHE_FORMAT_VERSION = 4
+
+CacheKey = tuple[object, ...]
+
+SIGNING_KEY_FILE_NAME = "cache.key"
+SIGNING_KEY_SIZE = 32
+SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+
+@cache
+def donna_version() -> str | None:
+    try:
+        return importlib.metadata.version("donna")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _user_cache_dir() -> pathlib.Path:
+    base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(base) / "donna"
+
+
+def _read_signing_key(path: pathlib.Path) -> bytes | None:
+    try:
+        with path.open("rb") as key_file:
+            key_stat = os.fstat(key_file.fileno())
+            content = key_file.read()
+    except OSError:
+        return None
+
+    # A key that another user can read or replace does not prove that Donna wrote the cache entries.
+    if not stat.S_ISREG(key_stat.st_mode) or key_stat.st_uid != os.getuid() or key_stat.st_mode & 0o077:
+        return None
+
+    if len(content) != SIGNING_KEY_SIZE:
+        return None
+
+    return content
+
+
+def _create_signing_key(path: pathlib.Path) -> None:
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    # NamedTemporaryFile creates the file readable only by the current user.
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".", suffix=".tmp", delete=False) as temp_file:
+        temp_file.write(secrets.token_bytes(SIGNING_KEY_SIZE))
+
+    # Linking never replaces a key created concurrently by another Donna process.
+    try:
+        os.link(temp_file.name, path)
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(temp_file.name)
+
+
+@cache
+def signing_key() -> bytes | None:
+    """Return the per-user key that signs cache entries, or None when there is no trustworthy key."""
+    path = _user_cache_dir() / SIGNING_KEY_FILE_NAME
+
+    if not path.exists():
+        try:
+            _create_signing_key(path)
+        except OSError:
+            return None
+
+    return _read_signing_key(path)
+
+
+def _signature(key: bytes, content: bytes) -> bytes:
+    return hmac.new(key, content, hashlib.sha256).digest()
+
+
+def _full_key(key: CacheKey) -> CacheKey | None:
+    version = donna_version()
+
+    # Without a known package version we cannot tell whether cached objects match the running code.
+    if version is None:
+        return None
+
+    return (CACHE_FORMAT_VERSION, version, *key)
+
+
+def cache_dir(namespace: str) -> ResolvedProjectPath:
+    path = ResolvedProjectPath(sessions.dir() / CACHE_DIR_NAME / namespace)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _entry_path(namespace: str, name: str) -> ResolvedProjectPath:
+    digest = hashlib.sha256(name.encode("utf-8")).hexdigest()
+    return ResolvedProjectPath(cache_dir(namespace) / f"{digest}.pickle")
+
+
+def read(namespace: str, name: str, key: CacheKey) -> object | None:
+    full_key = _full_key(key)
+    if full_key is None:
+        return None
+
+    signing = signing_key()
+    if signing is None:
+        return None
+
+    try:
+        content = _entry_path(namespace, name).read_bytes()
+    except FileNotFoundError:
+        return None
+
+    signature, pickled = content[:SIGNATURE_SIZE], content[SIGNATURE_SIZE:]
+
+    # Only entries signed by the current user are unpickled, anybody able to write the session directory could
+    # otherwise run code by placing a crafted pickle there.
+    if not hmac.compare_digest(signature, _signature(signing, pickled)):
+        return None
+
+    # Signed entries may still be left by another Donna build.
+    try:
+        entry: tuple[CacheKey, object] = pickle.loads(pickled)  # noqa: S301
+        stored_key, value = entry
+    except Exception:
+        return None
+
+    if stored_key != full_key:
+        return None
+
+    return value
+
+
+def write(namespace: str, name: str, key: CacheKey, value: object) -> None:
+    full_key = _full_key(key)
+    if full_key is None:
+        return
+
+    signing = signing_key()
+    if signing is None:
+        return
+
+    try:
+        content = pickle.dumps((full_key, value), protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return
+
+    path = _entry_path(namespace, name)
+
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".", suffix=".tmp", delete=False) as temp_file:
+        temp_file.write(_signature(signing, content) + content)
+
+    os.replace(temp_file.name, path)
@@ -34,8 +34,37 @@ def _is_journal_variable_argument(argument: str) -> bool:
     return len(argument) >= 2 and argument[0] == "{" and argument[-1] == "}"
 
 
+class JournalDelivery(str, enum.Enum):
+    sync = "sync"
+    background = "background"
+
+
+class JournalCommandMode(str, enum.Enum):
+    # Run the command once per record, passing record fields as arguments.
+    per_record = "per_record"
+    # Start the command once and write records to its stdin as JSON lines.
+    coprocess = "coprocess"
+    # Run the command once per delivered batch of records and write the batch to its stdin as JSON lines.
+    batch = "batch"
+
+
 class JournalConfig(BaseEntity):
     cmd: list[str] | None = None
+    cmd_mode: JournalCommandMode = JournalCommandMode.per_record
+    # Keep records in the session directory for `donna journal`.
+    store: bool = False
+    file: RelativeProjectPath | None = None
+    delivery: JournalDelivery = JournalDelivery.sync
+    # Maximum number of records delivered to sinks at once in the background delivery.
+    batch_size: int = pydantic.Field(default=64, ge=1)
+
+    @pydantic.field_validator("file", mode="after")
+    @classmethod
+    def validate_file(cls, value: RelativeProjectPath | None) -> RelativeProjectPath | None:
+        if value is None:
+            return value
+
+        return _validate_relative_project_path(value)
 
     @pydantic.field_validator("cmd", mode="after")
     @classmethod
@@ -59,6 +88,20 @@ class JournalConfig(BaseEntity):
 
         return value
 
+    @pydantic.model_validator(mode="after")
+    def validate_stdin_cmd(self) -> "JournalConfig":
+        if self.cmd_mode == JournalCommandMode.per_record or self.cmd is None:
+            return self
+
+        for argument in self.cmd:
+            if _is_journal_variable_argument(argument):
+                raise ValueError(
+                    f"Journal command config is invalid: `{argument}` placeholder can not be used in the "
+                    f"{self.cmd_mode.value} mode, records are written to the command stdin."
+                )
+
+        return self
+
 
 class DefaultsConfig(BaseEntity):
     tail_section_kind: PythonPath = PythonPath(NormalizedRawIdPath("donna.lib.text"))
@@ -66,6 +109,28 @@ class DefaultsConfig(BaseEntity):
     primary_section_id: SectionId = SectionId("primary")
 
 
+class CacheConfig(BaseEntity):
+    artifacts: bool = True
+    templates: bool = True
+    discovery: bool = True
+    validation: bool = True
+    graph: bool = True
+
+
+class StateFormat(str, enum.Enum):
+    json = "json"
+    binary = "binary"
+
+
+class StateConfig(BaseEntity):
+    format: StateFormat = StateFormat.json
+
+
+class ListingConfig(BaseEntity):
+    # Number of processes that load artifacts for `donna list` and `donna validate --all`.
+    max_workers: int = pydantic.Field(default=1, ge=1)
+
+
 def _default_workflow_dirs() -> list[RelativeProjectPath]:
     return [
         RelativeProjectPath(DONNA_DEFAULT_WORKFLOW_DIR),
@@ -93,6 +158,9 @@ class Config(BaseEntity):
     defaults: DefaultsConfig = pydantic.Field(default_factory=DefaultsConfig)
     workflow_dirs: list[RelativeProjectPath] = pydantic.Field(default_factory=_default_workflow_dirs)
     journal: JournalConfig = pydantic.Field(default_factory=JournalConfig)
+    cache: CacheConfig = pydantic.Field(default_factory=CacheConfig)
+    state: StateConfig = pydantic.Field(default_factory=StateConfig)
+    listing: ListingConfig = pydantic.Field(default_factory=ListingConfig)
 
     @pydantic.field_validator("session_dir", mode="after")
     @classmethod
@@ -147,6 +215,9 @@ class GlobalConfig[V]():
     def is_set(self) -> bool:
         return self._value is not None
 
+    def reset(self) -> None:
+        self._value = None
+
     def __call__(self) -> V:
         return self.get()
 
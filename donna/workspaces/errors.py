@@ -278,3 +278,22 @@ class GlobalConfigAlreadySet(InternalError):
 
 class GlobalConfigNotSet(InternalError):
     message = "Global config value is not set"
+
+
+class JournalStoreDisabled(WorkspaceError):
+    code: str = "donna.workspaces.journal_store_disabled"
+    message: str = "Journal records are not kept for this project."
+    ways_to_fix: list[str] = [
+        "Set `store = true` in the `[journal]` table of `donna.toml` to keep journal records for `donna journal`.",
+    ]
+
+
+class JournalFileWriteFailed(WorkspaceError):
+    code: str = "donna.workspaces.journal_file_write_failed"
+    message: str = "Journal file `{error.path}` can not be written: {error.details}"
+    ways_to_fix: list[str] = [
+        "Check that the directory of the journal file exists and is writable.",
+        "Change or omit `journal.file` to write the journal elsewhere.",
+    ]
+    path: str
+    details: str
@@ -1,16 +1,68 @@
+import hashlib
+import importlib.util
+import sys
+import time
+from collections.abc import Iterable, Mapping
 from pathlib import Path
 from stat import S_ISREG
 
+CONTENT_HASH_DIGEST_SIZE = 16
+
+# Filesystem timestamps come from a coarse clock (up to 2 seconds on FAT), so a file or directory changed within
+# this time after its metadata was taken may keep that metadata.
+TIMESTAMP_RESOLUTION_NS = 2_000_000_000
+
+# Content keys of files, by file path.
+FileContentKeys = dict[str, tuple[object, ...]]
+
+# Content keys of Python module sources, by module name.
+ModuleContentKeys = dict[str, tuple[object, ...]]
+
+# An imported module keeps its code while the process runs, so module sources are read once per command.
+_MODULE_CONTENT_KEYS: ModuleContentKeys = {}
+
+
+def content_hasher(content: bytes = b"") -> "hashlib.blake2b":
+    """Start a content hash that can be continued with `update` as content is appended."""
+    return hashlib.blake2b(content, digest_size=CONTENT_HASH_DIGEST_SIZE)
+
+
+def content_hash(content: bytes) -> str:
+    return content_hasher(content).hexdigest()
+
 
 class FileFingerprint:
-    __slots__ = ("mtime_ns", "size")
+    """File metadata, with a hash of the content computed on first need and memoized.
+
+    Editors and `git checkout` may keep modification time and size across content changes, but not the status
+    change time, which only the kernel sets. Coarse timestamps may still hide a rewrite made in the same tick,
+    so equal metadata is confirmed by the content hash unless the file was settled when the fingerprint was taken.
+    """
+
+    __slots__ = ("_content_hash", "ctime_ns", "mtime_ns", "path", "settled", "size")
 
-    def __init__(self, *, mtime_ns: int, size: int) -> None:
+    def __init__(  # noqa: CFQ002
+        self,
+        *,
+        mtime_ns: int,
+        size: int,
+        ctime_ns: int = 0,
+        settled: bool = False,
+        path: Path | None = None,
+        content_hash: str | None = None,
+    ) -> None:
         self.mtime_ns = mtime_ns
         self.size = size
+        self.ctime_ns = ctime_ns
+        self.settled = settled
+        self.path = path
+        self._content_hash = content_hash
 
     @classmethod
-    def from_path(cls, path: Path) -> "FileFingerprint | None":
+    def from_path(cls, path: Path, digest: str | None = None) -> "FileFingerprint | None":
+        """Take the fingerprint of the file, `digest` is the hash of the content just read from or written to it."""
+        taken_ns = time.time_ns()
+
         try:
             file_stat = path.stat()
         except FileNotFoundError:
@@ -19,10 +71,110 @@ class FileFingerprint:
         if not S_ISREG(file_stat.st_mode):
             return None
 
-        return cls(mtime_ns=file_stat.st_mtime_ns, size=file_stat.st_size)
+        fingerprint = cls(
+            mtime_ns=file_stat.st_mtime_ns,
+            size=file_stat.st_size,
+            ctime_ns=file_stat.st_ctime_ns,
+            settled=max(file_stat.st_mtime_ns, file_stat.st_ctime_ns) + TIMESTAMP_RESOLUTION_NS < taken_ns,
+            path=path,
+            content_hash=digest,
+        )
+
+        # A file changed in the current timestamp tick may change again without new metadata, a hash taken on
+        # comparison would see that later content, so it is taken right away.
+        if not fingerprint.settled:
+            _ = fingerprint.content_hash
+
+        return fingerprint
+
+    @property
+    def content_hash(self) -> str | None:
+        if self._content_hash is None and self.path is not None:
+            try:
+                self._content_hash = content_hash(self.path.read_bytes())
+            except OSError:
+                return None
+
+        return self._content_hash
+
+    def content_key(self) -> tuple[object, ...]:
+        """Identify the file content for persistent caches, by its hash when the file can be read."""
+        digest = self.content_hash
+
+        if digest is None:
+            return ("stat", self.mtime_ns, self.size)
+
+        return ("blake2b", digest)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, FileFingerprint):
             return NotImplemented
 
-        return self.mtime_ns == other.mtime_ns and self.size == other.size
+        if (self.mtime_ns, self.ctime_ns, self.size) != (other.mtime_ns, other.ctime_ns, other.size):
+            return False
+
+        if self.settled and other.settled:
+            return True
+
+        return self.content_hash == other.content_hash
+
+
+def content_keys(paths: Iterable[str]) -> FileContentKeys:
+    keys: FileContentKeys = {}
+
+    for path in paths:
+        fingerprint = FileFingerprint.from_path(Path(path))
+        if fingerprint is not None:
+            keys[path] = fingerprint.content_key()
+
+    return keys
+
+
+def content_keys_changed(keys: Mapping[str, tuple[object, ...]]) -> bool:
+    """Check whether any of the files was changed or removed since its content keys were taken."""
+    return content_keys(keys) != keys
+
+
+def _module_path(module_name: str) -> str | None:
+    module = sys.modules.get(module_name)
+
+    if module is not None:
+        path: str | None = getattr(module, "__file__", None)
+        return path
+
+    # Modules of cached artifacts may be not imported yet, their source is located without running them.
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+
+    if spec is None or not spec.has_location:
+        return None
+
+    return spec.origin
+
+
+def module_content_key(module_name: str) -> tuple[object, ...]:
+    key = _MODULE_CONTENT_KEYS.get(module_name)
+
+    if key is None:
+        path = _module_path(module_name)
+        fingerprint = FileFingerprint.from_path(Path(path)) if path is not None else None
+        key = fingerprint.content_key() if fingerprint is not None else ("missing",)
+        _MODULE_CONTENT_KEYS[module_name] = key
+
+    return key
+
+
+def module_content_keys(module_names: Iterable[str]) -> ModuleContentKeys:
+    """Identify the code of Python modules, for persisted data derived from it, like renders of custom primitives."""
+    return {module_name: module_content_key(module_name) for module_name in sorted(set(module_names))}
+
+
+def module_content_keys_changed(keys: Mapping[str, tuple[object, ...]]) -> bool:
+    return any(module_content_key(module_name) != key for module_name, key in keys.items())
+
+
+def forget_module_content_keys() -> None:
+    """Read module sources again, for processes that serve several commands."""
+    _MODULE_CONTENT_KEYS.clear()
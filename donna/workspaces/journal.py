@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import atexit
+import pathlib
+import queue
 import subprocess  # noqa: S404
-from typing import TYPE_CHECKING
+import tempfile
+import threading
+from typing import IO, Protocol, Sequence
 
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Ok, Result, unwrap_to_error
+from donna.protocol.journal import JournalRecord, serialize_record
 from donna.workspaces import errors as workspace_errors
-from donna.workspaces.config import JournalRecordAttribute
+from donna.workspaces import journal_store
+from donna.workspaces.config import JournalCommandMode, JournalConfig, JournalDelivery, JournalRecordAttribute
 
-if TYPE_CHECKING:
-    from donna.protocol.journal import JournalRecord
+# Seconds a coprocess journal command has to exit after its stdin is closed.
+COPROCESS_EXIT_TIMEOUT = 10
 
 
 def _is_variable_argument(argument: str) -> bool:
@@ -67,18 +74,9 @@ def _build_command_args(command: list[str], record: JournalRecord) -> Result[lis
     return Ok(args)
 
 
-@unwrap_to_error
-def write_record(record: JournalRecord) -> Result[None, ErrorsList]:
-    from donna.workspaces import config as workspace_config
-
-    command = workspace_config.config().journal.cmd
-    if command is None:
-        return Ok(None)
-
-    args = _build_command_args(command, record).unwrap()
-
+def _run_command(args: list[str], stdin: str = "") -> Result[None, ErrorsList]:
     try:
-        result = subprocess.run(args, check=False, capture_output=True, text=True)  # noqa: S603
+        result = subprocess.run(args, check=False, capture_output=True, text=True, input=stdin)  # noqa: S603
     except OSError as e:
         return Err(
             [
@@ -107,3 +105,354 @@ def write_record(record: JournalRecord) -> Result[None, ErrorsList]:
         )
 
     return Ok(None)
+
+
+class JournalSink(Protocol):
+    def write(self, records: Sequence[JournalRecord]) -> Result[None, ErrorsList]: ...  # noqa: E704
+
+    def close(self) -> Result[None, ErrorsList]: ...  # noqa: E704
+
+
+class FileJournalSink:
+    """Append records to a JSONL file, one serialized record per line."""
+
+    __slots__ = ("_path",)
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self._path = path
+
+    def write(self, records: Sequence[JournalRecord]) -> Result[None, ErrorsList]:
+        content = b"".join(serialize_record(record) + b"\n" for record in records)
+
+        try:
+            # A single append keeps lines of concurrent writers whole.
+            with self._path.open("ab") as stream:
+                stream.write(content)
+        except OSError as e:
+            return Err([workspace_errors.JournalFileWriteFailed(path=str(self._path), details=str(e))])
+
+        return Ok(None)
+
+    def close(self) -> Result[None, ErrorsList]:
+        return Ok(None)
+
+
+class StoreJournalSink:
+    """Append records to the journal store in the session directory."""
+
+    __slots__ = ()
+
+    def write(self, records: Sequence[JournalRecord]) -> Result[None, ErrorsList]:
+        try:
+            journal_store.append_records(records)
+        except OSError as e:
+            return Err([workspace_errors.JournalFileWriteFailed(path=str(e.filename), details=str(e))])
+
+        return Ok(None)
+
+    def close(self) -> Result[None, ErrorsList]:
+        return Ok(None)
+
+
+class CommandJournalSink:
+    """Run the configured command once per record."""
+
+    __slots__ = ("_command",)
+
+    def __init__(self, command: list[str]) -> None:
+        self._command = command
+
+    @unwrap_to_error
+    def write(self, records: Sequence[JournalRecord]) -> Result[None, ErrorsList]:
+        for record in records:
+            args = _build_command_args(self._command, record).unwrap()
+            _run_command(args).unwrap()
+
+        return Ok(None)
+
+    def close(self) -> Result[None, ErrorsList]:
+        return Ok(None)
+
+
+class BatchCommandJournalSink:
+    """Run the configured command once per batch of records and write them to its stdin as JSON lines."""
+
+    __slots__ = ("_command",)
+
+    def __init__(self, command: list[str]) -> None:
+        self._command = command
+
+    def write(self, records: Sequence[JournalRecord]) -> Result[None, ErrorsList]:
+        # Serialized records are JSON, so they are valid UTF-8 text.
+        content = b"".join(serialize_record(record) + b"\n" for record in records).decode("utf-8")
+        return _run_command(self._command, stdin=content)
+
+    def close(self) -> Result[None, ErrorsList]:
+        return Ok(None)
+
+
+class CoprocessJournalSink:
+    """Start the configured command once and write records to its stdin as JSON lines."""
+
+    __slots__ = ("_command", "_process", "_stderr")
+
+    def __init__(self, command: list[str]) -> None:
+        self._command = command
+        self._process: subprocess.Popen[bytes] | None = None
+        # A file instead of a pipe, so a chatty command can not block on a full stderr pipe.
+        self._stderr: IO[bytes] | None = None
+
+    def _error(self, details: str) -> workspace_errors.JournalCommandFailed:
+        returncode = self._process.poll() if self._process is not None else None
+        stderr = self._read_stderr()
+
+        if stderr:
+            details = f"{details}; stderr: {stderr}"
+
+        return workspace_errors.JournalCommandFailed(command=self._command, returncode=returncode, details=details)
+
+    def _read_stderr(self) -> str:
+        if self._stderr is None:
+            return ""
+
+        self._stderr.seek(0)
+        return self._stderr.read().decode("utf-8", errors="replace").strip()
+
+    def _start(self) -> subprocess.Popen[bytes]:
+        if self._process is None:
+            if self._stderr is None:
+                self._stderr = tempfile.TemporaryFile()
+
+            self._process = subprocess.Popen(  # noqa: S603
+                self._command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._stderr
+            )
+
+        return self._process
+
+    def write(self, records: Sequence[JournalRecord]) -> Result[None, ErrorsList]:
+        content = b"".join(serialize_record(record) + b"\n" for record in records)
+
+        try:
+            process = self._start()
+            assert process.stdin is not None
+            process.stdin.write(content)
+            process.stdin.flush()
+        except OSError as e:
+            return Err([self._error(str(e))])
+
+        return Ok(None)
+
+    def _wait(self, process: subprocess.Popen[bytes]) -> ErrorsList:
+        assert process.stdin is not None
+
+        try:
+            process.stdin.close()
+        except OSError:
+            # The command has already exited, its exit code is reported below.
+            pass
+
+        try:
+            returncode = process.wait(timeout=COPROCESS_EXIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            return [self._error(f"the command did not exit in {COPROCESS_EXIT_TIMEOUT} seconds after its input ended")]
+
+        if returncode != 0:
+            return [self._error(f"exit code {returncode}")]
+
+        return []
+
+    def close(self) -> Result[None, ErrorsList]:
+        errors = self._wait(self._process) if self._process is not None else []
+
+        if self._stderr is not None:
+            self._stderr.close()
+
+        self._process = None
+        self._stderr = None
+
+        if errors:
+            return Err(errors)
+
+        return Ok(None)
+
+
+def _write_to_sinks(sinks: Sequence[JournalSink], records: Sequence[JournalRecord]) -> ErrorsList:
+    errors: ErrorsList = []
+
+    for sink in sinks:
+        result = sink.write(records)
+
+        if result.is_err():
+            errors.extend(result.unwrap_err())
+
+    return errors
+
+
+def _close_sinks(sinks: Sequence[JournalSink]) -> ErrorsList:
+    errors: ErrorsList = []
+
+    for sink in sinks:
+        result = sink.close()
+
+        if result.is_err():
+            errors.extend(result.unwrap_err())
+
+    return errors
+
+
+class JournalWriter:
+    """Deliver every record to the sinks before returning."""
+
+    __slots__ = ("_sinks",)
+
+    def __init__(self, sinks: Sequence[JournalSink]) -> None:
+        self._sinks = list(sinks)
+
+    def write(self, record: JournalRecord) -> Result[None, ErrorsList]:
+        errors = _write_to_sinks(self._sinks, [record])
+
+        if errors:
+            return Err(errors)
+
+        return Ok(None)
+
+    def close(self) -> Result[None, ErrorsList]:
+        errors = _close_sinks(self._sinks)
+
+        if errors:
+            return Err(errors)
+
+        return Ok(None)
+
+
+class BackgroundJournalWriter:
+    """Deliver records to the sinks from a background thread.
+
+    Records queued while a batch is delivered form the next batch. Delivery errors are reported by the next
+    `write` or by `close`, which flushes the queue and is also called at process exit.
+    """
+
+    __slots__ = ("_batch_size", "_errors", "_lock", "_queue", "_sinks", "_thread")
+
+    def __init__(self, sinks: Sequence[JournalSink], batch_size: int) -> None:
+        self._sinks = list(sinks)
+        self._batch_size = batch_size
+        self._errors: ErrorsList = []
+        self._lock = threading.Lock()
+        self._queue: queue.SimpleQueue[JournalRecord | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._deliver, name="donna-journal", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _take_errors(self) -> ErrorsList:
+        with self._lock:
+            errors = self._errors
+            self._errors = []
+
+        return errors
+
+    def _next_batch(self) -> tuple[list[JournalRecord], bool]:
+        record = self._queue.get()
+        if record is None:
+            return [], True
+
+        batch = [record]
+
+        while len(batch) < self._batch_size:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if record is None:
+                return batch, True
+
+            batch.append(record)
+
+        return batch, False
+
+    def _deliver(self) -> None:
+        closed = False
+
+        while not closed:
+            batch, closed = self._next_batch()
+
+            if not batch:
+                continue
+
+            errors = _write_to_sinks(self._sinks, batch)
+
+            with self._lock:
+                self._errors.extend(errors)
+
+    def write(self, record: JournalRecord) -> Result[None, ErrorsList]:
+        self._queue.put(record)
+
+        errors = self._take_errors()
+        if errors:
+            return Err(errors)
+
+        return Ok(None)
+
+    def close(self) -> Result[None, ErrorsList]:
+        atexit.unregister(self.close)
+
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+        errors = self._take_errors() + _close_sinks(self._sinks)
+
+        if errors:
+            return Err(errors)
+
+        return Ok(None)
+
+
+def build_sinks(journal_config: JournalConfig) -> list[JournalSink]:
+    from donna.workspaces.config import project_dir
+
+    sinks: list[JournalSink] = []
+
+    if journal_config.store:
+        sinks.append(StoreJournalSink())
+
+    if journal_config.file is not None:
+        sinks.append(FileJournalSink(project_dir() / journal_config.file))
+
+    if journal_config.cmd is not None:
+        sinks.append(_build_command_sink(journal_config.cmd_mode, journal_config.cmd))
+
+    return sinks
+
+
+def _build_command_sink(mode: JournalCommandMode, command: list[str]) -> JournalSink:
+    match mode:
+        case JournalCommandMode.per_record:
+            return CommandJournalSink(command)
+        case JournalCommandMode.coprocess:
+            return CoprocessJournalSink(command)
+        case JournalCommandMode.batch:
+            return BatchCommandJournalSink(command)
+
+    raise AssertionError(f"Unsupported journal command mode: {mode}")
+
+
+def open_writer() -> JournalWriter | BackgroundJournalWriter:
+    from donna.workspaces import config as workspace_config
+
+    journal_config = workspace_config.config().journal
+    sinks = build_sinks(journal_config)
+
+    if journal_config.delivery == JournalDelivery.background and sinks:
+        return BackgroundJournalWriter(sinks, journal_config.batch_size)
+
+    return JournalWriter(sinks)
+
+
+def write_record(record: JournalRecord) -> Result[None, ErrorsList]:
+    from donna.workspaces import config as workspace_config
+
+    return JournalWriter(build_sinks(workspace_config.config().journal)).write(record)
@@ -0,0 +1,264 @@
+import fcntl
+import os
+import tempfile
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+import pydantic
+
+from donna.core.entities import BaseEntity
+from donna.core.errors import ErrorsList
+from donna.core.result import Err, Ok, Result
+from donna.domain.artifact_ids import ArtifactSectionId
+from donna.domain.constants import JOURNAL_DIR_NAME
+from donna.domain.internal_ids import TaskId
+from donna.domain.paths import ResolvedProjectPath
+from donna.protocol.journal import JournalRecord, serialize_record
+from donna.workspaces import errors as workspace_errors
+from donna.workspaces import sessions
+
+# Records are appended to numbered JSONL segment files, a full segment is never written again.
+# The index keeps task and operation ids of every segment, so filtered queries read only the segments
+# that may contain matching records.
+SEGMENT_MAX_RECORDS = 1024
+INDEX_FILE_NAME = "index.json"
+# Writers of several `donna` processes take this lock, so none of them overwrites the index of another.
+LOCK_FILE_NAME = "index.lock"
+
+# Seconds between checks of the index when following the journal.
+FOLLOW_POLL_INTERVAL = 0.2
+
+
+class JournalSegment(BaseEntity):
+    number: int
+    records: int = 0
+    task_ids: set[TaskId] = pydantic.Field(default_factory=set)
+    operation_ids: set[ArtifactSectionId] = pydantic.Field(default_factory=set)
+
+
+class JournalIndex(BaseEntity):
+    segments: list[JournalSegment] = pydantic.Field(default_factory=list)
+
+
+class JournalQuery:
+    __slots__ = ("operation_id", "task_id")
+
+    def __init__(self, task_id: TaskId | None = None, operation_id: ArtifactSectionId | None = None) -> None:
+        self.task_id = task_id
+        self.operation_id = operation_id
+
+    def matches(self, record: JournalRecord) -> bool:
+        if self.task_id is not None and record.current_task_id != self.task_id:
+            return False
+
+        return self.operation_id is None or record.current_operation_id == self.operation_id
+
+    def may_match(self, segment: JournalSegment) -> bool:
+        if self.task_id is not None and self.task_id not in segment.task_ids:
+            return False
+
+        return self.operation_id is None or self.operation_id in segment.operation_ids
+
+
+class JournalPosition:
+    """Position right after the last complete record of a segment."""
+
+    __slots__ = ("offset", "segment")
+
+    def __init__(self, segment: int, offset: int) -> None:
+        self.segment = segment
+        self.offset = offset
+
+
+def store_dir() -> ResolvedProjectPath:
+    path = ResolvedProjectPath(sessions.dir() / JOURNAL_DIR_NAME)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def require_enabled() -> Result[None, ErrorsList]:
+    from donna.workspaces import config as workspace_config
+
+    if not workspace_config.config().journal.store:
+        return Err([workspace_errors.JournalStoreDisabled()])
+
+    return Ok(None)
+
+
+def _index_path() -> ResolvedProjectPath:
+    return ResolvedProjectPath(store_dir() / INDEX_FILE_NAME)
+
+
+@contextmanager
+def _write_lock() -> Iterator[None]:
+    with ResolvedProjectPath(store_dir() / LOCK_FILE_NAME).open("ab") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        yield
+
+
+def _segment_path(number: int) -> ResolvedProjectPath:
+    return ResolvedProjectPath(store_dir() / f"segment-{number:06d}.jsonl")
+
+
+def _decode_record(line: bytes) -> JournalRecord | None:
+    try:
+        return JournalRecord.model_validate_json(line)
+    except pydantic.ValidationError:
+        return None
+
+
+def _read_segment(number: int, start: int = 0, end: int | None = None) -> tuple[list[JournalRecord], int]:
+    """Read complete records between the byte offsets and return them with the offset after the last one."""
+    try:
+        with _segment_path(number).open("rb") as stream:
+            stream.seek(start)
+            content = stream.read() if end is None else stream.read(max(end - start, 0))
+    except FileNotFoundError:
+        return [], start
+
+    # A record is complete only with its line end, the rest may be appended right now.
+    complete = content[: content.rfind(b"\n") + 1]
+    records = [record for line in complete.splitlines() if (record := _decode_record(line)) is not None]
+
+    return records, start + len(complete)
+
+
+def _rebuild_index() -> JournalIndex:
+    segments = []
+
+    for path in sorted(store_dir().glob("segment-*.jsonl")):
+        number = int(path.stem.removeprefix("segment-"))
+        records, _ = _read_segment(number)
+        segments.append(_add_to_segment(JournalSegment(number=number), records))
+
+    return JournalIndex(segments=segments)
+
+
+def load_index() -> JournalIndex:
+    try:
+        return JournalIndex.from_json(_index_path().read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return _rebuild_index()
+    except pydantic.ValidationError:
+        # The index is rewritten atomically, a broken one is left by something other than Donna.
+        return _rebuild_index()
+
+
+def _save_index(index: JournalIndex) -> None:
+    path = _index_path()
+
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".", suffix=".tmp", delete=False) as temp_file:
+        temp_file.write(index.model_dump_json().encode("utf-8"))
+
+    os.replace(temp_file.name, path)
+
+
+def index_stat() -> tuple[int, int, int] | None:
+    """Identify the index version by its metadata, the index is replaced by a new file on every write."""
+    try:
+        index_stat = os.stat(_index_path())
+    except FileNotFoundError:
+        return None
+
+    return (index_stat.st_ino, index_stat.st_mtime_ns, index_stat.st_size)
+
+
+def _add_to_segment(segment: JournalSegment, records: Sequence[JournalRecord]) -> JournalSegment:
+    return segment.replace(
+        records=segment.records + len(records),
+        task_ids=segment.task_ids | {record.current_task_id for record in records if record.current_task_id},
+        operation_ids=segment.operation_ids
+        | {record.current_operation_id for record in records if record.current_operation_id},
+    )
+
+
+def append_records(records: Sequence[JournalRecord]) -> None:
+    # Readers need no lock: segments only grow and the index is replaced atomically.
+    with _write_lock():
+        _append_records(records)
+
+
+def _append_records(records: Sequence[JournalRecord]) -> None:
+    index = load_index()
+    segments = list(index.segments)
+
+    if not segments:
+        segments.append(JournalSegment(number=1))
+
+    while records:
+        segment = segments[-1]
+
+        if segment.records >= SEGMENT_MAX_RECORDS:
+            segment = JournalSegment(number=segment.number + 1)
+            segments.append(segment)
+
+        chunk = records[: SEGMENT_MAX_RECORDS - segment.records]
+        records = records[len(chunk) :]
+
+        with _segment_path(segment.number).open("ab") as stream:
+            stream.write(b"".join(serialize_record(record) + b"\n" for record in chunk))
+
+        segments[-1] = _add_to_segment(segment, chunk)
+
+    _save_index(JournalIndex(segments=segments))
+
+
+def end_position(index: JournalIndex) -> JournalPosition:
+    if not index.segments:
+        return JournalPosition(segment=1, offset=0)
+
+    number = index.segments[-1].number
+    _, offset = _read_segment(number)
+    return JournalPosition(segment=number, offset=offset)
+
+
+def tail(count: int, query: JournalQuery, position: JournalPosition) -> list[JournalRecord]:
+    """Return the last `count` records matching the query that were written before the position."""
+    found: list[JournalRecord] = []
+    segments = [
+        segment for segment in load_index().segments if segment.number <= position.segment and query.may_match(segment)
+    ]
+
+    for segment in reversed(segments):
+        if len(found) >= count:
+            break
+
+        end = position.offset if segment.number == position.segment else None
+        records, _ = _read_segment(segment.number, end=end)
+        found = [record for record in records if query.matches(record)] + found
+
+    return found[max(len(found) - count, 0) :]
+
+
+def read_after(query: JournalQuery, position: JournalPosition) -> tuple[list[JournalRecord], JournalPosition]:
+    """Return records matching the query written after the position, with the position after them."""
+    found: list[JournalRecord] = []
+
+    for segment in load_index().segments:
+        if segment.number < position.segment:
+            continue
+
+        start = position.offset if segment.number == position.segment else 0
+        records, offset = _read_segment(segment.number, start=start)
+        found.extend(record for record in records if query.matches(record))
+        position = JournalPosition(segment=segment.number, offset=offset)
+
+    return found, position
+
+
+def follow(query: JournalQuery, position: JournalPosition) -> Iterator[JournalRecord]:
+    """Yield new records matching the query as they are written, forever."""
+    seen: tuple[int, int, int] | None = None
+
+    while True:
+        # Only the index metadata is polled, segments are read when the index is written again.
+        current = index_stat()
+
+        if current is None or current == seen:
+            time.sleep(FOLLOW_POLL_INTERVAL)
+            continue
+
+        seen = current
+        records, position = read_after(query, position)
+        yield from records
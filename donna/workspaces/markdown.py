@@ -1,6 +1,10 @@
 import enum
-from typing import cast
+import re
+from collections.abc import Mapping
+from functools import cache
+from typing import Annotated, cast
 
+import pydantic
 from markdown_it import MarkdownIt
 from markdown_it.token import Token
 from markdown_it.tree import SyntaxTreeNode
@@ -12,6 +16,17 @@ from donna.core.result import Err, Ok, Result, unwrap_to_error
 from donna.domain.artifact_ids import ArtifactId
 from donna.workspaces import errors as world_errors
 
+_FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_SECTION_HEADING_PATTERN = re.compile(r"^ {0,3}#{1,2}(?:[ \t]|$)")
+# Heading text without characters that mdformat escapes or normalizes, it is rendered back unchanged.
+_PLAIN_TITLE_PATTERN = re.compile(r"[^\\*_\[\]<`&\t\n]*")
+
+# The renderer keeps no state between calls.
+_RENDERER = MDRenderer()
+
+# Rendered markdown keeps its whitespace, entities strip strings by default.
+_RenderedMarkdown = Annotated[str, pydantic.StringConstraints(strip_whitespace=False)]
+
 
 class SectionLevel(str, enum.Enum):
     h1 = "h1"
@@ -50,10 +65,25 @@ class SectionSource(BaseEntity):
     title: str | None
     configs: list[CodeSource]
 
-    original_tokens: list[Token]
-    analysis_tokens: list[Token]
+    # Sections keep their body rendered back to markdown, token streams are dropped once parsing is done.
+    original_markdown: _RenderedMarkdown = ""
+    analysis_markdown: _RenderedMarkdown = ""
+
+    # Directive outputs that differ between render modes are kept in markdown as markers (see `templates.DualRender`)
+    original_values: dict[str, str] = pydantic.Field(default_factory=dict)
+    analysis_values: dict[str, str] = pydantic.Field(default_factory=dict)
 
-    def _as_markdown(self, tokens: list[Token], with_title: bool) -> str:
+    # Tokens collected by `parse`, they are rendered once by `_rendered` and released.
+    _tokens: list[Token] = pydantic.PrivateAttr(default_factory=list)
+
+    def _rendered(self) -> "SectionSource":
+        body = render_back(self._tokens)
+        self._tokens = []
+
+        # Until an analysis render is attached, both modes share the same markdown.
+        return self.replace(original_markdown=body, analysis_markdown=body)
+
+    def _as_markdown(self, body: str, values: dict[str, str], with_title: bool) -> str:
         parts = []
 
         if with_title and self.title is not None:
@@ -65,15 +95,15 @@ class SectionSource(BaseEntity):
 
             parts.append(f"{prefix} {self.title}")
 
-        parts.append(render_back(tokens))
+        parts.append(substitute_values(body, values))
 
         return "\n".join(parts)
 
     def as_original_markdown(self, with_title: bool) -> str:
-        return self._as_markdown(self.original_tokens, with_title)
+        return self._as_markdown(self.original_markdown, self.original_values, with_title)
 
     def as_analysis_markdown(self, with_title: bool) -> str:
-        return self._as_markdown(self.analysis_tokens, with_title)
+        return self._as_markdown(self.analysis_markdown, self.analysis_values, with_title)
 
     def config(self) -> Result[dict[str, object], ErrorsList]:
         config_blocks = [config for config in self.configs if "config" in config.properties]
@@ -92,8 +122,11 @@ class SectionSource(BaseEntity):
         data = config_blocks[0].structured_data().unwrap()
         return Ok(cast(dict[str, object], data))
 
+    def scripts(self) -> list[CodeSource]:
+        return [config for config in self.configs if "script" in config.properties]
+
     def script(self) -> Result[str | None, ErrorsList]:
-        script_blocks = [config.content for config in self.configs if "script" in config.properties]
+        script_blocks = [config.content for config in self.scripts()]
         if len(script_blocks) > 1:
             return Err(
                 [
@@ -109,17 +142,73 @@ class SectionSource(BaseEntity):
         return Ok(script_blocks[0])
 
 
+@cache
+def _commonmark() -> MarkdownIt:
+    # TODO: later we may want to customize it with plugins
+    return MarkdownIt("commonmark")
+
+
 def render_back(tokens: list[Token]) -> str:
-    renderer = MDRenderer()
-    return renderer.render(tokens, {}, {})
+    return _RENDERER.render(tokens, {}, {})
+
+
+def normalize(text: str) -> str:
+    return render_back(_commonmark().parse(text))
+
+
+def substitute_values(text: str, values: Mapping[str, str]) -> str:
+    for marker, value in values.items():
+        text = text.replace(marker, value)
+
+    return text
+
+
+# Splits source text by ATX h1/h2 headings outside fenced code blocks, i.e. by the boundaries of `parse` sections.
+# Setext headings and headings produced by templates are not detected, so callers must verify the result.
+def split_sections(text: str) -> list[str]:  # noqa: CCR001
+    slices: list[list[str]] = [[]]
+    fence: str | None = None
+
+    for line in text.splitlines(keepends=True):
+        if fence is not None:
+            stripped = line.strip()
+
+            if stripped.startswith(fence) and stripped == fence[0] * len(stripped):
+                fence = None
+
+            slices[-1].append(line)
+            continue
+
+        fence_match = _FENCE_PATTERN.match(line)
+        if fence_match is not None:
+            fence = fence_match.group(1)
+        elif _SECTION_HEADING_PATTERN.match(line) and "".join(slices[-1]).strip():
+            slices.append([])
+
+        slices[-1].append(line)
+
+    return ["".join(lines) for lines in slices]
 
 
 def clear_heading(text: str) -> str:
     return text.lstrip("#").strip()
 
 
+def heading_title(node: SyntaxTreeNode) -> str:
+    """Take the heading title from its inline text, render the heading back only when the title has markup."""
+    inline = node.children[0] if node.children else None
+
+    if inline is not None and len(inline.children) == 1 and inline.children[0].type == "text":
+        content = inline.children[0].content
+
+        if _PLAIN_TITLE_PATTERN.fullmatch(content) and "  " not in content and not content.endswith("#"):
+            return content
+
+    return clear_heading(render_back(node.to_tokens()).strip())
+
+
 def _parse_h1(
-    sections: list[SectionSource], node: SyntaxTreeNode, artifact_id: ArtifactId | None
+    sections: list[SectionSource], node: SyntaxTreeNode, artifact_id: ArtifactId | None, values: Mapping[str, str]
 ) -> Result[SyntaxTreeNode | None, ErrorsList]:
     if sections and any(section.level == SectionLevel.h1 for section in sections):
         return Err([world_errors.MarkdownMultipleH1Sections(artifact_id=artifact_id)])
@@ -129,9 +218,7 @@ def _parse_h1(
 
     new_section = SectionSource(
         level=SectionLevel.h1,
-        title=clear_heading(render_back(node.to_tokens()).strip()),
-        original_tokens=[],
-        analysis_tokens=[],
+        title=substitute_values(heading_title(node), values),
         configs=[],
     )
 
@@ -141,7 +228,7 @@ def _parse_h1(
 
 
 def _parse_h2(
-    sections: list[SectionSource], node: SyntaxTreeNode, artifact_id: ArtifactId | None
+    sections: list[SectionSource], node: SyntaxTreeNode, artifact_id: ArtifactId | None, values: Mapping[str, str]
 ) -> Result[SyntaxTreeNode | None, ErrorsList]:
 
     if not sections:
@@ -149,9 +236,7 @@ def _parse_h2(
 
     new_section = SectionSource(
         level=SectionLevel.h2,
-        title=clear_heading(render_back(node.to_tokens()).strip()),
-        original_tokens=[],
-        analysis_tokens=[],
+        title=substitute_values(heading_title(node), values),
         configs=[],
     )
 
@@ -161,19 +246,19 @@ def _parse_h2(
 
 
 def _parse_heading(
-    sections: list[SectionSource], node: SyntaxTreeNode, artifact_id: ArtifactId | None
+    sections: list[SectionSource], node: SyntaxTreeNode, artifact_id: ArtifactId | None, values: Mapping[str, str]
 ) -> Result[SyntaxTreeNode | None, ErrorsList]:
 
     if node.tag == "h1":
-        return _parse_h1(sections, node, artifact_id)
+        return _parse_h1(sections, node, artifact_id, values)
 
     if node.tag == "h2":
-        return _parse_h2(sections, node, artifact_id)
+        return _parse_h2(sections, node, artifact_id, values)
 
     if not sections:
         return Err([world_errors.MarkdownH1SectionMustBeFirst(artifact_id=artifact_id)])
 
-    sections[-1].original_tokens.extend(node.to_tokens())
+    sections[-1]._tokens.extend(node.to_tokens())
 
     return Ok(node.next_sibling)
 
@@ -182,6 +267,7 @@ def _parse_fence(  # noqa: CCR001
     sections: list[SectionSource],
     node: SyntaxTreeNode,
     artifact_id: ArtifactId | None,
+    values: Mapping[str, str],
 ) -> Result[SyntaxTreeNode | None, ErrorsList]:
     if not sections:
         return Err([world_errors.MarkdownH1SectionMustBeFirst(artifact_id=artifact_id)])
@@ -191,14 +277,14 @@ def _parse_fence(  # noqa: CCR001
     info_parts = node.info.split()
 
     if not info_parts:
-        section.original_tokens.extend(node.to_tokens())
+        section._tokens.extend(node.to_tokens())
         return Ok(node.next_sibling)
 
     format = info_parts[0]
     markers = info_parts[1:]
 
     if "donna" not in markers:
-        section.original_tokens.extend(node.to_tokens())
+        section._tokens.extend(node.to_tokens())
         return Ok(node.next_sibling)
 
     if markers == ["donna"]:
@@ -217,7 +303,7 @@ def _parse_fence(  # noqa: CCR001
     code_block = CodeSource(
         format=format,
         properties=properties,
-        content=node.content,
+        content=substitute_values(node.content, values),
     )
 
     section.configs.append(code_block)
@@ -229,7 +315,7 @@ def _parse_nested(sections: list[SectionSource], node: SyntaxTreeNode) -> Syntax
 
     assert node.nester_tokens is not None
 
-    section.original_tokens.append(node.nester_tokens.opening)
+    section._tokens.append(node.nester_tokens.opening)
 
     return node.children[0]
 
@@ -237,7 +323,7 @@ def _parse_nested(sections: list[SectionSource], node: SyntaxTreeNode) -> Syntax
 def _parse_others(sections: list[SectionSource], node: SyntaxTreeNode) -> SyntaxTreeNode | None:
     section = sections[-1]
 
-    section.original_tokens.extend(node.to_tokens())
+    section._tokens.extend(node.to_tokens())
 
     current: SyntaxTreeNode | None = node
 
@@ -249,18 +335,19 @@ def _parse_others(sections: list[SectionSource], node: SyntaxTreeNode) -> Syntax
 
         if current.type != "root":
             assert current.nester_tokens is not None
-            section.original_tokens.append(current.nester_tokens.closing)
+            section._tokens.append(current.nester_tokens.closing)
 
     return current
 
 
 @unwrap_to_error
 def parse(  # noqa: CCR001, CFQ001
-    text: str, *, artifact_id: ArtifactId | None = None
+    text: str, *, artifact_id: ArtifactId | None = None, values: Mapping[str, str] | None = None
 ) -> Result[list[SectionSource], ErrorsList]:  # pylint: disable=R0912, R0915
-    md = MarkdownIt("commonmark")  # TODO: later we may want to customize it with plugins
+    # `values` are substituted into section titles and code blocks, which are extracted during parsing
+    values = values or {}
 
-    tokens = md.parse(text)
+    tokens = _commonmark().parse(text)
 
     # we do not need root node
     root = SyntaxTreeNode(tokens)
@@ -271,11 +358,11 @@ def parse(  # noqa: CCR001, CFQ001
     while node is not None:
 
         if node.type == "heading":
-            node = _parse_heading(sections, node, artifact_id).unwrap()
+            node = _parse_heading(sections, node, artifact_id, values).unwrap()
             continue
 
         if node.type == "fence":
-            node = _parse_fence(sections, node, artifact_id).unwrap()
+            node = _parse_fence(sections, node, artifact_id, values).unwrap()
             continue
 
         if node.is_nested:
@@ -289,4 +376,4 @@ def parse(  # noqa: CCR001, CFQ001
 
         node = node.next_sibling
 
-    return Ok(sections)
+    return Ok([section._rendered() for section in sections])
@@ -1,6 +1,8 @@
 import uuid
 from typing import ClassVar, Protocol, cast
 
+import jinja2
+
 from donna.core.errors import ErrorsList
 from donna.core.result import Err, Ok, Result, unwrap_to_error
 from donna.domain.artifact_ids import ArtifactId
@@ -12,7 +14,10 @@ from donna.machine.templates import RenderMode
 from donna.workspaces import errors as world_errors
 from donna.workspaces import markdown
 from donna.workspaces.artifacts import ArtifactRenderContext
-from donna.workspaces.templates import render
+from donna.workspaces.templates import DualRender, has_only_expressions, render, render_dual
+
+# Tail section slices are parsed after a stub head, because `markdown.parse` requires the h1 section first.
+SECTION_SLICE_HEAD = "# Section\n\n"
 
 
 class MarkdownSectionConstructor(Protocol):
@@ -102,17 +107,42 @@ class MarkdownSectionMixin:
 
 @unwrap_to_error
 def parse_artifact_content(
-    artifact_id: ArtifactId, text: str, render_context: ArtifactRenderContext
+    artifact_id: ArtifactId, text: str, render_context: ArtifactRenderContext, *, template_name: str | None = None
 ) -> Result[list[markdown.SectionSource], ErrorsList]:
-    # Parsing an artifact two times is not ideal, but it is straightforward approach that works for now.
-    # We should consider optimizing this in the future if performance or stability becomes an issue.
-    # For now let's wait till we have more artifact analysis logic and till more use cases emerge.
+    # Both render modes are produced by a single template pass and, when possible, parsed once.
+    rendered = render_dual(artifact_id, text, render_context, template_name=template_name).unwrap()
+
+    if rendered.diverged:
+        sections = _parse_render_modes_separately(
+            artifact_id, text, rendered, render_context, template_name=template_name
+        ).unwrap()
+    else:
+        sections = markdown.parse(rendered.text, artifact_id=artifact_id, values=rendered.original_values).unwrap()
 
-    original_markdown_source = render(artifact_id, text, render_context).unwrap()
-    original_sections = markdown.parse(original_markdown_source, artifact_id=artifact_id).unwrap()
+        for section in sections:
+            section.original_values.update(rendered.original_values)
+            section.analysis_values.update(rendered.analysis_values)
+
+    if not sections:
+        # return Environment errors
+        return Err([world_errors.MarkdownArtifactWithoutSections(artifact_id=artifact_id)])
+
+    return Ok(sections)
+
+
+@unwrap_to_error
+def _parse_render_modes_separately(
+    artifact_id: ArtifactId,
+    text: str,
+    rendered: DualRender,
+    render_context: ArtifactRenderContext,
+    *,
+    template_name: str | None = None,
+) -> Result[list[markdown.SectionSource], ErrorsList]:
+    original_sections = markdown.parse(rendered.original_text(), artifact_id=artifact_id).unwrap()
 
     analysis_context = render_context.replace(primary_mode=RenderMode.analysis)
-    analyzed_markdown_source = render(artifact_id, text, analysis_context).unwrap()
+    analyzed_markdown_source = render(artifact_id, text, analysis_context, template_name=template_name).unwrap()
     analyzed_sections = markdown.parse(analyzed_markdown_source, artifact_id=artifact_id).unwrap()
 
     if len(original_sections) != len(analyzed_sections):
@@ -122,14 +152,12 @@ def parse_artifact_content(
             analyzed_count=len(analyzed_sections),
         )
 
-    if not original_sections:
-        # return Environment errors
-        return Err([world_errors.MarkdownArtifactWithoutSections(artifact_id=artifact_id)])
-
-    for original, analyzed in zip(original_sections, analyzed_sections):
-        original.analysis_tokens.extend(analyzed.original_tokens)
-
-    return Ok(original_sections)
+    return Ok(
+        [
+            original.replace(analysis_markdown=analyzed.original_markdown)
+            for original, analyzed in zip(original_sections, analyzed_sections)
+        ]
+    )
 
 
 def construct_artifact_from_bytes(
@@ -151,7 +179,7 @@ def construct_artifact_from_bytes(
 
 
 @unwrap_to_error
-def construct_artifact_from_markdown_source(  # noqa: CCR001
+def construct_artifact_from_markdown_source(
     artifact_id: ArtifactId,
     content: str,
     render_context: ArtifactRenderContext,
@@ -160,7 +188,105 @@ def construct_artifact_from_markdown_source(  # noqa: CCR001
     default_primary_section_id: SectionId,
 ) -> Result[Artifact, ErrorsList]:
     original_sections = parse_artifact_content(artifact_id, content, render_context).unwrap()
-    head_config = dict(original_sections[0].config().unwrap())
+
+    primary_section = construct_primary_section_from_markdown(
+        artifact_id=artifact_id,
+        source=original_sections[0],
+        default_primary_section_kind=default_primary_section_kind,
+        default_primary_section_id=default_primary_section_id,
+    ).unwrap()
+
+    sections = construct_sections_from_markdown(
+        artifact_id=artifact_id,
+        sections=original_sections[1:],
+        default_section_kind=default_section_kind,
+    ).unwrap()
+    sections = [primary_section, *sections]
+    return Ok(Artifact(id=artifact_id, sections=sections))
+
+
+@unwrap_to_error
+def construct_section_from_markdown_source(  # noqa: CCR001, CFQ002
+    artifact_id: ArtifactId,
+    content: str,
+    structure: Artifact,
+    section_id: SectionId,
+    render_context: ArtifactRenderContext,
+    default_section_kind: PythonPath,
+    default_primary_section_kind: PythonPath,
+    default_primary_section_id: SectionId,
+) -> Result[ArtifactSection | None, ErrorsList]:
+    """Render only the template slice of a single section.
+
+    `structure` is the same artifact rendered in another mode, it is used to locate the section and to verify
+    the slice. Returns `None` when the artifact can not be sliced safely and must be rendered as a whole.
+    """
+    section_number = structure.get_section_number(section_id)
+
+    if section_number is None or not has_only_expressions(content):
+        return Ok(None)
+
+    section_templates = markdown.split_sections(content)
+
+    if len(section_templates) != len(structure.sections):
+        return Ok(None)
+
+    primary = section_number == 0
+    section_template = section_templates[section_number]
+
+    if not primary:
+        section_template = SECTION_SLICE_HEAD + section_template
+
+    try:
+        parsed = parse_artifact_content(
+            artifact_id, section_template, render_context, template_name=f"{artifact_id}#{section_id}"
+        )
+    except jinja2.TemplateSyntaxError:
+        return Ok(None)
+
+    # Errors are reported by the whole artifact render, so that they do not depend on slicing.
+    if parsed.is_err():
+        return Ok(None)
+
+    sources = parsed.unwrap()
+
+    if len(sources) != (1 if primary else 2):
+        return Ok(None)
+
+    if primary:
+        constructed = construct_primary_section_from_markdown(
+            artifact_id=artifact_id,
+            source=sources[0],
+            default_primary_section_kind=default_primary_section_kind,
+            default_primary_section_id=default_primary_section_id,
+        )
+    else:
+        constructed = construct_sections_from_markdown(
+            artifact_id=artifact_id,
+            sections=sources[1:],
+            default_section_kind=default_section_kind,
+        ).map(lambda sections: sections[0])
+
+    if constructed.is_err():
+        return Ok(None)
+
+    section = constructed.unwrap()
+    expected = structure.sections[section_number]
+
+    if section.id != expected.id or section.kind != expected.kind or section.primary != expected.primary:
+        return Ok(None)
+
+    return Ok(section)
+
+
+@unwrap_to_error
+def construct_primary_section_from_markdown(
+    artifact_id: ArtifactId,
+    source: markdown.SectionSource,
+    default_primary_section_kind: PythonPath,
+    default_primary_section_id: SectionId,
+) -> Result[ArtifactSection, ErrorsList]:
+    head_config = dict(source.config().unwrap())
 
     if "kind" not in head_config or head_config["kind"] is None:
         head_config["kind"] = default_primary_section_kind
@@ -174,23 +300,12 @@ def construct_artifact_from_markdown_source(  # noqa: CCR001
     _ensure_markdown_constructible(primary_primitive, head_kind).unwrap()
     markdown_primary_primitive = cast(MarkdownSectionMixin, primary_primitive)
 
-    primary_section_result = markdown_primary_primitive.markdown_construct_section(
+    return markdown_primary_primitive.markdown_construct_section(
         artifact_id=artifact_id,
-        source=original_sections[0],
+        source=source,
         config=head_config,
         primary=True,
     )
-    if primary_section_result.is_err():
-        return Err(primary_section_result.unwrap_err())
-    primary_section = primary_section_result.unwrap()
-
-    sections = construct_sections_from_markdown(
-        artifact_id=artifact_id,
-        sections=original_sections[1:],
-        default_section_kind=default_section_kind,
-    ).unwrap()
-    sections = [primary_section, *sections]
-    return Ok(Artifact(id=artifact_id, sections=sections))
 
 
 @unwrap_to_error
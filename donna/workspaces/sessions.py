@@ -1,8 +1,13 @@
 import shutil
 
-from donna.domain.constants import STATE_FILE_NAME
+from donna.domain.constants import (
+    OUTPUTS_DIR_NAME,
+    STATE_BINARY_FILE_NAME,
+    STATE_CHANGES_FILE_NAME,
+    STATE_FILE_NAME,
+)
 from donna.domain.paths import ResolvedProjectPath
-from donna.workspaces.config import config, project_dir
+from donna.workspaces.config import StateFormat, config, project_dir
 from donna.workspaces.files import FileFingerprint
 
 
@@ -10,8 +15,32 @@ def _path() -> ResolvedProjectPath:
     return ResolvedProjectPath(project_dir() / config().session_dir)
 
 
+_STATE_FILE_NAMES = {
+    StateFormat.json: STATE_FILE_NAME,
+    StateFormat.binary: STATE_BINARY_FILE_NAME,
+}
+
+
 def _state_path() -> ResolvedProjectPath:
-    return ResolvedProjectPath(dir() / STATE_FILE_NAME)
+    return ResolvedProjectPath(dir() / _STATE_FILE_NAMES[state_format()])
+
+
+def _stored_state_path() -> ResolvedProjectPath:
+    """Path of the stored state, it may be left in another format until the next save after a config change."""
+    path = _state_path()
+    if path.exists():
+        return path
+
+    for file_name in _STATE_FILE_NAMES.values():
+        other_path = ResolvedProjectPath(dir() / file_name)
+        if other_path.exists():
+            return other_path
+
+    return path
+
+
+def _state_changes_path() -> ResolvedProjectPath:
+    return ResolvedProjectPath(dir() / STATE_CHANGES_FILE_NAME)
 
 
 def dir() -> ResolvedProjectPath:
@@ -24,6 +53,12 @@ def ensure_dir() -> None:
     dir()
 
 
+def outputs_dir() -> ResolvedProjectPath:
+    path = ResolvedProjectPath(dir() / OUTPUTS_DIR_NAME)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def reset_dir() -> None:
     session_dir = _path()
     if session_dir.exists():
@@ -32,18 +67,52 @@ def reset_dir() -> None:
     ensure_dir()
 
 
+def state_format() -> StateFormat:
+    return config().state.format
+
+
 def read_state() -> bytes | None:
-    path = _state_path()
+    path = _stored_state_path()
     if not path.exists():
         return None
 
     return path.read_bytes()
 
 
-def state_fingerprint() -> FileFingerprint | None:
-    return FileFingerprint.from_path(_state_path())
+def state_fingerprint(digest: str | None = None) -> FileFingerprint | None:
+    return FileFingerprint.from_path(_stored_state_path(), digest)
 
 
 def write_state(content: bytes) -> None:
     path = _state_path()
     path.write_bytes(content)
+
+    for file_name in _STATE_FILE_NAMES.values():
+        if file_name != path.name:
+            ResolvedProjectPath(dir() / file_name).unlink(missing_ok=True)
+
+
+def read_state_changes() -> bytes | None:
+    path = _state_changes_path()
+    if not path.exists():
+        return None
+
+    return path.read_bytes()
+
+
+def state_changes_fingerprint(digest: str | None = None) -> FileFingerprint | None:
+    return FileFingerprint.from_path(_state_changes_path(), digest)
+
+
+def write_state_changes(content: bytes) -> None:
+    path = _state_changes_path()
+    path.write_bytes(content)
+
+
+def append_state_changes(content: bytes) -> None:
+    with _state_changes_path().open("ab") as stream:
+        stream.write(content)
+
+
+def remove_state_changes() -> None:
+    _state_changes_path().unlink(missing_ok=True)
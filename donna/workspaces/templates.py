@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import contextvars
+import hashlib
 import importlib
 import importlib.util
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, cast
 
 import jinja2
+import pydantic
 
 from donna.core import errors as core_errors
+from donna.core.entities import BaseEntity
 from donna.core.errors import EnvironmentErrorsProxy, ErrorsList
 from donna.core.result import Err, Ok, Result
 from donna.domain.artifact_ids import ArtifactId
-from donna.machine.templates import Directive
+from donna.machine.templates import Directive, RenderMode
 from donna.machine.templates_context import DirectiveContext
 from donna.workspaces import errors as world_errors
+from donna.workspaces import markdown
 
 if TYPE_CHECKING:
     from donna.workspaces.artifacts import ArtifactRenderContext
@@ -20,11 +29,119 @@ if TYPE_CHECKING:
 
 _ENVIRONMENT = None
 
+DUAL_RENDER_CONTEXT_KEY = "__donna_dual_render__"
+
+TEMPLATES_CACHE_NAMESPACE = "templates"
+COMPILED_TEMPLATES_CACHE_SIZE = 128
+
+# Characters that may change Markdown structure around a substituted value.
+_UNSAFE_SUBSTITUTION_CHARACTERS = frozenset("\n\r`*[]\\&")
+
+_DIRECTIVE_MODULES: contextvars.ContextVar[set[str] | None] = contextvars.ContextVar(
+    "donna_directive_modules", default=None
+)
+
 
 def _is_importable_module(name: str) -> bool:
     return importlib.util.find_spec(name) is not None
 
 
+@contextmanager
+def recording_directive_modules() -> Iterator[set[str]]:
+    """Collect the modules of directives applied by renders inside the block, their code affects the output."""
+    modules: set[str] = set()
+    token = _DIRECTIVE_MODULES.set(modules)
+
+    try:
+        yield modules
+    finally:
+        _DIRECTIVE_MODULES.reset(token)
+
+
+class DualRender(BaseEntity):
+    """Result of rendering a template in its primary and analysis modes at once.
+
+    Directive outputs that differ between modes are left in `text` as alphanumeric markers,
+    so the text can be parsed once and the values substituted into the rendered section Markdown.
+    `diverged` is set when some output can not be substituted safely; `text` then contains
+    the primary output of such directives and the analysis mode must be rendered separately.
+    """
+
+    text: str
+    original_values: dict[str, str] = pydantic.Field(default_factory=dict)
+    analysis_values: dict[str, str] = pydantic.Field(default_factory=dict)
+    diverged: bool = False
+
+    def original_text(self) -> str:
+        return markdown.substitute_values(self.text, self.original_values)
+
+
+def _is_substitution_safe(value: object) -> bool:
+    if not isinstance(value, str) or not value or value.startswith("#"):
+        return False
+
+    if not _UNSAFE_SUBSTITUTION_CHARACTERS.isdisjoint(value):
+        return False
+
+    # The value must survive the Markdown normalization unchanged, as if it were parsed in place.
+    return markdown.normalize(value).rstrip("\n") == value
+
+
+class _DualRenderRecorder:
+    __slots__ = ("_marker_prefix", "analysis_values", "diverged", "original_values")
+
+    def __init__(self) -> None:
+        self._marker_prefix = f"DONNA{uuid.uuid4().hex}V"
+        self.original_values: dict[str, str] = {}
+        self.analysis_values: dict[str, str] = {}
+        self.diverged = False
+
+    def record(self, original: object, analysis: object) -> object:
+        if original == analysis:
+            return original
+
+        if not _is_substitution_safe(original) or not _is_substitution_safe(analysis):
+            self.diverged = True
+            return original
+
+        marker = f"{self._marker_prefix}{len(self.original_values)}X"
+        self.original_values[marker] = cast(str, original)
+        self.analysis_values[marker] = cast(str, analysis)
+
+        return marker
+
+    def result(self, text: str) -> DualRender:
+        # Template filters may transform a marker, in which case we can not substitute it back.
+        diverged = self.diverged or any(marker not in text for marker in self.original_values)
+
+        return DualRender(
+            text=text,
+            original_values=self.original_values,
+            analysis_values=self.analysis_values,
+            diverged=diverged,
+        )
+
+
+class _RenderModeOverride(Mapping[str, object]):
+    __slots__ = ("_context", "_render_mode")
+
+    def __init__(self, context: DirectiveContext, render_mode: RenderMode) -> None:
+        self._context = context
+        self._render_mode = render_mode
+
+    def __getitem__(self, key: str) -> object:
+        if key == "render_mode":
+            return self._render_mode
+
+        return self._context[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._context.keys())
+
+    def __len__(self) -> int:
+        return len(self._context.keys())
+
+
 class DirectivePathBuilder:
     def __init__(self, parts: tuple[str, ...]) -> None:
         self._parts = parts
@@ -91,6 +208,36 @@ class DirectivePathBuilder:
                 ]
             )
 
+        recorded_modules = _DIRECTIVE_MODULES.get()
+        if recorded_modules is not None:
+            recorded_modules.update((module_path, type(directive).__module__))
+
+        recorder = context.get(DUAL_RENDER_CONTEXT_KEY)
+
+        if not isinstance(recorder, _DualRenderRecorder):
+            return self._apply_directive(directive, directive_path, artifact_id, context, *argv, **kwargs)
+
+        original = self._apply_directive(directive, directive_path, artifact_id, context, *argv, **kwargs)
+        analysis = self._apply_directive(
+            directive,
+            directive_path,
+            artifact_id,
+            _RenderModeOverride(context, RenderMode.analysis),
+            *argv,
+            **kwargs,
+        )
+
+        return recorder.record(original, analysis)
+
+    @staticmethod
+    def _apply_directive(
+        directive: Directive,
+        directive_path: str,
+        artifact_id: ArtifactId | None,
+        context: DirectiveContext,
+        *argv: object,
+        **kwargs: object,
+    ) -> object:
         try:
             result = directive.apply_directive(context, *argv, **kwargs)
         except EnvironmentErrorsProxy:
@@ -143,7 +290,69 @@ def env() -> jinja2.Environment:
     return _ENVIRONMENT
 
 
-def render(artifact_id: ArtifactId, template: str, render_context: "ArtifactRenderContext") -> Result[str, ErrorsList]:
+def _bytecode_cache() -> jinja2.BytecodeCache | None:
+    from donna.workspaces import caches
+    from donna.workspaces import config as workspace_config
+
+    # Templates can be rendered outside of a workspace, for example, by tests or tools.
+    if not workspace_config.config.is_set() or not workspace_config.config().cache.templates:
+        return None
+
+    return jinja2.FileSystemBytecodeCache(directory=str(caches.cache_dir(TEMPLATES_CACHE_NAMESPACE)))
+
+
+def _compile_template(template: str, name: str | None) -> jinja2.Template:
+    environment = env()
+    bytecode_cache = _bytecode_cache()
+
+    if bytecode_cache is None:
+        return environment.from_string(template)
+
+    # The same steps as `jinja2.BaseLoader.load` does for templates loaded by name.
+    bucket = bytecode_cache.get_bucket(environment, name or "", None, template)
+
+    if bucket.code is None:
+        bucket.code = environment.compile(template)
+        bytecode_cache.set_bucket(bucket)
+
+    return environment.template_class.from_code(environment, bucket.code, environment.make_globals(None), None)
+
+
+class CompiledTemplatesCache:
+    __slots__ = ("_max_size", "_templates")
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._templates: OrderedDict[bytes, jinja2.Template] = OrderedDict()
+
+    def get(self, template: str, name: str | None = None) -> jinja2.Template:
+        key = hashlib.blake2b(template.encode("utf-8"), digest_size=16).digest()
+
+        compiled = self._templates.get(key)
+        if compiled is not None:
+            self._templates.move_to_end(key)
+            return compiled
+
+        compiled = _compile_template(template, name)
+        self._templates[key] = compiled
+
+        if len(self._templates) > self._max_size:
+            self._templates.popitem(last=False)
+
+        return compiled
+
+    def clear(self) -> None:
+        self._templates.clear()
+
+
+_COMPILED_TEMPLATES = CompiledTemplatesCache(max_size=COMPILED_TEMPLATES_CACHE_SIZE)
+
+
+def compiled_template(template: str, name: str | None = None) -> jinja2.Template:
+    return _COMPILED_TEMPLATES.get(template, name)
+
+
+def _template_context(artifact_id: ArtifactId, render_context: "ArtifactRenderContext") -> dict[str, object]:
     context: dict[str, object] = {"render_mode": render_context.primary_mode, "artifact_id": artifact_id}
 
     if render_context.current_task is not None:
@@ -152,8 +361,44 @@ def render(artifact_id: ArtifactId, template: str, render_context: "ArtifactRend
     if render_context.current_work_unit is not None:
         context["current_work_unit"] = render_context.current_work_unit
 
+    return context
+
+
+# Statements and comments may span several sections or define names used in other sections.
+def has_only_expressions(template: str) -> bool:
+    environment = env()
+    return environment.block_start_string not in template and environment.comment_start_string not in template
+
+
+def render(
+    artifact_id: ArtifactId,
+    template: str,
+    render_context: "ArtifactRenderContext",
+    *,
+    template_name: str | None = None,
+) -> Result[str, ErrorsList]:
+    context = _template_context(artifact_id, render_context)
+
     try:
-        template_obj = env().from_string(template)
+        template_obj = compiled_template(template, name=template_name or artifact_id)
         return Ok(template_obj.render(**context))
     except EnvironmentErrorsProxy as exc:
         return Err(cast(ErrorsList, exc.arguments["errors"]))
+
+
+def render_dual(
+    artifact_id: ArtifactId,
+    template: str,
+    render_context: "ArtifactRenderContext",
+    *,
+    template_name: str | None = None,
+) -> Result[DualRender, ErrorsList]:
+    recorder = _DualRenderRecorder()
+    context = _template_context(artifact_id, render_context)
+    context[DUAL_RENDER_CONTEXT_KEY] = recorder
+
+    try:
+        template_obj = compiled_template(template, name=template_name or artifact_id)
+        return Ok(recorder.result(template_obj.render(**context)))
+    except EnvironmentErrorsProxy as exc:
+        return Err(cast(ErrorsList, exc.arguments["errors"]))
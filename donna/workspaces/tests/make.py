@@ -30,13 +30,15 @@ def section_source(
     level: SectionLevel = SectionLevel.h2,
     title: str | None = "Section",
     configs: list[CodeSource] | None = None,
+    original_markdown: str = "",
+    analysis_markdown: str = "",
 ) -> SectionSource:
     return SectionSource(
         level=level,
         title=title,
         configs=configs or [],
-        original_tokens=[],
-        analysis_tokens=[],
+        original_markdown=original_markdown,
+        analysis_markdown=analysis_markdown,
     )
 
 
@@ -45,9 +47,7 @@ def code_source(format: str = "toml", content: str = "", **properties: str | boo
 
 
 def section_source_from_markdown(text: str, section_index: int = 0) -> SectionSource:
-    source = markdown.parse(text, artifact_id=ARTIFACT_ID).unwrap()[section_index]
-    source.analysis_tokens.extend(source.original_tokens)
-    return source
+    return markdown.parse(text, artifact_id=ARTIFACT_ID).unwrap()[section_index]
 
 
 def section_config(
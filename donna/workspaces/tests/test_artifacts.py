@@ -1,17 +1,26 @@
+import os
 import pathlib
+import time
 
 from pytest_mock import MockerFixture
 
 from donna.core.result import Err, Ok
 from donna.domain.artifact_ids import ArtifactId
-from donna.domain.paths import RelativeProjectPath, ResolvedProjectPath
+from donna.domain.paths import ProjectRootPath, RelativeProjectPath, ResolvedProjectPath
 from donna.machine.artifacts import Artifact
+from donna.machine.templates import RenderMode
+from donna.machine.tests import make as machine_make
+from donna.protocol.modes import Mode
 from donna.workspaces import artifacts
+from donna.workspaces import config as workspace_config
 from donna.workspaces import errors as workspace_errors
-from donna.workspaces.config import Config
+from donna.workspaces import files
+from donna.workspaces.config import CacheConfig, Config, GlobalConfig
 from donna.workspaces.files import FileFingerprint
 from donna.workspaces.tests import make
 
+_LATER_NS = files.TIMESTAMP_RESOLUTION_NS + 1
+
 
 class TestHasDonnaArtifactExtension:
     def test_matches_donna_markdown_suffix_case_insensitively(self) -> None:
@@ -72,28 +81,108 @@ class TestArtifactIsVisibleInWorkspace:
         assert artifacts._artifact_is_visible_in_workspace(make.ARTIFACT_ID)
 
 
-class TestArtifactIdFromFilesystemEntry:
-    def test_returns_artifact_id_for_regular_donna_file(self, tmp_path: pathlib.Path) -> None:
-        path = tmp_path / "test.donna.md"
-        path.write_text("", encoding="utf-8")
+class TestIndexedDirectory:
+    def test_init__keeps_mtime_entries_and_scan_time(self) -> None:
+        indexed = artifacts._IndexedDirectory(10, (("a.donna.md", False),), 20)
 
-        assert (
-            artifacts._artifact_id_from_filesystem_entry(ResolvedProjectPath(path), ["workflows"]) == make.ARTIFACT_ID
-        )
+        assert indexed.mtime_ns == 10
+        assert indexed.entries == (("a.donna.md", False),)
+        assert indexed.scanned_ns == 20
 
-    def test_returns_none_for_dirs_non_artifacts_and_invalid_names(self, tmp_path: pathlib.Path) -> None:
-        directory = tmp_path / "directory"
-        directory.mkdir()
-        ordinary_markdown = tmp_path / "ordinary.md"
-        ordinary_markdown.write_text("", encoding="utf-8")
-        invalid_name = tmp_path / "invalid name.donna.md"
-        invalid_name.write_text("", encoding="utf-8")
+    def test_is_fresh__trusts_listing_scanned_well_after_mtime(self) -> None:
+        indexed = artifacts._IndexedDirectory(10, (), 10 + files.TIMESTAMP_RESOLUTION_NS + 1)
 
-        assert artifacts._artifact_id_from_filesystem_entry(ResolvedProjectPath(directory), ["workflows"]) is None
-        assert (
-            artifacts._artifact_id_from_filesystem_entry(ResolvedProjectPath(ordinary_markdown), ["workflows"]) is None
-        )
-        assert artifacts._artifact_id_from_filesystem_entry(ResolvedProjectPath(invalid_name), ["workflows"]) is None
+        assert indexed.is_fresh(10)
+
+    def test_is_fresh__rejects_changed_mtime(self) -> None:
+        indexed = artifacts._IndexedDirectory(10, (), 10 + files.TIMESTAMP_RESOLUTION_NS + 1)
+
+        assert not indexed.is_fresh(11)
+
+    def test_is_fresh__rejects_listing_scanned_in_mtime_tick(self) -> None:
+        indexed = artifacts._IndexedDirectory(10, (), 10 + files.TIMESTAMP_RESOLUTION_NS)
+
+        assert not indexed.is_fresh(10)
+
+
+class TestDiscoveryIndex:
+    def test_listing__scans_new_directory(self, tmp_path: pathlib.Path) -> None:
+        (tmp_path / "a.donna.md").write_text("", encoding="utf-8")
+        index = artifacts._DiscoveryIndex({})
+
+        listing = index.listing(str(tmp_path))
+
+        assert listing is not None
+        assert listing.entries == (("a.donna.md", False),)
+        assert index.directories == {str(tmp_path): listing}
+        assert index.is_changed()
+
+    def test_listing__reuses_directory_with_same_mtime(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        mtime_ns = tmp_path.stat().st_mtime_ns
+        indexed = artifacts._IndexedDirectory(mtime_ns, (("cached.donna.md", False),), mtime_ns + _LATER_NS)
+        scan = mocker.patch.object(artifacts, "_scan_directory")
+        index = artifacts._DiscoveryIndex({str(tmp_path): indexed})
+
+        assert index.listing(str(tmp_path)) is indexed
+        assert not index.is_changed()
+        scan.assert_not_called()
+
+    def test_listing__rescans_directory_with_changed_mtime(self, tmp_path: pathlib.Path) -> None:
+        (tmp_path / "a.donna.md").write_text("", encoding="utf-8")
+        mtime_ns = tmp_path.stat().st_mtime_ns
+        stale = artifacts._IndexedDirectory(mtime_ns - 1, (), mtime_ns + _LATER_NS)
+        index = artifacts._DiscoveryIndex({str(tmp_path): stale})
+
+        listing = index.listing(str(tmp_path))
+
+        assert listing is not None
+        assert listing.entries == (("a.donna.md", False),)
+        assert index.is_changed()
+
+    def test_listing__rescans_directory_scanned_in_its_mtime_tick(self, tmp_path: pathlib.Path) -> None:
+        (tmp_path / "a.donna.md").write_text("", encoding="utf-8")
+        mtime_ns = tmp_path.stat().st_mtime_ns
+        racy = artifacts._IndexedDirectory(mtime_ns, (), mtime_ns)
+        index = artifacts._DiscoveryIndex({str(tmp_path): racy})
+
+        listing = index.listing(str(tmp_path))
+
+        assert listing is not None
+        assert listing.entries == (("a.donna.md", False),)
+        assert index.is_changed()
+
+    def test_listing__returns_none_for_missing_paths_and_files(self, tmp_path: pathlib.Path) -> None:
+        file_path = tmp_path / "file.donna.md"
+        file_path.write_text("", encoding="utf-8")
+        index = artifacts._DiscoveryIndex({})
+
+        assert index.listing(str(tmp_path / "missing")) is None
+        assert index.listing(str(file_path)) is None
+
+    def test_is_changed__reports_removed_directories(self, tmp_path: pathlib.Path) -> None:
+        index = artifacts._DiscoveryIndex({str(tmp_path / "removed"): artifacts._IndexedDirectory(1, (), 2)})
+
+        assert index.is_changed()
+
+
+class TestScanDirectory:
+    def test_scan_directory__records_scan_time_before_listing(self, tmp_path: pathlib.Path) -> None:
+        before = time.time_ns()
+
+        indexed = artifacts._scan_directory(str(tmp_path), 42)
+
+        assert before <= indexed.scanned_ns <= time.time_ns()
+
+    def test_scan_directory__keeps_directories_and_artifact_files_in_name_order(self, tmp_path: pathlib.Path) -> None:
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "b.donna.md").write_text("", encoding="utf-8")
+        (tmp_path / "a.DONNA.md").write_text("", encoding="utf-8")
+        (tmp_path / "ordinary.md").write_text("", encoding="utf-8")
+
+        indexed = artifacts._scan_directory(str(tmp_path), 42)
+
+        assert indexed.mtime_ns == 42
+        assert indexed.entries == (("a.DONNA.md", False), ("b.donna.md", False), ("nested", True))
 
 
 class TestWalkWorkflowDir:
@@ -101,14 +190,73 @@ class TestWalkWorkflowDir:
         nested = tmp_path / "nested"
         nested.mkdir()
         (tmp_path / "b.donna.md").write_text("", encoding="utf-8")
+        (tmp_path / "invalid name.donna.md").write_text("", encoding="utf-8")
         (nested / "a.donna.md").write_text("", encoding="utf-8")
 
-        assert list(artifacts._walk_workflow_dir(ResolvedProjectPath(tmp_path), ["workflows"])) == [
+        assert list(artifacts._walk_workflow_dir(str(tmp_path), ["workflows"], artifacts._DiscoveryIndex({}))) == [
             ArtifactId("@/workflows/b.donna.md"),
             ArtifactId("@/workflows/nested/a.donna.md"),
         ]
 
 
+class TestIsDiscoveryIndexEnabled:
+    def test_is_discovery_index_enabled__depends_on_cache_config(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.config.config", return_value=Config(cache=CacheConfig(discovery=False)))
+
+        assert not artifacts._is_discovery_index_enabled()
+
+        mocker.patch("donna.workspaces.config.config", return_value=Config())
+
+        assert artifacts._is_discovery_index_enabled()
+
+
+class TestDiscoveryIndexKey:
+    def test_discovery_index_key__uses_project_dir(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        mocker.patch("donna.workspaces.config.project_dir", return_value=tmp_path)
+
+        assert artifacts._discovery_index_key() == (str(tmp_path),)
+
+
+class TestLoadDiscoveryIndex:
+    def test_load_discovery_index__returns_persisted_directories(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_persistence_globals(mocker, tmp_path)
+        mocker.patch("donna.workspaces.config.project_dir", return_value=tmp_path)
+        workflows = tmp_path / "workflows"
+        workflows.mkdir()
+        mtime_ns = workflows.stat().st_mtime_ns
+        indexed = artifacts._IndexedDirectory(mtime_ns, (("cached.donna.md", False),), mtime_ns + _LATER_NS)
+        index = artifacts._DiscoveryIndex({})
+        index.directories[str(workflows)] = indexed
+        artifacts._save_discovery_index(index)
+
+        loaded = artifacts._load_discovery_index()
+
+        listing = loaded.listing(str(workflows))
+        assert listing is not None
+        assert listing.entries == (("cached.donna.md", False),)
+
+    def test_load_discovery_index__returns_empty_index_when_disabled(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_persistence_globals(mocker, tmp_path, Config(cache=CacheConfig(discovery=False)))
+        read = mocker.patch("donna.workspaces.caches.read")
+
+        assert not artifacts._load_discovery_index().is_changed()
+        read.assert_not_called()
+
+
+class TestSaveDiscoveryIndex:
+    def test_save_discovery_index__skips_unchanged_index(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_persistence_globals(mocker, tmp_path)
+        write = mocker.patch("donna.workspaces.caches.write")
+
+        artifacts._save_discovery_index(artifacts._DiscoveryIndex({}))
+
+        write.assert_not_called()
+
+
 class TestWalkFilesystem:
     def test_walk_filesystem__lists_artifacts_in_workflow_dirs(
         self, mocker: MockerFixture, tmp_path: pathlib.Path
@@ -150,6 +298,31 @@ class TestWalkFilesystem:
             ArtifactId("@/first/b.donna.md"),
         ]
 
+    def test_walk_filesystem__reuses_persisted_listings_of_untouched_dirs(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        workflows = tmp_path / "workflows"
+        nested = workflows / "nested"
+        nested.mkdir(parents=True)
+        (workflows / "b.donna.md").write_text("", encoding="utf-8")
+        past_ns = time.time_ns() - _LATER_NS
+        os.utime(workflows, ns=(past_ns, past_ns))
+        os.utime(nested, ns=(past_ns, past_ns))
+        _patch_persistence_globals(mocker, tmp_path)
+        mocker.patch("donna.workspaces.config.project_dir", return_value=tmp_path)
+        workflow_dirs = [RelativeProjectPath(pathlib.Path("workflows"))]
+
+        assert list(artifacts.walk_filesystem(workflow_dirs)) == [ArtifactId("@/workflows/b.donna.md")]
+
+        (nested / "a.donna.md").write_text("", encoding="utf-8")
+        scan = mocker.spy(artifacts, "_scan_directory")
+
+        assert list(artifacts.walk_filesystem(workflow_dirs)) == [
+            ArtifactId("@/workflows/b.donna.md"),
+            ArtifactId("@/workflows/nested/a.donna.md"),
+        ]
+        assert [call.args[0] for call in scan.call_args_list] == [str(nested)]
+
     def test_walk_filesystem__ignores_missing_workflow_dirs(
         self, mocker: MockerFixture, tmp_path: pathlib.Path
     ) -> None:
@@ -196,6 +369,15 @@ class TestResolveArtifactPath:
         assert result.unwrap() is None
 
 
+def _patch_persistence_globals(mocker: MockerFixture, tmp_path: pathlib.Path, config: Config | None = None) -> None:
+    config = config or Config()
+    mocker.patch("donna.workspaces.config.config", return_value=config)
+    mocker.patch("donna.workspaces.sessions.project_dir", return_value=tmp_path)
+    mocker.patch("donna.workspaces.sessions.config", return_value=config)
+    mocker.patch("donna.workspaces.caches.donna_version", return_value="1.2.3")
+    mocker.patch("donna.workspaces.caches.signing_key", return_value=b"k" * 32)
+
+
 class TestFilesystemRawArtifact:
     def test_get_bytes__returns_file_bytes(self, tmp_path: pathlib.Path) -> None:
         path = tmp_path / "workflow.donna.md"
@@ -207,6 +389,7 @@ class TestFilesystemRawArtifact:
     def test_render__renders_markdown_from_file_bytes(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
         path = tmp_path / "workflow.donna.md"
         path.write_bytes(b"# Workflow")
+        _patch_persistence_globals(mocker, tmp_path, Config(cache=CacheConfig(artifacts=False)))
         expected_artifact = Artifact(id=make.ARTIFACT_ID, sections=[])
         render_markdown_artifact = mocker.patch.object(
             artifacts,
@@ -228,6 +411,7 @@ class TestFilesystemRawArtifact:
     def test_render__returns_markdown_render_errors(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
         path = tmp_path / "workflow.donna.md"
         path.write_bytes(b"# Workflow")
+        _patch_persistence_globals(mocker, tmp_path)
         error = workspace_errors.MarkdownArtifactWithoutSections(artifact_id=make.ARTIFACT_ID)
         mocker.patch.object(artifacts, "render_markdown_artifact", return_value=Err([error]))
         raw_artifact = artifacts.FilesystemRawArtifact(path=ResolvedProjectPath(path))
@@ -237,6 +421,257 @@ class TestFilesystemRawArtifact:
         assert result.is_err()
         assert result.unwrap_err() == [error]
 
+    def test_render__reuses_artifact_persisted_by_previous_call(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        path = tmp_path / "workflow.donna.md"
+        path.write_bytes(b"# Workflow")
+        _patch_persistence_globals(mocker, tmp_path)
+        expected_artifact = machine_make.artifact()
+        render_markdown_artifact = mocker.patch.object(
+            artifacts, "render_markdown_artifact", return_value=Ok(expected_artifact)
+        )
+
+        first = artifacts.FilesystemRawArtifact(path=ResolvedProjectPath(path))
+        second = artifacts.FilesystemRawArtifact(path=ResolvedProjectPath(path))
+
+        assert first.render(make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW).unwrap() == expected_artifact
+        assert second.render(make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW).unwrap() == expected_artifact
+        render_markdown_artifact.assert_called_once()
+
+    def test_render__rerenders_changed_file(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "workflow.donna.md"
+        path.write_bytes(b"# Workflow")
+        _patch_persistence_globals(mocker, tmp_path)
+        render_markdown_artifact = mocker.patch.object(
+            artifacts, "render_markdown_artifact", return_value=Ok(machine_make.artifact())
+        )
+        raw_artifact = artifacts.FilesystemRawArtifact(path=ResolvedProjectPath(path))
+
+        assert raw_artifact.render(make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW).is_ok()
+        path.write_bytes(b"# Changed workflow")
+        assert raw_artifact.render(make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW).is_ok()
+
+        assert render_markdown_artifact.call_count == 2
+
+    def test_render__rerenders_changed_file_with_same_mtime_and_size(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        path = tmp_path / "workflow.donna.md"
+        path.write_bytes(b"# Workflow A")
+        file_stat = path.stat()
+        _patch_persistence_globals(mocker, tmp_path)
+        render_markdown_artifact = mocker.patch.object(
+            artifacts, "render_markdown_artifact", return_value=Ok(machine_make.artifact())
+        )
+        raw_artifact = artifacts.FilesystemRawArtifact(path=ResolvedProjectPath(path))
+
+        assert raw_artifact.render(make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW).is_ok()
+        path.write_bytes(b"# Workflow B")
+        os.utime(path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+        assert raw_artifact.render(make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW).is_ok()
+
+        assert render_markdown_artifact.call_count == 2
+
+    def test_render__reuses_persisted_artifact_of_touched_file(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        path = tmp_path / "workflow.donna.md"
+        path.write_bytes(b"# Workflow")
+        _patch_persistence_globals(mocker, tmp_path)
+        render_markdown_artifact = mocker.patch.object(
+            artifacts, "render_markdown_artifact", return_value=Ok(machine_make.artifact())
+        )
+        raw_artifact = artifacts.FilesystemRawArtifact(path=ResolvedProjectPath(path))
+
+        assert raw_artifact.render(make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW).is_ok()
+        os.utime(path, ns=(1, 1))
+        assert raw_artifact.render(make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW).is_ok()
+
+        render_markdown_artifact.assert_called_once()
+
+    def test_render__does_not_persist_execute_mode(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "workflow.donna.md"
+        path.write_bytes(b"# Workflow")
+        _patch_persistence_globals(mocker, tmp_path)
+        render_markdown_artifact = mocker.patch.object(
+            artifacts, "render_markdown_artifact", return_value=Ok(machine_make.artifact())
+        )
+        raw_artifact = artifacts.FilesystemRawArtifact(path=ResolvedProjectPath(path))
+        render_context = artifacts.ArtifactRenderContext(primary_mode=RenderMode.execute)
+
+        assert raw_artifact.render(make.ARTIFACT_ID, render_context).is_ok()
+        assert raw_artifact.render(make.ARTIFACT_ID, render_context).is_ok()
+
+        assert render_markdown_artifact.call_count == 2
+
+    def test_render_section__replaces_section_in_structure(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        path = tmp_path / "workflow.donna.md"
+        path.write_bytes(b"# Workflow")
+        structure = machine_make.artifact(
+            [
+                machine_make.artifact_section(primary=True),
+                machine_make.artifact_section(id=machine_make.SECONDARY_SECTION_ID, description="view"),
+            ]
+        )
+        section = machine_make.artifact_section(id=machine_make.SECONDARY_SECTION_ID, description="execute")
+        mocker.patch.object(artifacts, "render_markdown_section", return_value=Ok(section))
+        render_markdown_artifact = mocker.patch.object(artifacts, "render_markdown_artifact")
+        raw_artifact = artifacts.FilesystemRawArtifact(path=ResolvedProjectPath(path))
+        render_context = artifacts.ArtifactRenderContext(primary_mode=RenderMode.execute)
+
+        result = raw_artifact.render_section(
+            make.ARTIFACT_ID, structure, machine_make.SECONDARY_SECTION_ID, render_context
+        )
+
+        assert result.is_ok()
+        assert result.unwrap() == structure.replace_section(section)
+        render_markdown_artifact.assert_not_called()
+
+    def test_render_section__renders_whole_artifact_when_section_can_not_be_sliced(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        path = tmp_path / "workflow.donna.md"
+        path.write_bytes(b"# Workflow")
+        expected_artifact = machine_make.artifact()
+        mocker.patch.object(artifacts, "render_markdown_section", return_value=Ok(None))
+        render_markdown_artifact = mocker.patch.object(
+            artifacts, "render_markdown_artifact", return_value=Ok(expected_artifact)
+        )
+        raw_artifact = artifacts.FilesystemRawArtifact(path=ResolvedProjectPath(path))
+        render_context = artifacts.ArtifactRenderContext(primary_mode=RenderMode.execute)
+
+        result = raw_artifact.render_section(
+            make.ARTIFACT_ID, machine_make.artifact(), machine_make.PRIMARY_SECTION_ID, render_context
+        )
+
+        assert result.is_ok()
+        assert result.unwrap() == expected_artifact
+        render_markdown_artifact.assert_called_once_with(make.ARTIFACT_ID, b"# Workflow", render_context)
+
+
+class TestIsPersistable:
+    def test_is_persistable__accepts_task_independent_renders(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.config.config", return_value=Config())
+
+        assert artifacts._is_persistable(artifacts.RENDER_CONTEXT_VIEW)
+        assert artifacts._is_persistable(artifacts.ArtifactRenderContext(primary_mode=RenderMode.analysis))
+
+    def test_is_persistable__rejects_execute_mode_and_task_renders(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.config.config", return_value=Config())
+
+        assert not artifacts._is_persistable(artifacts.ArtifactRenderContext(primary_mode=RenderMode.execute))
+        assert not artifacts._is_persistable(
+            artifacts.ArtifactRenderContext(primary_mode=RenderMode.view, current_task=machine_make.task())
+        )
+
+    def test_is_persistable__respects_cache_config(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.config.config", return_value=Config(cache=CacheConfig(artifacts=False)))
+
+        assert not artifacts._is_persistable(artifacts.RENDER_CONTEXT_VIEW)
+
+
+class TestPersistedArtifactName:
+    def test_persisted_artifact_name__includes_render_mode(self) -> None:
+        assert (
+            artifacts._persisted_artifact_name(make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW)
+            == "@/workflows/test.donna.md:view"
+        )
+
+
+class TestPersistedArtifactKey:
+    def test_persisted_artifact_key__changes_with_file_fingerprint_and_config(self, mocker: MockerFixture) -> None:
+        config = mocker.patch("donna.workspaces.config.config", return_value=Config())
+        fingerprint = FileFingerprint(mtime_ns=1, size=2)
+
+        key = artifacts.persisted_artifact_key(make.ARTIFACT_ID, fingerprint, artifacts.RENDER_CONTEXT_VIEW)
+        changed_file_key = artifacts.persisted_artifact_key(
+            make.ARTIFACT_ID, FileFingerprint(mtime_ns=1, size=3), artifacts.RENDER_CONTEXT_VIEW
+        )
+        changed_content_key = artifacts.persisted_artifact_key(
+            make.ARTIFACT_ID, FileFingerprint(mtime_ns=1, size=2, content_hash="other"), artifacts.RENDER_CONTEXT_VIEW
+        )
+        config.return_value = Config(session_dir=RelativeProjectPath(pathlib.Path(".other")))
+        changed_config_key = artifacts.persisted_artifact_key(
+            make.ARTIFACT_ID, fingerprint, artifacts.RENDER_CONTEXT_VIEW
+        )
+
+        assert key != changed_file_key
+        assert key != changed_content_key
+        assert key != changed_config_key
+
+
+class TestLoadPersistedArtifact:
+    def test_load_persisted_artifact__returns_none_for_missing_entry(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_persistence_globals(mocker, tmp_path)
+
+        assert (
+            artifacts._load_persisted_artifact(
+                make.ARTIFACT_ID, FileFingerprint(mtime_ns=1, size=2), artifacts.RENDER_CONTEXT_VIEW
+            )
+            is None
+        )
+
+    def test_load_persisted_artifact__ignores_non_artifact_values(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_persistence_globals(mocker, tmp_path)
+        fingerprint = FileFingerprint(mtime_ns=1, size=2)
+        mocker.patch("donna.workspaces.caches.read", return_value="not an artifact")
+
+        assert artifacts._load_persisted_artifact(make.ARTIFACT_ID, fingerprint, artifacts.RENDER_CONTEXT_VIEW) is None
+
+    def test_load_persisted_artifact__ignores_render_of_changed_module_code(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_persistence_globals(mocker, tmp_path)
+        fingerprint = FileFingerprint(mtime_ns=1, size=2)
+        artifact = machine_make.artifact()
+        sources = files.module_content_keys(["json"])
+        artifacts._persist_artifact(make.ARTIFACT_ID, fingerprint, artifacts.RENDER_CONTEXT_VIEW, artifact, sources)
+
+        assert artifacts._load_persisted_artifact(make.ARTIFACT_ID, fingerprint, artifacts.RENDER_CONTEXT_VIEW)
+
+        mocker.patch.object(files, "module_content_key", return_value=("blake2b", "changed"))
+
+        assert artifacts._load_persisted_artifact(make.ARTIFACT_ID, fingerprint, artifacts.RENDER_CONTEXT_VIEW) is None
+
+
+class TestArtifactSourceModules:
+    def test_includes_primitive_and_directive_modules(self) -> None:
+        artifact = machine_make.artifact()
+
+        modules = artifacts._artifact_source_modules(artifact, {"project.directives"})
+
+        assert "project.directives" in modules
+        assert {str(section.kind).rsplit(".", maxsplit=1)[0] for section in artifact.sections} <= modules
+
+
+class TestPersistArtifact:
+    def test_persist_artifact__stores_artifact_for_matching_fingerprint(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_persistence_globals(mocker, tmp_path)
+        fingerprint = FileFingerprint(mtime_ns=1, size=2)
+        artifact = machine_make.artifact()
+
+        artifacts._persist_artifact(make.ARTIFACT_ID, fingerprint, artifacts.RENDER_CONTEXT_VIEW, artifact, {})
+
+        assert (
+            artifacts._load_persisted_artifact(make.ARTIFACT_ID, fingerprint, artifacts.RENDER_CONTEXT_VIEW)
+            == artifact
+        )
+        assert (
+            artifacts._load_persisted_artifact(
+                make.ARTIFACT_ID, FileFingerprint(mtime_ns=2, size=2), artifacts.RENDER_CONTEXT_VIEW
+            )
+            is None
+        )
+
 
 class TestFetchRawArtifact:
     def test_fetch_raw_artifact__returns_filesystem_artifact(
@@ -325,6 +760,38 @@ class TestRenderMarkdownArtifact:
         )
 
 
+class TestRenderMarkdownSection:
+    def test_render_markdown_section__uses_workspace_defaults(self, mocker: MockerFixture) -> None:
+        structure = machine_make.artifact()
+        section = machine_make.artifact_section(primary=True)
+        mocker.patch("donna.workspaces.config.config", return_value=Config())
+        construct = mocker.patch(
+            "donna.workspaces.markdown_parser.construct_section_from_markdown_source",
+            return_value=Ok(section),
+        )
+
+        result = artifacts.render_markdown_section(
+            make.ARTIFACT_ID,
+            b"# Workflow",
+            structure,
+            machine_make.PRIMARY_SECTION_ID,
+            artifacts.RENDER_CONTEXT_VIEW,
+        )
+
+        assert result.is_ok()
+        assert result.unwrap() == section
+        construct.assert_called_once_with(
+            make.ARTIFACT_ID,
+            "# Workflow",
+            structure,
+            machine_make.PRIMARY_SECTION_ID,
+            artifacts.RENDER_CONTEXT_VIEW,
+            default_section_kind=Config().defaults.tail_section_kind,
+            default_primary_section_kind=Config().defaults.primary_section_kind,
+            default_primary_section_id=Config().defaults.primary_section_id,
+        )
+
+
 class TestArtifactFingerprint:
     def test_artifact_fingerprint__returns_file_fingerprint(
         self, mocker: MockerFixture, tmp_path: pathlib.Path
@@ -345,3 +812,132 @@ class TestArtifactFingerprint:
 
         assert result.is_ok()
         assert result.unwrap() is None
+
+
+class TestViewCacheKey:
+    def test_view_cache_key__uses_persisted_view_key(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.config.config", return_value=Config())
+        fingerprint = FileFingerprint(mtime_ns=1, size=2, content_hash="hash")
+        mocker.patch.object(artifacts, "artifact_fingerprint", return_value=Ok(fingerprint))
+
+        assert artifacts.view_cache_key(make.ARTIFACT_ID) == artifacts.persisted_artifact_key(
+            make.ARTIFACT_ID, fingerprint, artifacts.RENDER_CONTEXT_VIEW
+        )
+
+    def test_view_cache_key__returns_none_for_missing_artifact(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(artifacts, "artifact_fingerprint", return_value=Ok(None))
+
+        assert artifacts.view_cache_key(make.ARTIFACT_ID) is None
+
+
+def _patch_workflows_workspace(mocker: MockerFixture, tmp_path: pathlib.Path) -> Config:
+    config = Config(
+        workflow_dirs=[RelativeProjectPath(pathlib.Path("workflows"))],
+        cache=CacheConfig(artifacts=False, templates=False),
+    )
+    mocker.patch("donna.workspaces.config.project_dir", return_value=tmp_path)
+    mocker.patch("donna.workspaces.config.config", return_value=config)
+    return config
+
+
+def _write_workflow(tmp_path: pathlib.Path, name: str, title: str) -> None:
+    path = tmp_path / "workflows" / name
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(f"# {title}\n\nBody\n", encoding="utf-8")
+
+
+class TestRenderArtifactFile:
+    def test_render_artifact_file__returns_raw_artifact_fingerprint_and_artifact(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_workflows_workspace(mocker, tmp_path)
+        _write_workflow(tmp_path, "test.donna.md", "Workflow")
+
+        raw_artifact, fingerprint, artifact = artifacts.render_artifact_file(
+            make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW
+        ).unwrap()
+
+        assert fingerprint == FileFingerprint.from_path(raw_artifact.path)
+        assert artifact.id == make.ARTIFACT_ID
+        assert artifact.primary_section().unwrap().title == "Workflow"
+
+    def test_render_artifact_file__reports_missing_artifact(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_workflows_workspace(mocker, tmp_path)
+
+        result = artifacts.render_artifact_file(make.ARTIFACT_ID, artifacts.RENDER_CONTEXT_VIEW)
+
+        assert isinstance(result.unwrap_err()[0], workspace_errors.ArtifactNotFound)
+
+
+class TestWorkerGlobals:
+    def test_worker_globals__skips_unset_globals(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        config = Config()
+        mocker.patch("donna.workspaces.config.project_dir", GlobalConfig[ResolvedProjectPath]())
+        mocker.patch("donna.workspaces.config.config_path", GlobalConfig[ResolvedProjectPath]())
+        mocker.patch("donna.workspaces.config.config", GlobalConfig[Config]())
+        mocker.patch("donna.workspaces.config.protocol", GlobalConfig[Mode]())
+        workspace_config.config.set(config)
+        workspace_config.protocol.set(Mode.llm)
+
+        assert artifacts._worker_globals() == (None, None, config, Mode.llm)
+
+
+class TestSetWorkerGlobal:
+    def test_set_worker_global__keeps_inherited_value(self) -> None:
+        global_config = GlobalConfig[str]()
+        global_config.set("inherited")
+
+        artifacts._set_worker_global(global_config, "passed")
+
+        assert global_config() == "inherited"
+
+    def test_set_worker_global__sets_missing_value(self) -> None:
+        global_config = GlobalConfig[str]()
+
+        artifacts._set_worker_global(global_config, "passed")
+        artifacts._set_worker_global(GlobalConfig[str](), None)
+
+        assert global_config() == "passed"
+
+
+class TestInstallWorkerGlobals:
+    def test_install_worker_globals__sets_passed_values(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        config = Config()
+        mocker.patch("donna.workspaces.config.project_dir", GlobalConfig[ResolvedProjectPath]())
+        mocker.patch("donna.workspaces.config.config_path", GlobalConfig[ResolvedProjectPath]())
+        mocker.patch("donna.workspaces.config.config", GlobalConfig[Config]())
+        mocker.patch("donna.workspaces.config.protocol", GlobalConfig[Mode]())
+
+        artifacts._install_worker_globals((ProjectRootPath(tmp_path), None, config, Mode.human))
+
+        assert workspace_config.project_dir() == tmp_path
+        assert not workspace_config.config_path.is_set()
+        assert workspace_config.config() == config
+        assert workspace_config.protocol() == Mode.human
+
+
+class TestRenderArtifactFilesInProcesses:
+    def test_render_artifact_files_in_processes__returns_results_in_given_order(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_workflows_workspace(mocker, tmp_path)
+        _write_workflow(tmp_path, "first.donna.md", "First")
+        _write_workflow(tmp_path, "second.donna.md", "Second")
+        artifact_ids = [
+            ArtifactId("@/workflows/second.donna.md"),
+            ArtifactId("@/workflows/missing.donna.md"),
+            ArtifactId("@/workflows/first.donna.md"),
+        ]
+
+        results = artifacts.render_artifact_files_in_processes(
+            artifact_ids, artifacts.RENDER_CONTEXT_VIEW, max_workers=2
+        )
+
+        assert [result.is_ok() for result in results] == [True, False, True]
+        assert [result.unwrap()[2].primary_section().unwrap().title for result in results[::2]] == [
+            "Second",
+            "First",
+        ]
+        assert isinstance(results[1].unwrap_err()[0], workspace_errors.ArtifactNotFound)
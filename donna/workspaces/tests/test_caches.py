@@ -0,0 +1,272 @@
+import importlib.metadata
+import os
+import pathlib
+
+import pytest
+from pytest_mock import MockerFixture
+
+from donna.domain.constants import CACHE_DIR_NAME
+from donna.domain.paths import RelativeProjectPath
+from donna.machine.tests import make as machine_make
+from donna.workspaces import caches
+from donna.workspaces.config import Config
+
+
+def _patch_cache_globals(mocker: MockerFixture, tmp_path: pathlib.Path, version: str | None = "1.2.3") -> None:
+    mocker.patch("donna.workspaces.sessions.project_dir", return_value=tmp_path)
+    mocker.patch(
+        "donna.workspaces.sessions.config",
+        return_value=Config(session_dir=RelativeProjectPath(pathlib.Path(".session/donna"))),
+    )
+    mocker.patch("donna.workspaces.caches.donna_version", return_value=version)
+    mocker.patch("donna.workspaces.caches.signing_key", return_value=b"k" * caches.SIGNING_KEY_SIZE)
+
+
+def _write_key(path: pathlib.Path, content: bytes, mode: int = 0o600) -> None:
+    path.write_bytes(content)
+    path.chmod(mode)
+
+
+class TestDonnaVersion:
+    def test_donna_version__returns_none_for_missing_package_metadata(self, mocker: MockerFixture) -> None:
+        mocker.patch(
+            "donna.workspaces.caches.importlib.metadata.version",
+            side_effect=importlib.metadata.PackageNotFoundError("donna"),
+        )
+        caches.donna_version.cache_clear()
+
+        try:
+            assert caches.donna_version() is None
+        finally:
+            caches.donna_version.cache_clear()
+
+    def test_donna_version__returns_package_version(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.caches.importlib.metadata.version", return_value="9.8.7")
+        caches.donna_version.cache_clear()
+
+        try:
+            assert caches.donna_version() == "9.8.7"
+        finally:
+            caches.donna_version.cache_clear()
+
+
+class TestUserCacheDir:
+    def test_user_cache_dir__uses_xdg_cache_home(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+    ) -> None:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert caches._user_cache_dir() == tmp_path / "donna"
+
+    def test_user_cache_dir__falls_back_to_home_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+
+        assert caches._user_cache_dir() == pathlib.Path.home() / ".cache" / "donna"
+
+
+class TestReadSigningKey:
+    def test_read_signing_key__returns_private_key(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / caches.SIGNING_KEY_FILE_NAME
+        _write_key(path, b"k" * caches.SIGNING_KEY_SIZE)
+
+        assert caches._read_signing_key(path) == b"k" * caches.SIGNING_KEY_SIZE
+
+    def test_read_signing_key__rejects_key_accessible_by_others(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / caches.SIGNING_KEY_FILE_NAME
+        _write_key(path, b"k" * caches.SIGNING_KEY_SIZE, mode=0o644)
+
+        assert caches._read_signing_key(path) is None
+
+    def test_read_signing_key__rejects_key_of_other_user(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / caches.SIGNING_KEY_FILE_NAME
+        _write_key(path, b"k" * caches.SIGNING_KEY_SIZE)
+        mocker.patch("donna.workspaces.caches.os.getuid", return_value=os.getuid() + 1)
+
+        assert caches._read_signing_key(path) is None
+
+    def test_read_signing_key__rejects_key_of_wrong_size(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / caches.SIGNING_KEY_FILE_NAME
+        _write_key(path, b"short")
+
+        assert caches._read_signing_key(path) is None
+
+    def test_read_signing_key__returns_none_for_missing_key(self, tmp_path: pathlib.Path) -> None:
+        assert caches._read_signing_key(tmp_path / caches.SIGNING_KEY_FILE_NAME) is None
+
+
+class TestCreateSigningKey:
+    def test_create_signing_key__creates_private_key(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "donna" / caches.SIGNING_KEY_FILE_NAME
+
+        caches._create_signing_key(path)
+
+        assert path.parent.stat().st_mode & 0o777 == 0o700
+        assert caches._read_signing_key(path) is not None
+        assert list(path.parent.iterdir()) == [path]
+
+    def test_create_signing_key__keeps_existing_key(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / caches.SIGNING_KEY_FILE_NAME
+        _write_key(path, b"k" * caches.SIGNING_KEY_SIZE)
+
+        caches._create_signing_key(path)
+
+        assert path.read_bytes() == b"k" * caches.SIGNING_KEY_SIZE
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestSigningKey:
+    def test_signing_key__creates_key_once(self, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        caches.signing_key.cache_clear()
+
+        try:
+            key = caches.signing_key()
+            caches.signing_key.cache_clear()
+
+            assert key is not None
+            assert caches.signing_key() == key
+            assert (tmp_path / "donna" / caches.SIGNING_KEY_FILE_NAME).read_bytes() == key
+        finally:
+            caches.signing_key.cache_clear()
+
+    def test_signing_key__returns_none_for_untrusted_key(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+    ) -> None:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        (tmp_path / "donna").mkdir()
+        _write_key(tmp_path / "donna" / caches.SIGNING_KEY_FILE_NAME, b"k" * caches.SIGNING_KEY_SIZE, mode=0o666)
+        caches.signing_key.cache_clear()
+
+        try:
+            assert caches.signing_key() is None
+        finally:
+            caches.signing_key.cache_clear()
+
+
+class TestSignature:
+    def test_signature__depends_on_key_and_content(self) -> None:
+        signature = caches._signature(b"key", b"content")
+
+        assert len(signature) == caches.SIGNATURE_SIZE
+        assert signature != caches._signature(b"other", b"content")
+        assert signature != caches._signature(b"key", b"other")
+
+
+class TestFullKey:
+    def test_full_key__prefixes_key_with_format_and_donna_versions(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.caches.donna_version", return_value="1.2.3")
+
+        assert caches._full_key(("key", 1)) == (caches.CACHE_FORMAT_VERSION, "1.2.3", "key", 1)
+
+    def test_full_key__returns_none_without_known_donna_version(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.caches.donna_version", return_value=None)
+
+        assert caches._full_key(("key",)) is None
+
+
+class TestCacheDir:
+    def test_cache_dir__creates_namespace_directory_under_session_dir(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+
+        path = caches.cache_dir("artifacts")
+
+        assert path == tmp_path / ".session" / "donna" / CACHE_DIR_NAME / "artifacts"
+        assert path.is_dir()
+
+
+class TestEntryPath:
+    def test_entry_path__hashes_entry_name_inside_namespace(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+
+        path = caches._entry_path("artifacts", "@/workflows/test.donna.md:view")
+
+        assert path.parent == caches.cache_dir("artifacts")
+        assert path.suffix == ".pickle"
+        assert path != caches._entry_path("artifacts", "@/workflows/test.donna.md:analysis")
+
+
+class TestRead:
+    def test_read__returns_none_for_missing_entry(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+
+        assert caches.read("artifacts", "missing", ("key",)) is None
+
+    def test_read__returns_written_value_for_same_key(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+        artifact = machine_make.artifact()
+
+        caches.write("artifacts", "entry", ("key", 1), artifact)
+
+        assert caches.read("artifacts", "entry", ("key", 1)) == artifact
+
+    def test_read__ignores_value_stored_for_other_key(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+        caches.write("artifacts", "entry", ("key", 1), "value")
+
+        assert caches.read("artifacts", "entry", ("key", 2)) is None
+
+    def test_read__ignores_value_stored_by_other_donna_version(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+        caches.write("artifacts", "entry", ("key",), "value")
+        mocker.patch("donna.workspaces.caches.donna_version", return_value="1.2.4")
+
+        assert caches.read("artifacts", "entry", ("key",)) is None
+
+    def test_read__ignores_corrupted_entry(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+        caches.write("artifacts", "entry", ("key",), "value")
+        for path in caches.cache_dir("artifacts").iterdir():
+            path.write_bytes(b"not a pickle")
+
+        assert caches.read("artifacts", "entry", ("key",)) is None
+
+    def test_read__ignores_entry_not_signed_with_user_key(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+        caches.write("artifacts", "entry", ("key",), "value")
+        mocker.patch("donna.workspaces.caches.signing_key", return_value=b"o" * caches.SIGNING_KEY_SIZE)
+        loads = mocker.spy(caches.pickle, "loads")
+
+        assert caches.read("artifacts", "entry", ("key",)) is None
+        loads.assert_not_called()
+
+    def test_read__returns_none_without_signing_key(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+        caches.write("artifacts", "entry", ("key",), "value")
+        mocker.patch("donna.workspaces.caches.signing_key", return_value=None)
+
+        assert caches.read("artifacts", "entry", ("key",)) is None
+
+
+class TestWrite:
+    def test_write__skips_cache_without_known_donna_version(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_cache_globals(mocker, tmp_path, version=None)
+
+        caches.write("artifacts", "entry", ("key",), "value")
+
+        assert caches.read("artifacts", "entry", ("key",)) is None
+        assert list(caches.cache_dir("artifacts").iterdir()) == []
+
+    def test_write__skips_cache_without_signing_key(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+        mocker.patch("donna.workspaces.caches.signing_key", return_value=None)
+
+        caches.write("artifacts", "entry", ("key",), "value")
+
+        assert list(caches.cache_dir("artifacts").iterdir()) == []
+
+    def test_write__replaces_previous_entry(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_cache_globals(mocker, tmp_path)
+
+        caches.write("artifacts", "entry", ("key", 1), "first")
+        caches.write("artifacts", "entry", ("key", 2), "second")
+
+        assert caches.read("artifacts", "entry", ("key", 2)) == "second"
+        assert len(list(caches.cache_dir("artifacts").iterdir())) == 1
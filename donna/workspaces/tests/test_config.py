@@ -9,7 +9,19 @@ from donna.domain.paths import ProjectConfigPath, ProjectRootPath, RelativeProje
 from donna.domain.python_path import PythonPath
 from donna.workspaces import config as workspace_config
 from donna.workspaces import errors as workspace_errors
-from donna.workspaces.config import Config, DefaultsConfig, GlobalConfig, JournalConfig, JournalRecordAttribute
+from donna.workspaces.config import (
+    CacheConfig,
+    Config,
+    DefaultsConfig,
+    GlobalConfig,
+    JournalCommandMode,
+    JournalConfig,
+    JournalDelivery,
+    JournalRecordAttribute,
+    ListingConfig,
+    StateConfig,
+    StateFormat,
+)
 from donna.workspaces.tests import make
 
 
@@ -40,6 +52,43 @@ class TestJournalConfig:
         with pytest.raises(pydantic.ValidationError):
             JournalConfig.model_validate({"cmd": cmd})
 
+    def test_defaults__deliver_synchronously_without_file(self) -> None:
+        journal_config = JournalConfig()
+
+        assert journal_config.file is None
+        assert journal_config.delivery == JournalDelivery.sync
+        assert journal_config.batch_size == 64
+
+    def test_validate_file__rejects_paths_outside_project(self) -> None:
+        with pytest.raises(pydantic.ValidationError):
+            JournalConfig.model_validate({"file": "../journal.jsonl"})
+
+    def test_validation__parses_background_delivery(self) -> None:
+        journal_config = JournalConfig.model_validate({"delivery": "background", "batch_size": 8})
+
+        assert journal_config.delivery == JournalDelivery.background
+        assert journal_config.batch_size == 8
+
+    def test_validate_stdin_cmd__accepts_literal_arguments(self) -> None:
+        journal_config = JournalConfig.model_validate({"cmd": ["tool", "--ndjson"], "cmd_mode": "coprocess"})
+
+        assert journal_config.cmd_mode == JournalCommandMode.coprocess
+
+    @pytest.mark.parametrize("cmd_mode", ["coprocess", "batch"])
+    def test_validate_stdin_cmd__rejects_placeholders(self, cmd_mode: str) -> None:
+        with pytest.raises(pydantic.ValidationError):
+            JournalConfig.model_validate({"cmd": ["tool", "{message}"], "cmd_mode": cmd_mode})
+
+
+class TestJournalCommandMode:
+    def test_values__match_config_names(self) -> None:
+        assert [mode.value for mode in JournalCommandMode] == ["per_record", "coprocess", "batch"]
+
+
+class TestJournalDelivery:
+    def test_values__match_config_names(self) -> None:
+        assert [delivery.value for delivery in JournalDelivery] == ["sync", "background"]
+
 
 class TestDefaultsConfig:
     def test_defaults__match_configuration_spec(self) -> None:
@@ -62,6 +111,42 @@ class TestDefaultsConfig:
             DefaultsConfig.model_validate(data)
 
 
+class TestCacheConfig:
+    def test_defaults__enable_caches(self) -> None:
+        assert CacheConfig().artifacts
+        assert CacheConfig().templates
+
+    def test_validation__rejects_unknown_fields(self) -> None:
+        with pytest.raises(pydantic.ValidationError):
+            CacheConfig.model_validate({"unknown": True})
+
+
+class TestStateFormat:
+    def test_values__match_config_names(self) -> None:
+        assert [state_format.value for state_format in StateFormat] == ["json", "binary"]
+
+
+class TestStateConfig:
+    def test_defaults__use_json_format(self) -> None:
+        assert StateConfig().format == StateFormat.json
+
+    def test_validation__parses_binary_format(self) -> None:
+        assert StateConfig.model_validate({"format": "binary"}).format == StateFormat.binary
+
+    def test_validation__rejects_unknown_format(self) -> None:
+        with pytest.raises(pydantic.ValidationError):
+            StateConfig.model_validate({"format": "yaml"})
+
+
+class TestListingConfig:
+    def test_defaults__load_artifacts_in_current_process(self) -> None:
+        assert ListingConfig().max_workers == 1
+
+    def test_validation__rejects_non_positive_workers(self) -> None:
+        with pytest.raises(pydantic.ValidationError):
+            ListingConfig.model_validate({"max_workers": 0})
+
+
 class TestDefaultWorkflowDirs:
     def test_returns_spec_defaults(self) -> None:
         assert workspace_config._default_workflow_dirs() == [
@@ -161,6 +246,16 @@ class TestGlobalConfig:
         with pytest.raises(workspace_errors.GlobalConfigAlreadySet):
             global_config.set("other")
 
+    def test_reset__allows_setting_value_again(self) -> None:
+        global_config = GlobalConfig[str]()
+        global_config.set("value")
+
+        global_config.reset()
+
+        assert not global_config.is_set()
+        global_config.set("other")
+        assert global_config.get() == "other"
+
 
 class TestWorkspace:
     def test_builds_validated_workspace_entity(self, tmp_path: pathlib.Path) -> None:
@@ -86,6 +86,16 @@ class TestJournalCommandFailed(_EnvironmentErrorCase):
         return workspace_errors.JournalCommandFailed(command=["tool"], returncode=1, details="bad")
 
 
+class TestJournalStoreDisabled(_EnvironmentErrorCase):
+    def error(self) -> workspace_errors.WorkspaceError:
+        return workspace_errors.JournalStoreDisabled()
+
+
+class TestJournalFileWriteFailed(_EnvironmentErrorCase):
+    def error(self) -> workspace_errors.WorkspaceError:
+        return workspace_errors.JournalFileWriteFailed(path="journal.jsonl", details="denied")
+
+
 class TestArtifactError:
     def test_content_intro__includes_artifact_id(self) -> None:
         error = workspace_errors.ArtifactNotFound(artifact_id=make.ARTIFACT_ID)
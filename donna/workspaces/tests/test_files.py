@@ -1,8 +1,34 @@
+import os
 import pathlib
+import sys
+import time
 
+import pytest
+from pytest_mock import MockerFixture
+
+from donna.workspaces import files
 from donna.workspaces.files import FileFingerprint
 
 
+class TestContentHasher:
+    def test_continues_hash_of_appended_content(self) -> None:
+        hasher = files.content_hasher(b"da")
+        hasher.update(b"ta")
+
+        assert hasher.hexdigest() == files.content_hash(b"data")
+
+
+class TestContentHash:
+    def test_content_hash__depends_on_content(self) -> None:
+        assert files.content_hash(b"data") == files.content_hash(b"data")
+        assert files.content_hash(b"data") != files.content_hash(b"other")
+
+
+def _settle(mocker: MockerFixture) -> None:
+    clock = mocker.patch.object(files, "time")
+    clock.time_ns.return_value = time.time_ns() + 2 * files.TIMESTAMP_RESOLUTION_NS
+
+
 class TestFileFingerprint:
     def test_from_path__returns_fingerprint_for_regular_file(self, tmp_path: pathlib.Path) -> None:
         path = tmp_path / "file.txt"
@@ -13,12 +39,203 @@ class TestFileFingerprint:
         assert fingerprint is not None
         assert fingerprint.size == 4
         assert fingerprint.mtime_ns == path.stat().st_mtime_ns
+        assert fingerprint.ctime_ns == path.stat().st_ctime_ns
+        assert fingerprint.content_hash == files.content_hash(b"data")
 
     def test_from_path__returns_none_for_missing_path_or_directory(self, tmp_path: pathlib.Path) -> None:
         assert FileFingerprint.from_path(tmp_path / "missing.txt") is None
         assert FileFingerprint.from_path(tmp_path) is None
 
-    def test_eq__compares_mtime_and_size(self) -> None:
-        assert FileFingerprint(mtime_ns=1, size=2) == FileFingerprint(mtime_ns=1, size=2)
+    def test_from_path__hashes_file_changed_in_current_timestamp_tick(
+        self, tmp_path: pathlib.Path, mocker: MockerFixture
+    ) -> None:
+        path = tmp_path / "file.txt"
+        path.write_text("data", encoding="utf-8")
+        hash_content = mocker.spy(files, "content_hash")
+
+        fingerprint = FileFingerprint.from_path(path)
+
+        assert fingerprint is not None
+        assert not fingerprint.settled
+        hash_content.assert_called_once_with(b"data")
+
+    def test_from_path__hashes_settled_file_on_first_need(self, tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+        path = tmp_path / "file.txt"
+        path.write_text("data", encoding="utf-8")
+        _settle(mocker)
+        hash_content = mocker.spy(files, "content_hash")
+
+        fingerprint = FileFingerprint.from_path(path)
+
+        assert fingerprint is not None
+        assert fingerprint.settled
+        hash_content.assert_not_called()
+
+        assert fingerprint.content_key() == ("blake2b", files.content_hash(b"data"))
+        assert fingerprint.content_key() == ("blake2b", files.content_hash(b"data"))
+        assert hash_content.call_count == 3
+
+    def test_from_path__uses_given_digest(self, tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+        path = tmp_path / "file.txt"
+        path.write_text("data", encoding="utf-8")
+        read_bytes = mocker.spy(pathlib.Path, "read_bytes")
+
+        fingerprint = FileFingerprint.from_path(path, "digest")
+
+        assert fingerprint is not None
+        assert fingerprint.content_hash == "digest"
+        read_bytes.assert_not_called()
+
+    def test_eq__compares_metadata(self) -> None:
+        assert FileFingerprint(mtime_ns=1, size=2, settled=True) == FileFingerprint(mtime_ns=1, size=2, settled=True)
         assert FileFingerprint(mtime_ns=1, size=2) != FileFingerprint(mtime_ns=2, size=2)
+        assert FileFingerprint(mtime_ns=1, size=2, ctime_ns=1) != FileFingerprint(mtime_ns=1, size=2, ctime_ns=2)
         assert FileFingerprint(mtime_ns=1, size=2) != object()
+
+    def test_eq__compares_content_hashes_of_unsettled_files(self) -> None:
+        assert FileFingerprint(mtime_ns=1, size=2, content_hash="a") == FileFingerprint(
+            mtime_ns=1, size=2, content_hash="a"
+        )
+        assert FileFingerprint(mtime_ns=1, size=2, content_hash="a") != FileFingerprint(
+            mtime_ns=1, size=2, content_hash="b"
+        )
+        assert FileFingerprint(mtime_ns=1, size=2, content_hash="a", settled=True) != FileFingerprint(
+            mtime_ns=1, size=2, content_hash="b"
+        )
+
+    def test_eq__does_not_read_settled_files(self, tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+        path = tmp_path / "file.txt"
+        path.write_text("data", encoding="utf-8")
+        _settle(mocker)
+        before = FileFingerprint.from_path(path)
+        read_bytes = mocker.spy(pathlib.Path, "read_bytes")
+
+        assert FileFingerprint.from_path(path) == before
+        read_bytes.assert_not_called()
+
+    def test_eq__detects_rewrite_that_keeps_mtime_and_size(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "file.txt"
+        path.write_text("data", encoding="utf-8")
+        before = FileFingerprint.from_path(path)
+        file_stat = path.stat()
+
+        path.write_text("diff", encoding="utf-8")
+        os.utime(path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+
+        assert before is not None
+        assert FileFingerprint.from_path(path) != before
+
+    def test_eq__detects_rewrite_that_keeps_all_metadata(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "file.txt"
+        path.write_text("data", encoding="utf-8")
+        before = FileFingerprint.from_path(path)
+        assert before is not None
+
+        path.write_text("diff", encoding="utf-8")
+        after = FileFingerprint.from_path(path)
+        assert after is not None
+        after.mtime_ns, after.ctime_ns = before.mtime_ns, before.ctime_ns
+
+        assert after != before
+
+    def test_from_path__keeps_content_hash_of_content_changed_in_current_tick(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "file.txt"
+        path.write_text("data", encoding="utf-8")
+        fingerprint = FileFingerprint.from_path(path)
+
+        path.write_text("changed", encoding="utf-8")
+
+        assert fingerprint is not None
+        assert fingerprint.content_hash == files.content_hash(b"data")
+
+    def test_content_key__prefers_content_hash(self) -> None:
+        assert FileFingerprint(mtime_ns=1, size=2, content_hash="a").content_key() == ("blake2b", "a")
+        assert FileFingerprint(mtime_ns=1, size=2).content_key() == ("stat", 1, 2)
+
+
+class TestContentKeys:
+    def test_skips_missing_files(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "source.py"
+        path.write_text("value = 1\n", encoding="utf-8")
+
+        keys = files.content_keys([str(path), str(tmp_path / "missing.py")])
+
+        assert list(keys) == [str(path)]
+
+
+class TestContentKeysChanged:
+    def test_detects_changed_and_removed_files(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "source.py"
+        path.write_text("value = 1\n", encoding="utf-8")
+        keys = files.content_keys([str(path)])
+
+        assert not files.content_keys_changed(keys)
+
+        path.write_text("value = 2\n", encoding="utf-8")
+        assert files.content_keys_changed(keys)
+
+        path.unlink()
+        assert files.content_keys_changed(keys)
+
+
+@pytest.fixture
+def module_source(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "donna_test_module_source.py"
+    path.write_text("value = 1\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(files, "_MODULE_CONTENT_KEYS", {})
+    return path
+
+
+class TestModulePath:
+    def test_locates_module_without_importing_it(self, module_source: pathlib.Path) -> None:
+        assert files._module_path("donna_test_module_source") == str(module_source)
+        assert "donna_test_module_source" not in sys.modules
+
+    def test_returns_none_for_missing_module(self) -> None:
+        assert files._module_path("donna_test_missing_module") is None
+
+
+@pytest.mark.usefixtures("module_source")
+class TestModuleContentKey:
+    def test_reads_module_source_once(self, mocker: MockerFixture) -> None:
+        module_path = mocker.spy(files, "_module_path")
+
+        assert files.module_content_key("donna_test_module_source") == files.module_content_key(
+            "donna_test_module_source"
+        )
+        module_path.assert_called_once()
+
+    def test_marks_missing_module(self) -> None:
+        assert files.module_content_key("donna_test_missing_module") == ("missing",)
+
+
+@pytest.mark.usefixtures("module_source")
+class TestModuleContentKeys:
+    def test_keys_modules_by_name(self) -> None:
+        keys = files.module_content_keys(["donna_test_module_source", "donna_test_module_source"])
+
+        assert list(keys) == ["donna_test_module_source"]
+
+
+class TestModuleContentKeysChanged:
+    def test_detects_changed_module_source(self, module_source: pathlib.Path) -> None:
+        keys = files.module_content_keys(["donna_test_module_source"])
+
+        assert not files.module_content_keys_changed(keys)
+
+        module_source.write_text("value = 2\n", encoding="utf-8")
+        files.forget_module_content_keys()
+
+        assert files.module_content_keys_changed(keys)
+
+
+class TestForgetModuleContentKeys:
+    def test_reads_module_sources_again(self, module_source: pathlib.Path, mocker: MockerFixture) -> None:
+        files.module_content_key("donna_test_module_source")
+        module_path = mocker.spy(files, "_module_path")
+
+        files.forget_module_content_keys()
+        files.module_content_key("donna_test_module_source")
+
+        module_path.assert_called_once()
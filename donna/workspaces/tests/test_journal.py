@@ -1,15 +1,29 @@
 import datetime
+import pathlib
 import subprocess  # noqa: S404
+import sys
+import threading
+from typing import Sequence
 
+import pytest
 from pytest_mock import MockerFixture
 
+from donna.core.errors import ErrorsList
+from donna.core.result import Err, Ok, Result
 from donna.domain.artifact_ids import ArtifactSectionId
 from donna.domain.internal_ids import TaskId, WorkUnitId
-from donna.protocol.journal import JournalRecord
+from donna.domain.paths import RelativeProjectPath
+from donna.protocol.journal import JournalRecord, serialize_record
 from donna.protocol.tests import make as protocol_make
 from donna.workspaces import errors as workspace_errors
-from donna.workspaces import journal
-from donna.workspaces.config import Config, JournalConfig, JournalRecordAttribute
+from donna.workspaces import journal, journal_store
+from donna.workspaces.config import (
+    Config,
+    JournalCommandMode,
+    JournalConfig,
+    JournalDelivery,
+    JournalRecordAttribute,
+)
 
 
 def _journal_record(**kwargs: object) -> JournalRecord:
@@ -151,7 +165,7 @@ class TestWriteRecord:
     def test_no_configured_command_is_noop(self, mocker: MockerFixture) -> None:
         mocker.patch(
             "donna.workspaces.config.config",
-            return_value=Config(journal=JournalConfig(cmd=None)),
+            return_value=Config(journal=JournalConfig(cmd=None, store=False)),
         )
         run = mocker.patch("subprocess.run")
 
@@ -163,7 +177,7 @@ class TestWriteRecord:
     def test_runs_configured_command(self, mocker: MockerFixture) -> None:
         mocker.patch(
             "donna.workspaces.config.config",
-            return_value=Config(journal=JournalConfig(cmd=["tool", "{message}"])),
+            return_value=Config(journal=JournalConfig(cmd=["tool", "{message}"], store=False)),
         )
         run = mocker.patch(
             "subprocess.run",
@@ -173,12 +187,12 @@ class TestWriteRecord:
         result = journal.write_record(_journal_record())
 
         assert result.is_ok()
-        run.assert_called_once_with(["tool", "message"], check=False, capture_output=True, text=True)
+        run.assert_called_once_with(["tool", "message"], check=False, capture_output=True, text=True, input="")
 
     def test_reports_command_os_error(self, mocker: MockerFixture) -> None:
         mocker.patch(
             "donna.workspaces.config.config",
-            return_value=Config(journal=JournalConfig(cmd=["tool"])),
+            return_value=Config(journal=JournalConfig(cmd=["tool"], store=False)),
         )
         mocker.patch("subprocess.run", side_effect=OSError("missing"))
 
@@ -193,7 +207,7 @@ class TestWriteRecord:
     def test_reports_nonzero_command_exit(self, mocker: MockerFixture) -> None:
         mocker.patch(
             "donna.workspaces.config.config",
-            return_value=Config(journal=JournalConfig(cmd=["tool"])),
+            return_value=Config(journal=JournalConfig(cmd=["tool"], store=False)),
         )
         mocker.patch(
             "subprocess.run",
@@ -208,3 +222,364 @@ class TestWriteRecord:
         assert error.command == ["tool"]
         assert error.returncode == 2
         assert error.details == "exit code 2; stderr: bad"
+
+
+class _RecordingSink:
+    def __init__(self, errors: list[workspace_errors.WorkspaceError] | None = None) -> None:
+        self.batches: list[list[JournalRecord]] = []
+        self.closed = 0
+        self.errors = errors or []
+
+    def write(self, records: Sequence[JournalRecord]) -> Result[None, ErrorsList]:
+        self.batches.append(list(records))
+
+        if self.errors:
+            return Err(list(self.errors))
+
+        return Ok(None)
+
+    def close(self) -> Result[None, ErrorsList]:
+        self.closed += 1
+        return Ok(None)
+
+
+def _file_error() -> workspace_errors.JournalFileWriteFailed:
+    return workspace_errors.JournalFileWriteFailed(path="journal.jsonl", details="denied")
+
+
+class TestRunCommand:
+    def test_succeeds_on_zero_exit(self, mocker: MockerFixture) -> None:
+        mocker.patch(
+            "subprocess.run",
+            return_value=subprocess.CompletedProcess(args=["tool"], returncode=0, stdout="", stderr=""),
+        )
+
+        assert journal._run_command(["tool"]).is_ok()
+
+    def test_reports_exit_code_without_stderr(self, mocker: MockerFixture) -> None:
+        mocker.patch(
+            "subprocess.run",
+            return_value=subprocess.CompletedProcess(args=["tool"], returncode=1, stdout="", stderr=""),
+        )
+
+        error = journal._run_command(["tool"]).unwrap_err()[0]
+
+        assert isinstance(error, workspace_errors.JournalCommandFailed)
+        assert error.details == "exit code 1"
+
+
+class TestJournalSink:
+    def test_builtin_sinks_follow_protocol(self, tmp_path: pathlib.Path) -> None:
+        sinks: list[journal.JournalSink] = [
+            journal.FileJournalSink(tmp_path / "journal.jsonl"),
+            journal.CommandJournalSink(["tool"]),
+            journal.BatchCommandJournalSink(["tool"]),
+        ]
+
+        assert all(sink.close().is_ok() for sink in sinks)
+
+
+class TestFileJournalSink:
+    def test_write__appends_serialized_records_as_lines(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "journal.jsonl"
+        sink = journal.FileJournalSink(path)
+        first = _journal_record(message="first")
+        second = _journal_record(message="second")
+
+        assert sink.write([first]).is_ok()
+        assert sink.write([second]).is_ok()
+
+        assert path.read_bytes() == serialize_record(first) + b"\n" + serialize_record(second) + b"\n"
+
+    def test_write__reports_os_error(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "missing" / "journal.jsonl"
+
+        result = journal.FileJournalSink(path).write([_journal_record()])
+
+        error = result.unwrap_err()[0]
+        assert isinstance(error, workspace_errors.JournalFileWriteFailed)
+        assert error.path == str(path)
+
+
+class TestStoreJournalSink:
+    def test_write__appends_records_to_journal_store(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        mocker.patch("donna.workspaces.sessions.dir", return_value=tmp_path)
+        records = [_journal_record(message="first"), _journal_record(message="second")]
+
+        assert journal.StoreJournalSink().write(records).is_ok()
+
+        position = journal_store.end_position(journal_store.load_index())
+        assert journal_store.tail(10, journal_store.JournalQuery(), position) == records
+
+    def test_write__reports_os_error(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(journal_store, "append_records", side_effect=OSError(13, "denied", "index.json"))
+
+        error = journal.StoreJournalSink().write([_journal_record()]).unwrap_err()[0]
+
+        assert isinstance(error, workspace_errors.JournalFileWriteFailed)
+        assert error.path == "index.json"
+
+
+class TestCommandJournalSink:
+    def test_write__runs_command_for_every_record(self, mocker: MockerFixture) -> None:
+        run = mocker.patch(
+            "subprocess.run",
+            return_value=subprocess.CompletedProcess(args=["tool"], returncode=0, stdout="", stderr=""),
+        )
+
+        result = journal.CommandJournalSink(["tool", "{message}"]).write(
+            [_journal_record(message="first"), _journal_record(message="second")]
+        )
+
+        assert result.is_ok()
+        assert [call.args[0] for call in run.call_args_list] == [["tool", "first"], ["tool", "second"]]
+
+    def test_write__stops_on_first_failure(self, mocker: MockerFixture) -> None:
+        run = mocker.patch("subprocess.run", side_effect=OSError("missing"))
+
+        result = journal.CommandJournalSink(["tool"]).write([_journal_record(), _journal_record()])
+
+        assert isinstance(result.unwrap_err()[0], workspace_errors.JournalCommandFailed)
+        run.assert_called_once()
+
+
+def _python_command(script: str) -> list[str]:
+    return [sys.executable, "-c", script]
+
+
+class TestBatchCommandJournalSink:
+    def test_write__runs_command_once_per_batch(self, tmp_path: pathlib.Path) -> None:
+        output = tmp_path / "records.jsonl"
+        sink = journal.BatchCommandJournalSink(
+            _python_command(
+                f"import sys, pathlib\nwith pathlib.Path({str(output)!r}).open('ab') as stream:\n"
+                "    stream.write(sys.stdin.buffer.read() + b'---\\n')"
+            )
+        )
+        records = [_journal_record(message="first"), _journal_record(message="second")]
+
+        assert sink.write(records).is_ok()
+        assert sink.close().is_ok()
+
+        assert output.read_bytes() == b"".join(serialize_record(record) + b"\n" for record in records) + b"---\n"
+
+    def test_write__reports_nonzero_exit(self) -> None:
+        result = journal.BatchCommandJournalSink(_python_command("import sys; sys.exit(3)")).write([_journal_record()])
+
+        error = result.unwrap_err()[0]
+        assert isinstance(error, workspace_errors.JournalCommandFailed)
+        assert error.returncode == 3
+
+
+class TestCoprocessJournalSink:
+    def test_write__streams_records_to_single_process(self, tmp_path: pathlib.Path) -> None:
+        output = tmp_path / "records.jsonl"
+        sink = journal.CoprocessJournalSink(
+            _python_command(f"import sys, pathlib; pathlib.Path({str(output)!r}).write_bytes(sys.stdin.buffer.read())")
+        )
+        records = [_journal_record(message="first"), _journal_record(message="second")]
+
+        assert sink.write(records[:1]).is_ok()
+        assert sink.write(records[1:]).is_ok()
+        assert sink.close().is_ok()
+
+        assert output.read_bytes() == b"".join(serialize_record(record) + b"\n" for record in records)
+
+    def test_write__starts_command_once(self, mocker: MockerFixture) -> None:
+        popen = mocker.patch("subprocess.Popen")
+        popen.return_value.wait.return_value = 0
+        sink = journal.CoprocessJournalSink(["tool"])
+
+        assert sink.write([_journal_record()]).is_ok()
+        assert sink.write([_journal_record()]).is_ok()
+        assert sink.close().is_ok()
+
+        popen.assert_called_once()
+        assert popen.return_value.stdin.write.call_count == 2
+
+    def test_write__reports_missing_command(self, tmp_path: pathlib.Path) -> None:
+        sink = journal.CoprocessJournalSink([str(tmp_path / "missing")])
+
+        error = sink.write([_journal_record()]).unwrap_err()[0]
+
+        assert isinstance(error, workspace_errors.JournalCommandFailed)
+        assert error.returncode is None
+        assert sink.close().is_ok()
+
+    def test_close__reports_nonzero_exit_with_stderr(self) -> None:
+        sink = journal.CoprocessJournalSink(
+            _python_command("import sys; sys.stdin.read(); sys.stderr.write('bad'); sys.exit(3)")
+        )
+
+        assert sink.write([_journal_record()]).is_ok()
+        error = sink.close().unwrap_err()[0]
+
+        assert isinstance(error, workspace_errors.JournalCommandFailed)
+        assert error.returncode == 3
+        assert error.details == "exit code 3; stderr: bad"
+
+    def test_close__kills_command_that_does_not_exit(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(journal, "COPROCESS_EXIT_TIMEOUT", 0.1)
+        sink = journal.CoprocessJournalSink(_python_command("import time; time.sleep(10)"))
+
+        assert sink.write([_journal_record()]).is_ok()
+        error = sink.close().unwrap_err()[0]
+
+        assert isinstance(error, workspace_errors.JournalCommandFailed)
+        assert "did not exit" in error.details
+
+    def test_close__without_records_does_not_start_command(self, mocker: MockerFixture) -> None:
+        popen = mocker.patch("subprocess.Popen")
+
+        assert journal.CoprocessJournalSink(["tool"]).close().is_ok()
+
+        popen.assert_not_called()
+
+
+class TestWriteToSinks:
+    def test_writes_to_every_sink_and_collects_errors(self) -> None:
+        failing = _RecordingSink(errors=[_file_error()])
+        working = _RecordingSink()
+        record = _journal_record()
+
+        errors = journal._write_to_sinks([failing, working], [record])
+
+        assert [type(error) for error in errors] == [workspace_errors.JournalFileWriteFailed]
+        assert failing.batches == [[record]]
+        assert working.batches == [[record]]
+
+
+class TestCloseSinks:
+    def test_closes_every_sink(self) -> None:
+        sinks = [_RecordingSink(), _RecordingSink()]
+
+        assert journal._close_sinks(sinks) == []
+        assert [sink.closed for sink in sinks] == [1, 1]
+
+
+class TestJournalWriter:
+    def test_write__delivers_record_immediately(self) -> None:
+        sink = _RecordingSink()
+        record = _journal_record()
+
+        assert journal.JournalWriter([sink]).write(record).is_ok()
+
+        assert sink.batches == [[record]]
+
+    def test_write__reports_sink_errors(self) -> None:
+        result = journal.JournalWriter([_RecordingSink(errors=[_file_error()])]).write(_journal_record())
+
+        assert isinstance(result.unwrap_err()[0], workspace_errors.JournalFileWriteFailed)
+
+    def test_close__closes_sinks(self) -> None:
+        sink = _RecordingSink()
+
+        assert journal.JournalWriter([sink]).close().is_ok()
+
+        assert sink.closed == 1
+
+
+class TestBackgroundJournalWriter:
+    def test_close__delivers_queued_records_in_order(self) -> None:
+        sink = _RecordingSink()
+        writer = journal.BackgroundJournalWriter([sink], batch_size=2)
+        records = [_journal_record(message=str(index)) for index in range(5)]
+
+        for record in records:
+            assert writer.write(record).is_ok()
+
+        assert writer.close().is_ok()
+
+        assert [record for batch in sink.batches for record in batch] == records
+        assert all(len(batch) <= 2 for batch in sink.batches)
+        assert sink.closed == 1
+
+    def test_write__reports_errors_of_previous_batches(self) -> None:
+        delivered = threading.Event()
+
+        class _FailingSink(_RecordingSink):
+            def write(self, records: Sequence[JournalRecord]) -> Result[None, ErrorsList]:
+                delivered.set()
+                return Err([_file_error()])
+
+        writer = journal.BackgroundJournalWriter([_FailingSink()], batch_size=1)
+
+        assert writer.write(_journal_record()).is_ok()
+        assert delivered.wait(timeout=5)
+        writer._thread.join(timeout=0.1)
+
+        results = [writer.write(_journal_record()), writer.close()]
+
+        errors = [error for result in results if result.is_err() for error in result.unwrap_err()]
+        assert [type(error) for error in errors] == [workspace_errors.JournalFileWriteFailed] * 2
+
+    def test_close__is_registered_at_exit(self, mocker: MockerFixture) -> None:
+        register = mocker.patch("atexit.register")
+        unregister = mocker.patch("atexit.unregister")
+
+        writer = journal.BackgroundJournalWriter([_RecordingSink()], batch_size=1)
+        writer.close()
+
+        register.assert_called_once_with(writer.close)
+        unregister.assert_called_once_with(writer.close)
+
+
+class TestBuildSinks:
+    def test_builds_file_and_command_sinks(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        mocker.patch("donna.workspaces.config.project_dir", return_value=tmp_path)
+
+        sinks = journal.build_sinks(
+            JournalConfig(file=RelativeProjectPath(pathlib.Path("journal.jsonl")), cmd=["tool"], store=False)
+        )
+
+        assert [type(sink) for sink in sinks] == [journal.FileJournalSink, journal.CommandJournalSink]
+
+    def test_builds_coprocess_sink_in_coprocess_mode(self) -> None:
+        sinks = journal.build_sinks(JournalConfig(cmd=["tool"], cmd_mode=JournalCommandMode.coprocess, store=False))
+
+        assert [type(sink) for sink in sinks] == [journal.CoprocessJournalSink]
+
+    def test_returns_store_sink_when_enabled(self) -> None:
+        assert [type(sink) for sink in journal.build_sinks(JournalConfig(store=True))] == [journal.StoreJournalSink]
+
+    def test_returns_no_sinks_by_default(self) -> None:
+        assert journal.build_sinks(JournalConfig()) == []
+
+
+class TestBuildCommandSink:
+    @pytest.mark.parametrize(
+        ("mode", "sink_type"),
+        [
+            (JournalCommandMode.per_record, journal.CommandJournalSink),
+            (JournalCommandMode.coprocess, journal.CoprocessJournalSink),
+            (JournalCommandMode.batch, journal.BatchCommandJournalSink),
+        ],
+    )
+    def test_builds_sink_of_mode(self, mode: JournalCommandMode, sink_type: type) -> None:
+        assert type(journal._build_command_sink(mode, ["tool"])) is sink_type
+
+
+class TestOpenWriter:
+    def test_returns_sync_writer_by_default(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.config.config", return_value=Config(journal=JournalConfig(cmd=["tool"])))
+
+        assert isinstance(journal.open_writer(), journal.JournalWriter)
+
+    def test_returns_background_writer_when_configured(self, mocker: MockerFixture) -> None:
+        mocker.patch(
+            "donna.workspaces.config.config",
+            return_value=Config(journal=JournalConfig(cmd=["tool"], delivery=JournalDelivery.background)),
+        )
+
+        writer = journal.open_writer()
+
+        assert isinstance(writer, journal.BackgroundJournalWriter)
+        assert writer.close().is_ok()
+
+    def test_background_delivery_without_sinks_is_sync(self, mocker: MockerFixture) -> None:
+        mocker.patch(
+            "donna.workspaces.config.config",
+            return_value=Config(journal=JournalConfig(delivery=JournalDelivery.background, store=False)),
+        )
+
+        assert isinstance(journal.open_writer(), journal.JournalWriter)
@@ -0,0 +1,373 @@
+import pathlib
+import subprocess  # noqa: S404
+import sys
+
+import pytest
+from pytest_mock import MockerFixture
+
+from donna.domain.artifact_ids import ArtifactSectionId
+from donna.domain.internal_ids import TaskId
+from donna.protocol.journal import JournalRecord, serialize_record
+from donna.protocol.tests import make as protocol_make
+from donna.workspaces import errors as workspace_errors
+from donna.workspaces import journal_store
+from donna.workspaces.config import Config, JournalConfig
+from donna.workspaces.journal_store import JournalIndex, JournalPosition, JournalQuery, JournalSegment
+
+FIRST_TASK = TaskId("T-1-b")
+SECOND_TASK = TaskId("T-2-c")
+FIRST_OPERATION = ArtifactSectionId("@/workflows/test.donna.md:first")
+SECOND_OPERATION = ArtifactSectionId("@/workflows/test.donna.md:second")
+
+
+@pytest.fixture(autouse=True)
+def session_dir(mocker: MockerFixture, tmp_path: pathlib.Path) -> pathlib.Path:
+    mocker.patch.object(journal_store.sessions, "dir", return_value=tmp_path)
+    return tmp_path
+
+
+def _record(
+    message: str, task_id: TaskId | None = FIRST_TASK, operation_id: ArtifactSectionId | None = FIRST_OPERATION
+) -> JournalRecord:
+    return protocol_make.journal_record(message=message, current_task_id=task_id, current_operation_id=operation_id)
+
+
+def _messages(records: list[JournalRecord]) -> list[str]:
+    return [record.message for record in records]
+
+
+def _end() -> JournalPosition:
+    return journal_store.end_position(journal_store.load_index())
+
+
+class TestJournalSegment:
+    def test_defaults__describe_empty_segment(self) -> None:
+        segment = JournalSegment(number=1)
+
+        assert segment.records == 0
+        assert segment.task_ids == set()
+        assert segment.operation_ids == set()
+
+
+class TestJournalIndex:
+    def test_json_round_trip__keeps_segment_ids(self) -> None:
+        index = JournalIndex(
+            segments=[JournalSegment(number=1, records=2, task_ids={FIRST_TASK}, operation_ids={FIRST_OPERATION})]
+        )
+
+        assert JournalIndex.from_json(index.to_json()) == index
+
+
+class TestJournalQuery:
+    def test_matches__filters_by_task_and_operation(self) -> None:
+        query = JournalQuery(task_id=FIRST_TASK, operation_id=FIRST_OPERATION)
+
+        assert query.matches(_record("match"))
+        assert not query.matches(_record("other task", task_id=SECOND_TASK))
+        assert not query.matches(_record("other operation", operation_id=SECOND_OPERATION))
+        assert JournalQuery().matches(_record("any", task_id=None, operation_id=None))
+
+    def test_may_match__uses_segment_ids(self) -> None:
+        segment = JournalSegment(number=1, task_ids={FIRST_TASK}, operation_ids={FIRST_OPERATION})
+
+        assert JournalQuery(task_id=FIRST_TASK).may_match(segment)
+        assert not JournalQuery(task_id=SECOND_TASK).may_match(segment)
+        assert not JournalQuery(operation_id=SECOND_OPERATION).may_match(segment)
+        assert JournalQuery().may_match(segment)
+
+
+class TestJournalPosition:
+    def test_keeps_segment_and_offset(self) -> None:
+        position = JournalPosition(segment=2, offset=10)
+
+        assert (position.segment, position.offset) == (2, 10)
+
+
+class TestStoreDir:
+    def test_creates_journal_dir_in_session_dir(self, session_dir: pathlib.Path) -> None:
+        assert journal_store.store_dir() == session_dir / "journal"
+        assert (session_dir / "journal").is_dir()
+
+
+class TestRequireEnabled:
+    def test_accepts_enabled_store(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.config.config", return_value=Config(journal=JournalConfig(store=True)))
+
+        assert journal_store.require_enabled().is_ok()
+
+    def test_reports_disabled_store(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.config.config", return_value=Config())
+
+        errors = journal_store.require_enabled().unwrap_err()
+
+        assert [type(error) for error in errors] == [workspace_errors.JournalStoreDisabled]
+
+
+class TestIndexPath:
+    def test_is_in_store_dir(self, session_dir: pathlib.Path) -> None:
+        assert journal_store._index_path() == session_dir / "journal" / "index.json"
+
+
+class TestSegmentPath:
+    def test_uses_zero_padded_segment_number(self, session_dir: pathlib.Path) -> None:
+        assert journal_store._segment_path(7) == session_dir / "journal" / "segment-000007.jsonl"
+
+
+class TestDecodeRecord:
+    def test_decodes_serialized_record(self) -> None:
+        record = _record("message")
+
+        assert journal_store._decode_record(serialize_record(record)) == record
+
+    def test_returns_none_for_broken_line(self) -> None:
+        assert journal_store._decode_record(b'{"message":') is None
+
+
+class TestReadSegment:
+    def test_reads_complete_records_only(self) -> None:
+        record = _record("first")
+        complete = serialize_record(record) + b"\n"
+        journal_store._segment_path(1).write_bytes(complete + b'{"partial":')
+
+        records, offset = journal_store._read_segment(1)
+
+        assert records == [record]
+        assert offset == len(complete)
+
+    def test_reads_between_offsets(self) -> None:
+        records = [_record("first"), _record("second"), _record("third")]
+        journal_store.append_records(records)
+        first_end, second_end = (
+            len(b"".join(serialize_record(record) + b"\n" for record in records[:count])) for count in (1, 2)
+        )
+
+        read, offset = journal_store._read_segment(1, start=first_end, end=second_end)
+
+        assert _messages(read) == ["second"]
+        assert offset == second_end
+
+    def test_missing_segment_has_no_records(self) -> None:
+        assert journal_store._read_segment(3, start=5) == ([], 5)
+
+
+class TestRebuildIndex:
+    def test_indexes_existing_segments(self) -> None:
+        journal_store._segment_path(1).write_bytes(serialize_record(_record("first")) + b"\n")
+        journal_store._segment_path(2).write_bytes(serialize_record(_record("second", task_id=SECOND_TASK)) + b"\n")
+
+        index = journal_store._rebuild_index()
+
+        assert [(segment.number, segment.records) for segment in index.segments] == [(1, 1), (2, 1)]
+        assert index.segments[1].task_ids == {SECOND_TASK}
+
+
+class TestLoadIndex:
+    def test_returns_saved_index(self) -> None:
+        index = JournalIndex(segments=[JournalSegment(number=1, records=3)])
+        journal_store._save_index(index)
+
+        assert journal_store.load_index() == index
+
+    def test_rebuilds_broken_index(self) -> None:
+        journal_store.append_records([_record("first")])
+        journal_store._index_path().write_text("{", encoding="utf-8")
+
+        assert [segment.records for segment in journal_store.load_index().segments] == [1]
+
+    def test_returns_empty_index_for_new_store(self) -> None:
+        assert journal_store.load_index() == JournalIndex()
+
+
+class TestSaveIndex:
+    def test_replaces_index_without_leaving_temporary_files(self, session_dir: pathlib.Path) -> None:
+        journal_store._save_index(JournalIndex(segments=[JournalSegment(number=1)]))
+        journal_store._save_index(JournalIndex(segments=[JournalSegment(number=2)]))
+
+        assert [path.name for path in (session_dir / "journal").iterdir()] == ["index.json"]
+        assert journal_store.load_index().segments[0].number == 2
+
+
+class TestIndexStat:
+    def test_changes_when_records_are_appended(self) -> None:
+        assert journal_store.index_stat() is None
+
+        journal_store.append_records([_record("first")])
+        index_stat = journal_store.index_stat()
+        journal_store.append_records([_record("second", task_id=SECOND_TASK)])
+
+        assert index_stat is not None
+        assert journal_store.index_stat() != index_stat
+
+    def test_does_not_read_index(self, mocker: MockerFixture) -> None:
+        journal_store.append_records([_record("first")])
+        read_bytes = mocker.spy(pathlib.Path, "read_bytes")
+        read_text = mocker.spy(pathlib.Path, "read_text")
+
+        assert journal_store.index_stat() is not None
+        read_bytes.assert_not_called()
+        read_text.assert_not_called()
+
+
+class TestWriteLock:
+    def test_excludes_writers_of_other_processes(self, session_dir: pathlib.Path) -> None:
+        lock_path = session_dir / "journal" / journal_store.LOCK_FILE_NAME
+
+        with journal_store._write_lock():
+            # The lock is held by this process, so a non-blocking attempt of another process fails.
+            child = subprocess.run([sys.executable, "-c", _TRY_LOCK, str(lock_path)], check=False)  # noqa: S603
+
+        assert child.returncode == 1
+
+
+_TRY_LOCK = """
+import fcntl, sys
+
+with open(sys.argv[1], "ab") as lock_file:
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        sys.exit(1)
+"""
+
+_APPEND_MANY = """
+import pathlib, sys
+from donna.protocol.tests import make
+from donna.workspaces import journal_store
+
+journal_store.sessions.dir = lambda: pathlib.Path(sys.argv[1])
+
+for number in range(int(sys.argv[2])):
+    journal_store.append_records([make.journal_record(message=f"record {number}")])
+"""
+
+
+class TestAddToSegment:
+    def test_counts_records_and_collects_ids(self) -> None:
+        segment = journal_store._add_to_segment(
+            JournalSegment(number=1, records=1, task_ids={FIRST_TASK}),
+            [_record("second", task_id=SECOND_TASK), _record("empty", task_id=None, operation_id=None)],
+        )
+
+        assert segment.records == 3
+        assert segment.task_ids == {FIRST_TASK, SECOND_TASK}
+        assert segment.operation_ids == {FIRST_OPERATION}
+
+
+class TestAppendRecords:
+    def test_appends_records_as_lines(self) -> None:
+        records = [_record("first"), _record("second")]
+
+        journal_store.append_records(records[:1])
+        journal_store.append_records(records[1:])
+
+        assert journal_store._segment_path(1).read_bytes() == b"".join(
+            serialize_record(record) + b"\n" for record in records
+        )
+
+    def test_keeps_records_of_concurrent_writers(self, session_dir: pathlib.Path) -> None:
+        writers = [
+            subprocess.Popen([sys.executable, "-c", _APPEND_MANY, str(session_dir), "25"])  # noqa: S603
+            for _ in range(4)
+        ]
+
+        assert [writer.wait() for writer in writers] == [0, 0, 0, 0]
+        assert sum(segment.records for segment in journal_store.load_index().segments) == 100
+        assert journal_store.load_index() == journal_store._rebuild_index()
+
+    def test_starts_new_segment_when_current_is_full(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(journal_store, "SEGMENT_MAX_RECORDS", 2)
+
+        journal_store.append_records([_record("first")])
+        journal_store.append_records([_record("second"), _record("third", task_id=SECOND_TASK)])
+
+        index = journal_store.load_index()
+        assert [(segment.number, segment.records) for segment in index.segments] == [(1, 2), (2, 1)]
+        assert index.segments[1].task_ids == {SECOND_TASK}
+
+
+class TestEndPosition:
+    def test_points_after_last_record(self) -> None:
+        journal_store.append_records([_record("first")])
+
+        position = _end()
+
+        assert (position.segment, position.offset) == (1, journal_store._segment_path(1).stat().st_size)
+
+    def test_points_to_start_of_empty_store(self) -> None:
+        position = _end()
+
+        assert (position.segment, position.offset) == (1, 0)
+
+
+class TestTail:
+    def test_returns_last_records_in_order(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(journal_store, "SEGMENT_MAX_RECORDS", 2)
+        journal_store.append_records([_record(str(number)) for number in range(5)])
+
+        assert _messages(journal_store.tail(3, JournalQuery(), _end())) == ["2", "3", "4"]
+
+    def test_reads_only_segments_that_may_match(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(journal_store, "SEGMENT_MAX_RECORDS", 2)
+        journal_store.append_records(
+            [
+                _record("first", task_id=SECOND_TASK),
+                _record("second"),
+                _record("third"),
+                _record("fourth"),
+            ]
+        )
+        position = _end()
+        read = mocker.spy(journal_store, "_read_segment")
+
+        records = journal_store.tail(10, JournalQuery(task_id=SECOND_TASK), position)
+
+        assert _messages(records) == ["first"]
+        assert [call.args[0] for call in read.call_args_list] == [1]
+
+    def test_ignores_records_after_position(self) -> None:
+        journal_store.append_records([_record("first")])
+        position = _end()
+        journal_store.append_records([_record("second")])
+
+        assert _messages(journal_store.tail(10, JournalQuery(), position)) == ["first"]
+
+
+class TestReadAfter:
+    def test_returns_new_records_across_segments(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(journal_store, "SEGMENT_MAX_RECORDS", 2)
+        journal_store.append_records([_record("first")])
+        position = _end()
+        journal_store.append_records([_record("second"), _record("third", operation_id=SECOND_OPERATION)])
+
+        records, position = journal_store.read_after(JournalQuery(operation_id=FIRST_OPERATION), position)
+
+        assert _messages(records) == ["second"]
+        assert (position.segment, position.offset) == (2, journal_store._segment_path(2).stat().st_size)
+        assert journal_store.read_after(JournalQuery(), position)[0] == []
+
+
+class _StopFollow(Exception):
+    pass
+
+
+class TestFollow:
+    def test_yields_records_written_after_position(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(journal_store, "FOLLOW_POLL_INTERVAL", 0)
+        journal_store.append_records([_record("old")])
+        records = journal_store.follow(JournalQuery(), _end())
+        journal_store.append_records([_record("new")])
+
+        assert next(records).message == "new"
+
+    def test_reads_index_only_when_it_changes(self, mocker: MockerFixture) -> None:
+        journal_store.append_records([_record("old")])
+        position = _end()
+        clock = mocker.patch.object(journal_store, "time")
+        clock.sleep.side_effect = [None, None, _StopFollow()]
+        load_index = mocker.spy(journal_store, "load_index")
+
+        with pytest.raises(_StopFollow):
+            next(journal_store.follow(JournalQuery(), position))
+
+        assert clock.sleep.call_count == 3
+        load_index.assert_called_once()
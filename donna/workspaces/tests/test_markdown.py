@@ -1,4 +1,6 @@
 from markdown_it import MarkdownIt
+from markdown_it.tree import SyntaxTreeNode
+from pytest_mock import MockerFixture
 
 from donna.workspaces import errors as workspace_errors
 from donna.workspaces import markdown
@@ -32,21 +34,27 @@ class TestCodeSource:
 
 
 class TestSectionSource:
-    def test_as_original_markdown__renders_title_and_original_tokens(self) -> None:
-        tokens = MarkdownIt("commonmark").parse("Body\n")
-        section = make.section_source(level=SectionLevel.h1, title="Workflow")
-        section.original_tokens.extend(tokens)
+    def test_as_original_markdown__renders_title_and_original_markdown(self) -> None:
+        section = make.section_source(level=SectionLevel.h1, title="Workflow", original_markdown="Body\n")
+
+        assert section.as_original_markdown(with_title=True) == "# Workflow\nBody\n"
+        assert section.as_original_markdown(with_title=False) == "Body\n"
+
+    def test_as_analysis_markdown__renders_title_and_analysis_markdown(self) -> None:
+        section = make.section_source(level=SectionLevel.h2, title="Step", analysis_markdown="Analysis\n")
 
-        assert section.as_original_markdown(with_title=True).startswith("# Workflow\n")
-        assert "Body" in section.as_original_markdown(with_title=False)
+        assert section.as_analysis_markdown(with_title=True) == "## Step\nAnalysis\n"
+        assert section.as_analysis_markdown(with_title=False) == "Analysis\n"
 
-    def test_as_analysis_markdown__renders_title_and_analysis_tokens(self) -> None:
-        tokens = MarkdownIt("commonmark").parse("Analysis\n")
-        section = make.section_source(level=SectionLevel.h2, title="Step")
-        section.analysis_tokens.extend(tokens)
+    def test_as_markdown__substitutes_mode_values_into_shared_markdown(self) -> None:
+        section = make.section_source(
+            original_markdown="Run `MARKER1X` now\n", analysis_markdown="Run `MARKER1X` now\n"
+        )
+        section.original_values.update({"MARKER1X": "donna run"})
+        section.analysis_values.update({"MARKER1X": "$$donna goto next donna$$"})
 
-        assert section.as_analysis_markdown(with_title=True).startswith("## Step\n")
-        assert "Analysis" in section.as_analysis_markdown(with_title=False)
+        assert section.as_original_markdown(with_title=False) == "Run `donna run` now\n"
+        assert section.as_analysis_markdown(with_title=False) == "Run `$$donna goto next donna$$` now\n"
 
     def test_config__returns_empty_dict_without_config_blocks(self) -> None:
         assert make.section_source().config().unwrap() == {}
@@ -69,6 +77,13 @@ class TestSectionSource:
         assert result.is_err()
         assert isinstance(result.unwrap_err()[0], workspace_errors.MarkdownMultipleConfigBlocksInSection)
 
+    def test_scripts__returns_script_blocks_in_order(self) -> None:
+        first = make.code_source("bash", "echo 1", script=True, id="first")
+        second = make.code_source("bash", "echo 2", script=True, id="second")
+        section = make.section_source(configs=[make.code_source("toml", "id = 'x'", config=True), first, second])
+
+        assert section.scripts() == [first, second]
+
     def test_script__returns_none_without_script_blocks(self) -> None:
         assert make.section_source().script().unwrap() is None
 
@@ -91,6 +106,11 @@ class TestSectionSource:
         assert isinstance(result.unwrap_err()[0], workspace_errors.MarkdownMultipleScriptBlocksInSection)
 
 
+class TestCommonmark:
+    def test_reuses_parser(self) -> None:
+        assert markdown._commonmark() is markdown._commonmark()
+
+
 class TestRenderBack:
     def test_renders_tokens_to_markdown(self) -> None:
         tokens = MarkdownIt("commonmark").parse("Body\n")
@@ -98,11 +118,70 @@ class TestRenderBack:
         assert "Body" in markdown.render_back(tokens)
 
 
+class TestNormalize:
+    def test_normalize__renders_markdown_in_canonical_form(self) -> None:
+        assert markdown.normalize("+ item\n") == "- item\n"
+        assert markdown.normalize("plain text") == "plain text\n"
+
+
+class TestSubstituteValues:
+    def test_substitute_values__replaces_every_marker_occurrence(self) -> None:
+        text = "A1X and A2X, again A1X"
+
+        assert markdown.substitute_values(text, {"A1X": "one", "A2X": "two"}) == "one and two, again one"
+
+    def test_substitute_values__keeps_text_without_values(self) -> None:
+        assert markdown.substitute_values("text", {}) == "text"
+
+
+class TestSplitSections:
+    def test_split_sections__splits_by_h1_and_h2_headings(self) -> None:
+        text = "\n# Workflow\n\nIntro\n\n## First\n\n### Details\n\n## Second\nBody\n"
+
+        assert markdown.split_sections(text) == [
+            "\n# Workflow\n\nIntro\n\n",
+            "## First\n\n### Details\n\n",
+            "## Second\nBody\n",
+        ]
+
+    def test_split_sections__ignores_headings_in_fenced_code(self) -> None:
+        text = "# Workflow\n\n````md\n## Not a section\n```\n# Still code\n````\n\n## Step\n"
+
+        assert markdown.split_sections(text) == [
+            "# Workflow\n\n````md\n## Not a section\n```\n# Still code\n````\n\n",
+            "## Step\n",
+        ]
+
+    def test_split_sections__matches_parsed_sections(self) -> None:
+        text = "# Workflow\n\n## First\n\n~~~\n# code\n~~~\n\n## Second\n#hashtag\n"
+
+        assert len(markdown.split_sections(text)) == len(markdown.parse(text).unwrap())
+
+
 class TestClearHeading:
     def test_removes_heading_markers_and_surrounding_whitespace(self) -> None:
         assert markdown.clear_heading("##  Step  ") == "Step"
 
 
+class TestHeadingTitle:
+    def test_takes_plain_title_from_inline_text(self, mocker: MockerFixture) -> None:
+        node = SyntaxTreeNode(MarkdownIt("commonmark").parse("## Plain title: step 1!\n")).children[0]
+        render_back = mocker.spy(markdown, "render_back")
+
+        assert markdown.heading_title(node) == "Plain title: step 1!"
+        render_back.assert_not_called()
+
+    def test_renders_title_with_markup(self) -> None:
+        node = SyntaxTreeNode(MarkdownIt("commonmark").parse("## Run  `donna` \\*now\\*\n")).children[0]
+
+        assert markdown.heading_title(node) == "Run `donna` \\*now\\*"
+
+    def test_renders_title_with_closing_hash(self) -> None:
+        node = SyntaxTreeNode(MarkdownIt("commonmark").parse("## Issue \\#\n")).children[0]
+
+        assert markdown.heading_title(node) == "Issue \\#"
+
+
 class TestParseH1:
     def test_parse_h1__creates_primary_section(self) -> None:
         result = markdown.parse("# Workflow\n", artifact_id=make.ARTIFACT_ID)
@@ -122,6 +201,14 @@ class TestParseH2:
         assert section.level == SectionLevel.h2
         assert section.title == "Step"
 
+    def test_parse_h2__substitutes_values_into_title(self) -> None:
+        result = markdown.parse(
+            "# Workflow\n\n## Step MARKER1X\n", artifact_id=make.ARTIFACT_ID, values={"MARKER1X": "one"}
+        )
+
+        assert result.is_ok()
+        assert result.unwrap()[1].title == "Step one"
+
 
 class TestParseHeading:
     def test_parse_heading__stores_lower_headings_as_section_content(self) -> None:
@@ -146,6 +233,16 @@ class TestParseFence:
         assert result.is_ok()
         assert result.unwrap()[0].config().unwrap() == {"id": "primary"}
 
+    def test_parse_fence__substitutes_values_into_code_blocks(self) -> None:
+        result = markdown.parse(
+            "# Workflow\n\n```toml donna\nid = 'MARKER1X'\n```\n",
+            artifact_id=make.ARTIFACT_ID,
+            values={"MARKER1X": "primary"},
+        )
+
+        assert result.is_ok()
+        assert result.unwrap()[0].config().unwrap() == {"id": "primary"}
+
     def test_parse_fence__parses_marker_key_values(self) -> None:
         result = markdown.parse(
             "# Workflow\n\n```toml donna name=value\nid = 'primary'\n```\n", artifact_id=make.ARTIFACT_ID
@@ -202,6 +299,16 @@ print("run")
         assert "Intro" in sections[0].as_original_markdown(with_title=False)
         assert "Body" in sections[1].as_original_markdown(with_title=False)
 
+    def test_parse__renders_each_section_once_and_releases_tokens(self, mocker: MockerFixture) -> None:
+        render_back = mocker.spy(markdown, "render_back")
+
+        sections = markdown.parse("# Workflow\n\nIntro\n\n## Step\n\nBody\n", artifact_id=make.ARTIFACT_ID).unwrap()
+
+        assert render_back.call_count == 2
+        assert [section.original_markdown for section in sections] == ["Intro\n", "Body\n"]
+        assert [section.analysis_markdown for section in sections] == ["Intro\n", "Body\n"]
+        assert all(section._tokens == [] for section in sections)
+
     def test_parse__rejects_h2_before_h1(self) -> None:
         result = markdown.parse("## Step\n", artifact_id=make.ARTIFACT_ID)
 
@@ -10,22 +10,57 @@ from donna.domain.ids import SectionId
 from donna.domain.python_path import PythonPath
 from donna.machine.artifacts import Artifact, ArtifactSection, ArtifactSectionConfig
 from donna.machine.primitives import Primitive
+from donna.machine.templates import RenderMode
 from donna.primitives.sections.text import Text
 from donna.workspaces import errors as workspace_errors
 from donna.workspaces import markdown_parser
-from donna.workspaces.artifacts import RENDER_CONTEXT_VIEW
+from donna.workspaces.artifacts import RENDER_CONTEXT_VIEW, ArtifactRenderContext
 from donna.workspaces.markdown import CodeSource, SectionLevel, SectionSource
 from donna.workspaces.markdown_parser import MarkdownSectionMixin, construct_sections_from_markdown
+from donna.workspaces.templates import DualRender
 from donna.workspaces.tests import make
 
 TEXT_KIND = PythonPath(NormalizedRawIdPath("donna.primitives.sections.text.Text"))
 LIB_TEXT_KIND = PythonPath(NormalizedRawIdPath("donna.lib.text"))
+EXECUTE_CONTEXT = ArtifactRenderContext(primary_mode=RenderMode.execute)
+SECTIONED_SOURCE = (
+    '# Workflow\n\n```toml donna\nid = "workflow"\n```\n\n'
+    "Start `{{ donna.workspaces.tests.test_templates.sample_directive('workflow') }}`.\n\n"
+    '## First\n\n```toml donna\nid = "first"\n```\n\n'
+    "Run `{{ donna.workspaces.tests.test_templates.sample_directive('first') }}`.\n\n"
+    '## Second\n\n```toml donna\nid = "second"\n```\n\n'
+    "Run `{{ donna.workspaces.tests.test_templates.sample_directive('second') }}`.\n"
+)
 
 
 class _MarkdownPrimitive(MarkdownSectionMixin, Primitive):
     config_class: ClassVar[type[ArtifactSectionConfig]] = ArtifactSectionConfig
 
 
+def _construct_artifact(content: str) -> Artifact:
+    return markdown_parser.construct_artifact_from_markdown_source(
+        make.ARTIFACT_ID,
+        content,
+        RENDER_CONTEXT_VIEW,
+        default_section_kind=LIB_TEXT_KIND,
+        default_primary_section_kind=LIB_TEXT_KIND,
+        default_primary_section_id=SectionId("primary"),
+    ).unwrap()
+
+
+def _construct_section(content: str, structure: Artifact, section_id: str) -> ArtifactSection | None:
+    return markdown_parser.construct_section_from_markdown_source(
+        make.ARTIFACT_ID,
+        content,
+        structure,
+        SectionId(section_id),
+        EXECUTE_CONTEXT,
+        default_section_kind=LIB_TEXT_KIND,
+        default_primary_section_kind=LIB_TEXT_KIND,
+        default_primary_section_id=SectionId("primary"),
+    ).unwrap()
+
+
 class _FailingMarkdownPrimitive(_MarkdownPrimitive):
     def markdown_construct_section(
         self,
@@ -87,13 +122,13 @@ class TestMarkdownSectionMixin:
 
 
 class TestParseArtifactContent:
-    def test_returns_original_sections_with_analysis_tokens(self) -> None:
+    def test_returns_original_sections_with_analysis_markdown(self) -> None:
         result = markdown_parser.parse_artifact_content(make.ARTIFACT_ID, "# Workflow\n\nBody\n", RENDER_CONTEXT_VIEW)
 
         assert result.is_ok()
         section = result.unwrap()[0]
         assert section.title == "Workflow"
-        assert section.analysis_tokens
+        assert section.analysis_markdown == "Body\n"
 
     def test_returns_error_for_source_without_sections(self) -> None:
         result = markdown_parser.parse_artifact_content(make.ARTIFACT_ID, "", RENDER_CONTEXT_VIEW)
@@ -101,15 +136,51 @@ class TestParseArtifactContent:
         assert result.is_err()
         assert isinstance(result.unwrap_err()[0], workspace_errors.MarkdownArtifactWithoutSections)
 
+    def test_parses_markdown_once_for_substitutable_directive_outputs(self, mocker: MockerFixture) -> None:
+        parse = mocker.spy(markdown_parser.markdown, "parse")
+        text = "# Workflow\n\nRun `{{ donna.workspaces.tests.test_templates.sample_directive('next') }}`.\n"
+
+        result = markdown_parser.parse_artifact_content(make.ARTIFACT_ID, text, RENDER_CONTEXT_VIEW)
+
+        assert result.is_ok()
+        section = result.unwrap()[0]
+        assert parse.call_count == 1
+        assert section.as_original_markdown(with_title=False) == "Run `view:next`.\n"
+        assert section.as_analysis_markdown(with_title=False) == "Run `$$donna sample next donna$$`.\n"
+
+    def test_renders_analysis_separately_for_diverged_directive_outputs(self, mocker: MockerFixture) -> None:
+        render = mocker.spy(markdown_parser, "render")
+        text = "# Workflow\n\n{{ donna.workspaces.tests.test_templates.multiline_directive() }}\n"
+
+        result = markdown_parser.parse_artifact_content(make.ARTIFACT_ID, text, RENDER_CONTEXT_VIEW)
+
+        assert result.is_ok()
+        section = result.unwrap()[0]
+        assert render.call_count == 1
+        assert section.as_original_markdown(with_title=False) == "first\nsecond\n"
+        assert section.as_analysis_markdown(with_title=False) == "$$donna multiline donna$$\n"
+
+
+class TestParseRenderModesSeparately:
+    def test_combines_original_and_analysis_markdown(self) -> None:
+        rendered = DualRender(text="# Workflow\n\nM1X\n", original_values={"M1X": "Original"}, diverged=True)
+        text = "# Workflow\n\n{{ donna.workspaces.tests.test_templates.multiline_directive() }}\n"
+
+        result = markdown_parser._parse_render_modes_separately(make.ARTIFACT_ID, text, rendered, RENDER_CONTEXT_VIEW)
+
+        assert result.is_ok()
+        section = result.unwrap()[0]
+        assert section.as_original_markdown(with_title=False) == "Original\n"
+        assert section.as_analysis_markdown(with_title=False) == "$$donna multiline donna$$\n"
+
     def test_raises_internal_error_for_analysis_section_count_mismatch(self, mocker: MockerFixture) -> None:
-        mocker.patch.object(
-            markdown_parser,
-            "render",
-            side_effect=[Ok("# Workflow\n"), Ok("# Workflow\n\n## Step\n")],
-        )
+        mocker.patch.object(markdown_parser, "render", return_value=Ok("# Workflow\n\n## Step\n"))
+        rendered = DualRender(text="# Workflow\n", diverged=True)
 
         try:
-            markdown_parser.parse_artifact_content(make.ARTIFACT_ID, "# Workflow\n", RENDER_CONTEXT_VIEW)
+            markdown_parser._parse_render_modes_separately(
+                make.ARTIFACT_ID, "# Workflow\n", rendered, RENDER_CONTEXT_VIEW
+            )
         except workspace_errors.MarkdownSectionsCountMismatch as error:
             assert error.arguments["original_count"] == 1
             assert error.arguments["analyzed_count"] == 2
@@ -158,6 +229,100 @@ class TestConstructArtifactFromMarkdownSource:
         assert artifact.sections[0].primary
 
 
+class TestConstructSectionFromMarkdownSource:
+    def test_renders_only_executed_tail_section(self, mocker: MockerFixture) -> None:
+        structure = _construct_artifact(SECTIONED_SOURCE)
+        render_dual = mocker.spy(markdown_parser, "render_dual")
+
+        section = _construct_section(SECTIONED_SOURCE, structure, "second")
+
+        assert section is not None
+        assert section.id == SectionId("second")
+        assert section.title == "Second"
+        assert section.description == "Run `execute:second`."
+        rendered_template = render_dual.call_args.args[1]
+        assert "'second'" in rendered_template
+        assert "'first'" not in rendered_template
+        assert "'workflow'" not in rendered_template
+
+    def test_renders_only_executed_primary_section(self) -> None:
+        structure = _construct_artifact(SECTIONED_SOURCE)
+
+        section = _construct_section(SECTIONED_SOURCE, structure, "workflow")
+
+        assert section is not None
+        assert section.primary
+        assert section.description == "Start `execute:workflow`."
+
+    def test_matches_tail_section_of_whole_artifact_render(self) -> None:
+        structure = _construct_artifact(SECTIONED_SOURCE)
+
+        section = _construct_section(SECTIONED_SOURCE, structure, "first")
+        whole_artifact = markdown_parser.construct_artifact_from_markdown_source(
+            make.ARTIFACT_ID,
+            SECTIONED_SOURCE,
+            EXECUTE_CONTEXT,
+            default_section_kind=LIB_TEXT_KIND,
+            default_primary_section_kind=LIB_TEXT_KIND,
+            default_primary_section_id=SectionId("primary"),
+        ).unwrap()
+
+        assert section == whole_artifact.get_section(SectionId("first")).unwrap()
+
+    def test_returns_none_for_unknown_section(self) -> None:
+        structure = _construct_artifact(SECTIONED_SOURCE)
+
+        assert _construct_section(SECTIONED_SOURCE, structure, "missing") is None
+
+    def test_returns_none_for_templates_with_statements(self) -> None:
+        content = SECTIONED_SOURCE + "{% if true %}Done{% endif %}\n"
+        structure = _construct_artifact(content)
+
+        assert _construct_section(content, structure, "second") is None
+
+    def test_returns_none_when_slices_do_not_match_structure(self) -> None:
+        structure = _construct_artifact(SECTIONED_SOURCE)
+        content = SECTIONED_SOURCE + "\n## Third\n"
+
+        assert _construct_section(content, structure, "second") is None
+
+    def test_returns_none_for_broken_section_template(self) -> None:
+        structure = _construct_artifact(SECTIONED_SOURCE)
+        content = SECTIONED_SOURCE.replace("sample_directive('second') }}", "sample_directive('second' }}")
+
+        assert _construct_section(content, structure, "second") is None
+
+    def test_returns_none_for_section_render_errors(self) -> None:
+        structure = _construct_artifact(SECTIONED_SOURCE)
+        content = SECTIONED_SOURCE.replace("sample_directive('second')", "failing_directive()")
+
+        assert _construct_section(content, structure, "second") is None
+
+    def test_returns_none_when_section_id_changed(self) -> None:
+        structure = _construct_artifact(SECTIONED_SOURCE)
+        content = SECTIONED_SOURCE.replace('id = "second"', 'id = "renamed"')
+
+        assert _construct_section(content, structure, "second") is None
+
+
+class TestConstructPrimarySectionFromMarkdown:
+    def test_applies_primary_section_defaults(self) -> None:
+        section = make.section_source(level=SectionLevel.h1, title="Workflow")
+
+        result = markdown_parser.construct_primary_section_from_markdown(
+            artifact_id=make.ARTIFACT_ID,
+            source=section,
+            default_primary_section_kind=LIB_TEXT_KIND,
+            default_primary_section_id=SectionId("primary"),
+        )
+
+        assert result.is_ok()
+        constructed = result.unwrap()
+        assert constructed.id == SectionId("primary")
+        assert constructed.kind == LIB_TEXT_KIND
+        assert constructed.primary
+
+
 class TestConstructSectionsFromMarkdown:
     def test_parses_raw_string_kind_at_workspace_boundary(self) -> None:
         section = SectionSource(
@@ -170,8 +335,6 @@ class TestConstructSectionsFromMarkdown:
                     content='id = "section"\nkind = "donna.primitives.sections.text.Text"',
                 )
             ],
-            original_tokens=[],
-            analysis_tokens=[],
         )
 
         result = construct_sections_from_markdown(
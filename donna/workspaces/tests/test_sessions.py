@@ -2,18 +2,23 @@ import pathlib
 
 from pytest_mock import MockerFixture
 
-from donna.domain.constants import STATE_FILE_NAME
+from donna.domain.constants import OUTPUTS_DIR_NAME, STATE_BINARY_FILE_NAME, STATE_CHANGES_FILE_NAME, STATE_FILE_NAME
 from donna.domain.paths import RelativeProjectPath
 from donna.workspaces import sessions
-from donna.workspaces.config import Config
+from donna.workspaces.config import Config, StateConfig, StateFormat
 from donna.workspaces.files import FileFingerprint
 
 
-def _patch_session_globals(mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+def _patch_session_globals(
+    mocker: MockerFixture, tmp_path: pathlib.Path, state_format: StateFormat = StateFormat.json
+) -> None:
     mocker.patch("donna.workspaces.sessions.project_dir", return_value=tmp_path)
     mocker.patch(
         "donna.workspaces.sessions.config",
-        return_value=Config(session_dir=RelativeProjectPath(pathlib.Path(".session/donna"))),
+        return_value=Config(
+            session_dir=RelativeProjectPath(pathlib.Path(".session/donna")),
+            state=StateConfig(format=state_format),
+        ),
     )
 
 
@@ -43,6 +48,43 @@ class TestStatePath:
 
         assert sessions._state_path() == tmp_path / ".session" / "donna" / STATE_FILE_NAME
 
+    def test_returns_binary_state_file_path_for_binary_format(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+
+        assert sessions._state_path() == tmp_path / ".session" / "donna" / STATE_BINARY_FILE_NAME
+
+
+class TestStoredStatePath:
+    def test_returns_configured_path_without_stored_state(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+
+        assert sessions._stored_state_path() == tmp_path / ".session" / "donna" / STATE_BINARY_FILE_NAME
+
+    def test_returns_state_stored_in_another_format(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path)
+        sessions.write_state(b"state")
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+
+        assert sessions._stored_state_path() == tmp_path / ".session" / "donna" / STATE_FILE_NAME
+
+
+class TestStateFormat:
+    def test_state_format__returns_configured_format(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+
+        assert sessions.state_format() == StateFormat.binary
+
+
+class TestStateChangesPath:
+    def test_returns_state_changes_file_path_under_session_dir(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path)
+
+        assert sessions._state_changes_path() == tmp_path / ".session" / "donna" / STATE_CHANGES_FILE_NAME
+
 
 class TestEnsureDir:
     def test_ensure_dir__creates_session_directory(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
@@ -53,6 +95,18 @@ class TestEnsureDir:
         assert (tmp_path / ".session" / "donna").is_dir()
 
 
+class TestOutputsDir:
+    def test_outputs_dir__creates_outputs_directory_under_session_dir(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path)
+
+        outputs_dir = sessions.outputs_dir()
+
+        assert outputs_dir == tmp_path / ".session" / "donna" / OUTPUTS_DIR_NAME
+        assert outputs_dir.is_dir()
+
+
 class TestResetDir:
     def test_reset_dir__removes_existing_content_and_recreates_directory(
         self, mocker: MockerFixture, tmp_path: pathlib.Path
@@ -82,6 +136,15 @@ class TestReadState:
 
         assert sessions.read_state() == b"state"
 
+    def test_read_state__reads_state_stored_in_another_format(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+        sessions.write_state(b"binary")
+        _patch_session_globals(mocker, tmp_path)
+
+        assert sessions.read_state() == b"binary"
+
 
 class TestWriteState:
     def test_write_state__writes_state_bytes(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
@@ -92,6 +155,18 @@ class TestWriteState:
 
         assert (tmp_path / ".session" / "donna" / STATE_FILE_NAME).read_bytes() == b"state"
 
+    def test_write_state__removes_state_stored_in_another_format(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path)
+        sessions.write_state(b"state")
+        _patch_session_globals(mocker, tmp_path, StateFormat.binary)
+
+        sessions.write_state(b"binary")
+
+        assert not (tmp_path / ".session" / "donna" / STATE_FILE_NAME).exists()
+        assert (tmp_path / ".session" / "donna" / STATE_BINARY_FILE_NAME).read_bytes() == b"binary"
+
 
 class TestStateFingerprint:
     def test_state_fingerprint__returns_none_for_missing_state_file(
@@ -110,3 +185,83 @@ class TestStateFingerprint:
         assert sessions.state_fingerprint() == FileFingerprint.from_path(
             tmp_path / ".session" / "donna" / STATE_FILE_NAME
         )
+
+
+class TestReadStateChanges:
+    def test_read_state_changes__returns_none_for_missing_file(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path)
+
+        assert sessions.read_state_changes() is None
+
+    def test_read_state_changes__returns_changes_bytes(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path)
+        sessions.write_state_changes(b"changes")
+
+        assert sessions.read_state_changes() == b"changes"
+
+
+class TestStateChangesFingerprint:
+    def test_state_changes_fingerprint__returns_none_for_missing_file(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path)
+
+        assert sessions.state_changes_fingerprint() is None
+
+    def test_state_changes_fingerprint__returns_fingerprint_for_changes_file(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path)
+        sessions.write_state_changes(b"changes")
+
+        assert sessions.state_changes_fingerprint() == FileFingerprint.from_path(
+            tmp_path / ".session" / "donna" / STATE_CHANGES_FILE_NAME
+        )
+
+
+class TestWriteStateChanges:
+    def test_write_state_changes__replaces_changes_bytes(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path)
+        sessions.write_state_changes(b"old")
+
+        sessions.write_state_changes(b"new")
+
+        assert sessions.read_state_changes() == b"new"
+
+
+class TestAppendStateChanges:
+    def test_append_state_changes__appends_to_existing_changes(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_session_globals(mocker, tmp_path)
+        sessions.write_state_changes(b"first\n")
+
+        sessions.append_state_changes(b"second\n")
+
+        assert sessions.read_state_changes() == b"first\nsecond\n"
+
+    def test_append_state_changes__creates_missing_file(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path)
+
+        sessions.append_state_changes(b"first\n")
+
+        assert sessions.read_state_changes() == b"first\n"
+
+
+class TestRemoveStateChanges:
+    def test_remove_state_changes__removes_changes_file(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path)
+        sessions.write_state_changes(b"changes")
+
+        sessions.remove_state_changes()
+
+        assert sessions.read_state_changes() is None
+
+    def test_remove_state_changes__ignores_missing_file(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_session_globals(mocker, tmp_path)
+
+        sessions.remove_state_changes()
+
+        assert sessions.read_state_changes() is None
@@ -1,14 +1,21 @@
+import pathlib
+from typing import cast
+
+import jinja2
 import pytest
 from pytest_mock import MockerFixture
 
 from donna.core.errors import EnvironmentErrorsProxy, ErrorsList
 from donna.core.result import Err, Ok, Result
+from donna.domain.constants import CACHE_DIR_NAME
 from donna.machine.templates import Directive, RenderMode
 from donna.machine.templates_context import DirectiveContext
+from donna.workspaces import config as workspace_config
 from donna.workspaces import errors as workspace_errors
 from donna.workspaces import templates
 from donna.workspaces.artifacts import ArtifactRenderContext
-from donna.workspaces.templates import DirectivePathBuilder, render
+from donna.workspaces.config import CacheConfig, Config, GlobalConfig
+from donna.workspaces.templates import DirectivePathBuilder, DualRender, render, render_dual
 from donna.workspaces.tests import make
 
 
@@ -33,18 +40,114 @@ class _ExplodingDirective(Directive):
         raise RuntimeError("boom")
 
 
+class _MultilineDirective(Directive):
+    analyze_id: str = "multiline"
+
+    def render_view(self, context: DirectiveContext, *argv: object) -> Result[object, ErrorsList]:
+        return Ok("first\nsecond")
+
+
 sample_directive = _Directive()
+multiline_directive = _MultilineDirective()
 failing_directive = _FailingDirective()
 exploding_directive = _ExplodingDirective()
 not_directive = object()
 
 
+class TestDualRender:
+    def test_original_text__substitutes_original_values(self) -> None:
+        rendered = DualRender(text="run M1X", original_values={"M1X": "view"}, analysis_values={"M1X": "analysis"})
+
+        assert rendered.original_text() == "run view"
+
+
+class TestIsSubstitutionSafe:
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "donna -p llm --config '/project/donna.toml' complete-action-request <action-request-id> '@/w.donna.md:a'",
+            "$$donna goto run_tach_script donna$$",
+        ],
+    )
+    def test_accepts_single_line_values_stable_under_markdown_normalization(self, value: str) -> None:
+        assert templates._is_substitution_safe(value)
+
+    @pytest.mark.parametrize("value", ["", "first\nsecond", "# Heading", "`code`", "a*b", "+ item", " padded", 42])
+    def test_rejects_values_that_may_change_markdown_structure(self, value: object) -> None:
+        assert not templates._is_substitution_safe(value)
+
+
+class TestDualRenderRecorder:
+    def test_record__returns_value_equal_in_both_modes(self) -> None:
+        recorder = templates._DualRenderRecorder()
+
+        assert recorder.record("same", "same") == "same"
+        assert recorder.original_values == {}
+
+    def test_record__returns_marker_for_different_values(self) -> None:
+        recorder = templates._DualRenderRecorder()
+
+        marker = recorder.record("view", "analysis")
+
+        assert isinstance(marker, str)
+        assert marker.isalnum()
+        assert recorder.original_values == {marker: "view"}
+        assert recorder.analysis_values == {marker: "analysis"}
+        assert not recorder.diverged
+
+    def test_record__marks_unsafe_values_as_diverged(self) -> None:
+        recorder = templates._DualRenderRecorder()
+
+        assert recorder.record("first\nsecond", "analysis") == "first\nsecond"
+        assert recorder.diverged
+
+    def test_result__marks_transformed_markers_as_diverged(self) -> None:
+        recorder = templates._DualRenderRecorder()
+        marker = cast(str, recorder.record("view", "analysis"))
+
+        assert not recorder.result(f"text {marker}").diverged
+        assert recorder.result(f"text {marker.lower()}").diverged
+
+
+class TestRenderModeOverride:
+    def test_overrides_render_mode_only(self) -> None:
+        context = templates._RenderModeOverride(
+            {"render_mode": RenderMode.view, "artifact_id": make.ARTIFACT_ID}, RenderMode.analysis
+        )
+
+        assert context["render_mode"] == RenderMode.analysis
+        assert context.get("artifact_id") == make.ARTIFACT_ID
+        assert context.get("missing") is None
+        assert set(context) == {"render_mode", "artifact_id"}
+        assert len(context) == 2
+
+
 class TestIsImportableModule:
     def test_returns_whether_module_can_be_imported(self) -> None:
         assert templates._is_importable_module("donna.workspaces.tests.test_templates")
         assert not templates._is_importable_module("donna.workspaces.tests.missing")
 
 
+class TestRecordingDirectiveModules:
+    def test_collects_modules_of_applied_directives(self) -> None:
+        builder = DirectivePathBuilder(("donna", "workspaces", "tests", "test_templates", "sample_directive"))
+
+        with templates.recording_directive_modules() as modules:
+            builder({"render_mode": RenderMode.view, "artifact_id": make.ARTIFACT_ID}, "value")
+
+        assert modules == {"donna.workspaces.tests.test_templates"}
+
+    def test_does_not_record_outside_of_block(self) -> None:
+        builder = DirectivePathBuilder(("donna", "workspaces", "tests", "test_templates", "sample_directive"))
+
+        with templates.recording_directive_modules() as modules:
+            pass
+
+        builder({"render_mode": RenderMode.view, "artifact_id": make.ARTIFACT_ID}, "value")
+
+        assert modules == set()
+
+
 class TestDirectivePathBuilder:
     def test_getattr__extends_directive_path(self) -> None:
         builder = DirectivePathBuilder(("donna", "workspaces")).tests.test_templates.sample_directive
@@ -173,6 +276,120 @@ class TestEnv:
         assert environment.undefined is templates.DirectivePathUndefined
 
 
+def _patch_templates_cache_globals(mocker: MockerFixture, tmp_path: pathlib.Path, config: Config) -> None:
+    mocker.patch("donna.workspaces.config.config", GlobalConfig[Config]())
+    workspace_config.config.set(config)
+    mocker.patch("donna.workspaces.sessions.project_dir", return_value=tmp_path)
+    mocker.patch("donna.workspaces.sessions.config", return_value=config)
+
+
+class TestBytecodeCache:
+    def test_bytecode_cache__is_disabled_without_workspace(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.config.config", GlobalConfig[Config]())
+
+        assert templates._bytecode_cache() is None
+
+    def test_bytecode_cache__respects_cache_config(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_templates_cache_globals(mocker, tmp_path, Config(cache=CacheConfig(templates=False)))
+
+        assert templates._bytecode_cache() is None
+
+    def test_bytecode_cache__stores_bytecode_in_session_cache_dir(
+        self, mocker: MockerFixture, tmp_path: pathlib.Path
+    ) -> None:
+        _patch_templates_cache_globals(mocker, tmp_path, Config())
+
+        bytecode_cache = templates._bytecode_cache()
+
+        assert isinstance(bytecode_cache, jinja2.FileSystemBytecodeCache)
+        assert bytecode_cache.directory == str(tmp_path / ".session" / "donna" / CACHE_DIR_NAME / "templates")
+
+
+class TestCompileTemplate:
+    def test_compile_template__compiles_without_bytecode_cache(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.templates._bytecode_cache", return_value=None)
+
+        assert templates._compile_template("Hello {{ name }}", None).render(name="Donna") == "Hello Donna"
+
+    def test_compile_template__reuses_bytecode_from_disk(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_templates_cache_globals(mocker, tmp_path, Config())
+        compile = mocker.spy(templates.env(), "compile")
+
+        first = templates._compile_template("Hello {{ name }}", "@/workflows/test.donna.md")
+        second = templates._compile_template("Hello {{ name }}", "@/workflows/test.donna.md")
+
+        assert first.render(name="Donna") == second.render(name="Donna") == "Hello Donna"
+        assert compile.call_count == 1
+
+    def test_compile_template__recompiles_changed_source(self, mocker: MockerFixture, tmp_path: pathlib.Path) -> None:
+        _patch_templates_cache_globals(mocker, tmp_path, Config())
+
+        templates._compile_template("Hello {{ name }}", "@/workflows/test.donna.md")
+        changed = templates._compile_template("Bye {{ name }}", "@/workflows/test.donna.md")
+
+        assert changed.render(name="Donna") == "Bye Donna"
+
+
+class TestCompiledTemplatesCache:
+    def test_get__returns_same_compiled_template_for_same_source(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.templates._bytecode_cache", return_value=None)
+        cache = templates.CompiledTemplatesCache(max_size=2)
+
+        assert cache.get("Hello") is cache.get("Hello")
+        assert cache.get("Hello") is not cache.get("Bye")
+
+    def test_get__evicts_least_recently_used_template(self, mocker: MockerFixture) -> None:
+        compile_template = mocker.patch(
+            "donna.workspaces.templates._compile_template", side_effect=lambda template, name: object()
+        )
+        cache = templates.CompiledTemplatesCache(max_size=2)
+
+        cache.get("first")
+        cache.get("second")
+        cache.get("first")
+        cache.get("third")
+        cache.get("first")
+        cache.get("second")
+
+        assert [call.args[0] for call in compile_template.call_args_list] == ["first", "second", "third", "second"]
+
+    def test_clear__drops_compiled_templates(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.templates._bytecode_cache", return_value=None)
+        cache = templates.CompiledTemplatesCache(max_size=2)
+        compiled = cache.get("Hello")
+
+        cache.clear()
+
+        assert cache.get("Hello") is not compiled
+
+
+class TestCompiledTemplate:
+    def test_compiled_template__uses_module_cache(self, mocker: MockerFixture) -> None:
+        mocker.patch("donna.workspaces.templates._bytecode_cache", return_value=None)
+
+        assert templates.compiled_template("{{ 1 + 1 }}") is templates.compiled_template("{{ 1 + 1 }}")
+        assert templates.compiled_template("{{ 1 + 1 }}").render() == "2"
+
+
+class TestHasOnlyExpressions:
+    def test_has_only_expressions__accepts_expressions(self) -> None:
+        assert templates.has_only_expressions("# Title\n\n{{ value }}\n")
+
+    @pytest.mark.parametrize("template", ["{% set value = 1 %}", "{# comment #}"])
+    def test_has_only_expressions__rejects_statements_and_comments(self, template: str) -> None:
+        assert not templates.has_only_expressions(template)
+
+
+class TestTemplateContext:
+    def test_template_context__includes_optional_task_values(self) -> None:
+        render_context = ArtifactRenderContext(primary_mode=RenderMode.view)
+
+        assert templates._template_context(make.ARTIFACT_ID, render_context) == {
+            "render_mode": RenderMode.view,
+            "artifact_id": make.ARTIFACT_ID,
+        }
+
+
 class TestRender:
     def test_render__applies_template_directives(self) -> None:
         context = ArtifactRenderContext(primary_mode=RenderMode.view)
@@ -197,3 +414,45 @@ class TestRender:
 
         assert result.is_err()
         assert isinstance(result.unwrap_err()[0], workspace_errors.MarkdownArtifactWithoutSections)
+
+
+class TestRenderDual:
+    def test_render_dual__keeps_mode_dependent_outputs_as_markers(self) -> None:
+        context = ArtifactRenderContext(primary_mode=RenderMode.view)
+
+        result = render_dual(
+            make.ARTIFACT_ID,
+            "{{ donna.workspaces.tests.test_templates.sample_directive('value') }}",
+            context,
+        )
+
+        assert result.is_ok()
+        rendered = result.unwrap()
+        assert not rendered.diverged
+        assert list(rendered.original_values) == [rendered.text]
+        assert rendered.original_text() == "view:value"
+        assert rendered.analysis_values[rendered.text] == "$$donna sample value donna$$"
+
+    def test_render_dual__reports_diverged_outputs(self) -> None:
+        context = ArtifactRenderContext(primary_mode=RenderMode.view)
+
+        result = render_dual(
+            make.ARTIFACT_ID,
+            "{{ donna.workspaces.tests.test_templates.multiline_directive() }}",
+            context,
+        )
+
+        assert result.is_ok()
+        assert result.unwrap() == DualRender(text="first\nsecond", diverged=True)
+
+    def test_render_dual__returns_directive_errors(self) -> None:
+        context = ArtifactRenderContext(primary_mode=RenderMode.view)
+
+        result = render_dual(
+            make.ARTIFACT_ID,
+            "{{ donna.workspaces.tests.test_templates.failing_directive() }}",
+            context,
+        )
+
+        assert result.is_err()
+        assert isinstance(result.unwrap_err()[0], workspace_errors.MarkdownArtifactWithoutSections)